@@ -1,19 +1,43 @@
 # app.py
 import streamlit as st
-from utils.database import get_connection
+from utils.session import DBSession
 from components.sidebar import show_sidebar
 from components.table_view import display_dataframe
 from components.filter_panel import apply_filters
 from components.sql_runner_simple import run_custom_query
 from components.sql_filter_runner import run_sql_filter
-from setup import test_connection
 
 from components.table_editor import table_editor
+from components.search_panel import search_panel
+from utils.perf import count_rerun, timed, show_perf_panel
+from utils.prefetch import get_prefetcher
+from utils.table_cache import get_table_cache, current_account
+from utils.change_feed import sync_changes
+from utils.snapshot import get_snapshot_scheduler
 
 # 2 Nutzer:
 # verwaltung (pw:1234)
 # kursleiter (pw:12345)
 
+def _db_session():
+    """
+    Liefert die Datenbanksitzung (DBSession) dieses Browser-Tabs.
+
+    Nach dem Login wird die beim Login erzeugte Sitzung verwendet, sonst
+    eine Sitzung mit den Zugangsdaten aus secrets.toml (öffentliche Ansicht).
+    Die Sitzung wird nur einmal aufgebaut und über Reruns wiederverwendet.
+    """
+    if st.session_state.get("db_session") is None:
+        st.session_state["db_session"] = DBSession.from_secrets()
+    return st.session_state["db_session"]
+
+def _end_session():
+    """Schließt die aktuelle Sitzung (z.B. beim Login/Logout)."""
+    session = st.session_state.pop("db_session", None)
+    if session is not None:
+        get_prefetcher().cancel(session)
+        session.close()
+
 def main():
     """
     Startet die Streamlit-App mit einem Tab:
@@ -26,7 +50,14 @@ def main():
     
     Liest Tabellen und Filter aus der Sidebar, verwaltet Limits und gibt
     Ergebnisse als DataFrame oder CSV aus.
+
+    Ergebnis, SQL-Tab und Editor laufen als Fragmente und werden nur bei
+    eigenen Eingaben neu ausgeführt; Tabellen und Spaltenstatistiken kommen
+    aus dem Cache und werden über das Änderungsprotokoll (utils/change_feed.py)
+    zeilenweise aktuell gehalten. Rerun-Zähler und Abschnittszeiten stehen im Expander
+    "Performance" in der Sidebar.
     """
+    count_rerun()
     st.title("Hochschulsport")
 
     if "default_view" not in st.session_state:
@@ -34,7 +65,6 @@ def main():
         st.session_state["show_login"] = False
         st.session_state["logged_in"] = False
         st.session_state["sql_user"] = None
-        st.session_state["sql_password"] = None
 
     with st.sidebar:
         st.subheader("Nutzerzugang")
@@ -52,9 +82,16 @@ def main():
             user = st.text_input("Nutzername")
             password = st.text_input("Passwort", type = "password")
             if st.button("Login", disabled = not(user and password)):
-                if test_connection(user, password) and user is not None:
+                import mysql.connector
+
+                try:
+                    session = DBSession.login(user, password)
+                except mysql.connector.Error:
+                    session = None
+                if session is not None:
+                    _end_session()
+                    st.session_state["db_session"] = session
                     st.session_state["sql_user"] = user
-                    st.session_state["sql_password"] = password
                     st.session_state["show_login"] = False
                     st.session_state["logged_in"] = True
                     st.rerun()
@@ -63,35 +100,43 @@ def main():
 
         #Show-Logout: Nutzer ist eingelogged (Verwaltung oder Kursleiter)
         if st.session_state["logged_in"]:
-            st.success(f"Erfolgreich als {st.session_state['sql_user']} verbunden!")
+            role = _db_session().role
+            role_text = f" (Rolle: {role})" if role else ""
+            st.success(f"Erfolgreich als {st.session_state['sql_user']} verbunden!{role_text}")
             if st.button("Abmelden"):
+                _end_session()
                 st.session_state["default_view"] = True
                 st.session_state["logged_in"] = False
                 st.session_state["sql_user"] = None
-                st.session_state["sql_password"] = None
+                st.session_state.pop("active_tab", None)
                 st.rerun()
 
-    conn = get_connection(
-            user=st.session_state["sql_user"],
-            password=st.session_state["sql_password"]
-        )
+    conn = _db_session().connection()
+    # Änderungen anderer Sitzungen in die zwischengespeicherten Tabellen übernehmen
+    with timed("change_feed"):
+        sync_changes(conn, current_account())
+    # Analyse-Snapshot im Hintergrund aktuell halten (startet einmal pro Prozess)
+    get_snapshot_scheduler()
 
     ## Nur Verwaltung und Kursleiter kriegen SQL-Abfrage und Tabelle bearbeiten angezeigt
     if st.session_state["logged_in"]:
         tabs = ["Tabelle anzeigen", "SQL-Abfrage","Tabelle bearbeiten"]
-        active_tab = st.radio("Wähle einen Tab", tabs, index=0)
     else:
         tabs = ["Tabelle anzeigen"]
-        active_tab = st.radio("Wähle einen Tab", tabs, index=0)
-        
+    # Der Tab kann auch über Links aus der Suche gesetzt werden (key="active_tab")
+    if st.session_state.get("active_tab") not in tabs:
+        st.session_state.pop("active_tab", None)
+    active_tab = st.radio("Wähle einen Tab", tabs, key="active_tab")
 
-    with st.sidebar:
-        selected_table, filters, limit_active, default_limit, df_for_filters = show_sidebar(conn, active_tab)
+    search_panel(_db_session(), st.session_state["logged_in"])
+
+    with st.sidebar, timed("sidebar"):
+        selected_table, filters, limit_active, default_limit, df_for_filters = show_sidebar(conn, active_tab, session=_db_session())
 
 
     if active_tab == "SQL-Abfrage":
         st.title("Freie SQL-Abfrage")
-        run_custom_query()
+        run_custom_query(conn, _db_session().role, _db_session().privileges)
 
     elif active_tab == "Tabelle anzeigen":
         limit_to_use = default_limit if limit_active else None
@@ -101,7 +146,13 @@ def main():
             st.info("Bitte wähle eine Tabelle in der Sidebar.")
         else:
             with st.spinner("Führe parametrisierten SQL-Filter aus..."):
-                run_sql_filter(conn, selected_table, filters, limit=limit_to_use)
+                run_sql_filter(conn, selected_table, filters, limit=limit_to_use, session=_db_session())
+            # FK-Nachbarn im Hintergrund vorladen, damit der nächste Tabellenwechsel sofort geht
+            prefetch_key = (current_account(), selected_table, limit_to_use)
+            if st.session_state.get("prefetched_for") != prefetch_key:
+                st.session_state["prefetched_for"] = prefetch_key
+                get_prefetcher().schedule(_db_session(), selected_table, current_account(),
+                                          True, limit_to_use, get_table_cache())
 
     elif active_tab == "Tabelle bearbeiten":
         if selected_table is None:
@@ -109,5 +160,7 @@ def main():
         else:
             table_editor(conn,selected_table)
 
+    show_perf_panel()
+
 if __name__ == "__main__":
     main()
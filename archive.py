@@ -0,0 +1,51 @@
+# archive.py
+import sys
+import argparse
+from datetime import date
+
+import mysql.connector
+
+from utils.archive import CHUNK_SIZE, KEEP_SEMESTERS, PAUSE, run_archive
+from utils.migrations import DATABASE
+from utils.provisioning import resolve_credentials, connect_server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Buchungen und Feedback abgeschlossener Semester archivieren")
+    parser.add_argument("--dry-run", action="store_true", help="Nur zählen, was archiviert würde")
+    parser.add_argument("--keep", type=int, default=KEEP_SEMESTERS,
+                        help="Abgeschlossene Semester, die online bleiben (Default %(default)s)")
+    parser.add_argument("--today", type=date.fromisoformat, help="Bezugsdatum JJJJ-MM-TT (Default heute)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Zeilen pro Transaktion")
+    parser.add_argument("--pause", type=float, default=PAUSE, help="Pause zwischen Chunks in Sekunden")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort (besser MYSQL_PASSWORD setzen)")
+    parser.add_argument("--host", help="MySQL-Host (sonst MYSQL_HOST bzw. secrets.toml, Default localhost)")
+    parser.add_argument("--port", type=int, help="MySQL-Port (Default 3306)")
+    parser.add_argument("--database", default=DATABASE, help="Name der Datenbank")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        creds = resolve_credentials(args.user, args.password, args.host, args.port)
+        conn = connect_server(creds)
+        cursor = conn.cursor()
+        cursor.execute(f"USE `{args.database}`;")
+        cursor.close()
+        try:
+            result = run_archive(conn, args.today, args.keep, args.chunk_size, args.pause, args.dry_run)
+        finally:
+            conn.close()
+    except mysql.connector.Error as e:
+        print(f"Archivierung fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    verb = "würden archiviert" if args.dry_run else "archiviert"
+    for table, count in result.items():
+        print(f"{table}: {count} Zeilen {verb}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
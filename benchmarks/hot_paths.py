@@ -0,0 +1,341 @@
+# benchmarks/hot_paths.py
+"""
+Micro-Benchmarks für den reinen Python-Code, der bei jedem Rerun läuft.
+
+Gemessen werden (ohne Datenbank, mit synthetischen Daten):
+
+- column_stats:     Spaltenstatistiken für das Filter-Panel
+- build_filters:    Filter-Widgets der Sidebar (Streamlit im Bare-Mode)
+- apply_filters:    Filtern eines DataFrames
+- where_clause:     WHERE-Terme aus den Filtern (pypika)
+- sql_render:       Ergebnis- und Zähl-SQL rendern wie `_run_sql_filter`
+- enum_options:     `_parse_enum_options` für alle ENUM-Spalten eines Schemas
+- to_python_value:  `_to_python_value` für alle Werte einer Zeile
+- frame_from_rows:  DataFrame aus Cursor-Zeilen (utils.dtypes)
+
+Fälle mit Zeilenzahl laufen für jede Größe aus `--sizes` (10^3 bis 10^7,
+große Größen nur bis zum Maximum des Falls), die anderen einmal. Breite
+Schemas über `--columns`.
+
+Aufruf (aus dem Projektverzeichnis):
+
+    python benchmarks/hot_paths.py                     # messen und ausgeben
+    python benchmarks/hot_paths.py --save              # Baseline speichern
+    python benchmarks/hot_paths.py --check             # gegen Baseline prüfen
+    python benchmarks/hot_paths.py --sizes 1000 10000000 --case apply_filters
+
+Mit `--check` ist der Exit-Code 1, wenn ein Fall mehr als `--threshold`
+(Standard 25 %) langsamer ist als in benchmarks/baselines.json. Die
+Baseline gilt nur für die Maschine, auf der sie gespeichert wurde; auf
+anderer Hardware zuerst mit `--save` neu erzeugen.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+BASELINE_PATH = os.path.join(PROJECT_DIR, "benchmarks", "baselines.json")
+DEFAULT_SIZES = [1_000, 100_000]
+DEFAULT_COLUMNS = 20
+DEFAULT_THRESHOLD = 0.25
+# Wiederholungen pro Fall; gewertet wird der Median
+DEFAULT_REPEAT = 5
+# Mindestdauer einer Wiederholung (Sekunden), kurze Fälle laufen entsprechend oft
+MIN_REPEAT_SECONDS = 0.2
+SEED = 42
+# Verschiedene Texte pro Textspalte (gemeinsame Objekte, damit 10^7 Zeilen in den Speicher passen)
+NAME_POOL = 100_000
+
+_STATUS = ["offen", "bezahlt", "storniert", "wartend"]
+
+
+def synthetic_frame(rows: int, columns: int = DEFAULT_COLUMNS):
+    """
+    Breites DataFrame mit den Spaltenarten der App.
+
+    Reihum: Primärschlüssel/Ganzzahl, Kommazahl, Datum, ENUM (category),
+    Text mit vielen verschiedenen Werten (höchstens NAME_POOL).
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(SEED)
+    data = {"id": np.arange(1, rows + 1, dtype="int64")}
+    names = np.array([f"Name {n}" for n in range(min(rows, NAME_POOL))], dtype=object)
+    for i in range(1, columns):
+        kind = i % 5
+        if kind == 0:
+            data[f"int_{i}"] = rng.integers(0, 1000, rows, dtype="int32")
+        elif kind == 1:
+            data[f"betrag_{i}"] = rng.random(rows) * 100
+        elif kind == 2:
+            data[f"datum_{i}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D")
+        elif kind == 3:
+            data[f"status_{i}"] = pd.Categorical.from_codes(rng.integers(0, len(_STATUS), rows), _STATUS)
+        else:
+            data[f"name_{i}"] = names[rng.integers(0, len(names), rows)]
+    return pd.DataFrame(data)
+
+
+def synthetic_filters(df) -> dict:
+    """Ein aktiver Filter pro Spalte, wie ihn `build_filters` liefert."""
+    import pandas as pd
+
+    filters = {}
+    for col in df.columns[1:]:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            filters[col] = (pd.Timestamp("2024-03-01"), pd.Timestamp("2025-06-30"))
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            filters[col] = _STATUS[:2]
+        elif pd.api.types.is_numeric_dtype(series):
+            filters[col] = (float(series.min()), float(series.quantile(0.9)))
+        else:
+            filters[col] = list(series.iloc[:50])
+    return filters
+
+
+def synthetic_cursor(rows: int, columns: int = DEFAULT_COLUMNS) -> tuple:
+    """Zeilen und `cursor.description` (mysql.connector-Format) wie nach fetchall()."""
+    import datetime as dt
+    import random
+    from decimal import Decimal
+
+    from mysql.connector.constants import FieldFlag, FieldType
+
+    rng = random.Random(SEED)
+    description = [("id", FieldType.LONG, None, None, None, None, 0, FieldFlag.PRI_KEY, 63)]
+    makers = [lambda: rng.randrange(1000)]
+    start = dt.datetime(2024, 1, 1)
+    for i in range(1, columns):
+        kind = i % 5
+        if kind == 0:
+            description.append((f"int_{i}", FieldType.LONG, None, None, None, None, 1, 0, 63))
+            makers.append(lambda: rng.randrange(1000))
+        elif kind == 1:
+            description.append((f"betrag_{i}", FieldType.NEWDECIMAL, None, None, None, None, 1, 0, 63))
+            makers.append(lambda: Decimal(rng.randrange(10000)) / 100)
+        elif kind == 2:
+            description.append((f"datum_{i}", FieldType.DATETIME, None, None, None, None, 1, 0, 63))
+            makers.append(lambda: start + dt.timedelta(minutes=rng.randrange(10 ** 6)))
+        elif kind == 3:
+            description.append((f"status_{i}", FieldType.STRING, None, None, None, None, 0, FieldFlag.ENUM, 45))
+            makers.append(lambda: rng.choice(_STATUS))
+        else:
+            description.append((f"name_{i}", FieldType.VAR_STRING, None, None, None, None, 1, 0, 45))
+            makers.append(lambda: f"Name {rng.randrange(rows)}")
+    data = [tuple([n] + [make() for make in makers[1:]]) for n in range(1, rows + 1)]
+    return data, description
+
+
+def synthetic_schema(columns: int = DEFAULT_COLUMNS) -> list:
+    """DESCRIBE-Typen eines breiten Schemas (jede fünfte Spalte ENUM)."""
+    types = []
+    for i in range(columns):
+        if i % 5 == 3:
+            types.append("enum(" + ",".join(f"'{s}_{i}_{j}'" for s in _STATUS for j in range(3)) + ")")
+        else:
+            types.append(["int", "decimal(10,2)", "datetime", None, "varchar(100)"][i % 5])
+    return types
+
+
+# Jeder Fall: Setup(rows, columns) -> Funktion ohne Argumente; None = unabhängig von der Zeilenzahl
+def _case_column_stats(rows, columns):
+    from components.filter_panel import column_stats
+
+    df = synthetic_frame(rows, columns)
+    return lambda: column_stats(df)
+
+
+def _case_build_filters(rows, columns):
+    from components.filter_panel import build_filters, column_stats
+
+    df = synthetic_frame(rows, columns)
+    stats = column_stats(df)
+    return lambda: build_filters(df, stats)
+
+
+def _case_apply_filters(rows, columns):
+    from components.filter_panel import apply_filters
+
+    df = synthetic_frame(rows, columns)
+    filters = synthetic_filters(df)
+    return lambda: apply_filters(df, filters, limit=1000)
+
+
+def _case_where_clause(rows, columns):
+    from components.sql_filter_runner import build_where_clause
+
+    df = synthetic_frame(1_000, columns)
+    filters, allowed = synthetic_filters(df), list(df.columns)
+    return lambda: build_where_clause(filters, allowed)
+
+
+def _case_sql_render(rows, columns):
+    from pypika import Query
+
+    from components.sql_filter_runner import build_count_sql, build_where_clause
+
+    df = synthetic_frame(1_000, columns)
+    filters, allowed = synthetic_filters(df), list(df.columns)
+
+    def render():
+        term, _ = build_where_clause(filters, allowed)
+        query = Query.from_("Buchung").select("*").where(term)
+        base_sql = str(query).replace('"', "`")
+        page_sql = str(query.limit(1000).offset(2000)).replace('"', "`")
+        return base_sql, page_sql, build_count_sql("Buchung", term)
+    return render
+
+
+def _case_enum_options(rows, columns):
+    from components.table_editor import _parse_enum_options
+
+    types = synthetic_schema(columns)
+    return lambda: [_parse_enum_options(t) for t in types]
+
+
+def _case_to_python_value(rows, columns):
+    from components.table_editor import _to_python_value
+
+    row = list(synthetic_frame(10, columns).iloc[0])
+    return lambda: [_to_python_value(v) for v in row]
+
+
+def _case_frame_from_rows(rows, columns):
+    from utils.dtypes import frame_from_rows
+
+    data, description = synthetic_cursor(rows, columns)
+    return lambda: frame_from_rows(data, description)
+
+
+# Name -> (Setup, größte Zeilenzahl oder None wenn unabhängig von der Zeilenzahl)
+CASES = {
+    "column_stats": (_case_column_stats, 10_000_000),
+    "build_filters": (_case_build_filters, 1_000_000),
+    "apply_filters": (_case_apply_filters, 10_000_000),
+    "where_clause": (_case_where_clause, None),
+    "sql_render": (_case_sql_render, None),
+    "enum_options": (_case_enum_options, None),
+    "to_python_value": (_case_to_python_value, None),
+    # Python-Tupel pro Zeile: 10^7 Zeilen passen nicht sinnvoll in den Speicher
+    "frame_from_rows": (_case_frame_from_rows, 1_000_000),
+}
+
+
+def measure(fn, repeat: int = DEFAULT_REPEAT) -> float:
+    """Median der Laufzeit eines Aufrufs in ms (timeit, Anzahl Aufrufe per autorange)."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * MIN_REPEAT_SECONDS / elapsed) if elapsed else number)
+    runs = timer.repeat(repeat=repeat, number=number)
+    return statistics.median(runs) / number * 1000
+
+
+def run(cases: list, sizes: list, columns: int, repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    Führt die Fälle aus.
+
+    Returns:
+        dict: "fall@zeilen" (bzw. "fall") -> ms pro Aufruf
+    """
+    import logging
+
+    # Bare-Mode-Warnungen von Streamlit (build_filters, st.cache_*) unterdrücken
+    logging.disable(logging.WARNING)
+    results = {}
+    for name in cases:
+        setup, max_rows = CASES[name]
+        for rows in (sorted(sizes) if max_rows else [None]):
+            if max_rows and rows > max_rows:
+                continue
+            key = f"{name}@{rows}" if rows else name
+            results[key] = measure(setup(rows, columns), repeat)
+            print(f"  {results[key]:12.3f} ms  {key}", flush=True)
+    return results
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, columns: int, path: str = BASELINE_PATH):
+    """Speichert die Messwerte samt Maschine; vorhandene andere Fälle bleiben erhalten."""
+    baseline = load_baseline(path)
+    if baseline.get("columns", columns) != columns:
+        baseline["results"] = {}
+    baseline.update({"machine": _machine(), "columns": columns})
+    baseline.setdefault("results", {}).update({k: round(v, 4) for k, v in results.items()})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Vergleicht Messwerte mit der Baseline.
+
+    Returns:
+        list: (Fall, Baseline-ms, gemessen-ms, Faktor) für alle Fälle über der Schwelle
+    """
+    regressions = []
+    for key, ms in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base and ms > base * (1 + threshold):
+            regressions.append((key, base, ms, ms / base))
+    return regressions
+
+
+def _machine() -> str:
+    return f"{platform.machine()} {platform.processor()} / {os.cpu_count()} CPUs / Python {platform.python_version()}".replace("  ", " ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-Benchmarks der Rerun-Hot-Paths")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="Nur diese(n) Fall/Fälle messen (mehrfach möglich)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Zeilenzahlen der synthetischen Tabellen (z.B. 1000 100000 10000000)")
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS, help="Spalten der synthetischen Tabellen")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Wiederholungen pro Fall (Median)")
+    parser.add_argument("--save", action="store_true", help="Messwerte als Baseline speichern")
+    parser.add_argument("--check", action="store_true", help="Gegen die Baseline prüfen (Exit-Code 1 bei Regression)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Erlaubte Verlangsamung gegenüber der Baseline (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    print(f"Hot-Path-Benchmarks ({args.columns} Spalten, Median aus {args.repeat}):")
+    results = run(args.case or list(CASES), args.sizes, args.columns, args.repeat)
+
+    if args.save:
+        save_baseline(results, args.columns)
+        print(f"Baseline gespeichert: {os.path.relpath(BASELINE_PATH, PROJECT_DIR)}")
+    if args.check:
+        baseline = load_baseline()
+        if not baseline:
+            print("FEHLER: keine Baseline vorhanden (zuerst mit --save erzeugen)")
+            sys.exit(1)
+        if baseline.get("machine") != _machine():
+            print(f"Hinweis: Baseline stammt von {baseline.get('machine')}, Vergleich nur bedingt aussagekräftig")
+        if baseline.get("columns") != args.columns:
+            print(f"Hinweis: Baseline mit {baseline.get('columns')} Spalten gemessen")
+        missing = [k for k in results if k not in baseline.get("results", {})]
+        if missing:
+            print(f"Ohne Baseline: {', '.join(missing)}")
+        regressions = compare(results, baseline, args.threshold)
+        for key, base, ms, factor in regressions:
+            print(f"FEHLER: {key}: {ms:.3f} ms statt {base:.3f} ms ({factor:.2f}x)")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# benchmarks/load_test.py
+"""
+Lasttest: simuliert viele gleichzeitige App-Sitzungen gegen eine lokale MySQL.
+
+Jede simulierte Sitzung meldet sich wie die App mit einer eigenen
+`DBSession` an (eigener Pool) und führt reihum die Datenpfade der
+Oberfläche aus:
+
+- sidebar: Tabellenliste, Tabelle aus dem TableCache, Spaltenstatistiken
+  (wie `show_sidebar`)
+- filter:  WHERE-Klausel aus einem zufälligen Bereichsfilter bauen und
+  ausführen (wie `run_sql_filter`)
+- editor:  Schema + Zeile per Primärschlüssel lesen (wie `table_editor`)
+- sql:     eine der Beispiel-Queries aus dem SQL-Tab (wie `run_custom_query`)
+
+Streamlit-Widgets werden dabei nicht gerendert. Mit `--apptest` wird
+stattdessen die komplette App pro Sitzung über Streamlits AppTest
+ausgeführt (langsamer, misst volle Reruns inkl. Rendering).
+
+Sitzungen laufen als Threads, mit `--processes` verteilt auf mehrere
+Prozesse (wie mehrere App-Instanzen). Ausgegeben werden Durchsatz,
+Latenz-Perzentile je Szenario, die Zahl der Serververbindungen
+(Threads_connected) und der Speicher pro Sitzung.
+
+Aufruf (aus dem Projektverzeichnis):
+
+    python benchmarks/load_test.py --setup --seed-scale 10 --sessions 50 --duration 60
+
+Die Zugangsdaten (Admin für Setup/Seeding und Monitoring) kommen wie bei
+`setup.py --headless` aus Argumenten, Umgebung oder secrets.toml.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+DEFAULT_DATABASE = "hochschulsport_load"
+SCENARIOS = ["sidebar", "filter", "editor", "sql"]
+# Tabellen, die im Test angezeigt/gefiltert/bearbeitet werden
+TABLES = ["Kursteilnehmer", "Buchung", "Veranstaltung", "Sportangebot", "Feedback"]
+# Zeilen pro Einheit von --seed-scale
+SEED_PARTICIPANTS = 1000
+SEED_BOOKINGS_PER_PARTICIPANT = 3
+SEED_BATCH = 1000
+LIMIT = 1000
+
+
+def seed(creds: dict, database: str, scale: int):
+    """
+    Befüllt die Datenbank mit `scale` * SEED_PARTICIPANTS Teilnehmern und
+    je SEED_BOOKINGS_PER_PARTICIPANT Buchungen (executemany in Batches).
+    """
+    from utils.provisioning import connect_server
+
+    conn = connect_server(creds, database=database)
+    cursor = conn.cursor()
+    cursor.execute("SELECT veranstaltungs_id FROM Veranstaltung;")
+    events = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT COALESCE(MAX(teilnehmer_id), 0) FROM Kursteilnehmer;")
+    first_id = cursor.fetchone()[0] + 1
+
+    rng = random.Random(42)
+    participants = scale * SEED_PARTICIPANTS
+    statuses = ["bezahlt", "offen", "wartend", "storniert"]
+    start = time.perf_counter()
+    for offset in range(0, participants, SEED_BATCH):
+        ids = range(first_id + offset, first_id + min(offset + SEED_BATCH, participants))
+        cursor.executemany(
+            "INSERT INTO Kursteilnehmer (teilnehmer_id, teilnehmer_name, teilnehmer_mail, teilnehmer_adresse) "
+            "VALUES (%s, %s, %s, %s)",
+            [(i, f"Last Teilnehmer {i}", f"last{i}@example.org", f"Teststraße {i % 200}") for i in ids],
+        )
+        bookings = []
+        for i in ids:
+            # verschiedene Veranstaltungen pro Teilnehmer (Trigger legen sonst Duplikate an)
+            for event in rng.sample(events, min(SEED_BOOKINGS_PER_PARTICIPANT, len(events))):
+                bookings.append((rng.randint(10, 80), i, event, rng.choice(statuses)))
+        cursor.executemany(
+            "INSERT INTO Buchung (betrag, teilnehmer_id, veranstaltungs_id, buchung_status) VALUES (%s, %s, %s, %s)",
+            bookings,
+        )
+        conn.commit()
+    cursor.close()
+    conn.close()
+    print(f"Seed: {participants} Teilnehmer, {participants * SEED_BOOKINGS_PER_PARTICIPANT} Buchungen "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+def _scenario_sidebar(conn, account, cache, rng):
+    from components.filter_panel import column_stats
+    from utils.table_cache import load_table_names, get_cached_table
+
+    load_table_names(conn, account)
+    entry = get_cached_table(conn, rng.choice(TABLES), account=account, cache=cache)
+    if entry["stats"] is None:
+        entry["stats"] = column_stats(entry["df"])
+
+
+def _scenario_filter(conn, account, cache, rng):
+    from pypika import Query
+    from components.filter_panel import column_stats
+    from components.sql_filter_runner import build_where_clause, cached_table_columns
+    from utils.table_cache import get_cached_table
+
+    table = rng.choice(TABLES)
+    entry = get_cached_table(conn, table, account=account, cache=cache)
+    if entry["stats"] is None:
+        entry["stats"] = column_stats(entry["df"])
+    numeric = {col: s for col, s in entry["stats"].items() if s["kind"] == "numeric"}
+    filters = {}
+    if numeric:
+        col = rng.choice(list(numeric))
+        low, high = numeric[col]["min"], numeric[col]["max"]
+        filters[col] = (low, low + (high - low) * rng.random())
+    term, _ = build_where_clause(filters, cached_table_columns(conn, account, table))
+    query = Query.from_(table).select("*")
+    if term:
+        query = query.where(term)
+    sql = str(query.limit(LIMIT)).replace('"', "`")
+    cursor = conn.cursor(buffered=True)
+    cursor.execute(sql)
+    cursor.fetchall()
+    cursor.close()
+
+
+def _scenario_editor(conn, account, cache, rng):
+    from components.table_editor import cached_table_schema, fetch_row
+    from utils.table_cache import get_cached_page
+
+    table = rng.choice(TABLES)
+    schema = cached_table_schema(conn, account, table)
+    pk_cols = [col["name"] for col in schema if col["key"] == "PRI"]
+    # Schlüssel aus der ersten Ergebnisseite wählen, dann wie der Editor per PK lesen
+    df = get_cached_page(conn, table, LIMIT, account=account, cache=cache)["df"]
+    if df.empty or not pk_cols:
+        return
+    row = df.iloc[rng.randrange(len(df))]
+    fetch_row(conn, table, pk_cols, [row[col] for col in pk_cols])
+
+
+def _scenario_sql(conn, account, cache, rng):
+    from components.sql_runner_simple import EXAMPLE_QUERIES
+    from utils.sql_script import execute_script
+
+    label = rng.choice(list(EXAMPLE_QUERIES))
+    params = ("Yogastudio",) if "%s" in EXAMPLE_QUERIES[label] else None
+    execute_script(conn, EXAMPLE_QUERIES[label], params)
+
+
+_SCENARIOS = {
+    "sidebar": _scenario_sidebar,
+    "filter": _scenario_filter,
+    "editor": _scenario_editor,
+    "sql": _scenario_sql,
+}
+
+
+def _run_session(index, args, cache, deadline, samples, lock):
+    """Eine simulierte Sitzung: Login, dann Szenarien im Wechsel bis zur Deadline."""
+    from utils.session import DBSession
+
+    rng = random.Random(index)
+    local = []
+    try:
+        session = DBSession.login(args.app_user, args.app_password, host=args.host, database=args.database)
+    except Exception as e:
+        local.append(("login", 0.0, repr(e)))
+        with lock:
+            samples.extend(local)
+        return
+    account = f"{args.app_user}#{index}" if args.isolated_cache else args.app_user
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choice(SCENARIOS)
+            start = time.perf_counter()
+            error = None
+            try:
+                _SCENARIOS[name](session.connection(), account, cache, rng)
+            except Exception as e:
+                error = repr(e)
+            local.append((name, (time.perf_counter() - start) * 1000, error))
+            if args.think_ms:
+                time.sleep(rng.uniform(0, 2 * args.think_ms) / 1000)
+    finally:
+        session.close()
+    with lock:
+        samples.extend(local)
+
+
+def _run_apptest_session(index, args, deadline, samples, lock):
+    """Eine Sitzung über AppTest: volle Reruns der App inkl. Rendering."""
+    from streamlit.testing.v1 import AppTest
+
+    local = []
+    at = AppTest.from_file(os.path.join(PROJECT_DIR, "app.py"), default_timeout=60)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        error = None
+        try:
+            at.run()
+            if at.exception:
+                error = str(at.exception[0].message)
+        except Exception as e:
+            error = repr(e)
+        local.append(("app_rerun", (time.perf_counter() - start) * 1000, error))
+    with lock:
+        samples.extend(local)
+
+
+def run_process(args, sessions: int, offset: int = 0) -> dict:
+    """
+    Führt `sessions` Sitzungen als Threads in diesem Prozess aus.
+
+    Returns:
+        dict: samples (Szenario, ms, Fehler), peak_traced (Bytes), max_rss (KiB), sessions.
+    """
+    os.chdir(PROJECT_DIR)
+    from utils.table_cache import TableCache
+
+    if args.memory:
+        tracemalloc.start()
+    cache = TableCache()
+    samples = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = []
+    for i in range(sessions):
+        if args.apptest:
+            target, targs = _run_apptest_session, (offset + i, args, deadline, samples, lock)
+        else:
+            target, targs = _run_session, (offset + i, args, cache, deadline, samples, lock)
+        thread = threading.Thread(target=target, args=targs, daemon=True)
+        thread.start()
+        threads.append(thread)
+        if args.ramp_ms:
+            time.sleep(args.ramp_ms / 1000)
+    for thread in threads:
+        thread.join()
+    peak = tracemalloc.get_traced_memory()[1] if args.memory else None
+    if args.memory:
+        tracemalloc.stop()
+    return {
+        "samples": samples,
+        "peak_traced": peak,
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "sessions": sessions,
+    }
+
+
+def _process_entry(payload):
+    args, sessions, offset = payload
+    return run_process(args, sessions, offset)
+
+
+class ConnectionMonitor(threading.Thread):
+    """Fragt Threads_connected regelmäßig über eine eigene Admin-Verbindung ab."""
+
+    def __init__(self, creds: dict, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.creds = creds
+        self.interval = interval
+        self.values = []
+        self._stopped = threading.Event()
+
+    def run(self):
+        from utils.provisioning import connect_server
+
+        conn = connect_server(self.creds)
+        conn.autocommit = True
+        cursor = conn.cursor()
+        while not self._stopped.is_set():
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected';")
+            self.values.append(int(cursor.fetchone()[1]))
+            self._stopped.wait(self.interval)
+        cursor.close()
+        conn.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def _percentiles(values: list) -> tuple:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value, value
+    q = statistics.quantiles(values, n=100, method="inclusive")
+    return q[49], q[94], q[98]
+
+
+def report(results: list, duration: float, connections: list):
+    samples = [s for r in results for s in r["samples"]]
+    sessions = sum(r["sessions"] for r in results)
+    ok = [s for s in samples if s[2] is None]
+    errors = [s for s in samples if s[2] is not None]
+
+    print(f"\nSitzungen: {sessions}, Dauer: {duration:.1f}s, Prozesse: {len(results)}")
+    print(f"Durchsatz: {len(ok) / duration:.1f} Aktionen/s ({len(ok)} ok, {len(errors)} Fehler)")
+    print(f"{'Szenario':<10} {'Anzahl':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name in sorted({s[0] for s in ok}):
+        values = [s[1] for s in ok if s[0] == name]
+        p50, p95, p99 = _percentiles(values)
+        print(f"{name:<10} {len(values):>7} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {max(values):>9.1f}")
+    if errors:
+        print("Fehler (erste 5):")
+        for name, _, error in errors[:5]:
+            print(f"  {name}: {error}")
+    if connections:
+        print(f"Serververbindungen (Threads_connected): Start {connections[0]}, max {max(connections)}, "
+              f"+{max(connections) - connections[0]} durch den Test")
+    rss = sum(r["max_rss"] for r in results)
+    print(f"Max. RSS aller Prozesse: {rss / 1024:.0f} MiB ({rss / 1024 / max(sessions, 1):.2f} MiB pro Sitzung)")
+    if results[0]["peak_traced"] is not None:
+        traced = sum(r["peak_traced"] for r in results)
+        print(f"Python-Heap (tracemalloc, Spitze): {traced / 2**20:.1f} MiB "
+              f"({traced / 2**20 / max(sessions, 1):.2f} MiB pro Sitzung)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest mit vielen gleichzeitigen App-Sitzungen")
+    parser.add_argument("--sessions", type=int, default=20, help="Gleichzeitige Sitzungen insgesamt")
+    parser.add_argument("--processes", type=int, default=1, help="Sitzungen auf N Prozesse verteilen")
+    parser.add_argument("--duration", type=float, default=30, help="Testdauer in Sekunden")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mittlere Denkpause zwischen Aktionen")
+    parser.add_argument("--ramp-ms", type=float, default=0, help="Verzögerung zwischen Sitzungsstarts")
+    parser.add_argument("--apptest", action="store_true", help="Komplette App per AppTest ausführen (Datenbank/Konto aus secrets.toml)")
+    parser.add_argument("--isolated-cache", action="store_true",
+                        help="Eigene Cache-Schlüssel pro Sitzung (wie viele verschiedene Konten)")
+    parser.add_argument("--memory", action="store_true", help="Python-Heap mit tracemalloc messen (langsamer)")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="Testdatenbank")
+    parser.add_argument("--setup", action="store_true", help="Testdatenbank vorher neu aufbauen")
+    parser.add_argument("--seed-scale", type=int, default=0,
+                        help=f"Zusätzlich N*{SEED_PARTICIPANTS} Teilnehmer mit Buchungen einfügen")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort des Admins")
+    parser.add_argument("--host", help="MySQL-Host")
+    parser.add_argument("--port", type=int, help="MySQL-Port")
+    parser.add_argument("--app-user", help="Nutzer der simulierten Sitzungen (Default: Admin)")
+    parser.add_argument("--app-password", help="Passwort der simulierten Sitzungen")
+    return parser.parse_args(argv)
+
+
+def main():
+    os.chdir(PROJECT_DIR)
+    args = parse_args()
+    from utils.provisioning import resolve_credentials, provision_database
+
+    creds = resolve_credentials(args.user, args.password, args.host, args.port)
+    args.host = creds["host"]
+    args.app_user = args.app_user or creds["user"]
+    args.app_password = args.app_password or creds["password"]
+
+    if args.setup:
+        provision_database(creds, args.database, force=True)
+    if args.seed_scale:
+        seed(creds, args.database, args.seed_scale)
+
+    monitor = ConnectionMonitor(creds)
+    monitor.start()
+    start = time.perf_counter()
+    if args.processes > 1:
+        per_process = [args.sessions // args.processes + (1 if i < args.sessions % args.processes else 0)
+                       for i in range(args.processes)]
+        offsets = [sum(per_process[:i]) for i in range(args.processes)]
+        with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+            results = pool.map(_process_entry, [(args, n, o) for n, o in zip(per_process, offsets)])
+    else:
+        results = [run_process(args, args.sessions)]
+    duration = time.perf_counter() - start
+    monitor.stop()
+    report(results, duration, monitor.values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/startup.py
+"""
+Misst die Importzeit der Streamlit-App mit `python -X importtime`.
+
+Die App zeichnet ihren ersten Seitenaufbau (Titel, Login) direkt nach dem
+Import von `app.py`. Die Importzeit ist daher ein guter Näherungswert für
+die Zeit bis zum ersten Paint bei einem Kaltstart.
+
+Aufruf (aus dem Projektverzeichnis):
+
+    python benchmarks/startup.py --budget-ms 300
+
+Exit-Code 1, wenn das Budget überschritten wird oder ein Modul aus
+FORBIDDEN_MODULES beim Start importiert wird. Damit lässt sich das Skript
+direkt in CI einbinden; tests/test_startup.py führt dieselbe Prüfung
+(`check_startup`) im Testlauf aus.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module, die erst bei Bedarf geladen werden dürfen
+FORBIDDEN_MODULES = ["tkinter", "pandas", "numpy", "pypika", "mysql.connector"]
+
+DEFAULT_BUDGET_MS = 300
+DEFAULT_RUNS = 5
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str = "app") -> dict:
+    """
+    Importiert `module` in einem frischen Interpreter mit -X importtime.
+
+    Returns:
+        dict: {"total_ms": float, "modules": {name: kumulierte ms (nur oberste Ebene)}}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = cumulative_us / 1000
+        if len(indent) == 1:
+            # Nur Module der obersten Ebene aufsummieren
+            total_us += cumulative_us
+    return {"total_ms": total_us / 1000, "modules": modules}
+
+
+def check_startup(budget_ms: float = DEFAULT_BUDGET_MS, runs: int = DEFAULT_RUNS) -> dict:
+    """
+    Misst `runs` Kaltstarts von app.py und prüft Budget und Lazy-Imports.
+
+    Returns:
+        dict: median_ms, modules (des letzten Laufs) und errors (Liste von Meldungen, leer = bestanden).
+    """
+    results = [measure_import("app") for _ in range(runs)]
+    median_ms = statistics.median(r["total_ms"] for r in results)
+    loaded = results[-1]["modules"]
+    errors = []
+    eager = [m for m in FORBIDDEN_MODULES if m in loaded]
+    if eager:
+        errors.append(f"beim Start importiert, sollte lazy sein: {', '.join(eager)}")
+    if median_ms > budget_ms:
+        errors.append(f"Startbudget überschritten ({median_ms:.1f} ms > {budget_ms:.0f} ms)")
+    return {"median_ms": median_ms, "modules": loaded, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importzeit-/Startbudget der App prüfen")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximal erlaubte Median-Importzeit von app.py in ms")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="Anzahl Kaltstarts, aus denen der Median gebildet wird")
+    args = parser.parse_args()
+
+    result = check_startup(args.budget_ms, args.runs)
+    slowest = sorted(result["modules"].items(), key=lambda kv: kv[1], reverse=True)[:10]
+    print(f"Importzeit app.py (Median aus {args.runs}): {result['median_ms']:.1f} ms (Budget {args.budget_ms:.0f} ms)")
+    print("Langsamste Module (kumuliert):")
+    for name, ms in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    for error in result["errors"]:
+        print(f"FEHLER: {error}")
+    sys.exit(1 if result["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
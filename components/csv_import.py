@@ -0,0 +1,104 @@
+# components/csv_import.py
+import streamlit as st
+from utils.bulk_import import (CHUNK_SIZE, load_checks, load_foreign_keys, load_rows, read_csv,
+                               to_rows, validate)
+from utils.change_feed import sync_changes
+from utils.table_cache import current_account
+
+# Vorschau der gültigen bzw. abgewiesenen Zeilen
+PREVIEW_ROWS = 20
+
+
+def show_csv_import(conn, table_name: str, schema: list):
+    """
+    Massenimport einer CSV-Datei in die gewählte Tabelle (Aktion im Editor).
+
+    Die Datei wird beim Hochladen einmal geprüft (siehe utils.bulk_import.validate);
+    das Ergebnis bleibt bis zu einer anderen Datei in st.session_state.
+    Nach dem Import werden eingefügte Zeilen, abgewiesene Zeilen (als
+    CSV zum Herunterladen) und der Durchsatz angezeigt.
+
+    Args:
+        conn: Datenbankverbindung (ohne offene Transaktion).
+        table_name (str): Zieltabelle.
+        schema (list): DESCRIBE-Zeilen wie `get_table_schema`.
+    """
+    import mysql.connector as mysql
+    import pandas as pd
+    # Import hier: table_editor bindet dieses Modul ein
+    from components.table_editor import _format_db_error
+
+    st.subheader("CSV importieren")
+    columns = ", ".join(col["name"] for col in schema if "auto_increment" not in (col["extra"] or "").lower())
+    st.caption(f"Kopfzeile mit Spaltennamen ({columns}); Trennzeichen , oder ;, "
+               "Datum als JJJJ-MM-TT oder TT.MM.JJJJ, leere Felder = NULL bzw. Standardwert.")
+    upload = st.file_uploader("CSV-Datei", type=["csv", "txt"], key=f"csv_import_{table_name}")
+    if upload is None:
+        return
+
+    state_key = f"csv_import_state_{table_name}"
+    state = st.session_state.get(state_key)
+    if state is None or state["file_id"] != upload.file_id:
+        try:
+            with st.spinner("Datei wird geprüft..."):
+                df = read_csv(upload.getvalue())
+                valid, rejected = validate(
+                    conn, table_name, df, schema,
+                    checks=load_checks(conn, table_name),
+                    foreign_keys=load_foreign_keys(conn, table_name),
+                )
+        except ValueError as e:
+            st.error(str(e))
+            return
+        except mysql.Error as e:
+            st.error(_format_db_error(e))
+            return
+        state = {"file_id": upload.file_id, "source": df, "valid": valid, "rejected": rejected, "result": None}
+        st.session_state[state_key] = state
+
+    valid, rejected = state["valid"], state["rejected"]
+    col1, col2 = st.columns(2)
+    col1.metric("Gültige Zeilen", len(valid))
+    col2.metric("Abgewiesen (Prüfung)", len(rejected))
+    if len(rejected):
+        with st.expander("Abgewiesene Zeilen"):
+            st.dataframe(rejected.head(PREVIEW_ROWS), hide_index=True)
+    if len(valid):
+        with st.expander("Vorschau"):
+            st.dataframe(valid.head(PREVIEW_ROWS), hide_index=True)
+
+    if state["result"] is None:
+        if st.button(f"{len(valid)} Zeilen importieren", disabled=not len(valid)):
+            bar = st.progress(0.0, text="Import läuft...")
+            result = load_rows(
+                conn, table_name, list(valid.columns), to_rows(valid), CHUNK_SIZE,
+                progress=lambda done, total: bar.progress(done / total, text=f"{done} von {total} Zeilen"),
+            )
+            # Von der Datenbank abgewiesene Zeilen mit ihren Originalwerten zum Bericht hinzufügen
+            failed = state["source"].loc[valid.index[[i for i, _ in result["failed"]]]].copy()
+            failed.insert(0, "fehler", [_format_db_error(e) for _, e in result["failed"]])
+            if result["error"] is not None:
+                # Nach einem Abbruch nicht mehr versuchte Zeilen (frühere Chunks sind committet)
+                skipped = state["source"].loc[valid.index[result["stopped_at"]:]].copy()
+                skipped.insert(0, "fehler", f"nicht importiert (Abbruch: {_format_db_error(result['error'])})")
+                failed = pd.concat([failed, skipped])
+            failed.insert(0, "zeile", failed.index + 2)
+            report = pd.concat([rejected, failed]).sort_values("zeile") if len(failed) else rejected
+            state["result"] = {**result, "report": report}
+            sync_changes(conn, current_account(), table_name, force=True)
+            st.rerun()
+        return
+
+    result = state["result"]
+    if result["error"] is not None:
+        st.error(f"Import abgebrochen nach {result['inserted']} eingefügten Zeilen: {_format_db_error(result['error'])}. "
+                 f"Bereits eingefügte Zeilen bleiben erhalten; ab Zeile {valid.index[result['stopped_at']] + 2} "
+                 "wurde nichts mehr importiert.")
+    else:
+        st.success(f"{result['inserted']} Zeilen eingefügt in {result['duration_ms'] / 1000:.1f} s "
+                   f"({result['rows_per_s']:.0f} Zeilen/s).")
+    report = result["report"]
+    if len(report):
+        st.warning(f"{len(report)} Zeilen nicht importiert ({len(result['failed'])} davon von der Datenbank abgewiesen).")
+        st.download_button("Abgewiesene Zeilen herunterladen (CSV)", report.to_csv(index=False).encode("utf-8"),
+                           file_name=f"{table_name}_abgewiesen.csv", mime="text/csv")
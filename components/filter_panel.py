@@ -1,8 +1,80 @@
 # components/filter_panel.py
 import streamlit as st
-import pandas as pd 
+from typing import TYPE_CHECKING
 
-def build_filters(df: pd.DataFrame) -> dict:
+# pandas wird erst in den Funktionen importiert (schnellerer App-Start)
+if TYPE_CHECKING:
+    import pandas as pd
+
+def column_stats(df: "pd.DataFrame") -> dict:
+    """
+    Berechnet einmalig die Statistiken, die das Filter-Panel pro Spalte benötigt.
+
+    Das Ergebnis wird zusammen mit dem DataFrame zwischengespeichert, damit
+    nunique/min/max/unique nicht bei jedem Rerun neu über die Daten laufen.
+
+    Args:
+        df (pd.DataFrame): Das DataFrame der Tabelle.
+
+    Returns:
+        dict: Spaltenname -> {"kind": "numeric"|"datetime"|"other", ...}
+    """
+    import pandas as pd
+
+    stats = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) and series.nunique() > 1:
+            stats[col] = {"kind": "numeric", "min": float(series.min()), "max": float(series.max())}
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            stats[col] = {"kind": "datetime", "min": series.min(), "max": series.max()}
+        else:
+            stats[col] = {"kind": "other", "options": list(series.dropna().unique())}
+    return stats
+
+def update_column_stats(stats: dict, df: "pd.DataFrame", rows: "pd.DataFrame"):
+    """
+    Ergänzt Statistiken um neue bzw. geänderte Zeilen, ohne die ganze Tabelle zu durchlaufen.
+
+    Min/Max werden nur erweitert und Optionen nur ergänzt; nach Löschungen
+    sind die Werte daher eine Obermenge (für die Filtergrenzen unkritisch).
+
+    Args:
+        stats (dict): Bisherige Statistiken aus `column_stats`.
+        df (pd.DataFrame): Das gepatchte DataFrame der Tabelle.
+        rows (pd.DataFrame): Die neuen/geänderten Zeilen.
+
+    Returns:
+        dict: Neue Statistiken oder None, wenn sich die Art einer Spalte
+            ändern könnte (dann neu mit `column_stats` berechnen).
+    """
+    import pandas as pd
+
+    updated = {}
+    for col in df.columns:
+        old = stats.get(col)
+        if old is None:
+            return None
+        series = rows[col].dropna()
+        if old["kind"] == "other" and pd.api.types.is_numeric_dtype(df[col]):
+            # "other" bei numerischen Spalten heißt: bisher nur ein Wert
+            return None
+        if series.empty:
+            updated[col] = old
+        elif old["kind"] == "numeric":
+            updated[col] = {"kind": "numeric", "min": min(old["min"], float(series.min())),
+                            "max": max(old["max"], float(series.max()))}
+        elif old["kind"] == "datetime":
+            updated[col] = {"kind": "datetime", "min": min(old["min"], series.min()),
+                            "max": max(old["max"], series.max())}
+        else:
+            options = list(old["options"])
+            known = set(options)
+            options.extend(v for v in series.unique() if v not in known)
+            updated[col] = {"kind": "other", "options": options}
+    return updated
+
+def build_filters(df: "pd.DataFrame", stats: dict = None) -> dict:
     """
     Erzeugt Filter in der Sidebar für jede Spalte eines DataFrames.
 
@@ -12,23 +84,28 @@ def build_filters(df: pd.DataFrame) -> dict:
 
     Args:
         df (pd.DataFrame): Das DataFrame, für das Filter erzeugt werden sollen.
+        stats (dict, optional): Vorberechnete Spaltenstatistiken aus `column_stats`.
+            Falls None, werden sie aus `df` berechnet.
 
     Returns:
         dict: Jeder Schlüssel ist eine Spalte ist und
               der Wert das Filterkriterium.
     """
+    import pandas as pd
+
     filters = {}
+    if stats is None:
+        stats = column_stats(df)
 
     for col in df.columns:
+        col_stats = stats[col]
         with st.sidebar.expander(f"Filter für {col}", expanded=False):
             active_key = f"{col}_active"
             active = st.checkbox("Aktivieren", value=False, key=active_key)
 
-            nunique = df[col].nunique()
-
             # Numerische Spalten
-            if pd.api.types.is_numeric_dtype(df[col]) and nunique > 1:
-                mn, mx = float(df[col].min()), float(df[col].max())
+            if col_stats["kind"] == "numeric":
+                mn, mx = col_stats["min"], col_stats["max"]
                 default_min = min(0, mn)
 
                 min_key, max_key = f"{col}_min", f"{col}_max"
@@ -45,8 +122,8 @@ def build_filters(df: pd.DataFrame) -> dict:
                     filters[col] = (st.session_state[min_key], st.session_state[max_key])
 
             # Datumsspalten
-            elif pd.api.types.is_datetime64_any_dtype(df[col]):
-                mn, mx = df[col].min(), df[col].max()
+            elif col_stats["kind"] == "datetime":
+                mn, mx = col_stats["min"], col_stats["max"]
 
                 start_key, end_key = f"{col}_start", f"{col}_end"
 
@@ -69,7 +146,7 @@ def build_filters(df: pd.DataFrame) -> dict:
                     st.session_state[multi_key] = []
 
                 st.multiselect(f"Werte für {col}",
-                               options=list(df[col].dropna().unique()),
+                               options=col_stats["options"],
                                key=multi_key)
 
                 if active:
@@ -78,7 +155,7 @@ def build_filters(df: pd.DataFrame) -> dict:
     return filters
 
 
-def apply_filters(df: pd.DataFrame, filters: dict, limit: int = 1000) -> pd.DataFrame:
+def apply_filters(df: "pd.DataFrame", filters: dict, limit: int = 1000) -> "pd.DataFrame":
     """
     Wendet die angegebenen Filter auf ein DataFrame an.
 
@@ -0,0 +1,97 @@
+# components/schedule_panel.py
+import datetime as dt
+
+import streamlit as st
+from utils.schedule import TERMIN_MINUTES, get_schedule, weekly
+
+# Tabellen, bei deren Einfügen der Belegungsplan geprüft wird
+CHECKED_TABLES = ("Veranstaltung", "Veranstaltung_Termine")
+_WEEKDAYS = ("Mo", "Di", "Mi", "Do", "Fr", "Sa", "So")
+
+
+def _format_start(start: dt.datetime) -> str:
+    return f"{_WEEKDAYS[start.weekday()]} {start:%d.%m.%Y %H:%M}"
+
+
+def _show_conflicts(conflicts: list):
+    st.warning(f"{len(conflicts)} Überschneidung(en) mit bestehenden Terminen.")
+    st.dataframe(
+        [{"Belegt": f"{c['art']} {c['id']}", "Beginn": _format_start(c["beginn"]),
+          "Veranstaltung": c["veranstaltungs_id"], "Termin": c["termin_id"]} for c in conflicts],
+        hide_index=True,
+    )
+
+
+def show_schedule_check(conn, table_name: str, new_data: dict):
+    """
+    Prüft im Editor beim Einfügen den Belegungsplan (utils/schedule.py).
+
+    - Veranstaltung: geplante wöchentliche Termine gegen Ort und
+      Kursleiter aus dem Formular prüfen, freie Termine vorschlagen.
+    - Veranstaltung_Termine: den gewählten Termin gegen Orte und
+      Kursleiter der Veranstaltung prüfen.
+
+    Nur Hinweis; eingefügt wird unabhängig davon.
+
+    Args:
+        conn: Datenbankverbindung.
+        table_name (str): Tabelle des Editors.
+        new_data (dict): Werte des Formulars.
+    """
+    import mysql.connector as mysql
+    # Import hier: table_editor bindet dieses Modul ein
+    from components.table_editor import _format_db_error
+
+    if table_name not in CHECKED_TABLES:
+        return
+    schedule = get_schedule()
+    try:
+        schedule.refresh(conn)
+    except mysql.Error as e:
+        st.caption(f"Belegungsplan nicht verfügbar: {_format_db_error(e)}")
+        return
+
+    if table_name == "Veranstaltung_Termine":
+        event = schedule.events.get(new_data.get("veranstaltungs_id"))
+        if event is None or not new_data.get("termin_id"):
+            return
+        cursor = conn.cursor()
+        cursor.execute("SELECT datum FROM Termin WHERE termin_id = %s;", (new_data["termin_id"],))
+        row = cursor.fetchone()
+        cursor.close()
+        if row is None or row[0] is None:
+            return
+        conflicts = schedule.conflicts(event["orte"], event["kursleiter"], [row[0]],
+                                       exclude=new_data["veranstaltungs_id"])
+        if conflicts:
+            _show_conflicts(conflicts)
+        else:
+            st.caption(f"Termin {_format_start(row[0])}: Ort und Kursleiter sind frei.")
+        return
+
+    with st.expander("Terminplanung prüfen"):
+        st.caption(f"Wöchentliche Termine zu je {TERMIN_MINUTES} Minuten; geprüft werden "
+                   "ort_id und kursleiter_id aus dem Formular.")
+        ort_id = new_data.get("ort_id") or None
+        kursleiter_id = new_data.get("kursleiter_id") or None
+        col1, col2, col3 = st.columns(3)
+        first_day = col1.date_input("Erster Termin", key="schedule_day")
+        first_time = col2.time_input("Beginn", value=dt.time(18, 0), step=dt.timedelta(minutes=30),
+                                     key="schedule_time")
+        weeks = col3.number_input("Wochen", min_value=1, value=int(new_data.get("dauer") or 1),
+                                  step=1, key="schedule_weeks")
+        starts = weekly(dt.datetime.combine(first_day, first_time), weeks)
+
+        conflicts = schedule.conflicts([ort_id], kursleiter_id, starts)
+        if conflicts:
+            _show_conflicts(conflicts)
+        else:
+            st.success(f"Alle {len(starts)} Termine sind frei.")
+
+        if st.button("Freie Termine suchen", key="schedule_search"):
+            slots = schedule.free_slots([ort_id], kursleiter_id, first_day, weeks)
+            if slots:
+                st.write("Frei in allen Wochen (erster Termin):")
+                st.write(", ".join(_format_start(s) for s in slots))
+            else:
+                st.info("Keine freien Termine in der Woche ab dem gewählten Tag.")
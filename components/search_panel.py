@@ -0,0 +1,81 @@
+# components/search_panel.py
+import streamlit as st
+from utils.perf import timed
+from utils.search import SEARCH_INDEXES, build_boolean_query, search_all
+from utils.table_cache import current_account, get_table_cache
+
+def _open_in_view(table: str, pk_column: str, pk):
+    """Callback: Tabelle im Tab 'Tabelle anzeigen' öffnen und auf den Treffer filtern."""
+    st.session_state["active_tab"] = "Tabelle anzeigen"
+    st.session_state["selected_table"] = table
+    st.session_state[f"{pk_column}_active"] = True
+    st.session_state[f"{pk_column}_min"] = float(pk)
+    st.session_state[f"{pk_column}_max"] = float(pk)
+
+def _open_in_editor(table: str, pk_column: str, pk):
+    """Callback: Treffer im Tab 'Tabelle bearbeiten' öffnen (immer mit frisch gelesenem Stand)."""
+    from components.table_editor import _close_edit
+
+    _close_edit()
+    st.session_state["active_tab"] = "Tabelle bearbeiten"
+    st.session_state["selected_table"] = table
+    st.session_state["editor_action"] = "Eintrag bearbeiten"
+    st.session_state[f"edit_{pk_column}"] = str(pk)
+
+@st.fragment
+def search_panel(session, can_edit: bool = False):
+    """
+    Globale Volltextsuche über Teilnehmer, Sportangebote, Feedback und Orte.
+
+    Läuft als Fragment: Tippen in das Suchfeld führt nur die Suche erneut
+    aus. Jeder Treffer verlinkt in die Tabellenansicht (gefiltert auf den
+    Primärschlüssel) und, mit Login, in den Editor.
+
+    Args:
+        session: DBSession des Nutzers (die Suche läuft mit seinen Rechten).
+        can_edit (bool, optional): Link "Bearbeiten" anzeigen (nur für Tabellen mit Schreibrecht).
+    """
+    with timed("suche"):
+        _search_panel(session, can_edit)
+
+def _search_panel(session, can_edit: bool):
+    with st.expander("Suche", expanded=bool(st.session_state.get("search_text"))):
+        text = st.text_input(
+            f"Suche in {', '.join(SEARCH_INDEXES)}",
+            key="search_text",
+            placeholder="z.B. Name, Sportangebot, Kommentar oder Ort",
+        )
+        if not text.strip():
+            return
+        if not build_boolean_query(text):
+            st.caption("Suchwörter müssen mindestens 3 Zeichen lang sein.")
+            return
+
+        # Ergebnis nur neu laden, wenn sich Suche oder Datenstand geändert haben
+        result_key = (current_account(), text, get_table_cache().generation)
+        cached = st.session_state.get("search_result")
+        if cached is not None and cached[0] == result_key:
+            result = cached[1]
+        else:
+            # Tabellen ohne SELECT-Recht gar nicht erst abfragen
+            tables = session.privileges.readable(SEARCH_INDEXES)
+            if not tables:
+                st.caption("Keine durchsuchbaren Tabellen.")
+                return
+            result = search_all(session, text, tables=tables)
+            st.session_state["search_result"] = (result_key, result)
+
+        results = result["results"]
+        editable = set(session.privileges.writable(SEARCH_INDEXES)) if can_edit else set()
+        st.caption(f"{len(results)} Treffer in {result['duration_ms']:.0f} ms")
+        for i, hit in enumerate(results):
+            cols = st.columns([2, 6, 1, 1])
+            cols[0].markdown(f"**{hit['table']}** #{hit['pk']}")
+            cols[1].write(hit["text"])
+            link_args = (hit["table"], hit["pk_column"], hit["pk"])
+            if cols[2].button("Anzeigen", key=f"search_view_{i}", on_click=_open_in_view, args=link_args):
+                st.rerun()
+            if hit["table"] in editable and cols[3].button("Bearbeiten", key=f"search_edit_{i}", on_click=_open_in_editor, args=link_args):
+                st.rerun()
+        for table, message in result["errors"].items():
+            st.warning(f"{table}: Suche nicht möglich ({message})")
@@ -1,9 +1,46 @@
 # components/sidebar.py
 import streamlit as st
-from utils.database import load_dataframe
-from components.filter_panel import build_filters
+from utils.fanout import fan_out
+from utils.perf import record
+from utils.table_cache import load_table_names, get_cached_table, current_account, get_table_cache
+from components.filter_panel import build_filters, column_stats
+from components.sql_filter_runner import cached_table_columns
+from utils.snapshot import snapshot_available
 
-def show_sidebar(conn, active_tab: str, apply_joins: bool = False):
+def _load_table_with_stats(conn, table_name, apply_joins, account, cache) -> dict:
+    entry = get_cached_table(conn, table_name, apply_joins, account, cache)
+    if entry["stats"] is None:
+        entry["stats"] = column_stats(entry["df"])
+    return entry
+
+def warm_caches(session, conn, table_name: str, apply_joins: bool = True):
+    """
+    Lädt Tabellenliste, Tabelle samt Spaltenstatistiken und Spaltennamen parallel.
+
+    Die drei Abfragen hängen nicht voneinander ab; bei einem Cache-Miss der
+    Tabelle laufen sie über utils.fanout auf getrennten Verbindungen, danach
+    findet die Sidebar (und der Filter-Runner) alles im Cache. Ist die
+    Tabelle schon im Cache, passiert nichts.
+
+    Args:
+        session: DBSession des Nutzers (liefert die Pool-Verbindungen).
+        conn: UI-Verbindung.
+        table_name (str): Zuletzt gewählte Tabelle (st.session_state["selected_table"]).
+        apply_joins (bool, optional): Variante der Tabelle wie in show_sidebar.
+    """
+    account, cache = current_account(), get_table_cache()
+    if not table_name or cache.get((account, table_name, apply_joins)) is not None:
+        return
+    outcome = fan_out({
+        "tabellen": lambda c: load_table_names(c, account),
+        "tabelle": lambda c: _load_table_with_stats(c, table_name, apply_joins, account, cache),
+        "spalten": lambda c: cached_table_columns(c, account, table_name),
+    }, conn, session)
+    for name, elapsed_ms in outcome["timings"].items():
+        record(f"sidebar.{name}", elapsed_ms)
+    # Fehler (z.B. Tabelle inzwischen ohne Rechte) zeigen die regulären Aufrufe an
+
+def show_sidebar(conn, active_tab: str, apply_joins: bool = False, session=None):
     """
     Zeigt die Sidebar mit Tabellen-Auswahl, Limit und Filtern an 
     (nur in den Tabs 'Tabelle anzeigen' und 'Tabelle bearbeiten').
@@ -12,6 +49,9 @@ def show_sidebar(conn, active_tab: str, apply_joins: bool = False):
         conn: Datenbankverbindung.
         active_tab (str): Der aktuell aktive Tab.
         apply_joins (bool, optional): Ob Joins beim Laden des DataFrames angewendet werden sollen. Default False.
+        session (DBSession, optional): Mit Sitzung werden die Daten der Tabellenansicht
+            bei einem Cache-Miss parallel geladen (siehe warm_caches) und die
+            Tabellenliste auf die Rechte der Sitzung beschränkt.
 
     Returns:
         tuple: (selected_table, filters, limit_active, default_limit, df_for_filters)
@@ -21,13 +61,20 @@ def show_sidebar(conn, active_tab: str, apply_joins: bool = False):
 
     st.header("Navigation / Auswahl")
 
-    # Tabellen laden
-    cursor = conn.cursor()
-    cursor.execute("SHOW TABLES;")
-    tables = [t[0] for t in cursor.fetchall()]
-    cursor.close()
+    if session is not None and active_tab == "Tabelle anzeigen":
+        warm_caches(session, conn, st.session_state.get("selected_table"))
 
-    selected_table = st.selectbox("Wähle eine Tabelle", tables)
+    # Tabellen laden (zwischengespeichert, kein SHOW TABLES pro Rerun)
+    tables = load_table_names(conn, current_account())
+    # Nur Tabellen, die die Sitzung lesen bzw. im Editor ändern darf
+    if session is not None:
+        privileges = session.privileges
+        tables = privileges.writable(tables) if active_tab == "Tabelle bearbeiten" else privileges.readable(tables)
+
+    # key="selected_table": Links aus der Suche wählen die Tabelle vor
+    if st.session_state.get("selected_table") not in tables:
+        st.session_state.pop("selected_table", None)
+    selected_table = st.selectbox("Wähle eine Tabelle", tables, key="selected_table")
 
     if active_tab == "Tabelle bearbeiten":
         return selected_table,{}, False, None, None
@@ -42,12 +89,18 @@ def show_sidebar(conn, active_tab: str, apply_joins: bool = False):
         min_value=1, value=1000, step=100
     )
 
+    # Abfragen der Tabellenansicht auf dem lokalen Snapshot statt auf der Datenbank
+    if active_tab == "Tabelle anzeigen" and snapshot_available():
+        st.checkbox("Analyse-Snapshot verwenden", key="use_snapshot",
+                    help="Ergebnis und Trefferzahl kommen aus den Parquet-Dateien (Stand bis zu wenige Minuten alt).")
+
     if selected_table:
         if active_tab == "Tabelle anzeigen":
             apply_joins = True
-        # DataFrame laden und Filter bauen
-        df_for_filters = load_dataframe(conn, selected_table, apply_joins=apply_joins)
-        filters = build_filters(df_for_filters)
+        # DataFrame und Spaltenstatistiken aus dem Cache holen und Filter bauen
+        entry = _load_table_with_stats(conn, selected_table, apply_joins, current_account(), get_table_cache())
+        df_for_filters = entry["df"]
+        filters = build_filters(df_for_filters, entry["stats"])
     else:
         df_for_filters = None
         filters = {}
@@ -1,11 +1,22 @@
 # components/sql_filter_runner.py
 import json
-from pypika import Query
-from pypika.terms import Field
+import math
 import streamlit as st
-import pandas as pd
+from utils.fanout import fan_out
+from utils.perf import record, timed
+from utils.archive import ARCHIVE_DATE_COLUMNS, archive_horizon
+from utils.snapshot import load_state, query_snapshot, snapshot_available, snapshot_tables
+from utils.table_cache import current_account, get_table_cache, get_cached_page, load_primary_key
 
 JOIN_CONFIG_PATH = "utils/join_config.json"
+# Wie lange das jüngste Archivdatum zwischengespeichert wird (Sekunden)
+ARCHIVE_HORIZON_TTL = 300
+# Bis zu so vielen (laut EXPLAIN) zu lesenden Zeilen wird exakt gezählt, darüber geschätzt
+EXACT_COUNT_MAX_ROWS = 200_000
+# Gemerkte Trefferzahlen pro Sitzung (Filter-Fingerabdrücke)
+COUNT_CACHE_SIZE = 32
+# Zusatzspalte bei Abfragen mit Archiv: 0 = Live-Tabelle, 1 = Archivtabelle
+SOURCE_COLUMN = "archiviert"
 
 def load_join_config():
     """Lädt die Join-Konfiguration aus der JSON-Datei."""
@@ -16,6 +27,9 @@ def build_where_clause(filters, allowed_cols):
     """
     Erstellt PyPika-Terms für WHERE-Klausel.
     """
+    # pypika wird erst hier importiert (schnellerer App-Start)
+    from pypika.terms import Field
+
     clauses = []
     params = []
     for col, val in filters.items():
@@ -63,8 +77,41 @@ def get_table_columns(conn, table_name: str) -> list:
         if cursor:
             cursor.close()
 
+@st.cache_data(show_spinner=False)
+def cached_table_columns(_conn, account: str, table_name: str) -> list:
+    """Wie `get_table_columns`, aber pro Konto und Tabelle zwischengespeichert."""
+    return get_table_columns(_conn, table_name)
+
+@st.cache_data(ttl=ARCHIVE_HORIZON_TTL, show_spinner=False)
+def cached_archive_horizon(_conn, account: str, table_name: str):
+    """Wie `utils.archive.archive_horizon`, pro Konto und Tabelle zwischengespeichert."""
+    return archive_horizon(_conn, table_name)
+
+def archive_for_filters(conn, table_name: str, filters: dict) -> str:
+    """
+    Archivtabelle, die für die Filter mit abgefragt werden muss.
+
+    Das Archiv wird nur einbezogen, wenn ein Datumsfilter auf die
+    Datumsspalte aktiv ist und sein Beginn vor dem jüngsten archivierten
+    Datum liegt.
+
+    Returns:
+        str: Name der Archivtabelle oder None.
+    """
+    if table_name not in ARCHIVE_DATE_COLUMNS:
+        return None
+    archive, column = ARCHIVE_DATE_COLUMNS[table_name]
+    if not isinstance(filters.get(column), tuple):
+        return None
+    horizon = cached_archive_horizon(conn, current_account(), table_name)
+    if horizon is None or filters[column][0] > horizon:
+        return None
+    return archive
+
 def build_sql_query(conn, table_name, filters, limit):
     """Erstellt die SQL-Abfrage basierend auf den Filtern und dem Limit."""
+    from pypika import Query
+
     allowed_cols = get_table_columns(conn, table_name)
     where_sql, params = build_where_clause(filters, allowed_cols)
     query = Query.from_(table_name).select("*")
@@ -77,22 +124,79 @@ def build_sql_query(conn, table_name, filters, limit):
     sql = sql.replace('"', "`")
     return sql, params
 
-def run_sql_filter(conn, table_name, filters, limit):
+@st.fragment
+def run_sql_filter(conn, table_name, filters, limit, session=None):
     """
     Baut eine parametrisierte SELECT-Abfrage aus Filtern.
     Führt diese aus und zeigt das Ergebnis an.
+
+    Läuft als Fragment: Der Button zum Ein-/Ausblenden der SQL-Query
+    führt nur dieses Fragment erneut aus. Das Ergebnis der zuletzt
+    ausgeführten Query wird im Session State gehalten, sodass ein
+    solcher Rerun keine erneute Datenbankabfrage auslöst.
+
+    Mit `session` laufen Ergebnisseite und Zählung der Treffer parallel
+    auf zusätzlichen Pool-Verbindungen (siehe utils.fanout). Die
+    Trefferzahl wird pro Filter gemerkt; Blättern durch die Seiten
+    (OFFSET) und der CSV-Export zählen nicht erneut.
     """
-    allowed_cols = get_table_columns(conn, table_name)
+    with timed("ergebnis"):
+        _run_sql_filter(conn, table_name, filters, limit, session)
+
+def _run_sql_filter(conn, table_name, filters, limit, session=None):
+    from pypika import Query
+    from pypika.terms import Field, ValueWrapper
+
+    allowed_cols = cached_table_columns(conn, current_account(), table_name)
     if not allowed_cols:
         return
 
     term, params = build_where_clause(filters, allowed_cols)
 
-    query = Query.from_(table_name).select("*")
-    if term:
-        query = query.where(term)
+    archive = archive_for_filters(conn, table_name, filters) if term else None
+    # Feste Reihenfolge nach Primärschlüssel, sonst überspringt/wiederholt OFFSET Zeilen
+    order = [Field(c) for c in load_primary_key(conn, current_account(), table_name) if c in allowed_cols]
+    if archive:
+        # Datumsfilter reicht ins Archiv: beide Tabellen mit gleichen Spalten und ihrer Herkunft
+        query = (Query.from_(table_name).select(*allowed_cols, ValueWrapper(0).as_(SOURCE_COLUMN)).where(term)
+                 .union_all(Query.from_(archive).select(*allowed_cols, ValueWrapper(1).as_(SOURCE_COLUMN)).where(term)))
+        order.append(Field(SOURCE_COLUMN))
+    else:
+        query = Query.from_(table_name).select("*")
+        if term:
+            query = query.where(term)
+    base_sql = str(query).replace('"', "`")
+
+    # Optional auf dem lokalen Analyse-Snapshot statt auf der Datenbank (utils.snapshot)
+    # (exportiert mit dem Konto aus secrets.toml: nur Tabellen, die die Sitzung lesen darf)
+    snapshot_at, readable = None, None
+    if st.session_state.get("use_snapshot"):
+        readable = snapshot_tables(session.privileges if session is not None else None)
+        if all(snapshot_available(t) and t in readable for t in (table_name, archive) if t):
+            snapshot_at = load_state().get("refreshed_at")
+
+    # Trefferzahl pro Filter-Fingerabdruck (ohne Limit/Seite): Blättern und Limit-Änderungen zählen nicht neu
+    account, cache = current_account(), get_table_cache()
+    count_sql = build_count_sql(table_name, term, archive)
+    count_key = (account, count_sql, cache.generation, snapshot_at)
+    counts = st.session_state.setdefault("match_counts", {})
+    match_count = counts.get(count_key)
+
+    if st.session_state.get("filter_page_for") != (account, count_sql):
+        st.session_state["filter_page_for"] = (account, count_sql)
+        st.session_state.pop("filter_page", None)
+    page = st.session_state.get("filter_page", 1) if limit else 1
+    if limit and match_count is not None and page > max(1, math.ceil(match_count["count"] / limit)):
+        # Datenstand hat sich geändert, die gewählte Seite gibt es nicht mehr
+        st.session_state.pop("filter_page", None)
+        page = 1
+
+    if order:
+        query = query.orderby(*order)
     if limit: #limit deaktiviert -> limit = None
         query = query.limit(limit)
+        if page > 1:
+            query = query.offset((page - 1) * limit)
 
     sql = str(query)
     sql = sql.replace('"',"`")  # MySQL Backticks
@@ -105,30 +209,141 @@ def run_sql_filter(conn, table_name, filters, limit):
         st.session_state.show_sql = not st.session_state.show_sql
     st.button("SQL Query anzeigen/ausblenden", on_click=toggle_sql)
 
+    if archive:
+        st.caption(f"Der Datumsfilter reicht in archivierte Daten, {archive} wird mit abgefragt.")
+    if snapshot_at:
+        st.caption(f"Ergebnis aus dem Analyse-Snapshot (Stand {snapshot_at.replace('T', ' ')}).")
+
     if st.session_state.show_sql:
         st.subheader("Ausgeführte SQL-Abfrage:")
         st.code(sql, language="sql", line_numbers=True, wrap_lines=True)
     #st.write(f"Parameter: {params}")
 
-    cursor = None
+    # Ergebnis nur neu laden, wenn sich Query oder Datenstand geändert haben
+    result_key = (account, sql, cache.generation, snapshot_at)
+    cached = st.session_state.get("filter_result")
+    if cached is not None and cached[0] == result_key:
+        _show_result(cached[1], counts.get(count_key), limit)
+        return
+
+    # Ergebnisseite und Trefferzahl sind unabhängig: parallel auf getrennten Verbindungen
+    if snapshot_at:
+        # DuckDB zählt auf Parquet exakt und schnell; keine Datenbankverbindung nötig
+        tasks = {"page": lambda c: query_snapshot(sql, tables=readable)}
+        if limit and match_count is None:
+            tasks["count"] = lambda c: {"count": int(query_snapshot(count_sql, tables=readable).iloc[0, 0]), "exact": True}
+        session = None
+    elif term is None and page == 1:
+        # Ohne Filter: erste Seite aus dem gemeinsamen Cache (ggf. vom Prefetcher geladen)
+        tasks = {"page": lambda c: get_cached_page(c, table_name, limit, account=account, cache=cache)["df"]}
+    else:
+        tasks = {"page": lambda c: _fetch_frame(c, sql)}
+    if limit and match_count is None and "count" not in tasks:
+        tasks["count"] = lambda c: count_matches(c, base_sql, count_sql)
+    outcome = fan_out(tasks, conn, session)
+    for name, elapsed_ms in outcome["timings"].items():
+        record(f"ergebnis.{name}", elapsed_ms)
+
+    if "page" in outcome["errors"]:
+        st.error(f"Fehler bei SQL-Filter-Ausführung: {outcome['errors']['page']}")
+        return
+    df = outcome["results"]["page"]
+    if not limit or (page == 1 and len(df) < limit):
+        # Vollständiges Ergebnis: Trefferzahl ist exakt len(df)
+        match_count = {"count": len(df), "exact": True}
+    elif match_count is None:
+        # Trefferzahl ist nur Zusatzinfo, ein Fehler beim Zählen blendet sie aus
+        match_count = outcome["results"].get("count")
+    if match_count is not None:
+        _remember_count(counts, count_key, match_count)
+    st.session_state["filter_result"] = (result_key, df)
+    _show_result(df, match_count, limit)
+
+def build_count_sql(table_name, term, archive=None) -> str:
+    """COUNT(*) mit derselben WHERE-Klausel wie die Ergebnisabfrage (inkl. Archiv)."""
+    from pypika import Query, functions as fn
+
+    tables = [table_name, archive] if archive else [table_name]
+    parts = []
+    for table in tables:
+        query = Query.from_(table).select(fn.Count("*"))
+        if term is not None:
+            query = query.where(term)
+        parts.append(f"({query})")
+    return ("SELECT " + " + ".join(parts)).replace('"', "`")
+
+def count_matches(conn, select_sql: str, count_sql: str, exact_max_rows: int = EXACT_COUNT_MAX_ROWS) -> dict:
+    """
+    Anzahl der Treffer einer Filterabfrage, exakt oder geschätzt.
+
+    Zuerst wird der Plan der Abfrage (ohne LIMIT) per EXPLAIN angesehen.
+    Müsste COUNT(*) mehr als `exact_max_rows` Zeilen lesen (kein passender
+    Index), wird die Schätzung des Optimizers übernommen statt zu zählen.
+
+    Args:
+        conn: Datenbankverbindung.
+        select_sql (str): Filterabfrage ohne LIMIT.
+        count_sql (str): COUNT(*) mit derselben WHERE-Klausel (siehe build_count_sql).
+        exact_max_rows (int, optional): Grenze für exaktes Zählen.
+
+    Returns:
+        dict: count (int) und exact (bool).
+    """
+    from utils.query_guard import explain
+
+    try:
+        plan = explain(conn, select_sql)
+    except Exception:
+        # Kein EXPLAIN möglich (z.B. Rechte): exakt zählen
+        plan = None
+    if plan is not None and plan["rows"] > exact_max_rows:
+        return {"count": int(plan["produced"]), "exact": False}
+    return {"count": _fetch_count(conn, count_sql), "exact": True}
+
+def _remember_count(counts: dict, key, match_count: dict):
+    counts.pop(key, None)
+    counts[key] = match_count
+    while len(counts) > COUNT_CACHE_SIZE:
+        counts.pop(next(iter(counts)))
+
+def _fetch_frame(conn, sql):
+    from utils.dtypes import frame_from_cursor
+
+    cursor = conn.cursor(buffered=True)
     try:
-        cursor = conn.cursor(buffered=True)
         cursor.execute(sql)
-        rows = cursor.fetchall()
-        if cursor.description:
-            cols = [c[0] for c in cursor.description]
-            df = pd.DataFrame(rows, columns=cols)
-        else:
-            df = pd.DataFrame()
-        st.dataframe(df)
-        st.download_button(
-            "CSV herunterladen",
-            data=df.to_csv(index=False),
-            file_name="sql_filter_result.csv",
-            mime="text/csv"
-        )
-    except Exception as e:
-        st.error(f"Fehler bei SQL-Filter-Ausführung: {e}")
+        return frame_from_cursor(cursor)
     finally:
-        if cursor:
-            cursor.close()
+        cursor.close()
+
+def _fetch_count(conn, sql):
+    cursor = conn.cursor(buffered=True)
+    try:
+        cursor.execute(sql)
+        return int(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+
+def _show_result(df, match_count=None, limit=None):
+    """Zeigt das Ergebnis-DataFrame samt Trefferzahl, Seitenwahl und CSV-Download an."""
+    if match_count is not None:
+        total = match_count["count"]
+        prefix = "" if match_count["exact"] else "ca. "
+        if limit and total > limit:
+            pages = max(1, math.ceil(total / limit))
+            if st.session_state.get("filter_page", 1) > pages:
+                st.session_state.pop("filter_page", None)
+            # Größe des vollständigen Ergebnisses aus der Größe der geladenen Seite hochgerechnet
+            size = df.memory_usage(deep=True).sum() / max(len(df), 1) * total
+            size_text = f"{size / 2**20:,.1f} MB" if size >= 2**20 else f"{size / 2**10:,.0f} KB"
+            st.caption(f"{len(df):,} von {prefix}{total:,} Treffern angezeigt (ohne Limit ca. {size_text})")
+            st.number_input(f"Seite (von {prefix}{pages:,})", min_value=1, max_value=pages, step=1, key="filter_page")
+        else:
+            st.caption(f"{prefix}{total:,} Treffer")
+    st.dataframe(df)
+    st.download_button(
+        "CSV herunterladen",
+        data=df.to_csv(index=False),
+        file_name="sql_filter_result.csv",
+        mime="text/csv"
+    )
@@ -1,83 +1,33 @@
 # components/sql_runner_simple.py
 import streamlit as st
-import pandas as pd
-from utils.database import get_connection
-import mysql.connector as mysql
+from utils.perf import timed
+from utils.sql_script import execute_script, split_statements
+from utils.query_guard import analyze_script, guard_statement, load_limits
+from utils.table_cache import invalidate_table
+from utils.snapshot import load_state
 
-def _execute_sql(conn, cursor, sql, params=None):
-    """Führt die SQL-Query aus und zeigt Ergebnisse/Status in Streamlit an."""
-    sql_upper = sql.strip().upper()
-    try:
-        if sql_upper.startswith("SELECT") or sql_upper.startswith("SHOW"):
-            if params:
-                cursor.execute(sql, params)
-            else:
-                cursor.execute(sql)
-            data = cursor.fetchall()
-            if cursor.description is None:
-                st.warning("Keine Spaltenbeschreibung verfügbar. Keine Ergebnisse.")
-                df = pd.DataFrame()
-            else:
-                cols = [c[0] for c in cursor.description]
-                df = pd.DataFrame(data, columns=cols)
-                st.dataframe(df)
-                st.download_button(
-                    "CSV herunterladen",
-                    data=df.to_csv(index=False),
-                    file_name="result.csv",
-                    mime="text/csv"
-                )
-        else:
-            # INSERT, UPDATE, DELETE
-            if params:
-                cursor.execute(sql, params)
-            else:
-                cursor.execute(sql)
-            conn.commit()
-            st.success(f"Operation erfolgreich durchgeführt. {cursor.rowcount} Zeilen betroffen.")
-    except mysql.Error as e:
-        errno = getattr(e, "errno", None)
-        msg = getattr(e, "msg", None) or str(e)
-        if errno in (1142, 1143):
-            st.error("Berechtigungsfehler: Dein Datenbankbenutzer hat nicht die nötigen Rechte für diese Aktion.")
-        else:
-            st.error(f"Datenbankfehler ({errno}): {msg}")
-
-def run_custom_query():
-    """Streamlit-Komponente zum Ausführen eigener SQL-Queries mit Beispiel-Queries."""
-    st.subheader("SQL-Abfrage ausführen")
-
-    conn = get_connection(
-        user=st.session_state["sql_user"],
-        password=st.session_state["sql_password"]
-    )
-
-    # Standardwert für parametrierten Ort setzen
-    if "ort_param" not in st.session_state:
-        st.session_state["ort_param"] = "Yogastudio"
-
-    # Beispiel-Queries
-    example_queries = {
-        "1: Anzeigen aller Studenten": """
+# Beispiel-Queries (auch von benchmarks/load_test.py genutzt)
+EXAMPLE_QUERIES = {
+    "1: Anzeigen aller Studenten": """
 SELECT k.*, s.matrikelnummer
 FROM Kursteilnehmer k
 INNER JOIN Studierende s
   ON k.teilnehmer_id = s.teilnehmer_id;
 """,
-        "2: Anzahl Veranstaltungen pro Angebot": """
+    "2: Anzahl Veranstaltungen pro Angebot": """
 SELECT s.angebot_id, s.angebot_name, COUNT(v.veranstaltungs_id) AS anzahl_veranstaltungen
 FROM Sportangebot s
 LEFT JOIN Veranstaltung v ON s.angebot_id = v.angebot_id
 GROUP BY s.angebot_id, s.angebot_name;
 """,
-        "3: Teilnehmerliste und Sportangebote, die sie gebucht haben": """
+    "3: Teilnehmerliste und Sportangebote, die sie gebucht haben": """
 SELECT k.teilnehmer_id, k.teilnehmer_name, s.angebot_name
 FROM Kursteilnehmer k
 JOIN Buchung b ON k.teilnehmer_id = b.teilnehmer_id
 JOIN Veranstaltung v ON b.veranstaltungs_id = v.veranstaltungs_id
 JOIN Sportangebot s ON v.angebot_id = s.angebot_id;
 """,
-        "4: Alle Teilnehmer die auf Anmeldelisten stehen": """
+    "4: Alle Teilnehmer die auf Anmeldelisten stehen": """
 SELECT k.teilnehmer_id, k.teilnehmer_name AS teilnehmer_name, v.veranstaltungs_id, sa.angebot_name
 FROM Buchung b
 JOIN Kursteilnehmer k ON b.teilnehmer_id = k.teilnehmer_id
@@ -86,7 +36,7 @@ JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
 WHERE b.buchung_status = 'wartend'
 ORDER BY v.veranstaltungs_id, b.datum;
 """,
-        "5: Prozentuelle Auslastung aller Kurse (nur bezahlte Buchung)": """
+    "5: Prozentuelle Auslastung aller Kurse (nur bezahlte Buchung)": """
 SELECT sa.angebot_name AS veranstaltungsname, v.verfügbare_plätze,
 COUNT(b.buchungs_id) AS belegte_plaetze,
 ROUND(COUNT(b.buchungs_id) / v.verfügbare_plätze * 100, 1) AS auslastung_prozent
@@ -98,14 +48,14 @@ AND b.buchung_status = 'bezahlt'
 GROUP BY sa.angebot_name, v.verfügbare_plätze
 ORDER BY auslastung_prozent DESC;
 """,
-        "6: Kurse die in bestimmten Ort stattfinden (Yogastudio)": """
+    "6: Kurse die in bestimmten Ort stattfinden (Yogastudio)": """
 SELECT v.veranstaltungs_id, sa.angebot_name, o.ort_name
 FROM Veranstaltung v
 JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
 JOIN Ort o ON v.ort_id = o.ort_id
 WHERE o.ort_name = 'Yogastudio';
 """,
-        "7: Teilnehmer mit den meisten Buchungen": """
+    "7: Teilnehmer mit den meisten Buchungen": """
 SELECT k.teilnehmer_id, k.teilnehmer_name, COUNT(b.buchungs_id) AS buchungen
 FROM Kursteilnehmer k
 JOIN Buchung b ON k.teilnehmer_id = b.teilnehmer_id
@@ -113,7 +63,7 @@ GROUP BY k.teilnehmer_id, k.teilnehmer_name
 ORDER BY buchungen DESC
 LIMIT 1;
 """,
-        "8: Einnahmen pro Angebot": """
+    "8: Einnahmen pro Angebot": """
 SELECT sa.angebot_name, SUM(b.betrag) AS gesamt_einnahmen
 FROM Buchung b
 JOIN Veranstaltung v ON b.veranstaltungs_id = v.veranstaltungs_id
@@ -122,49 +72,196 @@ WHERE b.buchung_status = 'bezahlt'
 GROUP BY sa.angebot_name
 ORDER BY gesamt_einnahmen DESC;
 """,
-        "9: Veranstaltungen mit mehr als 5 verfügbaren Plätzen": """
+    "9: Veranstaltungen mit mehr als 5 verfügbaren Plätzen": """
 SELECT sa.angebot_name, v.verfügbare_plätze
 FROM Veranstaltung v
 JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
 WHERE v.verfügbare_plätze > 5;
 """,
-        "10: Veranstaltungen mit freien Plätzen in Sporthalle": """
+    "10: Veranstaltungen mit freien Plätzen in Sporthalle": """
 SELECT v.veranstaltungs_id, sa.angebot_name, o.ort_name, v.verfügbare_plätze
 FROM Veranstaltung v
 JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
 JOIN Ort o ON v.ort_id = o.ort_id
 WHERE o.ort_name = "Sporthalle";
 """,
-        "11: Verwaltungsangestellte die für Gesellschaftstanz verantwortlich sind": """
+    "11: Verwaltungsangestellte die für Gesellschaftstanz verantwortlich sind": """
 SELECT vw.angestellten_name
 FROM Verwaltungsangestellter vw
 WHERE angestellten_id IN (
-    SELECT angestellten_id
-    FROM Verwaltete_veranstaltungen
-    WHERE veranstaltungs_id IN (
-        SELECT veranstaltungs_id
-        FROM Veranstaltung
-        WHERE angebot_id IN (
-            SELECT angebot_id
-            FROM Sportangebot sa
-            WHERE sa.angebot_name = "Gesellschaftstanz"
-        )
+SELECT angestellten_id
+FROM Verwaltete_veranstaltungen
+WHERE veranstaltungs_id IN (
+    SELECT veranstaltungs_id
+    FROM Veranstaltung
+    WHERE angebot_id IN (
+        SELECT angebot_id
+        FROM Sportangebot sa
+        WHERE sa.angebot_name = "Gesellschaftstanz"
     )
+)
 );
 """,
-        "12: Veranstaltungen an bestimmtem Ort (parametrisiert)": """
+    "12: Veranstaltungen an bestimmtem Ort (parametrisiert)": """
 SELECT v.veranstaltungs_id, sa.angebot_name, o.ort_name, v.verfügbare_plätze
 FROM Veranstaltung v
 JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
 JOIN Ort o ON v.ort_id = o.ort_id
 WHERE o.ort_name = %s;
 """
-    }
+}
+
+def _format_sql_error(e: Exception) -> str:
+    """Kurze Fehlermeldung für Datenbankfehler (Berechtigungen gesondert)."""
+    errno = getattr(e, "errno", None)
+    msg = getattr(e, "msg", None) or str(e)
+    if errno in (1142, 1143):
+        return "Berechtigungsfehler: Dein Datenbankbenutzer hat nicht die nötigen Rechte für diese Aktion."
+    if errno == 3024:
+        return "Abbruch: Die Abfrage hat die maximale Ausführungszeit überschritten. Bitte weiter einschränken."
+    if errno:
+        return f"Datenbankfehler ({errno}): {msg}"
+    return f"Fehler: {msg}"
+
+def _execute_sql(conn, sql, params=None, limits=None):
+    """
+    Führt ein SQL-Skript (ein oder mehrere Statements) aus und zeigt
+    pro Statement Ergebnis/Status sowie die Laufzeit in Streamlit an.
+
+    Siehe `utils.sql_script.execute_script` für Batching und Transaktion.
+    Mit `limits` (siehe utils.query_guard) bekommen SELECTs eine maximale
+    Ausführungszeit und Ergebnisse werden auf max_rows Zeilen gekürzt.
+    """
+    from utils.dtypes import frame_from_rows
+
+    rewrite = (lambda stmt: guard_statement(stmt, limits)) if limits else None
+    try:
+        results = execute_script(conn, sql, params, rewrite=rewrite)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    # Sobald etwas committet wurde (auch vor einem späteren Fehler), gecachte Tabellen verwerfen
+    changes = [i for i, r in enumerate(results, start=1) if r["kind"] in ("write", "ddl") and r["error"] is None]
+    committed = [i for i in changes if results[i - 1]["committed"]]
+    if committed:
+        invalidate_table()
+
+    # Anzeige mit den eingegebenen Statements (ohne Hint/LIMIT des Guards)
+    originals = split_statements(sql)
+    for i, res in enumerate(results, start=1):
+        stmt = originals[i - 1] if i <= len(originals) else res["statement"]
+        label = stmt if len(stmt) <= 80 else stmt[:77] + "..."
+        if len(results) > 1:
+            st.markdown(f"**Statement {i}** ({res['duration_ms']:.1f} ms): `{label}`")
+        if res["error"] is not None:
+            st.error(_format_sql_error(res["error"]))
+            rolled_back = [j for j in changes if j not in committed]
+            if committed:
+                # DDL committet in MySQL implizit; davor Ausgeführtes bleibt bestehen
+                st.warning(f"Bereits committet (vor bzw. durch DDL): Statement {', '.join(map(str, committed))}."
+                           + (f" Zurückgerollt: Statement {', '.join(map(str, rolled_back))}." if rolled_back else ""))
+            elif any(r["kind"] == "write" for r in results):
+                st.info("Alle Änderungen dieses Skripts wurden zurückgerollt.")
+        elif res["columns"] is not None:
+            rows = res["rows"]
+            if limits and len(rows) > limits["max_rows"]:
+                rows = rows[:limits["max_rows"]]
+                st.warning(f"Ergebnis auf {limits['max_rows']:,} Zeilen begrenzt.")
+            df = frame_from_rows(rows, res["description"])
+            st.dataframe(df)
+            st.download_button(
+                "CSV herunterladen",
+                data=df.to_csv(index=False),
+                file_name=f"result_{i}.csv" if len(results) > 1 else "result.csv",
+                mime="text/csv",
+                key=f"sql_download_{i}"
+            )
+        elif res["kind"] == "write":
+            st.success(f"Operation erfolgreich durchgeführt. {res['rowcount']} Zeilen betroffen.")
+        else:
+            st.success("Statement erfolgreich ausgeführt.")
+
+    if len(results) > 1:
+        with st.expander("Laufzeit pro Statement"):
+            st.table({
+                "Nr.": list(range(1, len(results) + 1)),
+                "Art": [r["kind"] for r in results],
+                "Dauer (ms)": [round(r["duration_ms"], 1) for r in results],
+                "Zeilen": [len(r["rows"]) if r["columns"] is not None else r["rowcount"] for r in results],
+            })
+
+def _execute_on_snapshot(sql, params=None, limits=None, privileges=None):
+    """
+    Führt ein SELECT auf dem lokalen Analyse-Snapshot aus (utils.snapshot).
+
+    Die Datenbank wird dabei nicht abgefragt; eine Kostenprüfung per
+    EXPLAIN entfällt. Ergebnisse werden wie sonst auf max_rows gekürzt.
+    Sichtbar sind nur Tabellen/Views mit SELECT-Recht der Sitzung.
+    """
+    import time
+    from utils.snapshot import query_snapshot, snapshot_tables
+
+    start = time.perf_counter()
+    try:
+        df = query_snapshot(sql, params, tables=snapshot_tables(privileges))
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.caption(f"Auf dem Snapshot ausgeführt in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if limits and len(df) > limits["max_rows"]:
+        df = df.head(limits["max_rows"])
+        st.warning(f"Ergebnis auf {limits['max_rows']:,} Zeilen begrenzt.")
+    st.dataframe(df)
+    st.download_button(
+        "CSV herunterladen",
+        data=df.to_csv(index=False),
+        file_name="result.csv",
+        mime="text/csv",
+        key="sql_download_snapshot"
+    )
+
+def _show_analysis(analysis: dict):
+    """Zeigt die Gründe für Warnungen/Blockaden aus `analyze_script` an."""
+    for res in analysis["statements"]:
+        if res["level"] == "ok":
+            continue
+        stmt = " ".join(res["statement"].split())
+        label = stmt if len(stmt) <= 80 else stmt[:77] + "..."
+        show = st.error if res["level"] == "block" else st.warning
+        show(f"`{label}`: " + "; ".join(res["reasons"]))
+
+@st.fragment
+def run_custom_query(conn, role=None, privileges=None):
+    """
+    Streamlit-Komponente zum Ausführen eigener SQL-Queries mit Beispiel-Queries.
+
+    Läuft als Fragment, damit Eingaben im SQL-Tab nicht die ganze App neu ausführen.
+    Vor der Ausführung werden die Kosten per EXPLAIN geschätzt (utils.query_guard):
+    teure Abfragen brauchen eine Bestätigung, sehr teure werden blockiert.
+
+    Args:
+        conn: Verbindung der angemeldeten Sitzung (siehe utils.session.DBSession).
+            Queries laufen damit immer mit den Rechten des eingeloggten Nutzers.
+        role (str, optional): Aktive Rolle; bestimmt die Grenzwerte.
+        privileges (Privileges, optional): Rechte der Sitzung (utils.privileges);
+            Statements ohne nötiges Recht werden nicht abgeschickt.
+    """
+    with timed("sql_abfrage"):
+        _run_custom_query(conn, role, privileges)
+
+def _run_custom_query(conn, role=None, privileges=None):
+    st.subheader("SQL-Abfrage ausführen")
+
+    # Standardwert für parametrierten Ort setzen
+    if "ort_param" not in st.session_state:
+        st.session_state["ort_param"] = "Yogastudio"
+
 
     # Anzeigen der Beispiele
     with st.expander("Beispiel-Queries anzeigen"):
         st.write("Klicke auf einen Button, um die Query als Beispiel auszuführen.")
-        for label, query in example_queries.items():
+        for label, query in EXAMPLE_QUERIES.items():
             if st.button(label):
                 st.session_state["sql_text"] = query.strip()
                 st.session_state["selected_query"] = label
@@ -177,23 +274,64 @@ WHERE o.ort_name = %s;
     if "sql_text" not in st.session_state:
         st.session_state["sql_text"] = ""
 
-    sql = st.text_area("SQL", height=240, key="sql_text")
+    sql = st.text_area("SQL", height=240, key="sql_text",
+                       help="Mehrere Statements mit ; trennen. Schreibende Statements laufen gemeinsam in einer Transaktion; "
+                            "DDL (CREATE, ALTER, DROP, ...) committet alles davor.")
+
+    limits = load_limits(role)
+
+    # Lesende Auswertungen können auf dem lokalen Snapshot laufen und entlasten die Datenbank
+    state = load_state()
+    on_snapshot = st.checkbox(
+        f"Auf Analyse-Snapshot ausführen (Stand {state['refreshed_at'].replace('T', ' ')})"
+        if state.get("refreshed_at") else "Auf Analyse-Snapshot ausführen (noch kein Snapshot)",
+        key="sql_on_snapshot", disabled=not state.get("refreshed_at"),
+        help="Nur ein SELECT; läuft mit DuckDB auf den Parquet-Dateien aus utils/snapshot.py.",
+    )
 
     # Ausführen Button 
     if st.button("Ausführen"):
+        st.session_state.pop("sql_guard_pending", None)
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-
             if st.session_state.get("selected_query") == "12: Veranstaltungen an bestimmtem Ort (parametrisiert)":
                 params = (st.session_state["ort_param"],)
             else:
                 params = None
 
-            _execute_sql(conn, cursor, st.session_state["sql_text"], params)
-            cursor.close()
-            conn.close()
+            if on_snapshot and state.get("refreshed_at"):
+                _execute_on_snapshot(st.session_state["sql_text"], params, limits, privileges)
+                return
+
+            statements = split_statements(st.session_state["sql_text"])
+            # Fehlende Rechte vorab erkennen, statt EXPLAIN und Ausführung am Server scheitern zu lassen
+            denied = [(i, privileges.denied_statement(stmt)) for i, stmt in enumerate(statements, 1)] if privileges else []
+            denied = [(i, msg) for i, msg in denied if msg]
+            if denied:
+                for i, msg in denied:
+                    st.error(f"Statement {i} nicht ausgeführt: fehlendes Recht ({msg}).")
+                return
+            analysis = analyze_script(conn, statements, limits, params if len(statements) == 1 else None)
+            if analysis["level"] == "block":
+                _show_analysis(analysis)
+                st.error("Abfrage blockiert: geschätzter Aufwand zu hoch. Bitte mit WHERE, LIMIT oder Join-Bedingungen einschränken.")
+            elif analysis["level"] == "warn":
+                st.session_state["sql_guard_pending"] = {
+                    "sql": st.session_state["sql_text"], "params": params, "analysis": analysis,
+                }
+            else:
+                _execute_sql(conn, st.session_state["sql_text"], params, limits)
         except Exception as e:
             st.error(f"Fehler bei der Ausführung: {e}")
 
-    conn.close()
+    # Teure Abfrage: erst nach Bestätigung ausführen
+    pending = st.session_state.get("sql_guard_pending")
+    if pending is not None and pending["sql"] != st.session_state["sql_text"]:
+        st.session_state.pop("sql_guard_pending", None)
+    elif pending is not None:
+        _show_analysis(pending["analysis"])
+        if st.button("Trotzdem ausführen"):
+            st.session_state.pop("sql_guard_pending", None)
+            try:
+                _execute_sql(conn, pending["sql"], pending["params"], limits)
+            except Exception as e:
+                st.error(f"Fehler bei der Ausführung: {e}")
@@ -1,11 +1,30 @@
 # components/table_editor.py
 import streamlit as st
-import pandas as pd
-from utils.database import load_dataframe
-import mysql.connector as mysql
-import numpy as np
+from utils.perf import timed
+from utils.table_cache import current_account
+from utils.change_feed import sync_changes
+from utils.write_queue import RESULT_TIMEOUT, get_write_queue
+from components.csv_import import show_csv_import
+from components.waitlist_panel import show_waitlist
+from components.schedule_panel import show_schedule_check
+from utils.waitlist import PROCEDURE, WAITLIST_TABLES, affected_event, promote_waitlist
+from utils.privileges import Privileges
 from typing import List, Dict, Any
 
+# pandas, numpy und mysql.connector werden erst in den Funktionen importiert,
+# damit der Start der App nicht auf sie wartet.
+
+# Editor-Aktion -> benötigtes Recht auf der Tabelle
+EDITOR_ACTIONS = {
+    "Eintrag hinzufügen": "INSERT",
+    "Eintrag löschen": "DELETE",
+    "Eintrag bearbeiten": "UPDATE",
+    "CSV importieren": "INSERT",
+}
+# Stand des geöffneten Eintrags im Bearbeiten-Dialog (nur einer zur Zeit) und seine Eingabefelder
+EDIT_BASE = "edit_base"
+EDIT_FIELD_PREFIX = "edit_field_"
+
 def get_table_schema(conn, table_name: str) -> List[Dict[str, Any]]:
     """
     Liefert DESCRIBE-Ergebnis als Liste von Dicts mit:
@@ -28,6 +47,11 @@ def get_table_schema(conn, table_name: str) -> List[Dict[str, Any]]:
         })
     return schema
 
+@st.cache_data(show_spinner=False)
+def cached_table_schema(_conn, account: str, table_name: str) -> List[Dict[str, Any]]:
+    """Wie `get_table_schema`, aber pro Konto und Tabelle zwischengespeichert."""
+    return get_table_schema(_conn, table_name)
+
 def _parse_enum_options(type_str: str):
     """Wenn type_str ein enum(...) ist, liefert eine Liste der Optionen, sonst None"""
     if isinstance(type_str, str) and type_str.lower().startswith("enum("):
@@ -69,22 +93,47 @@ def _format_db_error(e: Exception) -> str:
         return "Berechtigungsfehler: Dein Datenbankbenutzer hat nicht die nötigen Rechte für diese Aktion."
     if errno == 1048:
         return "NOT NULL-Verstoß: Ein Pflichtfeld wurde leer gelassen."
+    if errno == 1305:
+        return "Prozedur fehlt: Bitte die ausstehenden Migrationen anwenden (python migrate.py up)."
+    if errno == 1370:
+        return "Berechtigungsfehler: Dein Datenbankbenutzer darf diese Prozedur nicht ausführen."
     if errno:
         return f"Datenbankfehler ({errno}): {msg}"
     return f"Datenbankfehler: {msg}"
 
-def insert_entry(conn, table_name: str, data: dict):
+def _write(conn, query: str, params: list, queue=None) -> int:
+    """
+    Führt ein schreibendes Statement aus und gibt den rowcount zurück.
+
+    Mit `queue` (siehe utils.write_queue) wird das Statement in den
+    gemeinsamen Group Commit eingereiht und höchstens RESULT_TIMEOUT
+    Sekunden auf das Ergebnis gewartet, sonst direkt auf `conn`
+    ausgeführt und committet.
+    """
+    if queue is not None:
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        try:
+            return queue.submit(query, params).result(timeout=RESULT_TIMEOUT)
+        except FutureTimeout:
+            raise TimeoutError(f"Keine Bestätigung der Datenbank nach {RESULT_TIMEOUT:.0f} s; "
+                               "die Änderung wird evtl. noch ausgeführt.") from None
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    rowcount = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return rowcount
+
+def insert_entry(conn, table_name: str, data: dict, queue=None) -> int:
     """Fügt einen neuen Eintrag ein (DB-Operation)."""
     columns = ", ".join(f"`{c}`" for c in data.keys())
     placeholders = ", ".join(["%s"] * len(data))
     values = list(data.values())
     query = f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders});"
-    cursor = conn.cursor()
-    cursor.execute(query, values)
-    conn.commit()
-    cursor.close()
+    return _write(conn, query, values, queue)
 
-def update_entry(conn, table_name: str, data: dict, pk_cols: List[str], pk_vals: list):
+def update_entry(conn, table_name: str, data: dict, pk_cols: List[str], pk_vals: list, queue=None) -> int:
     """Aktualisiert einen bestehenden Eintrag basierend auf zusammengesetztem Primärschlüssel (DB-Operation)."""
     clean_data_vals = [_to_python_value(v) for v in data.values()]
     clean_pk_vals = [_to_python_value(v) for v in pk_vals]
@@ -92,26 +141,107 @@ def update_entry(conn, table_name: str, data: dict, pk_cols: List[str], pk_vals:
     assignments = ", ".join([f"`{k}`=%s" for k in data.keys()])
     where_clause = " AND ".join([f"`{col}`=%s" for col in pk_cols])
     query = f"UPDATE `{table_name}` SET {assignments} WHERE {where_clause};"
+    return _write(conn, query, clean_data_vals + clean_pk_vals, queue)
 
-    cursor = conn.cursor()
-    cursor.execute(query, clean_data_vals + clean_pk_vals)
-    conn.commit()
-    cursor.close()
 
-
-def delete_entry(conn, table_name: str, pk_cols: List[str], pk_vals: list):
+def delete_entry(conn, table_name: str, pk_cols: List[str], pk_vals: list, queue=None) -> int:
     """Löscht einen Eintrag basierend auf zusammengesetztem Primärschlüssel (DB-Operation)."""
     clean_pk_vals = [_to_python_value(v) for v in pk_vals]
     where_clause = " AND ".join([f"`{col}`=%s" for col in pk_cols])
     query = f"DELETE FROM `{table_name}` WHERE {where_clause};"
+    return _write(conn, query, clean_pk_vals, queue)
+
+def _parse_pk_value(col_type: str, text: str):
+    """Wandelt eine Primärschlüssel-Eingabe anhand des Spaltentyps um (ValueError bei ungültiger Zahl)."""
+    typ = col_type.lower()
+    if "int" in typ:
+        return int(text)
+    if any(x in typ for x in ("decimal", "float", "double")):
+        return float(text)
+    return text
+
+def fetch_row(conn, table_name: str, pk_cols: List[str], pk_vals: list):
+    """
+    Liest genau eine Zeile über den Primärschlüssel (Indexzugriff statt ganzer Tabelle).
 
+    Die Werte bleiben unverändert (z.B. Decimal, datetime), damit sie später
+    exakt im WHERE eines bedingten Updates verglichen werden können.
+
+    Returns:
+        dict: Spaltenname -> Wert, oder None, wenn es die Zeile nicht gibt.
+    """
+    where_clause = " AND ".join([f"`{col}`=%s" for col in pk_cols])
     cursor = conn.cursor()
-    cursor.execute(query, clean_pk_vals)
-    conn.commit()
+    cursor.execute(f"SELECT * FROM `{table_name}` WHERE {where_clause} LIMIT 1;",
+                   [_to_python_value(v) for v in pk_vals])
+    row = cursor.fetchone()
+    columns = [c[0] for c in cursor.description] if cursor.description else []
+    cursor.fetchall()
     cursor.close()
+    return dict(zip(columns, row)) if row is not None else None
+
+def _table_is_empty(conn, table_name: str) -> bool:
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT 1 FROM `{table_name}` LIMIT 1;")
+    empty = not cursor.fetchall()
+    cursor.close()
+    return empty
+
+def update_entry_if_unchanged(conn, table_name: str, changes: dict, pk_cols: List[str], pk_vals: list,
+                              original: dict, schema: List[Dict[str, Any]] = None, queue=None) -> int:
+    """
+    Optimistisches Update: schreibt nur die geänderten Spalten und nur, wenn
+    die Zeile seit dem Lesen nicht verändert wurde.
+
+    Im WHERE wird neben dem Primärschlüssel jede Spalte NULL-sicher (`<=>`)
+    mit ihrem ursprünglich gelesenen Wert verglichen. Hat inzwischen jemand
+    anderes die Zeile geändert oder gelöscht, trifft das UPDATE keine Zeile
+    (rowcount 0) – ohne zusätzlichen Lesezugriff.
+
+    Args:
+        changes (dict): Nur die geänderten Spalten mit neuem Wert.
+        original (dict): Zeile, wie sie beim Öffnen gelesen wurde (siehe fetch_row).
+        schema (list, optional): Ergebnis von get_table_schema; JSON-/Geometrie-
+            Spalten werden nicht verglichen.
+
+    Returns:
+        int: rowcount (0 = Konflikt oder Zeile gelöscht).
+    """
+    skip = {col["name"] for col in (schema or []) if any(x in col["type"].lower() for x in ("json", "geometry"))}
+    compare = [col for col in original if col not in pk_cols and col not in skip]
+
+    assignments = ", ".join([f"`{k}`=%s" for k in changes])
+    where_clause = " AND ".join([f"`{col}`=%s" for col in pk_cols] + [f"`{col}` <=> %s" for col in compare])
+    query = f"UPDATE `{table_name}` SET {assignments} WHERE {where_clause};"
+    params = ([_to_python_value(v) for v in changes.values()]
+              + [_to_python_value(v) for v in pk_vals]
+              + [original[col] for col in compare])
+    return _write(conn, query, params, queue)
+
+def _same_value(new, old) -> bool:
+    """Vergleicht einen Formularwert mit dem gelesenen Datenbankwert (Typen wie date/datetime, Decimal/float)."""
+    import datetime
+    from decimal import Decimal
+
+    if new is None or old is None:
+        return (new is None or new == "") and (old is None or old == "")
+    if isinstance(old, datetime.datetime) and not isinstance(new, datetime.datetime) and isinstance(new, datetime.date):
+        return old.date() == new
+    if isinstance(old, (Decimal, float)) or isinstance(new, (Decimal, float)):
+        try:
+            return float(new) == float(old)
+        except (TypeError, ValueError):
+            return False
+    if isinstance(old, (bytes, bytearray)):
+        old = old.decode(errors="replace")
+    if isinstance(new, str) and not isinstance(old, str):
+        return new == str(old)
+    return new == old
 
 def _to_python_value(val):
     """Hilfsfunktion: numpy und andere Spezialtypen -> Standard Python"""
+    import numpy as np
+
     if isinstance(val, np.integer):
         return int(val)
     if isinstance(val, np.floating):
@@ -119,6 +249,7 @@ def _to_python_value(val):
     return val
 
  
+@st.fragment
 def table_editor(conn, table_name: str):
     """
     Zeigt ein UI, mit der ein eingeloggter Benutzer Tabelleninhalte:
@@ -130,10 +261,13 @@ def table_editor(conn, table_name: str):
     - Hinzufügen: für jede Spalte wird ein passendes Eingabefeld erzeugt
         (AUTO_INCREMENT PKs werden beim Hinzufügen übersprungen; ENUM -> Selectbox;
         int/decimal/float -> number_input; date/datetime -> date_input; sonst text_input).
-    - Löschen: freie ID-Eingabe; falls vorhanden, wird die Zeile angezeigt
+    - Löschen: freie ID-Eingabe; falls vorhanden, wird die Zeile angezeigt (Zugriff per
+        Primärschlüssel, die Tabelle wird nicht komplett geladen)
     - Bearbeiten: freie ID-Eingabe, falls vorhanden, wird die Zeile angezeigt. Die
         Felder folgen dem Spaltentyp; AUTO_INCREMENT PKs können nicht
-        bearbeitet werden
+        bearbeitet werden. Gespeichert werden nur geänderte Spalten, und nur
+        wenn die Zeile seit dem Öffnen unverändert ist (optimistisches Sperren,
+        siehe `update_entry_if_unchanged`); sonst erscheint ein Merge-Dialog
     - DB-Fehler (Duplicate Key, Foreign Key, Check-Constraint, Permission, NOT NULL)
         werden abgefangen und als Meldung an den Nutzer ausgegeben.
 
@@ -141,27 +275,57 @@ def table_editor(conn, table_name: str):
         conn: Offene MySQL-Verbindung (mysql.connector)
         table_name: Name der Tabelle, die bearbeitet werden soll
 
+    Läuft als Fragment: Eingaben im Editor führen nur den Editor erneut aus.
+    Nach einer erfolgreichen Schreiboperation wird der Tabellen-Cache
+    verworfen und die gesamte App neu ausgeführt.
+
     Returns:
         None  (gibt Ergebnisse direkt mithilfe von Streamlit aus)
     """
+    with timed("editor"):
+        _table_editor(conn, table_name)
+
+def _session_privileges() -> Privileges:
+    """Rechte der angemeldeten Sitzung (ohne Sitzung: uneingeschränkt)."""
+    session = st.session_state.get("db_session")
+    return session.privileges if session is not None else Privileges("")
+
+def _table_editor(conn, table_name: str):
+    import pandas as pd
+    import mysql.connector as mysql
+
     if not table_name:
         st.info("Bitte wähle eine Tabelle.")
         return
 
     st.header(f"Tabelle bearbeiten: {table_name}")
 
-    df = load_dataframe(conn, table_name)
-    schema = get_table_schema(conn, table_name)
+    schema = cached_table_schema(conn, current_account(), table_name)
+    types = {col["name"]: col["type"] for col in schema}
+    # Schreibzugriffe laufen gebündelt über den Writer des Kontos (Group Commit)
+    queue = get_write_queue(st.session_state.get("db_session"))
 
     pk_cols = [col["name"] for col in schema if col["key"] == "PRI"]
     if not pk_cols:
         st.warning("Keine Primärschlüssel in der Tabelle gefunden.")
         return
 
-    if df.empty:
+    # Nur Aktionen anbieten, die die Rechte der Sitzung erlauben (statt Fehler 1142 abzuwarten)
+    privileges = _session_privileges()
+    actions = [a for a, priv in EDITOR_ACTIONS.items() if privileges.allows(priv, table_name)]
+    if table_name in WAITLIST_TABLES and privileges.can_execute(PROCEDURE):
+        actions.append("Warteliste nachrücken")
+    if not actions:
+        st.info(f"Keine Schreibrechte auf {table_name}.")
+        return
+    if st.session_state.get("editor_action") not in actions:
+        st.session_state.pop("editor_action", None)
+
+    empty = _table_is_empty(conn, table_name)
+    if empty:
         st.warning("Die Tabelle ist leer.")
 
-    action = st.radio("Aktion auswählen", ["Eintrag hinzufügen", "Eintrag löschen", "Eintrag bearbeiten"])
+    action = st.radio("Aktion auswählen", actions, key="editor_action", on_change=_close_edit)
 
     if action == "Eintrag hinzufügen":
         st.subheader("Neuen Eintrag hinzufügen")
@@ -192,10 +356,13 @@ def table_editor(conn, table_name: str):
             else:
                 new_data[name] = st.text_input(f"{name} ({typ})", key=f"add_{name}")
 
+        show_schedule_check(conn, table_name, new_data)
+
         if st.button("Eintrag hinzufügen"):
             try:
                 prepared = {k: (_to_python_value(v) if v is not None else None) for k, v in new_data.items()}
-                insert_entry(conn, table_name, prepared)
+                insert_entry(conn, table_name, prepared, queue=queue)
+                sync_changes(conn, current_account(), table_name, force=True)
                 st.rerun()
                 st.success("Eintrag hinzugefügt!")
             except mysql.Error as e:
@@ -210,21 +377,21 @@ def table_editor(conn, table_name: str):
     elif action == "Eintrag löschen":
         st.subheader("Eintrag löschen")
         
-        if df.empty:
+        if empty:
             st.warning("Die Tabelle ist leer. Keine Einträge zum Löschen vorhanden.")
         else:
             pk_inputs = {col: st.text_input(f"Gib den Wert für {col} ein", key=f"del_{col}") for col in pk_cols}
 
             if all(pk_inputs.values()):
                 try:
-                    pk_vals = [_to_python_value(type(df[col].iloc[0])(pk_inputs[col])) for col in pk_cols]
-                    selected_row = df.copy()
-                    for col, val in zip(pk_cols, pk_vals):
-                        selected_row = selected_row[selected_row[col] == val]
-                    if not selected_row.empty:
-                        st.table(selected_row)
+                    pk_vals = [_parse_pk_value(types[col], pk_inputs[col]) for col in pk_cols]
+                    selected_row = fetch_row(conn, table_name, pk_cols, pk_vals)
+                    if selected_row is not None:
+                        st.table(pd.DataFrame([selected_row]))
                         if st.button("Eintrag endgültig löschen"):
-                            delete_entry(conn, table_name, pk_cols, pk_vals)
+                            delete_entry(conn, table_name, pk_cols, pk_vals, queue=queue)
+                            _promote_waitlist(conn, table_name, selected_row)
+                            sync_changes(conn, current_account(), table_name, force=True)
                             st.success("Eintrag gelöscht!") #wird nur kurz angezeigt, wegen anderer Warnung
                             st.rerun()
                     else:
@@ -239,25 +406,28 @@ def table_editor(conn, table_name: str):
     elif action == "Eintrag bearbeiten":
         st.subheader("Eintrag bearbeiten")
         
-        if df.empty:
+        if empty:
             st.warning("Die Tabelle ist leer. Keine Einträge zum Bearbeiten vorhanden.")
         else:
-            pk_inputs = {col: st.text_input(f"Gib den Wert für {col} ein", key=f"edit_{col}") for col in pk_cols}
+            pk_inputs = {col: st.text_input(f"Gib den Wert für {col} ein", key=f"edit_{col}", on_change=_close_edit)
+                         for col in pk_cols}
 
             if all(pk_inputs.values()):
                 try:
                     # Typkonvertierung für PKs
-                    pk_vals = [_to_python_value(type(df[col].iloc[0])(pk_inputs[col])) for col in pk_cols]
+                    pk_vals = [_parse_pk_value(types[col], pk_inputs[col]) for col in pk_cols]
 
-                    # Zeilen filtern
-                    mask = pd.Series(True, index=df.index)
-                    for col, val in zip(pk_cols, pk_vals):
-                        mask &= df[col] == val
+                    # Stand beim Öffnen merken: Grundlage für das bedingte Update.
+                    # Jedes neue Öffnen (anderer Eintrag, neue PK-Eingabe, Aktion neu gewählt) liest neu.
+                    base_key = EDIT_BASE
+                    if st.session_state.get(f"{base_key}_eintrag") != (table_name, tuple(pk_vals)):
+                        _close_edit()
+                        st.session_state[f"{base_key}_eintrag"] = (table_name, tuple(pk_vals))
+                        st.session_state[base_key] = fetch_row(conn, table_name, pk_cols, pk_vals)
+                    row = st.session_state[base_key]
 
-                    if mask.any():
-                        selected_row = df[mask]
-                        st.table(selected_row)
-                        row = selected_row.iloc[0]
+                    if row is not None:
+                        st.table(pd.DataFrame([row]))
 
                         updated_data = {}
                         for col in schema:
@@ -267,15 +437,13 @@ def table_editor(conn, table_name: str):
                             enum_opts = _parse_enum_options(typ)
 
                             current_value = row[name]
-                            if isinstance(current_value, pd.Series):
-                                current_value = current_value.iloc[0] if not current_value.empty else None
 
                             # AUTO_INCREMENT PK nur anzeigen
                             if col["key"] == "PRI" and "auto_increment" in extra.lower():
                                 st.markdown(f"*{name} (Primärschlüssel, AUTO_INCREMENT): {current_value}*")
                                 continue
 
-                            input_key = f"edit_{name}_{'_'.join(str(v) for v in pk_vals)}"
+                            input_key = f"{EDIT_FIELD_PREFIX}{name}"
 
                             # ENUM
                             if enum_opts:
@@ -312,20 +480,125 @@ def table_editor(conn, table_name: str):
                                 val = str(current_value) if pd.notna(current_value) else ""
                                 updated_data[name] = st.text_input(f"{name} ({typ})", value=val, key=input_key)
 
-                        if st.button("Eintrag aktualisieren"):
-                            try:
-                                prepared = {k: (_to_python_value(v) if v is not None else None) for k, v in updated_data.items()}
-                                update_entry(conn, table_name, prepared, pk_cols, pk_vals)
-                                st.rerun()
-                                st.success("Eintrag aktualisiert!")
-
-                            except Exception as e:
-                                st.error("Fehler beim Aktualisieren.")
-                                with st.expander("Fehlerdetails"):
-                                    st.text(str(e))
+                        conflict_key = f"{base_key}_konflikt"
+                        if st.session_state.get(conflict_key):
+                            _show_merge_prompt(conn, table_name, schema, pk_cols, pk_vals, base_key, queue)
+                        elif st.button("Eintrag aktualisieren"):
+                            prepared = {k: (_to_python_value(v) if v is not None else None) for k, v in updated_data.items()}
+                            # Nur tatsächlich geänderte Spalten schreiben
+                            changes = {k: v for k, v in prepared.items() if not _same_value(v, row.get(k))}
+                            if not changes:
+                                st.info("Keine Änderungen.")
+                            else:
+                                _apply_update(conn, table_name, schema, changes, pk_cols, pk_vals, base_key, queue)
                     else:
+                        _close_edit()
                         st.warning("Keine Zeile mit den angegebenen Primärschlüssel-Werten gefunden.")
+                except ValueError:
+                    st.error("Ungültiger Wert für einen Primärschlüssel. Bitte den richtigen Typ eingeben.")
                 except Exception as e:
                     st.error("Fehler beim Bearbeiten.")
                     with st.expander("Fehlerdetails"):
                         st.text(str(e))
+
+    elif action == "CSV importieren":
+        show_csv_import(conn, table_name, schema)
+
+    elif action == "Warteliste nachrücken":
+        show_waitlist(conn)
+
+def _close_edit():
+    """Verwirft den gemerkten Stand des Bearbeiten-Dialogs samt Konflikt und Eingabefeldern."""
+    for key in (EDIT_BASE, f"{EDIT_BASE}_eintrag", f"{EDIT_BASE}_konflikt"):
+        st.session_state.pop(key, None)
+    _drop_edit_fields()
+
+def _drop_edit_fields():
+    """Setzt die Eingabefelder des Bearbeiten-Dialogs zurück (nächster Lauf zeigt den gemerkten Stand)."""
+    for key in [k for k in st.session_state if isinstance(k, str) and k.startswith(EDIT_FIELD_PREFIX)]:
+        del st.session_state[key]
+
+def _promote_waitlist(conn, table_name: str, row: dict):
+    """
+    Lässt nach einer Änderung an Buchung/Veranstaltung für die betroffene
+    Veranstaltung Wartende nachrücken. Fehler (z.B. Migration 0005 noch
+    nicht angewendet) werden nur angezeigt; die Änderung selbst ist bereits committet.
+    """
+    import mysql.connector as mysql
+
+    veranstaltungs_id = affected_event(table_name, row)
+    if veranstaltungs_id is None or not _session_privileges().can_execute(PROCEDURE):
+        return
+    try:
+        count = promote_waitlist(conn, veranstaltungs_id)
+    except mysql.Error as e:
+        st.warning(f"Warteliste nicht nachgerückt: {_format_db_error(e)}")
+        return
+    if count:
+        st.toast(f"{count} Buchungen von der Warteliste nachgerückt.")
+
+def _apply_update(conn, table_name, schema, changes, pk_cols, pk_vals, base_key, queue):
+    """
+    Führt das bedingte Update aus. Bei einem Konflikt wird der aktuelle
+    Stand gelesen (ein Zugriff über den Primärschlüssel) und statt eines
+    Neuladens der Tabelle der Merge-Dialog angezeigt.
+    """
+    import mysql.connector as mysql
+
+    original = st.session_state[base_key]
+    try:
+        rowcount = update_entry_if_unchanged(conn, table_name, changes, pk_cols, pk_vals, original, schema, queue=queue)
+    except mysql.Error as e:
+        st.error(_format_db_error(e))
+        with st.expander("Fehlerdetails"):
+            st.text(str(e))
+        return
+
+    if rowcount == 0:
+        current = fetch_row(conn, table_name, pk_cols, pk_vals)
+        if current is None:
+            _close_edit()
+            st.error("Der Eintrag wurde inzwischen gelöscht.")
+            return
+        if not all(_same_value(v, current.get(k)) for k, v in changes.items()):
+            st.session_state[f"{base_key}_konflikt"] = {"current": current, "changes": changes}
+            st.rerun(scope="fragment")
+        # Sonst stand bereits genau dieser Wert in der Datenbank
+
+    _close_edit()
+    _promote_waitlist(conn, table_name, original)
+    sync_changes(conn, current_account(), table_name, force=True)
+    st.success("Eintrag aktualisiert!")
+    st.rerun()
+
+def _show_merge_prompt(conn, table_name, schema, pk_cols, pk_vals, base_key, queue):
+    """Zeigt eigene und fremde Änderungen nebeneinander und lässt den Nutzer entscheiden."""
+    conflict_key = f"{base_key}_konflikt"
+    original = st.session_state[base_key]
+    current = st.session_state[conflict_key]["current"]
+    changes = st.session_state[conflict_key]["changes"]
+
+    theirs = {k for k in current if not _same_value(current[k], original.get(k))}
+    columns = [k for k in current if k in changes or k in theirs]
+    st.warning("Der Eintrag wurde inzwischen von jemand anderem geändert.")
+    st.table({
+        "Spalte": columns,
+        "Beim Öffnen": [str(original.get(k)) for k in columns],
+        "Deine Änderung": [str(changes[k]) if k in changes else "–" for k in columns],
+        "Aktuell in der DB": [str(current.get(k)) for k in columns],
+        "Konflikt": ["ja" if k in changes and k in theirs and not _same_value(changes[k], current[k]) else "nein"
+                     for k in columns],
+    })
+    st.caption("Übernehmen schreibt nur deine geänderten Spalten; andere Änderungen bleiben erhalten.")
+
+    col1, col2 = st.columns(2)
+    if col1.button("Meine Änderungen übernehmen"):
+        # Neuer Vergleichsstand ist der aktuelle Datenbankstand
+        st.session_state[base_key] = current
+        st.session_state.pop(conflict_key, None)
+        _apply_update(conn, table_name, schema, changes, pk_cols, pk_vals, base_key, queue)
+    if col2.button("Aktuellen Stand laden"):
+        st.session_state[base_key] = current
+        st.session_state.pop(conflict_key, None)
+        _drop_edit_fields()
+        st.rerun(scope="fragment")
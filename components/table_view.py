@@ -1,6 +1,10 @@
 # components/table_view.py
 import streamlit as st
-import pandas as pd
+from typing import TYPE_CHECKING
 
-def display_dataframe(df: pd.DataFrame):
+# pandas wird erst in den Funktionen importiert (schnellerer App-Start)
+if TYPE_CHECKING:
+    import pandas as pd
+
+def display_dataframe(df: "pd.DataFrame"):
     st.dataframe(df)
\ No newline at end of file
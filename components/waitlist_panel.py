@@ -0,0 +1,54 @@
+# components/waitlist_panel.py
+import streamlit as st
+from utils.change_feed import sync_changes
+from utils.table_cache import current_account
+from utils.waitlist import promote_waitlist, waitlist_overview
+
+
+def show_waitlist(conn):
+    """
+    Warteliste im Editor (Buchung/Veranstaltung): Übersicht und Nachrücken
+    für eine oder alle Veranstaltungen über die Prozedur `nachruecken`.
+
+    Args:
+        conn: Datenbankverbindung (ohne offene Transaktion).
+    """
+    import mysql.connector as mysql
+    # Import hier: table_editor bindet dieses Modul ein
+    from components.table_editor import _format_db_error
+
+    st.subheader("Warteliste nachrücken")
+    message = st.session_state.pop("waitlist_message", None)
+    if message:
+        st.success(message)
+
+    try:
+        overview = waitlist_overview(conn)
+    except mysql.Error as e:
+        st.error(_format_db_error(e))
+        return
+    if not overview:
+        st.info("Keine wartenden Buchungen.")
+        return
+
+    st.dataframe(
+        [{"Veranstaltung": r["veranstaltungs_id"], "Plätze": r["plaetze"], "Belegt": r["belegt"],
+          "Wartend": r["wartend"], "Frei": r["frei"]} for r in overview],
+        hide_index=True,
+    )
+    st.caption("Es rücken die ältesten Wartenden nach, höchstens so viele wie Plätze frei sind "
+               "(„Frei“ leer = unbegrenzt).")
+
+    options = ["Alle Veranstaltungen"] + [r["veranstaltungs_id"] for r in overview]
+    target = st.selectbox("Veranstaltung", options, key="waitlist_target")
+    if st.button("Warteliste nachrücken"):
+        try:
+            count = promote_waitlist(conn, None if target == options[0] else target)
+        except mysql.Error as e:
+            st.error(_format_db_error(e))
+            with st.expander("Fehlerdetails"):
+                st.text(str(e))
+            return
+        sync_changes(conn, current_account(), "Buchung", force=True)
+        st.session_state["waitlist_message"] = f"{count} Buchungen nachgerückt."
+        st.rerun()
@@ -0,0 +1,58 @@
+# invoices.py
+import sys
+import argparse
+
+import mysql.connector
+
+from utils.invoices import CHUNK_SIZE, PAUSE, SENDER, count_missing, generate_invoices, render_invoices
+from utils.migrations import DATABASE
+from utils.provisioning import resolve_credentials, connect_server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fehlende Rechnungen für offene und bezahlte Buchungen anlegen")
+    parser.add_argument("--angestellter", type=int, help="angestellten_id des bearbeitenden Verwaltungsangestellten")
+    parser.add_argument("--sender", default=SENDER, help="Absender der Rechnungen (Default %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="Nur zählen, wie viele Rechnungen fehlen")
+    parser.add_argument("--render", metavar="VERZEICHNIS", help="Neue Rechnungen zusätzlich als HTML in dieses Verzeichnis schreiben")
+    parser.add_argument("--workers", type=int, help="Prozesse für das Rendern (Default: Anzahl CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Buchungen pro Transaktion")
+    parser.add_argument("--pause", type=float, default=PAUSE, help="Pause zwischen Chunks in Sekunden")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort (besser MYSQL_PASSWORD setzen)")
+    parser.add_argument("--host", help="MySQL-Host (sonst MYSQL_HOST bzw. secrets.toml, Default localhost)")
+    parser.add_argument("--port", type=int, help="MySQL-Port (Default 3306)")
+    parser.add_argument("--database", default=DATABASE, help="Name der Datenbank")
+    args = parser.parse_args(argv)
+    if not args.dry_run and args.angestellter is None:
+        parser.error("--angestellter ist erforderlich (außer bei --dry-run)")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        creds = resolve_credentials(args.user, args.password, args.host, args.port)
+        conn = connect_server(creds)
+        cursor = conn.cursor()
+        cursor.execute(f"USE `{args.database}`;")
+        cursor.close()
+        try:
+            if args.dry_run:
+                print(f"Rechnung: {count_missing(conn)} Rechnungen würden angelegt")
+                return 0
+            created = generate_invoices(conn, args.angestellter, args.sender, args.chunk_size, args.pause)
+            print(f"Rechnung: {len(created)} Rechnungen angelegt")
+            if args.render and created:
+                written = render_invoices(conn, created, args.render, args.workers, args.chunk_size)
+                print(f"{written} Dokumente in {args.render}")
+        finally:
+            conn.close()
+    except mysql.connector.Error as e:
+        print(f"Rechnungslauf fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
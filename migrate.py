@@ -0,0 +1,94 @@
+# migrate.py
+import sys
+import argparse
+import mysql.connector
+
+from utils.migrations import (
+    DATABASE, MIGRATIONS_DIR,
+    discover_migrations, ensure_version_table, applied_versions, pending_migrations,
+    migrate, estimate, mark_baseline,
+)
+from utils.provisioning import resolve_credentials, connect_server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Schema-Migrationen der Hochschulsport-Datenbank")
+    parser.add_argument("command", choices=["status", "up", "dry-run", "baseline"], nargs="?", default="status",
+                        help="status: Übersicht, up: ausstehende Migrationen anwenden, "
+                             "dry-run: Dauer schätzen ohne auszuführen, "
+                             "baseline: bestehende Datenbank aus dem alten Setup als Version 1 markieren")
+    parser.add_argument("--target", type=int, help="Nur bis zu dieser Version migrieren")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort (besser MYSQL_PASSWORD setzen)")
+    parser.add_argument("--host", help="MySQL-Host (sonst MYSQL_HOST bzw. secrets.toml, Default localhost)")
+    parser.add_argument("--port", type=int, help="MySQL-Port (Default 3306)")
+    parser.add_argument("--database", default=DATABASE, help="Name der Datenbank")
+    parser.add_argument("--path", default=MIGRATIONS_DIR, help="Verzeichnis mit den Migrationen")
+    return parser.parse_args(argv)
+
+
+def print_status(conn, path):
+    applied = applied_versions(conn) if conn is not None else {}
+    for migration in discover_migrations(path):
+        state = "angewendet" if migration["version"] in applied else "ausstehend"
+        print(f"{migration['version']:04d}_{migration['name']:<40} {state}")
+
+
+def database_exists(cursor, database):
+    cursor.execute("SELECT 1 FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = %s;", (database,))
+    return cursor.fetchone() is not None
+
+
+def print_estimate(report):
+    if not report:
+        print("Keine ausstehenden Migrationen.")
+        return
+    total = 0.0
+    for label, stmt, seconds, algorithm in report:
+        total += seconds
+        first_line = " ".join(stmt.split())[:70]
+        print(f"{label:<30} {algorithm:<8} ~{seconds:8.2f}s  {first_line}")
+    print(f"Geschätzte Gesamtdauer: ~{total:.1f}s")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        creds = resolve_credentials(args.user, args.password, args.host, args.port)
+        conn = connect_server(creds)
+        cursor = conn.cursor()
+        # status und dry-run lesen nur: keine Datenbank und keine schema_version anlegen
+        if args.command in ("up", "baseline"):
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{args.database}`;")
+        elif not database_exists(cursor, args.database):
+            cursor.close()
+            conn.close()
+            print(f"Datenbank {args.database} existiert noch nicht, alle Migrationen stehen aus.")
+            if args.command == "status":
+                print_status(None, args.path)
+            return 0
+        cursor.execute(f"USE `{args.database}`;")
+        cursor.close()
+        try:
+            if args.command == "status":
+                print_status(conn, args.path)
+            elif args.command == "dry-run":
+                print_estimate(estimate(conn, args.database, args.target, args.path))
+            elif args.command == "baseline":
+                mark_baseline(conn, args.target or 1, args.path)
+                print_status(conn, args.path)
+            else:
+                ensure_version_table(conn)
+                if not pending_migrations(conn, args.path, args.target):
+                    print("Datenbank ist aktuell.")
+                migrate(conn, args.database, args.target, args.path)
+        finally:
+            conn.close()
+    except (ValueError, mysql.connector.Error) as e:
+        print(f"Migration fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,12 +19,10 @@ Teilnehmer können:
 
 /*
 * 1. Erstellen der Datenbank
+* Übernimmt der Migrations-Runner (utils/migrations.py): Er legt die
+* Datenbank an, wählt sie aus und führt diese Baseline-Migration aus.
 */ 
 
-CREATE DATABASE hochschulsport; 
-USE hochschulsport;
-# DROP DATABASE Hochschulsport
-
 /*
 * 2. Entitäten
 */ 
@@ -579,85 +577,7 @@ CREATE INDEX idx_ort_name ON Ort(ort_name);
 
 /*
 * 8. Queries
-*/ 
-
-# 8.1 Anzeigen aller Studenten
-SELECT k.*, s.matrikelnummer
-FROM Kursteilnehmer k
-INNER JOIN Studierende s
-  ON k.teilnehmer_id = s.teilnehmer_id;
-
-#8.2 Anzahl Veranstaltungen pro Angebot
-SELECT s.angebot_id, s.angebot_name, COUNT(v.veranstaltungs_id) AS anzahl_veranstaltungen
-FROM Sportangebot s
-LEFT JOIN Veranstaltung v ON s.angebot_id = v.angebot_id
-GROUP BY s.angebot_id, s.angebot_name;
-
-#8.3 Teilnehmerliste und Sportangebote, die sie gebucht haben
-SELECT k.teilnehmer_id, k.teilnehmer_name, s.angebot_name
-FROM Kursteilnehmer k
-JOIN Buchung b ON k.teilnehmer_id = b.teilnehmer_id
-JOIN Veranstaltung v ON b.veranstaltungs_id = v.veranstaltungs_id
-JOIN Sportangebot s ON v.angebot_id = s.angebot_id;
-
-#8.4 Alle Teilnehmer die auf anmeldungslisten stehen
-SELECT k.teilnehmer_id, k.teilnehmer_name AS teilnehmer_name, v.veranstaltungs_id, sa.angebot_name
-FROM Buchung b
-JOIN Kursteilnehmer k ON b.teilnehmer_id = k.teilnehmer_id
-JOIN Veranstaltung v ON b.veranstaltungs_id = v.veranstaltungs_id
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-WHERE b.buchung_status = 'wartend'
-ORDER BY v.veranstaltungs_id, b.datum;
-
-#8.5 Prozentuelle Auslastung aller Kurse (nur bezahlte Buchung)
-SELECT sa.angebot_name AS veranstaltungsname, v.verfügbare_plätze,
-COUNT(b.buchungs_id) AS belegte_plaetze,
-ROUND(COUNT(b.buchungs_id) / v.verfügbare_plätze * 100, 1) AS auslastung_prozent
-FROM Veranstaltung v
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-LEFT JOIN Buchung b 
-ON v.veranstaltungs_id = b.veranstaltungs_id
-AND b.buchung_status = 'bezahlt' 
-GROUP BY sa.angebot_name, v.verfügbare_plätze
-ORDER BY auslastung_prozent DESC;
-
-#8.6 Kurse die in bestimmten Ort stattfinden
-SELECT v.veranstaltungs_id, sa.angebot_name, o.ort_name
-FROM Veranstaltung v
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-JOIN Ort o ON v.ort_id = o.ort_id
-WHERE o.ort_name = 'Yogastudio'; 
-
-#8.7 Teilnehmer mit den meisten Buchungen
-SELECT k.teilnehmer_id, k.teilnehmer_name, COUNT(b.buchungs_id) AS buchungen
-FROM Kursteilnehmer k
-JOIN Buchung b ON k.teilnehmer_id = b.teilnehmer_id
-GROUP BY k.teilnehmer_id, k.teilnehmer_name
-ORDER BY buchungen DESC
-LIMIT 1;
-
-#8.8 Einnahmen pro Angebot
-SELECT sa.angebot_name, SUM(b.betrag) AS gesamt_einnahmen
-FROM Buchung b
-JOIN Veranstaltung v ON b.veranstaltungs_id = v.veranstaltungs_id
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-WHERE b.buchung_status = 'bezahlt'
-GROUP BY sa.angebot_name
-ORDER BY gesamt_einnahmen DESC;
-
-#8.9 Veranstaltungen mit mehr als 50 verfügbaren Plätzen
-SELECT sa.angebot_name, v.verfügbare_plätze
-FROM Veranstaltung v
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-WHERE v.verfügbare_plätze > 5;
-
-/* #8.10 Parameterized Query
-* benötigt connector
-SELECT v.veranstaltungs_id, sa.angebot_name, o.ort_name, v.verfügbare_plätze
-FROM Veranstaltung v
-JOIN Sportangebot sa ON v.angebot_id = sa.angebot_id
-JOIN Ort o ON v.ort_id = o.ort_id
-WHERE o.ort_name = ?; 
+* Die Beispielabfragen stehen im SQL-Tab der App (components/sql_runner_simple.py).
 */
 
 /*
@@ -668,11 +588,11 @@ WHERE o.ort_name = ?;
 #DROP USER 'verwaltung'@'localhost';
 #DROP USER 'kursleiter'@'localhost';
 
-CREATE USER 'verwaltung'@'localhost' IDENTIFIED BY '1234';
-CREATE USER 'kursleiter'@'localhost' IDENTIFIED BY '12345';
+CREATE USER IF NOT EXISTS 'verwaltung'@'localhost' IDENTIFIED BY '1234';
+CREATE USER IF NOT EXISTS 'kursleiter'@'localhost' IDENTIFIED BY '12345';
 
-CREATE ROLE 'rolle_verwaltung';
-CREATE ROLE 'rolle_kursleiter';
+CREATE ROLE IF NOT EXISTS 'rolle_verwaltung';
+CREATE ROLE IF NOT EXISTS 'rolle_kursleiter';
 
 GRANT rolle_verwaltung TO 'verwaltung'@'localhost';
 GRANT rolle_kursleiter TO 'kursleiter'@'localhost';
@@ -0,0 +1,16 @@
+/*
+* Volltextsuche (utils/search.py, components/search_panel.py)
+*
+* FULLTEXT-Indizes für die Suchfelder der App. InnoDB kann FULLTEXT nicht
+* mit LOCK=NONE anlegen; der Migrations-Runner fällt dann auf den
+* Standard-Algorithmus zurück. Der erste FULLTEXT-Index einer Tabelle
+* baut sie einmal neu auf (FTS_DOC_ID), weitere Indizes gehen ohne Kopie.
+*/
+
+ALTER TABLE Kursteilnehmer ADD FULLTEXT INDEX ft_kursteilnehmer (teilnehmer_name, teilnehmer_mail);
+
+ALTER TABLE Sportangebot ADD FULLTEXT INDEX ft_sportangebot (angebot_name, angebot_beschreibung);
+
+ALTER TABLE Feedback ADD FULLTEXT INDEX ft_feedback (kommentar);
+
+ALTER TABLE Ort ADD FULLTEXT INDEX ft_ort (ort_name, adresse);
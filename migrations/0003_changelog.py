@@ -0,0 +1,70 @@
+# migrations/0003_changelog.py
+"""
+Änderungs-Feed (utils/change_feed.py)
+
+Legt die Tabelle `changelog` an und für jede Basistabelle je einen
+AFTER INSERT/UPDATE/DELETE-Trigger, der Tabelle, Operation und
+Primärschlüssel der geänderten Zeile protokolliert. `change_id` steigt
+monoton; die App liest nur Einträge nach der zuletzt gesehenen ID und
+lädt gezielt die betroffenen Zeilen nach.
+
+Die Trigger werden aus information_schema erzeugt, damit neue Tabellen
+nur diese Migration (bzw. `changelog_triggers`) brauchen.
+"""
+
+CHANGELOG_TABLE = "changelog"
+# Tabellen ohne Protokollierung
+EXCLUDED = {CHANGELOG_TABLE, "schema_version"}
+
+
+def primary_keys(conn) -> dict:
+    """Basistabelle -> Liste der Primärschlüsselspalten (in Indexreihenfolge)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT k.TABLE_NAME, k.COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.TABLES t ON t.TABLE_SCHEMA = k.TABLE_SCHEMA AND t.TABLE_NAME = k.TABLE_NAME "
+        "WHERE k.TABLE_SCHEMA = DATABASE() AND k.CONSTRAINT_NAME = 'PRIMARY' AND t.TABLE_TYPE = 'BASE TABLE' "
+        "ORDER BY k.TABLE_NAME, k.ORDINAL_POSITION;"
+    )
+    keys = {}
+    for table, column in cursor.fetchall():
+        keys.setdefault(table, []).append(column)
+    cursor.close()
+    return {t: cols for t, cols in keys.items() if t.lower() not in EXCLUDED}
+
+
+def changelog_triggers(table: str, pk_cols: list) -> list:
+    """DROP/CREATE-Statements der drei Protokoll-Trigger einer Tabelle."""
+    def pk_json(row):
+        return "JSON_OBJECT(" + ", ".join(f"'{c}', {row}.`{c}`" for c in pk_cols) + ")"
+
+    def log(op, row):
+        return f"INSERT INTO `{CHANGELOG_TABLE}` (table_name, op, pk) VALUES ('{table}', '{op}', {pk_json(row)});"
+
+    pk_changed = " OR ".join(f"NOT (OLD.`{c}` <=> NEW.`{c}`)" for c in pk_cols)
+    statements = []
+    for suffix, event, body in (
+        ("ins", "INSERT", log("I", "NEW")),
+        # Geänderter Primärschlüssel: alte Zeile gilt als gelöscht
+        ("upd", "UPDATE", f"BEGIN IF {pk_changed} THEN {log('D', 'OLD')} END IF; {log('U', 'NEW')} END"),
+        ("del", "DELETE", log("D", "OLD")),
+    ):
+        name = f"changelog_{suffix}_{table}"
+        statements.append(f"DROP TRIGGER IF EXISTS `{name}`;")
+        statements.append(f"CREATE TRIGGER `{name}` AFTER {event} ON `{table}` FOR EACH ROW {body}")
+    return statements
+
+
+def upgrade(ctx):
+    ctx.execute(
+        f"CREATE TABLE IF NOT EXISTS `{CHANGELOG_TABLE}` ("
+        "change_id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT, "
+        "table_name VARCHAR(64) NOT NULL, "
+        "op ENUM('I', 'U', 'D') NOT NULL, "
+        "pk JSON NOT NULL, "
+        "changed_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3), "
+        "INDEX idx_changelog_changed_at (changed_at))"
+    )
+    for table, pk_cols in primary_keys(ctx.conn).items():
+        for stmt in changelog_triggers(table, pk_cols):
+            ctx.execute(stmt)
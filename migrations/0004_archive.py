@@ -0,0 +1,49 @@
+# migrations/0004_archive.py
+"""
+Archivtabellen für abgeschlossene Semester (utils/archive.py)
+
+Partitionierung von Buchung nach `datum` ist in InnoDB nicht möglich,
+solange Fremdschlüssel bestehen (Buchung -> Kursteilnehmer/Veranstaltung,
+Rechnung -> Buchung). Alte Zeilen werden daher in eigene Tabellen mit
+gleichen Spalten verschoben (CREATE TABLE ... LIKE übernimmt Spalten und
+Indizes, aber keine Fremdschlüssel und Trigger).
+
+Die Archivtabellen bekommen die Changelog-Trigger aus 0003, damit der
+Tabellen-Cache der App nach einem Archivlauf aktuell bleibt.
+"""
+import os
+
+from utils.migrations import load_migration_module
+
+ARCHIVE_TABLES = {
+    "Buchung": "Buchung_Archiv",
+    "Rechnung": "Rechnung_Archiv",
+    "Feedback": "Feedback_Archiv",
+}
+
+
+def _has_index(conn, table: str, index: str) -> bool:
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1;",
+        (table, index),
+    )
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def upgrade(ctx):
+    # Archivlauf und Datumsfilter im Tabellen-Browser suchen über datum
+    if not _has_index(ctx.conn, "Buchung", "idx_buchung_datum"):
+        ctx.execute("CREATE INDEX idx_buchung_datum ON Buchung(datum)")
+
+    for table, archive in ARCHIVE_TABLES.items():
+        ctx.execute(f"CREATE TABLE IF NOT EXISTS `{archive}` LIKE `{table}`")
+
+    changelog = load_migration_module(os.path.join(os.path.dirname(__file__), "0003_changelog.py"))
+    keys = changelog.primary_keys(ctx.conn)
+    for table, archive in ARCHIVE_TABLES.items():
+        for stmt in changelog.changelog_triggers(archive, keys[table]):
+            ctx.execute(stmt)
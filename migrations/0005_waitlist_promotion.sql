@@ -0,0 +1,110 @@
+/*
+* Nachrücken von der Warteliste (utils/waitlist.py)
+*
+* handle_storno aus der Baseline hat nach einer Stornierung die älteste
+* wartende Buchung per UPDATE Buchung aktualisiert. Ein Trigger darf die
+* Tabelle, auf der er ausgelöst wurde, aber nicht ändern (Fehler 1442):
+* Sobald es Wartende gab, ist jede Stornierung gescheitert. Und wird
+* verfügbare_plätze erhöht, passiert gar nichts.
+*
+* Der Trigger setzt jetzt nur noch teilnahme_möglich; das Nachrücken
+* übernimmt die Prozedur nachruecken für eine (p_veranstaltungs_id) oder
+* alle Veranstaltungen (NULL). Pro Veranstaltung rücken so viele der
+* ältesten Wartenden nach, wie Plätze frei sind, in einem UPDATE über
+* ROW_NUMBER(). Danach werden teilnahme_möglich und
+* Angemeldete_Kursteilnehmer für die betroffenen Veranstaltungen
+* mengenbasiert abgeglichen. p_nachgerueckt liefert die Zahl der
+* nachgerückten Buchungen.
+*
+*   CALL nachruecken(NULL, @n); SELECT @n;
+*/
+
+DROP TRIGGER IF EXISTS handle_storno;
+
+DROP PROCEDURE IF EXISTS nachruecken;
+
+DELIMITER $$
+
+CREATE TRIGGER handle_storno
+AFTER UPDATE ON Buchung
+FOR EACH ROW
+BEGIN
+    IF NEW.buchung_status = 'storniert' AND OLD.buchung_status <> 'storniert' THEN
+        UPDATE anmeldungsliste
+        SET teilnahme_möglich = 1
+        WHERE veranstaltungs_id = NEW.veranstaltungs_id;
+    END IF;
+END$$
+
+CREATE PROCEDURE nachruecken(IN p_veranstaltungs_id INT, OUT p_nachgerueckt INT)
+MODIFIES SQL DATA
+BEGIN
+    -- Älteste Wartende je Veranstaltung, höchstens so viele wie Plätze frei sind
+    -- (verfügbare_plätze NULL = unbegrenzt)
+    UPDATE Buchung b
+    JOIN (
+        SELECT w.buchungs_id
+        FROM (
+            SELECT buchungs_id, veranstaltungs_id,
+                   ROW_NUMBER() OVER (PARTITION BY veranstaltungs_id ORDER BY datum, buchungs_id) AS rang
+            FROM Buchung
+            WHERE buchung_status = 'wartend'
+              AND (p_veranstaltungs_id IS NULL OR veranstaltungs_id = p_veranstaltungs_id)
+        ) w
+        JOIN (
+            SELECT v.veranstaltungs_id, v.verfügbare_plätze - COUNT(a.buchungs_id) AS frei
+            FROM Veranstaltung v
+            LEFT JOIN Buchung a
+              ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+            WHERE p_veranstaltungs_id IS NULL OR v.veranstaltungs_id = p_veranstaltungs_id
+            GROUP BY v.veranstaltungs_id, v.verfügbare_plätze
+        ) f ON f.veranstaltungs_id = w.veranstaltungs_id
+        WHERE f.frei IS NULL OR w.rang <= f.frei
+    ) n ON n.buchungs_id = b.buchungs_id
+    SET b.buchung_status = 'offen';
+    SET p_nachgerueckt = ROW_COUNT();
+
+    -- Anmeldung möglich, solange Plätze frei sind
+    UPDATE anmeldungsliste l
+    JOIN (
+        SELECT v.veranstaltungs_id,
+               COALESCE(v.verfügbare_plätze > COUNT(a.buchungs_id), 1) AS moeglich
+        FROM Veranstaltung v
+        LEFT JOIN Buchung a
+          ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+        WHERE p_veranstaltungs_id IS NULL OR v.veranstaltungs_id = p_veranstaltungs_id
+        GROUP BY v.veranstaltungs_id, v.verfügbare_plätze
+    ) f ON f.veranstaltungs_id = l.veranstaltungs_id
+    SET l.teilnahme_möglich = f.moeglich;
+
+    -- Angemeldete_Kursteilnehmer = bezahlte Buchungen (wie buchung_insert/buchung_update)
+    DELETE k
+    FROM Angemeldete_Kursteilnehmer k
+    JOIN anmeldungsliste l ON l.anmeldungsliste_id = k.anmeldungsliste_id
+    WHERE (p_veranstaltungs_id IS NULL OR l.veranstaltungs_id = p_veranstaltungs_id)
+      AND NOT EXISTS (
+          SELECT 1 FROM Buchung b
+          WHERE b.veranstaltungs_id = l.veranstaltungs_id
+            AND b.teilnehmer_id = k.teilnehmer_id
+            AND b.buchung_status = 'bezahlt'
+      );
+
+    INSERT IGNORE INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id)
+    SELECT b.teilnehmer_id, MIN(l.anmeldungsliste_id)
+    FROM Buchung b
+    JOIN anmeldungsliste l ON l.veranstaltungs_id = b.veranstaltungs_id
+    WHERE b.buchung_status = 'bezahlt'
+      AND (p_veranstaltungs_id IS NULL OR b.veranstaltungs_id = p_veranstaltungs_id)
+      AND NOT EXISTS (
+          SELECT 1
+          FROM Angemeldete_Kursteilnehmer k
+          JOIN anmeldungsliste l2 ON l2.anmeldungsliste_id = k.anmeldungsliste_id
+          WHERE k.teilnehmer_id = b.teilnehmer_id AND l2.veranstaltungs_id = b.veranstaltungs_id
+      )
+    GROUP BY b.teilnehmer_id, b.veranstaltungs_id;
+END$$
+
+DELIMITER ;
+
+GRANT EXECUTE ON PROCEDURE hochschulsport.nachruecken TO rolle_verwaltung;
+GRANT EXECUTE ON PROCEDURE hochschulsport.nachruecken TO rolle_kursleiter;
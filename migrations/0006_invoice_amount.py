@@ -0,0 +1,42 @@
+# migrations/0006_invoice_amount.py
+"""
+Rechnungsbetrag für den Rechnungslauf (utils/invoices.py)
+
+Rechnung bekommt die Spalte `betrag` (wie die Preisspalten von
+Veranstaltung DECIMAL(5,2)), Rechnung_Archiv aus 0004 ebenso, damit
+archivierte Rechnungen ihren Betrag behalten. Bestehende Rechnungen
+werden chunkweise mit dem Preis ihrer Teilnehmergruppe nachgetragen.
+"""
+INVOICE_TABLES = ("Rechnung", "Rechnung_Archiv")
+
+
+def _has_column(conn, table: str, column: str) -> bool:
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s LIMIT 1;",
+        (table, column),
+    )
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def upgrade(ctx):
+    for table in INVOICE_TABLES:
+        if not _has_column(ctx.conn, table, "betrag"):
+            ctx.execute(f"ALTER TABLE `{table}` ADD COLUMN betrag DECIMAL(5,2) NULL")
+
+    # Preislogik wie utils/invoices.py (PRICE_SQL) zum Stand dieser Migration, bewusst
+    # nicht importiert: spätere Änderungen dort dürfen diese Migration nicht verändern
+    ctx.backfill(
+        "Rechnung", "rechnungs_id",
+        "UPDATE Rechnung r JOIN Buchung b ON b.buchungs_id = r.buchungs_id "
+        "JOIN Veranstaltung v ON v.veranstaltungs_id = b.veranstaltungs_id "
+        "LEFT JOIN Studierende s ON s.teilnehmer_id = b.teilnehmer_id "
+        "LEFT JOIN Beschäftigte be ON be.teilnehmer_id = b.teilnehmer_id "
+        "SET r.betrag = CASE WHEN s.teilnehmer_id IS NOT NULL THEN v.preis_student "
+        "WHEN be.teilnehmer_id IS NOT NULL THEN v.preis_beschäftigte "
+        "ELSE v.preis_externe_alumni END "
+        "WHERE r.betrag IS NULL AND r.{range}",
+    )
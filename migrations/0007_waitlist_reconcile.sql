@@ -0,0 +1,111 @@
+/*
+* Nachrücken ohne Abgleich archivierter Veranstaltungen
+*
+* nachruecken aus 0005 hat für alle Veranstaltungen (NULL) danach
+* teilnahme_möglich und Angemeldete_Kursteilnehmer über alle
+* Veranstaltungen abgeglichen. Seit 0004 liegen die Buchungen
+* abgeschlossener Veranstaltungen aber in Buchung_Archiv: Der Abgleich
+* hat vergangene Veranstaltungen wieder geöffnet und jede Anmeldung
+* gelöscht, deren bezahlte Buchung archiviert war.
+*
+* Ohne p_veranstaltungs_id werden jetzt nur noch die Veranstaltungen
+* abgeglichen, in denen tatsächlich jemand nachgerückt ist. Die
+* Nachrücker stehen dafür in der temporären Tabelle
+* nachruecken_kandidaten (je Verbindung, am Ende wieder gelöscht). Mit
+* p_veranstaltungs_id bleibt es beim Abgleich dieser einen
+* Veranstaltung.
+*
+*   CALL nachruecken(NULL, @n); SELECT @n;
+*/
+
+DROP PROCEDURE IF EXISTS nachruecken;
+
+DELIMITER $$
+
+CREATE PROCEDURE nachruecken(IN p_veranstaltungs_id INT, OUT p_nachgerueckt INT)
+MODIFIES SQL DATA
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS nachruecken_kandidaten;
+    CREATE TEMPORARY TABLE nachruecken_kandidaten (
+        buchungs_id INT PRIMARY KEY,
+        veranstaltungs_id INT NOT NULL
+    );
+
+    -- Älteste Wartende je Veranstaltung, höchstens so viele wie Plätze frei sind
+    -- (verfügbare_plätze NULL = unbegrenzt)
+    INSERT INTO nachruecken_kandidaten (buchungs_id, veranstaltungs_id)
+    SELECT w.buchungs_id, w.veranstaltungs_id
+    FROM (
+        SELECT buchungs_id, veranstaltungs_id,
+               ROW_NUMBER() OVER (PARTITION BY veranstaltungs_id ORDER BY datum, buchungs_id) AS rang
+        FROM Buchung
+        WHERE buchung_status = 'wartend'
+          AND (p_veranstaltungs_id IS NULL OR veranstaltungs_id = p_veranstaltungs_id)
+    ) w
+    JOIN (
+        SELECT v.veranstaltungs_id, v.verfügbare_plätze - COUNT(a.buchungs_id) AS frei
+        FROM Veranstaltung v
+        LEFT JOIN Buchung a
+          ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+        WHERE p_veranstaltungs_id IS NULL OR v.veranstaltungs_id = p_veranstaltungs_id
+        GROUP BY v.veranstaltungs_id, v.verfügbare_plätze
+    ) f ON f.veranstaltungs_id = w.veranstaltungs_id
+    WHERE f.frei IS NULL OR w.rang <= f.frei;
+
+    UPDATE Buchung b
+    JOIN nachruecken_kandidaten n ON n.buchungs_id = b.buchungs_id
+    SET b.buchung_status = 'offen';
+    SET p_nachgerueckt = ROW_COUNT();
+
+    -- Anmeldung möglich, solange Plätze frei sind
+    UPDATE anmeldungsliste l
+    JOIN (
+        SELECT v.veranstaltungs_id,
+               COALESCE(v.verfügbare_plätze > COUNT(a.buchungs_id), 1) AS moeglich
+        FROM Veranstaltung v
+        LEFT JOIN Buchung a
+          ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+        WHERE v.veranstaltungs_id = p_veranstaltungs_id
+           OR (p_veranstaltungs_id IS NULL
+               AND v.veranstaltungs_id IN (SELECT veranstaltungs_id FROM nachruecken_kandidaten))
+        GROUP BY v.veranstaltungs_id, v.verfügbare_plätze
+    ) f ON f.veranstaltungs_id = l.veranstaltungs_id
+    SET l.teilnahme_möglich = f.moeglich;
+
+    -- Angemeldete_Kursteilnehmer = bezahlte Buchungen (wie buchung_insert/buchung_update)
+    DELETE k
+    FROM Angemeldete_Kursteilnehmer k
+    JOIN anmeldungsliste l ON l.anmeldungsliste_id = k.anmeldungsliste_id
+    WHERE (l.veranstaltungs_id = p_veranstaltungs_id
+           OR (p_veranstaltungs_id IS NULL
+               AND l.veranstaltungs_id IN (SELECT veranstaltungs_id FROM nachruecken_kandidaten)))
+      AND NOT EXISTS (
+          SELECT 1 FROM Buchung b
+          WHERE b.veranstaltungs_id = l.veranstaltungs_id
+            AND b.teilnehmer_id = k.teilnehmer_id
+            AND b.buchung_status = 'bezahlt'
+      );
+
+    INSERT IGNORE INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id)
+    SELECT b.teilnehmer_id, MIN(l.anmeldungsliste_id)
+    FROM Buchung b
+    JOIN anmeldungsliste l ON l.veranstaltungs_id = b.veranstaltungs_id
+    WHERE b.buchung_status = 'bezahlt'
+      AND (b.veranstaltungs_id = p_veranstaltungs_id
+           OR (p_veranstaltungs_id IS NULL
+               AND b.veranstaltungs_id IN (SELECT veranstaltungs_id FROM nachruecken_kandidaten)))
+      AND NOT EXISTS (
+          SELECT 1
+          FROM Angemeldete_Kursteilnehmer k
+          JOIN anmeldungsliste l2 ON l2.anmeldungsliste_id = k.anmeldungsliste_id
+          WHERE k.teilnehmer_id = b.teilnehmer_id AND l2.veranstaltungs_id = b.veranstaltungs_id
+      )
+    GROUP BY b.teilnehmer_id, b.veranstaltungs_id;
+
+    DROP TEMPORARY TABLE nachruecken_kandidaten;
+END$$
+
+DELIMITER ;
+
+GRANT EXECUTE ON PROCEDURE hochschulsport.nachruecken TO rolle_verwaltung;
+GRANT EXECUTE ON PROCEDURE hochschulsport.nachruecken TO rolle_kursleiter;
@@ -1,14 +1,19 @@
 # reset.py
+import sys
+import argparse
 import mysql.connector
-import tkinter as tk
-from tkinter import simpledialog, messagebox
+
+from utils.provisioning import (
+    ROLES, USERS, DATABASE,
+    resolve_credentials, reset_database, list_copies,
+)
 
 HOST = "localhost"
-ROLES = ["rolle_verwaltung", "rolle_kursleiter"]
-USERS = ["verwaltung", "kursleiter"]
-DATABASE = "hochschulsport"
 
 def ask_credentials():
+    import tkinter as tk
+    from tkinter import simpledialog
+
     root = tk.Tk()
     root.withdraw()
     user = simpledialog.askstring("Login", "MySQL Benutzername:")
@@ -16,6 +21,9 @@ def ask_credentials():
     return user, pwd
 
 def confirm_reset():
+    import tkinter as tk
+    from tkinter import messagebox
+
     root = tk.Tk()
     root.withdraw()
     return messagebox.askyesno(
@@ -24,38 +32,19 @@ def confirm_reset():
     )
 
 def reset_db(user: str, password: str, host: str = HOST):
-    try:
-        conn = mysql.connector.connect(host=host, user=user, password=password)
-        cursor = conn.cursor()
-
-        # Alle Rechte von Benutzern aufheben
-        for u in USERS:
-            cursor.execute(f"REVOKE ALL PRIVILEGES, GRANT OPTION FROM '{u}'@'localhost';")
-
-        # Rollenrechte zurücksetzen (REVOKE funktioniert nur über Rollen, nicht direkt auf Tabellen)
-        for role in ROLES:
-            cursor.execute(f"REVOKE ALL PRIVILEGES, GRANT OPTION FROM `{role}`;")
-
-        # Rollen löschen
-        for role in ROLES:
-            cursor.execute(f"DROP ROLE IF EXISTS `{role}`;")
-
-        # Benutzer löschen
-        for u in USERS:
-            cursor.execute(f"DROP USER IF EXISTS '{u}'@'localhost';")
-
-        # Datenbank löschen
-        cursor.execute(f"DROP DATABASE IF EXISTS `{DATABASE}`;")
+    """Löscht Rollen, Benutzer (inkl. Rechte) und die Datenbank und meldet das Ergebnis per Dialog."""
+    from tkinter import messagebox
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+    try:
+        reset_database({"user": user, "password": password, "host": host, "port": 3306})
         messagebox.showinfo("Erfolg", "Alle Rollen, Benutzer, Rechte und die Datenbank wurden gelöscht!")
     except mysql.connector.Error as e:
         messagebox.showerror("Fehler", f"Fehler bei der Datenbankoperation:\n{e}")
 
 def test_connection(user, pwd, host="localhost"):
     """Testet Verbindung mit den angegebenen Zugangsdaten"""
+    from tkinter import messagebox
+
     try:
         conn = mysql.connector.connect(
             host=host,
@@ -68,7 +57,45 @@ def test_connection(user, pwd, host="localhost"):
         messagebox.showerror("Fehler", f"Login fehlgeschlagen:\n{e}")
         return False
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hochschulsport-Datenbank, Rollen und Nutzer löschen")
+    parser.add_argument("--headless", action="store_true",
+                        help="Ohne GUI-Dialoge ausführen (Zugangsdaten aus Argumenten, Umgebung oder secrets.toml)")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort (besser MYSQL_PASSWORD setzen)")
+    parser.add_argument("--host", help="MySQL-Host (sonst MYSQL_HOST bzw. secrets.toml, Default localhost)")
+    parser.add_argument("--port", type=int, help="MySQL-Port (Default 3306)")
+    parser.add_argument("--database", default=DATABASE, help="Name der Datenbank")
+    parser.add_argument("--copies", action="store_true",
+                        help="Auch alle Kopien <database>_N (aus setup.py --copies) löschen")
+    parser.add_argument("--yes", action="store_true", help="Ohne Rückfrage löschen (für --headless erforderlich)")
+    return parser.parse_args(argv)
+
+def main_headless(args):
+    """Reset ohne GUI (idempotent, ein Roundtrip). Gibt den Exit-Code zurück."""
+    if not args.yes:
+        print("Abbruch: Zum Löschen im Headless-Modus --yes angeben.", file=sys.stderr)
+        return 2
+    try:
+        creds = resolve_credentials(args.user, args.password, args.host, args.port)
+        databases = [args.database]
+        if args.copies:
+            databases += list_copies(creds, prefix=f"{args.database}_")
+        seconds = reset_database(creds, databases, ROLES, USERS)
+    except (ValueError, mysql.connector.Error) as e:
+        print(f"Reset fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    print(f"Gelöscht: Rollen {', '.join(ROLES)}; Nutzer {', '.join(USERS)}; "
+          f"Datenbanken {', '.join(databases)} ({seconds:.2f}s)")
+    return 0
+
 def main():
+    args = parse_args()
+    if args.headless:
+        sys.exit(main_headless(args))
+
+    from tkinter import messagebox
+
     user, pwd = ask_credentials()
     if not user or not pwd:
         messagebox.showwarning("Abbruch", "Keine Zugangsdaten eingegeben.")
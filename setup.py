@@ -1,24 +1,22 @@
 # setup.py
 import os
+import sys
+import argparse
 import mysql.connector
-import tkinter as tk
-from tkinter import simpledialog, messagebox
 import toml
-import re
 
-SCHEMA_FILE = os.path.join("SQL Dateien","dbs_3.sql")
-SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
-
-
-
-def _remove_multiline_comments(sql):
-    """ Entfernt alle Kommentare"""
-    sql_no_comments = re.sub(r"/\*.*?\*/", "", sql, flags=re.DOTALL)
-    sql_no_comments = re.sub(r"^\s*(--|#).*?$", "", sql_no_comments, flags=re.MULTILINE)
-    return sql_no_comments
+# SECRETS_FILE bleibt über setup.py erreichbar
+from utils.provisioning import (
+    SECRETS_FILE, DATABASE,
+    resolve_credentials, provision_database, provision_copies, format_durations,
+)
 
 def ask_credentials():
     """Öffnet Tkinter GUI-Dialog für DB-Login"""
+    # tkinter nur für den GUI-Dialog laden
+    import tkinter as tk
+    from tkinter import simpledialog
+
     root = tk.Tk()
     root.withdraw()  # Kein Hauptfenster
     user = simpledialog.askstring("Login", "MySQL Benutzername:")
@@ -27,6 +25,8 @@ def ask_credentials():
 
 def test_connection(user, pwd, host="localhost"):
     """Testet Verbindung mit den angegebenen Zugangsdaten"""
+    from tkinter import messagebox
+
     try:
         conn = mysql.connector.connect(
             host=host,
@@ -41,74 +41,14 @@ def test_connection(user, pwd, host="localhost"):
 
 
 def run_sql(user, pwd, host="localhost"):
-    """Liest schema.sql ein, entfernt DELIMITER-Zeilen, extrahiert Trigger und führt SQL-Statements aus."""
-    conn = mysql.connector.connect(
-        host=host,
-        user=user,
-        password=pwd
-    )
-    cursor = conn.cursor()
-
-    with open(SCHEMA_FILE, encoding="utf-8") as f:
-        sql = f.read()
-
-    sql = _remove_multiline_comments(sql)
-    # Entferne alle Zeilen mit DELIMITER
-    sql = re.sub(r"^\s*DELIMITER.*\n", "", sql, flags=re.MULTILINE)
-
-    # Extrahiere Trigger mit regulärem Ausdruck
-    trigger_pattern = re.compile(r"CREATE TRIGGER.*?END\s*\$\$*", re.DOTALL)
-    triggers = trigger_pattern.findall(sql)
-
-    # Entferne Trigger aus dem SQL-Code
-    sql_without_triggers = trigger_pattern.sub("", sql)
-
-
-    # Extrahiere INSERT INTO mit regulärem Ausdruck
-    insert_pattern = re.compile(r"(INSERT\s+INTO\b.*?;)", re.DOTALL | re.IGNORECASE)
-    inserts = insert_pattern.findall(sql_without_triggers)
-    sql_without_triggers_and_insert = insert_pattern.sub("", sql_without_triggers)  # INSERTs aus dem SQL entfernen
-
-    # Führe alle anderen SQL-Statements aus
-    statements = [stmt.strip() for stmt in sql_without_triggers_and_insert.split(";") if stmt.strip()]
-    for stmt in statements:
-        cursor.execute(stmt)
-        try:
-            cursor.fetchall()  # Für Statements, die Ergebnisse liefern
-        except mysql.connector.errors.InterfaceError:
-            pass  # Für Statements, die keine Ergebnisse liefern
-
-    # Führe die extrahierten Trigger separat aus
-    for trigger in triggers:
-        trigger_stmt = trigger.replace("$$", ";")  # Ersetze $$ durch ;
-        try:
-            cursor.execute(trigger_stmt)
-            try:
-                cursor.fetchall()
-            except mysql.connector.errors.InterfaceError:
-                pass
-        except mysql.connector.Error as e:
-            #erste 100 Zeichen
-            messagebox.showerror("Trigger-Fehler", f"Fehler beim Erstellen eines Triggers:\n{e}\n\nTrigger:\n{trigger_stmt[:100]}...")
-            conn.rollback()
-            cursor.close()
-            conn.close()
-            return
-        
-    for insert in inserts:
-        try:
-            cursor.execute(insert)
-        except mysql.connector.Error as e:
-            #erste 100 Zeichen
-            messagebox.showerror("INSERT-Fehler", f"Fehler beim Ausführen eines INSERTs:\n{e}\n\nINSERT:\n{insert[:100]}...")
-            conn.rollback()
-            cursor.close()
-            conn.close()
-            return
-        
-    conn.commit()
-    cursor.close()
-    conn.close()
+    """Baut die Datenbank über die Migrationen auf (siehe utils.provisioning) und meldet das Ergebnis per Dialog."""
+    from tkinter import messagebox
+
+    try:
+        provision_database({"user": user, "password": pwd, "host": host, "port": 3306})
+    except (ValueError, mysql.connector.Error) as e:
+        messagebox.showerror("Fehler", f"Fehler beim Erstellen der Datenbank:\n{e}")
+        return
     messagebox.showinfo("Erfolg", "Datenbank erfolgreich erstellt!")
 
 def update_secrets(user, pwd, host="localhost"):
@@ -141,7 +81,47 @@ def update_secrets(user, pwd, host="localhost"):
 
     #messagebox.showinfo("Gespeichert", f"Zugangsdaten in {SECRETS_FILE} gespeichert.")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hochschulsport-Datenbank aufsetzen")
+    parser.add_argument("--headless", action="store_true",
+                        help="Ohne GUI-Dialoge ausführen (Zugangsdaten aus Argumenten, Umgebung oder secrets.toml)")
+    parser.add_argument("--user", help="MySQL-Admin (sonst MYSQL_USER bzw. secrets.toml)")
+    parser.add_argument("--password", help="Passwort (besser MYSQL_PASSWORD setzen)")
+    parser.add_argument("--host", help="MySQL-Host (sonst MYSQL_HOST bzw. secrets.toml, Default localhost)")
+    parser.add_argument("--port", type=int, help="MySQL-Port (Default 3306)")
+    parser.add_argument("--database", default=DATABASE, help="Name der Datenbank")
+    parser.add_argument("--force", action="store_true", help="Bestehende Datenbank vorher löschen")
+    parser.add_argument("--copies", type=int, default=0,
+                        help="Zusätzlich N isolierte Kopien <database>_1..N parallel anlegen (z.B. für Lasttests)")
+    parser.add_argument("--workers", type=int, default=4, help="Parallele Verbindungen für --copies")
+    parser.add_argument("--write-secrets", action="store_true", help="Zugangsdaten in secrets.toml speichern")
+    return parser.parse_args(argv)
+
+def main_headless(args):
+    """Setup ohne GUI: idempotent, mit Dauer pro Migration. Gibt den Exit-Code zurück."""
+    try:
+        creds = resolve_credentials(args.user, args.password, args.host, args.port)
+        durations = provision_database(creds, args.database, force=args.force)
+        print(f"{args.database}: {format_durations(durations)}")
+        if args.copies:
+            results = provision_copies(creds, args.copies, prefix=f"{args.database}_",
+                                       workers=args.workers, force=args.force)
+            for name, copy_durations in results.items():
+                print(f"{name}: {format_durations(copy_durations)}")
+    except (ValueError, mysql.connector.Error) as e:
+        print(f"Setup fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    if args.write_secrets:
+        update_secrets(creds["user"], creds["password"], creds["host"])
+    return 0
+
 def main():
+    args = parse_args()
+    if args.headless:
+        sys.exit(main_headless(args))
+
+    from tkinter import messagebox
+
     host = "localhost"  # ggf. anpassen
     while True:
         user, pwd = ask_credentials()
@@ -0,0 +1,56 @@
+# tests/conftest.py
+"""
+Gemeinsame Fixtures: alle Tests laufen gegen das SQLite-Testdouble
+(utils/sqlite_backend.py), jeder Test mit frischen Beispieldaten.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["HS_DB_BACKEND"] = "sqlite"
+
+# Zugangsdaten der Baseline-Konten; andere Nutzer haben im Testdouble volle Rechte (auch DDL)
+ACCOUNTS = {"verwaltung": "1234", "kursleiter": "12345", "admin": ""}
+
+
+@pytest.fixture(autouse=True)
+def fresh_database(monkeypatch):
+    """Frische Datenbank und leere Streamlit-Caches pro Test (Pfade relativ zum Projekt)."""
+    import streamlit as st
+    from utils.sqlite_backend import reset_database
+
+    monkeypatch.chdir(ROOT)
+    reset_database()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+    reset_database()
+
+
+@pytest.fixture
+def connect():
+    """Öffnet Verbindungen als Baseline-Konto; schließt sie nach dem Test."""
+    from utils.database import connect as db_connect
+
+    opened = []
+
+    def _connect(user="verwaltung", **kwargs):
+        conn = db_connect(user=user, password=ACCOUNTS[user], database="hochschulsport", **kwargs)
+        opened.append(conn)
+        return conn
+
+    yield _connect
+    for conn in opened:
+        conn.close()
+
+
+def scalar(conn, sql, params=()):
+    """Erster Wert der ersten Zeile."""
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else None
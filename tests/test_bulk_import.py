@@ -0,0 +1,99 @@
+# tests/test_bulk_import.py
+import datetime as dt
+
+from mysql.connector import errors
+
+import utils.bulk_import
+from conftest import scalar
+from components.table_editor import get_table_schema
+from utils.bulk_import import load_foreign_keys, load_rows, read_csv, to_rows, validate
+
+
+class _Deadlocks:
+    """Verbindung, deren INSERTs mit `termin_id` in `ids` `times`-mal als Deadlock scheitern."""
+
+    def __init__(self, conn, ids, times):
+        self._conn = conn
+        self.ids = ids
+        self.times = times
+
+    def cursor(self, *args, **kwargs):
+        return _DeadlockCursor(self, self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _DeadlockCursor:
+    def __init__(self, owner, cursor):
+        self._owner = owner
+        self._cursor = cursor
+
+    def _check(self, rows):
+        if self._owner.times and any(row[0] in self._owner.ids for row in rows):
+            self._owner.times -= 1
+            raise errors.InternalError(msg="Deadlock found when trying to get lock", errno=1213)
+
+    def execute(self, operation, params=None):
+        if params:
+            self._check([params])
+        return self._cursor.execute(operation, params)
+
+    def executemany(self, operation, seq_params):
+        self._check(seq_params)
+        return self._cursor.executemany(operation, seq_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _import(conn, table_name, csv):
+    schema = get_table_schema(conn, table_name)
+    valid, rejected = validate(conn, table_name, read_csv(csv.encode()), schema,
+                               foreign_keys=load_foreign_keys(conn, table_name))
+    result = load_rows(conn, table_name, list(valid.columns), to_rows(valid))
+    return valid, rejected, result
+
+
+def test_empty_date_cell_is_null(connect):
+    conn = connect()
+    valid, rejected, result = _import(conn, "Termin", "termin_id;datum\n9001;\n9002;01.10.2025 18:00\n")
+    assert len(rejected) == 0 and result["inserted"] == 2 and not result["failed"]
+    assert to_rows(valid)[0] == (9001, None)
+    assert scalar(conn, "SELECT datum FROM Termin WHERE termin_id = 9001;") is None
+    assert scalar(conn, "SELECT datum FROM Termin WHERE termin_id = 9002;").year == 2025
+    assert not conn.in_transaction
+
+
+def test_empty_cell_gets_column_default(connect):
+    conn = connect()
+    teilnehmer = scalar(conn, "SELECT MIN(teilnehmer_id) FROM Kursteilnehmer;")
+    veranstaltung = scalar(conn, "SELECT MIN(veranstaltungs_id) FROM Veranstaltung;")
+    csv = (f"buchungs_id,datum,teilnehmer_id,veranstaltungs_id,buchung_status\n"
+           f"9001,,{teilnehmer},{veranstaltung},\n")
+    _, rejected, result = _import(conn, "Buchung", csv)
+    assert len(rejected) == 0 and result["inserted"] == 1
+    # Buchung.datum ist nullable mit DEFAULT CURRENT_TIMESTAMP, buchung_status NOT NULL DEFAULT 'offen'
+    datum = scalar(conn, "SELECT datum FROM Buchung WHERE buchungs_id = 9001;")
+    assert isinstance(datum, dt.datetime) and datum.year > 2000
+    assert scalar(conn, "SELECT buchung_status FROM Buchung WHERE buchungs_id = 9001;") in ("offen", "wartend")
+
+
+def test_deadlocked_chunk_is_retried(connect, monkeypatch):
+    monkeypatch.setattr(utils.bulk_import, "RETRY_PAUSE", 0)
+    conn = _Deadlocks(connect(), ids={9003}, times=2)
+    rows = [(9001 + i, None) for i in range(4)]
+    result = load_rows(conn, "Termin", ["termin_id", "datum"], rows, chunk_size=2)
+    assert result["inserted"] == 4 and result["error"] is None and not result["failed"]
+    assert scalar(conn, "SELECT COUNT(*) FROM Termin WHERE termin_id BETWEEN 9001 AND 9004;") == 4
+
+
+def test_abort_returns_committed_chunks(connect, monkeypatch):
+    monkeypatch.setattr(utils.bulk_import, "RETRY_PAUSE", 0)
+    conn = _Deadlocks(connect(), ids={9003}, times=100)
+    rows = [(9001 + i, None) for i in range(6)]
+    result = load_rows(conn, "Termin", ["termin_id", "datum"], rows, chunk_size=2)
+    assert result["inserted"] == 2 and result["stopped_at"] == 2
+    assert result["error"].errno == 1213
+    assert scalar(conn, "SELECT COUNT(*) FROM Termin WHERE termin_id BETWEEN 9001 AND 9006;") == 2
+    assert not conn.in_transaction
@@ -0,0 +1,72 @@
+# tests/test_change_feed.py
+from conftest import scalar
+from utils.change_feed import ChangeFeed
+from utils.table_cache import TableCache, get_cached_table
+
+
+def _feed(conn):
+    feed = ChangeFeed(TableCache())
+    feed.sync(conn, "admin", force=True)
+    return feed
+
+
+def test_cascade_discards_dependent_tables(connect):
+    conn = connect("admin", autocommit=True)
+    feed = _feed(conn)
+    notified = []
+    feed.add_listener(lambda table_name, pks: notified.append((table_name, pks)))
+    termin_id = scalar(conn, "SELECT MIN(termin_id) FROM Veranstaltung_Termine;")
+    get_cached_table(conn, "Veranstaltung_Termine", account="admin", cache=feed.cache)
+
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM Termin WHERE termin_id = %s;", (termin_id,))
+    # MySQL protokolliert die per Kaskade gelöschten Zeilen nicht
+    cursor.execute("DELETE FROM changelog WHERE table_name <> 'Termin';")
+    cursor.close()
+    feed.sync(conn, "admin", force=True)
+
+    assert feed.cache.keys_for("Veranstaltung_Termine") == []
+    assert ("Veranstaltung_Termine", None) in notified
+
+
+def test_late_commit_below_last_id_is_applied(connect):
+    conn = connect("admin", autocommit=True)
+    feed = _feed(conn)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle A' WHERE ort_id = 1;")
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle B' WHERE ort_id = 2;")
+    # Die erste Änderung wird erst nach der zweiten sichtbar (späterer Commit)
+    cursor.execute("SELECT change_id, table_name, op, pk FROM changelog ORDER BY change_id DESC LIMIT 1 OFFSET 1;")
+    late = cursor.fetchone()
+    cursor.execute("DELETE FROM changelog WHERE change_id = %s;", (late[0],))
+    get_cached_table(conn, "Ort", account="admin", cache=feed.cache)
+    feed.sync(conn, "admin", force=True)
+
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle C' WHERE ort_id = 1;")
+    cursor.execute("DELETE FROM changelog WHERE change_id > %s;", (late[0],))
+    cursor.execute("INSERT INTO changelog (change_id, table_name, op, pk) VALUES (%s, %s, %s, %s);", late)
+    cursor.close()
+    assert feed.sync(conn, "admin", force=True) == {"Ort": 1}
+
+    df = feed.cache.get(("admin", "Ort", False))["df"]
+    assert df.loc[df["ort_id"] == 1, "ort_name"].tolist() == ["Halle C"]
+
+
+def test_changes_after_overflow_are_applied(connect, monkeypatch):
+    import utils.change_feed
+
+    monkeypatch.setattr(utils.change_feed, "MAX_CHANGES", 3)
+    conn = connect("admin", autocommit=True)
+    feed = _feed(conn)
+    cursor = conn.cursor()
+    for i in range(1, 5):
+        cursor.execute("UPDATE Ort SET ort_name = %s WHERE ort_id = 1;", (f"X{i}",))
+    feed.sync(conn, "admin", force=True)
+    # Nach dem Verwerfen neu geladen, danach geändert
+    get_cached_table(conn, "Ort", account="admin", cache=feed.cache)
+    cursor.execute("UPDATE Ort SET ort_name = 'NEU' WHERE ort_id = 1;")
+    cursor.close()
+    feed.sync(conn, "admin", force=True)
+
+    df = feed.cache.get(("admin", "Ort", False))["df"]
+    assert df.loc[df["ort_id"] == 1, "ort_name"].tolist() == ["NEU"]
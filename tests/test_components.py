@@ -0,0 +1,126 @@
+# tests/test_components.py
+"""Komponenten über streamlit.testing gegen das SQLite-Testdouble."""
+from streamlit.testing.v1 import AppTest
+
+from conftest import scalar
+
+TIMEOUT = 30
+
+
+def _sidebar_app(user, password, tab):
+    import streamlit as st
+    from components.sidebar import show_sidebar
+    from utils.session import DBSession
+
+    if "db_session" not in st.session_state:
+        st.session_state["db_session"] = DBSession.login(user, password)
+        st.session_state["sql_user"] = user
+    session = st.session_state["db_session"]
+    result = show_sidebar(session.connection(), tab, session=session)
+    st.session_state["result"] = result[:4]
+
+
+def _filter_app(table_name, filters, limit):
+    import streamlit as st
+    from components.sql_filter_runner import run_sql_filter
+    from utils.session import DBSession
+
+    if "db_session" not in st.session_state:
+        st.session_state["db_session"] = DBSession.login("verwaltung", "1234")
+        st.session_state["sql_user"] = "verwaltung"
+    session = st.session_state["db_session"]
+    run_sql_filter(session.connection(), table_name, filters, limit, session=session)
+
+
+def _editor_app(user, password, table_name):
+    import streamlit as st
+    from components.table_editor import table_editor
+    from utils.session import DBSession
+
+    if "db_session" not in st.session_state:
+        st.session_state["db_session"] = DBSession.login(user, password)
+        st.session_state["sql_user"] = user
+    table_editor(st.session_state["db_session"].connection(), table_name)
+
+
+def test_sidebar_lists_writable_tables_in_editor():
+    at = AppTest.from_function(_sidebar_app, args=("kursleiter", "12345", "Tabelle bearbeiten"),
+                               default_timeout=TIMEOUT).run()
+    assert not at.exception
+    assert at.selectbox[0].options == ["Buchung", "Feedback"]
+
+
+def test_sidebar_builds_filters_for_selected_table():
+    at = AppTest.from_function(_sidebar_app, args=("verwaltung", "1234", "Tabelle anzeigen"),
+                               default_timeout=TIMEOUT).run()
+    assert not at.exception
+    at.selectbox[0].set_value("Ort").run()
+    assert not at.exception
+    selected, filters, limit_active, limit = at.session_state["result"]
+    assert (selected, limit_active, limit) == ("Ort", True, 1000)
+    assert isinstance(filters, dict)
+
+
+def test_sql_filter_shows_matching_rows(connect):
+    conn = connect()
+    total = scalar(conn, "SELECT COUNT(*) FROM Buchung;")
+    paid = scalar(conn, "SELECT COUNT(*) FROM Buchung WHERE buchung_status = 'bezahlt';")
+
+    at = AppTest.from_function(_filter_app, args=("Buchung", {}, 1000), default_timeout=TIMEOUT).run()
+    assert not at.exception
+    assert len(at.dataframe[0].value) == total
+
+    at = AppTest.from_function(_filter_app, args=("Buchung", {"buchung_status": ["bezahlt"]}, 1000),
+                               default_timeout=TIMEOUT).run()
+    assert not at.exception
+    df = at.dataframe[0].value
+    assert len(df) == paid and set(df["buchung_status"]) == {"bezahlt"}
+
+
+def test_sql_filter_pages_by_primary_key():
+    at = AppTest.from_function(_filter_app, args=("Angemeldete_Kursteilnehmer", {"anmeldungsliste_id": [1, 11]}, 2),
+                               default_timeout=TIMEOUT).run()
+    assert not at.exception
+    df = at.dataframe[0].value
+    assert list(zip(df["teilnehmer_id"], df["anmeldungsliste_id"])) == [(1, 1), (1, 11)]
+
+
+def test_table_editor_inserts_row(connect):
+    conn = connect()
+    before = scalar(conn, "SELECT COUNT(*) FROM Ort;")
+    at = AppTest.from_function(_editor_app, args=("verwaltung", "1234", "Ort"), default_timeout=TIMEOUT).run()
+    assert not at.exception
+    at.radio(key="editor_action").set_value("Eintrag hinzufügen").run()
+    at.text_input(key="add_ort_name").input("Testhalle").run()
+    [b for b in at.button if b.label == "Eintrag hinzufügen"][0].click().run()
+    assert not at.exception and not at.error
+    assert scalar(conn, "SELECT COUNT(*) FROM Ort;") == before + 1
+    assert scalar(conn, "SELECT COUNT(*) FROM Ort WHERE ort_name = 'Testhalle';") == 1
+
+
+def test_table_editor_reloads_entry_when_reopened(connect):
+    conn = connect()
+    at = AppTest.from_function(_editor_app, args=("verwaltung", "1234", "Ort"), default_timeout=TIMEOUT).run()
+    at.radio(key="editor_action").set_value("Eintrag bearbeiten").run()
+    at.text_input(key="edit_ort_id").input("1").run()
+    name = at.text_input(key="edit_field_ort_name").value
+
+    # Jemand anderes ändert den Eintrag, während der Dialog offen ist; später wird er neu geöffnet
+    cursor = conn.cursor()
+    cursor.execute("UPDATE Ort SET ort_name = %s WHERE ort_id = 1;", (name + " (neu)",))
+    conn.commit()
+    cursor.close()
+    at.radio(key="editor_action").set_value("Eintrag löschen").run()
+    at.radio(key="editor_action").set_value("Eintrag bearbeiten").run()
+    at.text_input(key="edit_ort_id").input("1").run()
+    assert not at.exception
+    assert at.text_input(key="edit_field_ort_name").value == name + " (neu)"
+
+
+def test_table_editor_hides_actions_without_privileges():
+    at = AppTest.from_function(_editor_app, args=("kursleiter", "12345", "Ort"), default_timeout=TIMEOUT).run()
+    assert not at.exception
+    assert [i.value for i in at.info] == ["Keine Schreibrechte auf Ort."]
+
+    at = AppTest.from_function(_editor_app, args=("kursleiter", "12345", "Buchung"), default_timeout=TIMEOUT).run()
+    assert "Eintrag hinzufügen" not in at.radio(key="editor_action").options
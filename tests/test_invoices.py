@@ -0,0 +1,47 @@
+# tests/test_invoices.py
+from utils.invoices import generate_invoices
+
+
+def test_new_invoices_are_matched_by_booking(connect):
+    conn = connect("admin", autocommit=True)
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE Rechnung ADD COLUMN betrag DECIMAL(8,2);")
+    cursor.execute("INSERT INTO Buchung (buchungs_id, teilnehmer_id, veranstaltungs_id) "
+                   "SELECT 9, teilnehmer_id, veranstaltungs_id FROM Buchung WHERE buchungs_id = 6;")
+    cursor.execute("UPDATE Buchung SET buchung_status = 'bezahlt' WHERE buchungs_id = 9;")
+    # Eine parallele Sitzung legt währenddessen eine Rechnung im selben Bereich an
+    # (Trigger direkt in SQLite, das Testdouble übersetzt kein CREATE TRIGGER)
+    conn._db.execute("CREATE TRIGGER parallel_rechnung AFTER INSERT ON Rechnung WHEN NEW.buchungs_id = 6 "
+                     "BEGIN INSERT INTO Rechnung (sender, angestellten_id, buchungs_id) VALUES ('parallel', 1, 7); END")
+
+    created = generate_invoices(conn, 1, log=lambda message: None)
+
+    cursor.execute("SELECT rechnungs_id FROM Rechnung WHERE buchungs_id IN (6, 9) ORDER BY rechnungs_id;")
+    assert created == [row[0] for row in cursor.fetchall()]
+    assert len(created) == 2
+    cursor.close()
+
+
+def test_render_waits_for_oldest_chunk_before_reading_more(monkeypatch, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import utils.invoices
+
+    rendered, fetched = [], []
+
+    def fetch(conn, ids):
+        # Von den bisher gelesenen Chunks sind höchstens MAX_PENDING_CHUNKS noch nicht gerendert
+        assert len(fetched) - len(rendered) <= utils.invoices.MAX_PENDING_CHUNKS
+        fetched.append(ids)
+        return ids
+
+    def render(invoices, out_dir):
+        rendered.append(invoices)
+        return len(invoices)
+
+    monkeypatch.setattr(utils.invoices, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(utils.invoices, "fetch_invoices", fetch)
+    monkeypatch.setattr(utils.invoices, "_render_batch", render)
+    done = utils.invoices.render_invoices(None, list(range(10)), str(tmp_path), workers=1, chunk_size=2,
+                                          log=lambda message: None)
+    assert done == 10 and len(fetched) == 5
@@ -0,0 +1,37 @@
+# tests/test_migrations.py
+import pytest
+
+from conftest import scalar
+from utils.migrations import (VERSION_TABLE, applied_versions, discover_migrations, ensure_version_table, estimate,
+                              mark_baseline)
+from utils.provisioning import _table_names, check_existing_schema
+
+
+def test_dry_run_does_not_create_version_table(connect):
+    conn = connect("admin")
+    assert applied_versions(conn) == {}
+    report = estimate(conn)
+    labels = {label for label, *_ in report}
+    assert labels == {f"{m['version']:04d}_{m['name']}" for m in discover_migrations()}
+    assert scalar(conn, "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_NAME = %s;",
+                  (VERSION_TABLE,)) == 0
+
+
+def test_partial_schema_is_not_marked_as_baseline(connect):
+    conn = connect("admin")
+    tables = _table_names(conn, "hochschulsport")
+    assert check_existing_schema(conn, "hochschulsport", tables) is True
+
+    with pytest.raises(ValueError, match="--force"):
+        check_existing_schema(conn, "hochschulsport", tables - {"veranstaltung"})
+
+
+def test_baseline_aborted_after_version_table_is_detected(connect):
+    conn = connect("admin")
+    ensure_version_table(conn)
+    tables = _table_names(conn, "hochschulsport")
+    with pytest.raises(ValueError, match="--force"):
+        check_existing_schema(conn, "hochschulsport", tables)
+
+    mark_baseline(conn)
+    assert check_existing_schema(conn, "hochschulsport", tables) is False
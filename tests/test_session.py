@@ -0,0 +1,18 @@
+# tests/test_session.py
+import pytest
+
+from utils.session import DBSession
+
+
+def test_pooled_does_not_reauthenticate_expired_session():
+    session = DBSession.login("verwaltung", "1234")
+    conn, pool = session.connection(), session._pool
+    session.expires_at = 0.0
+    with pytest.raises(RuntimeError):
+        session.pooled()
+    # UI-Verbindung und Pool bleiben unangetastet, bis der Skript-Thread neu anmeldet
+    assert session._conn is conn and session._pool is pool and conn.is_connected()
+    session.connection()
+    extra = session.pooled()
+    extra.close()
+    session.close()
@@ -0,0 +1,62 @@
+# tests/test_snapshot.py
+import duckdb
+import pytest
+
+from utils.privileges import Privileges, parse_grants
+from utils.snapshot import query_snapshot, refresh_snapshot, snapshot_tables
+
+
+def test_snapshot_only_exposes_readable_tables(connect, tmp_path):
+    directory = str(tmp_path)
+    refresh_snapshot(connect("admin"), directory)
+    privileges = Privileges("hochschulsport", parse_grants(["GRANT SELECT ON `hochschulsport`.`Ort` TO `x`@`%`"]))
+
+    tables = snapshot_tables(privileges, directory)
+    assert tables == ["Ort"]
+    assert query_snapshot("SELECT COUNT(*) FROM Ort", directory=directory, tables=tables).iloc[0, 0] > 0
+    with pytest.raises(duckdb.CatalogException):
+        query_snapshot("SELECT * FROM Buchung", directory=directory, tables=tables)
+
+
+def _rows(directory, name):
+    from utils.snapshot import _read_parquet, snapshot_path
+
+    return _read_parquet(snapshot_path(name, directory))
+
+
+def test_incremental_refresh_reexports_cascaded_tables(connect, tmp_path):
+    directory = str(tmp_path)
+    conn = connect("admin", autocommit=True)
+    refresh_snapshot(conn, directory)
+    cursor = conn.cursor()
+    cursor.execute("SELECT MIN(termin_id) FROM Veranstaltung_Termine;")
+    termin_id = cursor.fetchone()[0]
+    cursor.execute("DELETE FROM Termin WHERE termin_id = %s;", (termin_id,))
+    # MySQL protokolliert die per Kaskade gelöschten Zeilen nicht
+    cursor.execute("DELETE FROM changelog WHERE table_name <> 'Termin';")
+    cursor.close()
+
+    result = refresh_snapshot(conn, directory)
+    assert result["mode"] == "incremental"
+    assert "Veranstaltung_Termine" in result["exported"]
+    assert termin_id not in _rows(directory, "Veranstaltung_Termine")["termin_id"].tolist()
+
+
+def test_incremental_refresh_reads_late_commits(connect, tmp_path):
+    directory = str(tmp_path)
+    conn = connect("admin", autocommit=True)
+    refresh_snapshot(conn, directory)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle A' WHERE ort_id = 1;")
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle B' WHERE ort_id = 2;")
+    # Die erste Änderung wird erst nach der nächsten Aktualisierung sichtbar (späterer Commit)
+    cursor.execute("SELECT change_id, table_name, op, pk FROM changelog ORDER BY change_id DESC LIMIT 1 OFFSET 1;")
+    late = cursor.fetchone()
+    cursor.execute("DELETE FROM changelog WHERE change_id = %s;", (late[0],))
+    assert refresh_snapshot(conn, directory)["patched"] == {"Ort": 1}
+
+    cursor.execute("INSERT INTO changelog (change_id, table_name, op, pk) VALUES (%s, %s, %s, %s);", late)
+    cursor.close()
+    assert refresh_snapshot(conn, directory)["patched"] == {"Ort": 1}
+    df = _rows(directory, "Ort")
+    assert df.loc[df["ort_id"] == 1, "ort_name"].tolist() == ["Halle A"]
@@ -0,0 +1,26 @@
+# tests/test_sql_script.py
+from conftest import scalar
+from utils.sql_script import execute_script
+
+
+def test_writes_share_one_transaction(connect):
+    conn = connect(autocommit=True)
+    results = execute_script(conn, "INSERT INTO Ort (ort_id, ort_name) VALUES (901, 'A1');\n"
+                                   "INSERT INTO Ort (ort_id, ort_name) VALUES (1, 'doppelt');")
+    assert results[-1]["error"] is not None
+    assert not any(r["committed"] for r in results)
+    assert scalar(conn, "SELECT COUNT(*) FROM Ort WHERE ort_id = 901;") == 0
+
+
+def test_ddl_commits_earlier_writes_and_reports_them(connect):
+    conn = connect("admin", autocommit=True)
+    results = execute_script(conn, "INSERT INTO Ort (ort_id, ort_name) VALUES (901, 'A1');\n"
+                                   "CREATE INDEX idx_test_adresse ON Ort (adresse);\n"
+                                   "INSERT INTO Ort (ort_id, ort_name) VALUES (902, 'A2');\n"
+                                   "INSERT INTO Ort (ort_id, ort_name) VALUES (1, 'doppelt');")
+    assert [r["committed"] for r in results] == [True, True, False, False]
+    assert results[-1]["error"] is not None
+    # A1 lag vor der DDL und bleibt; A2 lag in der neuen Transaktion und wird zurückgerollt
+    assert scalar(conn, "SELECT COUNT(*) FROM Ort WHERE ort_id = 901;") == 1
+    assert scalar(conn, "SELECT COUNT(*) FROM Ort WHERE ort_id = 902;") == 0
+    assert not conn.in_transaction
@@ -0,0 +1,49 @@
+# tests/test_sqlite_backend.py
+import time
+
+import mysql.connector as mysql
+import pytest
+
+from conftest import scalar
+from utils.dtypes import frame_from_cursor
+from utils.sqlite_backend import BUSY_TIMEOUT
+
+
+def test_primary_keys_stay_int64(connect):
+    conn = connect()
+    cursor = conn.cursor()
+    cursor.execute("SELECT b.buchungs_id, b.teilnehmer_id FROM Buchung b "
+                   "JOIN Veranstaltung v ON v.veranstaltungs_id = b.veranstaltungs_id;")
+    df = frame_from_cursor(cursor)
+    cursor.close()
+    assert str(df["buchungs_id"].dtype) == "int64"
+    # Keine Primärschlüsselspalte: wird wie bei MySQL verkleinert
+    assert str(df["teilnehmer_id"].dtype) != "int64"
+
+
+def test_denied_write_releases_lock(connect):
+    kursleiter, verwaltung = connect("kursleiter"), connect("verwaltung")
+    with pytest.raises(mysql.Error) as denied:
+        kursleiter.cursor().execute("INSERT INTO Ort (ort_name) VALUES ('Halle X');")
+    assert denied.value.errno == 1142
+    assert not kursleiter.in_transaction
+
+    start = time.monotonic()
+    cursor = verwaltung.cursor()
+    cursor.execute("UPDATE Ort SET ort_name = 'Halle Y' WHERE ort_id = 1;")
+    verwaltung.commit()
+    assert time.monotonic() - start < BUSY_TIMEOUT
+    assert scalar(verwaltung, "SELECT ort_name FROM Ort WHERE ort_id = 1;") == "Halle Y"
+
+
+def test_failed_write_in_transaction_keeps_earlier_changes(connect):
+    conn = connect()
+    cursor = conn.cursor()
+    conn.start_transaction()
+    cursor.execute("UPDATE Ort SET ort_name = 'A' WHERE ort_id = 1;")
+    with pytest.raises(mysql.IntegrityError):
+        cursor.execute("INSERT INTO Ort (ort_id, ort_name) VALUES (1, 'doppelt');")
+    # Wie bei MySQL: nur das fehlgeschlagene Statement fällt weg
+    assert conn.in_transaction
+    conn.commit()
+    assert scalar(conn, "SELECT ort_name FROM Ort WHERE ort_id = 1;") == "A"
@@ -0,0 +1,7 @@
+# tests/test_startup.py
+from benchmarks.startup import DEFAULT_BUDGET_MS, check_startup
+
+
+def test_app_import_stays_within_startup_budget():
+    result = check_startup(DEFAULT_BUDGET_MS)
+    assert not result["errors"], "; ".join(result["errors"])
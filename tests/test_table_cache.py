@@ -0,0 +1,44 @@
+# tests/test_table_cache.py
+import utils.table_cache
+from utils.table_cache import TableCache, get_cached_page, get_cached_table
+
+
+def test_load_racing_with_invalidate_is_not_cached(connect, monkeypatch):
+    conn = connect()
+    cache = TableCache()
+    load = utils.table_cache.load_dataframe
+
+    def load_during_write(*args, **kwargs):
+        df = load(*args, **kwargs)
+        # Schreibzugriff einer anderen Sitzung, während das Ergebnis noch unterwegs ist
+        cache.invalidate("Ort")
+        return df
+
+    monkeypatch.setattr(utils.table_cache, "load_dataframe", load_during_write)
+    entry = get_cached_table(conn, "Ort", account="verwaltung", cache=cache)
+    assert len(entry["df"]) > 0
+    assert cache.get(("verwaltung", "Ort", False)) is None
+
+    monkeypatch.setattr(utils.table_cache, "load_dataframe", load)
+    get_cached_table(conn, "Ort", account="verwaltung", cache=cache)
+    assert cache.get(("verwaltung", "Ort", False)) is not None
+
+
+def test_put_with_outdated_generation_drops_entry(connect):
+    conn = connect()
+    cache = TableCache()
+    entry = get_cached_table(conn, "Ort", account="verwaltung", cache=cache)
+    generation = cache.table_generation("Ort")
+    cache.bump("Ort")
+    cache.put(("verwaltung", "Ort", False), entry["df"].head(1), generation=generation)
+    assert cache.get(("verwaltung", "Ort", False)) is None
+    # Andere Tabellen sind nicht betroffen
+    assert cache.table_generation("Buchung") < cache.table_generation("Ort")
+
+
+def test_first_page_is_ordered_by_primary_key(connect):
+    conn = connect()
+    # Eingefügt als (1, 1), (2, 2), (3, 3), (4, 1), (1, 11): ohne ORDER BY fehlt (1, 11)
+    entry = get_cached_page(conn, "Angemeldete_Kursteilnehmer", 3, account="verwaltung", cache=TableCache())
+    rows = [tuple(r) for r in entry["df"][["teilnehmer_id", "anmeldungsliste_id"]].itertuples(index=False)]
+    assert rows == [(1, 1), (1, 11), (2, 2)]
@@ -0,0 +1,22 @@
+# tests/test_waitlist.py
+from tests.conftest import scalar
+from utils.waitlist import promote_waitlist
+
+
+def test_promotion_for_all_events_leaves_archived_events_alone(connect):
+    conn = connect("admin", autocommit=True)
+    cursor = conn.cursor()
+    # Veranstaltung 2 ist archiviert: bezahlte Buchung in Buchung_Archiv, Anmeldung bleibt, Liste geschlossen
+    cursor.execute("DELETE FROM Buchung WHERE buchungs_id = 2;")
+    cursor.execute("INSERT OR IGNORE INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id) VALUES (2, 2);")
+    cursor.execute("UPDATE anmeldungsliste SET teilnahme_möglich = 0 WHERE veranstaltungs_id = 2;")
+    cursor.execute("UPDATE Veranstaltung SET verfügbare_plätze = 2 WHERE veranstaltungs_id = 11;")
+    cursor.close()
+
+    assert promote_waitlist(conn) == 1
+
+    assert scalar(conn, "SELECT buchung_status FROM Buchung WHERE buchungs_id = 7;") == "offen"
+    assert scalar(conn, "SELECT buchung_status FROM Buchung WHERE buchungs_id = 8;") == "wartend"
+    assert scalar(conn, "SELECT MAX(teilnahme_möglich) FROM anmeldungsliste WHERE veranstaltungs_id = 11;") == 0
+    assert scalar(conn, "SELECT MAX(teilnahme_möglich) FROM anmeldungsliste WHERE veranstaltungs_id = 2;") == 0
+    assert scalar(conn, "SELECT COUNT(*) FROM Angemeldete_Kursteilnehmer WHERE anmeldungsliste_id = 2;") == 1
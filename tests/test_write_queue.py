@@ -0,0 +1,32 @@
+# tests/test_write_queue.py
+import pytest
+
+from conftest import scalar
+from utils.write_queue import WriteQueue
+
+
+class _DroppedOnce:
+    """Verbindung, die nach is_connected() beim ersten cursor() abbricht."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.dropped = False
+
+    def cursor(self, *args, **kwargs):
+        if not self.dropped:
+            self.dropped = True
+            raise ConnectionError("Verbindung verloren")
+        return self._conn.cursor(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def test_failed_batch_resolves_futures_and_writer_survives(connect):
+    queue = WriteQueue(lambda: _DroppedOnce(connect()))
+    first = queue.submit("INSERT INTO Ort (ort_id, ort_name) VALUES (901, 'A1');")
+    with pytest.raises(ConnectionError):
+        first.result(timeout=5)
+    second = queue.submit("INSERT INTO Ort (ort_id, ort_name) VALUES (902, 'A2');")
+    assert second.result(timeout=5) == 1
+    assert scalar(connect(), "SELECT COUNT(*) FROM Ort WHERE ort_id IN (901, 902);") == 1
@@ -0,0 +1,222 @@
+# utils/archive.py
+"""
+Archivierung von Buchungen und Feedback abgeschlossener Semester.
+
+Zeilen werden aus Buchung/Feedback in die Archivtabellen aus
+migrations/0004_archive.py verschoben (Rechnungen zusammen mit ihrer
+Buchung, da Rechnung per ON DELETE CASCADE an Buchung hängt). Jeder
+Chunk läuft in einer eigenen kurzen Transaktion (INSERT ... SELECT in
+das Archiv, dann DELETE über den Primärschlüssel), dazwischen eine
+kurze Pause – es entstehen keine langen Sperren auf den Live-Tabellen.
+
+Abgeschlossen ist ein Semester, wenn es vor dem aktuellen liegt; die
+letzten KEEP_SEMESTERS abgeschlossenen Semester bleiben online. Eine
+Zeile wird nur archiviert, wenn ihre Veranstaltung keinen Termin nach
+dem Stichtag mehr hat; offene (unbezahlte) Buchungen bleiben immer.
+
+Aufruf über `python archive.py` (siehe dort).
+"""
+import time
+from datetime import date, datetime, timedelta
+
+# Semesterbeginn (Monat, Tag): Sommersemester ab 1.4., Wintersemester ab 1.10.
+SEMESTER_STARTS = ((4, 1), (10, 1))
+KEEP_SEMESTERS = 1
+CHUNK_SIZE = 1000
+# Pause zwischen zwei Chunks (Sekunden), damit andere Transaktionen drankommen
+PAUSE = 0.05
+
+# Veranstaltung der Zeile hat keinen Termin am/nach dem Stichtag
+_CLOSED = (
+    "NOT EXISTS (SELECT 1 FROM Veranstaltung_Termine vt JOIN Termin tm ON tm.termin_id = vt.termin_id "
+    "WHERE vt.veranstaltungs_id = t.veranstaltungs_id AND tm.datum >= %(cutoff)s)"
+)
+
+# Quelltabelle -> Archiv, Auswahlbedingung und mitzuverschiebende abhängige Tabellen
+ARCHIVE_JOBS = [
+    {
+        "table": "Buchung",
+        "archive": "Buchung_Archiv",
+        "pk": "buchungs_id",
+        "where": "t.datum < %(cutoff)s AND t.buchung_status IN ('bezahlt', 'storniert', 'wartend') AND " + _CLOSED,
+        "dependents": [("Rechnung", "Rechnung_Archiv", "buchungs_id")],
+    },
+    {
+        "table": "Feedback",
+        "archive": "Feedback_Archiv",
+        "pk": "feedback_id",
+        "where": (
+            "t.veranstaltungs_id IS NOT NULL AND EXISTS (SELECT 1 FROM Veranstaltung_Termine vt "
+            "WHERE vt.veranstaltungs_id = t.veranstaltungs_id) AND " + _CLOSED
+        ),
+        "dependents": [],
+    },
+]
+
+# Tabellen, deren Archiv der Tabellen-Browser bei einem Datumsfilter einbezieht
+ARCHIVE_DATE_COLUMNS = {"Buchung": ("Buchung_Archiv", "datum")}
+
+
+def semester_start(day: date) -> date:
+    """Erster Tag des Semesters, in dem `day` liegt."""
+    starts = [date(day.year, m, d) for m, d in SEMESTER_STARTS if (m, d) <= (day.month, day.day)]
+    if starts:
+        return starts[-1]
+    month, d = SEMESTER_STARTS[-1]
+    return date(day.year - 1, month, d)
+
+
+def archive_cutoff(today: date = None, keep_semesters: int = KEEP_SEMESTERS) -> datetime:
+    """
+    Stichtag der Archivierung: Beginn des ältesten Semesters, das online bleibt.
+
+    Args:
+        today (date, optional): Bezugsdatum (Default: heute).
+        keep_semesters (int, optional): Abgeschlossene Semester, die online bleiben.
+
+    Returns:
+        datetime: Zeilen davor werden archiviert.
+    """
+    start = semester_start(today or date.today())
+    for _ in range(keep_semesters):
+        start = semester_start(start - timedelta(days=1))
+    return datetime.combine(start, datetime.min.time())
+
+
+def common_columns(conn, table: str, archive: str) -> list:
+    """Spalten, die in Quelle und Archiv vorkommen (Reihenfolge der Quelle)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT c.COLUMN_NAME FROM information_schema.COLUMNS c "
+        "JOIN information_schema.COLUMNS a ON a.TABLE_SCHEMA = c.TABLE_SCHEMA "
+        "AND a.TABLE_NAME = %s AND a.COLUMN_NAME = c.COLUMN_NAME "
+        "WHERE c.TABLE_SCHEMA = DATABASE() AND c.TABLE_NAME = %s ORDER BY c.ORDINAL_POSITION;",
+        (archive, table),
+    )
+    columns = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return columns
+
+
+def count_candidates(conn, job: dict, cutoff: datetime) -> int:
+    """Anzahl der Zeilen, die ein Archivlauf verschieben würde."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM `{job['table']}` t WHERE {job['where']};", {"cutoff": cutoff})
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def _move_chunk(conn, job: dict, ids: list, columns: dict):
+    """Verschiebt eine Menge von Zeilen (samt abhängiger Zeilen) in einer Transaktion."""
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        for dep_table, dep_archive, fk in job["dependents"]:
+            cols = ", ".join(f"`{c}`" for c in columns[dep_table])
+            cursor.execute(
+                f"INSERT INTO `{dep_archive}` ({cols}) SELECT {cols} FROM `{dep_table}` WHERE `{fk}` IN ({placeholders});",
+                ids,
+            )
+            cursor.execute(f"DELETE FROM `{dep_table}` WHERE `{fk}` IN ({placeholders});", ids)
+        cols = ", ".join(f"`{c}`" for c in columns[job["table"]])
+        cursor.execute(
+            f"INSERT INTO `{job['archive']}` ({cols}) SELECT {cols} FROM `{job['table']}` WHERE `{job['pk']}` IN ({placeholders});",
+            ids,
+        )
+        cursor.execute(f"DELETE FROM `{job['table']}` WHERE `{job['pk']}` IN ({placeholders});", ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def archive_job(conn, job: dict, cutoff: datetime, chunk_size: int = CHUNK_SIZE, pause: float = PAUSE, log=print) -> int:
+    """
+    Verschiebt alle passenden Zeilen einer Tabelle chunkweise ins Archiv.
+
+    Die Kandidaten werden per Keyset über den Primärschlüssel gelesen;
+    jeder Chunk prüft die Bedingung beim Verschieben nicht erneut, läuft
+    aber in einer eigenen Transaktion und sperrt nur seine Zeilen.
+
+    Returns:
+        int: Anzahl verschobener Zeilen.
+    """
+    columns = {job["table"]: common_columns(conn, job["table"], job["archive"])}
+    for dep_table, dep_archive, _ in job["dependents"]:
+        columns[dep_table] = common_columns(conn, dep_table, dep_archive)
+
+    moved, last_id = 0, None
+    cursor = conn.cursor()
+    try:
+        while True:
+            after = f" AND t.`{job['pk']}` > %(last_id)s" if last_id is not None else ""
+            cursor.execute(
+                f"SELECT t.`{job['pk']}` FROM `{job['table']}` t WHERE {job['where']}{after} "
+                f"ORDER BY t.`{job['pk']}` LIMIT {int(chunk_size)};",
+                {"cutoff": cutoff, "last_id": last_id},
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                break
+            _move_chunk(conn, job, ids, columns)
+            moved += len(ids)
+            last_id = ids[-1]
+            log(f"{job['table']}: {moved} Zeilen archiviert (bis {job['pk']} {last_id})")
+            if pause:
+                time.sleep(pause)
+    finally:
+        cursor.close()
+    return moved
+
+
+def run_archive(conn, today: date = None, keep_semesters: int = KEEP_SEMESTERS, chunk_size: int = CHUNK_SIZE,
+                pause: float = PAUSE, dry_run: bool = False, log=print) -> dict:
+    """
+    Archiviert Buchungen und Feedback aller abgeschlossenen Semester.
+
+    Args:
+        conn: Verbindung mit Schreibrechten auf Live- und Archivtabellen.
+        today (date, optional): Bezugsdatum (Default: heute).
+        keep_semesters (int, optional): Abgeschlossene Semester, die online bleiben.
+        chunk_size (int, optional): Zeilen pro Transaktion.
+        pause (float, optional): Pause zwischen Chunks in Sekunden.
+        dry_run (bool, optional): Nur zählen, nichts verschieben.
+        log (callable, optional): Ausgabe von Fortschrittsmeldungen.
+
+    Returns:
+        dict: Tabelle -> Anzahl (verschobener bzw. im Dry-Run betroffener) Zeilen.
+    """
+    cutoff = archive_cutoff(today, keep_semesters)
+    log(f"Stichtag: {cutoff:%d.%m.%Y}")
+    result = {}
+    for job in ARCHIVE_JOBS:
+        if dry_run:
+            result[job["table"]] = count_candidates(conn, job, cutoff)
+        else:
+            result[job["table"]] = archive_job(conn, job, cutoff, chunk_size, pause, log)
+    return result
+
+
+def archive_horizon(conn, table: str):
+    """
+    Jüngstes archiviertes Datum einer Tabelle aus ARCHIVE_DATE_COLUMNS.
+
+    Returns:
+        datetime: MAX(Datumsspalte) des Archivs oder None (leer bzw. kein Archiv).
+    """
+    if table not in ARCHIVE_DATE_COLUMNS:
+        return None
+    archive, column = ARCHIVE_DATE_COLUMNS[table]
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT MAX(`{column}`) FROM `{archive}`;")
+        return cursor.fetchone()[0]
+    except Exception:
+        # Migration 0004 nicht angewendet oder keine Leserechte
+        return None
+    finally:
+        cursor.close()
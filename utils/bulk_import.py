@@ -0,0 +1,414 @@
+# utils/bulk_import.py
+"""
+CSV-Massenimport in eine Tabelle (z.B. Kursteilnehmer/Buchungen eines Semesters).
+
+Statt einer Zeile pro Klick wie im Editor:
+
+1. `read_csv` liest die Datei komplett als Text (Trennzeichen , oder ;).
+2. `validate` prüft und wandelt alle Spalten vektorisiert gegen das Schema
+   (DESCRIBE) um: Zahlen, Datumswerte (ISO oder TT.MM.JJJJ), ENUM-Optionen,
+   Textlänge, NOT NULL, einfache CHECK-Constraints (BETWEEN, IN,
+   Vergleiche) und Fremdschlüssel über eine gebündelte Abfrage pro FK
+   statt einer pro Zeile. Doppelte Primärschlüssel in der Datei und schon
+   vorhandene werden ebenfalls abgewiesen.
+3. `load_rows` schreibt die gültigen Zeilen mit `executemany` in Chunks
+   von CHUNK_SIZE Zeilen, jeder Chunk in einer Transaktion. Scheitert ein
+   Chunk (z.B. an einem Trigger), wird er zeilenweise hinter SAVEPOINTs
+   wiederholt: nur die fehlerhaften Zeilen fallen heraus. Deadlocks und
+   Lock-Wait-Timeouts wiederholen den ganzen Chunk; ein Abbruch liefert
+   ein Teilergebnis mit den schon committeten Zeilen.
+
+Trigger wie `check_teilnahme_moeglich` laufen weiterhin pro Zeile (das
+legt MySQL fest); gespart werden die Roundtrips und COMMITs pro Zeile.
+"""
+import io
+import re
+import time
+from typing import TYPE_CHECKING
+
+# pandas und mysql.connector werden erst in den Funktionen importiert
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Zeilen pro executemany/Transaktion
+CHUNK_SIZE = 1000
+# Höchstens so viele Werte pro IN (...) bei der Fremdschlüssel-Prüfung
+LOOKUP_CHUNK = 1000
+# Wiederholungen eines Chunks, den der Server komplett zurückgerollt hat
+MAX_RETRIES = 2
+# Wartezeit vor der n-ten Wiederholung: n * RETRY_PAUSE (Sekunden)
+RETRY_PAUSE = 0.2
+
+# MySQL: Deadlock bzw. Lock-Wait-Timeout, Transaktion wurde zurückgerollt
+_ROLLED_BACK = (1213, 1205)
+
+_RANGE = re.compile(r"^\(?`?(\w+)`?\s+between\s+(-?[\d.]+)\s+and\s+(-?[\d.]+)\)?$", re.I)
+_IN = re.compile(r"^\(?`?(\w+)`?\s+in\s*\((.*)\)\)?$", re.I | re.S)
+_COMPARE = re.compile(r"^\(?`?(\w+)`?\s*(>=|<=|>|<|<>|!=)\s*(-?[\d.]+)\)?$")
+_STRING = re.compile(r"(?:_\w+)?'((?:[^']|'')*)'")
+
+
+def read_csv(data: bytes) -> "pd.DataFrame":
+    """
+    Liest eine CSV-Datei komplett als Text (Umwandlung erst in `validate`).
+
+    Das Trennzeichen (, oder ;) wird aus der Kopfzeile erkannt; leere Felder
+    werden zu NULL.
+
+    Raises:
+        ValueError: Wenn die Datei nicht gelesen werden kann.
+    """
+    import pandas as pd
+
+    text = data.decode("utf-8-sig")
+    header = text.split("\n", 1)[0]
+    sep = ";" if header.count(";") > header.count(",") else ","
+    try:
+        df = pd.read_csv(io.StringIO(text), sep=sep, dtype=str, keep_default_na=False, skipinitialspace=True)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise ValueError(f"CSV-Datei kann nicht gelesen werden: {e}") from e
+    df.columns = [c.strip() for c in df.columns]
+    return df.apply(lambda s: s.str.strip()).replace("", None)
+
+
+def load_checks(conn, table_name: str) -> list:
+    """
+    CHECK-Constraints einer Tabelle als (Spalte, Art, Werte).
+
+    Art ist "range" (min, max), "in" (erlaubte Werte) oder ein Vergleich
+    (">=", ...). Andere Ausdrücke prüft erst die Datenbank beim Einfügen.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT cc.CHECK_CLAUSE FROM information_schema.TABLE_CONSTRAINTS tc "
+            "JOIN information_schema.CHECK_CONSTRAINTS cc "
+            "ON cc.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA AND cc.CONSTRAINT_NAME = tc.CONSTRAINT_NAME "
+            "WHERE tc.TABLE_SCHEMA = DATABASE() AND tc.TABLE_NAME = %s AND tc.CONSTRAINT_TYPE = 'CHECK';",
+            (table_name,),
+        )
+        clauses = [row[0] for row in cursor.fetchall()]
+    except Exception:
+        # Server ohne CHECK_CONSTRAINTS (MySQL < 8.0.16): nur die Datenbank prüft
+        clauses = []
+    finally:
+        cursor.close()
+    return [check for check in (parse_check(c) for c in clauses) if check]
+
+
+def parse_check(clause: str):
+    """Wandelt eine CHECK_CLAUSE in (Spalte, Art, Werte) um, oder None wenn nicht unterstützt."""
+    clause = clause.strip()
+    match = _RANGE.match(clause)
+    if match:
+        return match.group(1), "range", (float(match.group(2)), float(match.group(3)))
+    match = _IN.match(clause)
+    if match:
+        return match.group(1), "in", [v.replace("''", "'") for v in _STRING.findall(match.group(2))]
+    match = _COMPARE.match(clause)
+    if match:
+        return match.group(1), match.group(2), float(match.group(3))
+    return None
+
+
+def load_foreign_keys(conn, table_name: str) -> dict:
+    """Spalte -> (referenzierte Tabelle, referenzierte Spalte) für einspaltige Fremdschlüssel."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+        "FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL;",
+        (table_name,),
+    )
+    fks = {column: (ref_table, ref_column) for column, ref_table, ref_column in cursor.fetchall()}
+    cursor.close()
+    return fks
+
+
+def existing_values(conn, table_name: str, column: str, values: list) -> set:
+    """Welche der Werte gibt es in `table_name`.`column`? (gebündelt, LOOKUP_CHUNK Werte pro Abfrage)"""
+    found = set()
+    cursor = conn.cursor()
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"SELECT `{column}` FROM `{table_name}` WHERE `{column}` IN ({placeholders});", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    cursor.close()
+    return found
+
+
+def _coerce(series, typ: str, enum_opts):
+    """
+    Wandelt eine Textspalte gemäß Spaltentyp um.
+
+    Returns:
+        tuple: (umgewandelte Spalte, Maske ungültiger Werte, Fehlertext)
+    """
+    import pandas as pd
+
+    present = series.notna()
+    typ = typ.lower()
+    if enum_opts:
+        return series, present & ~series.isin(enum_opts), f"nicht in {enum_opts}"
+    if "int" in typ:
+        numbers = pd.to_numeric(series, errors="coerce")
+        bad = present & (numbers.isna() | (numbers % 1 != 0))
+        if "unsigned" in typ:
+            bad |= present & (numbers < 0)
+        return numbers.where(~bad).astype("Int64"), bad, "keine (passende) Ganzzahl"
+    if any(x in typ for x in ("decimal", "float", "double")):
+        numbers = pd.to_numeric(series.str.replace(",", ".", regex=False), errors="coerce")
+        return numbers, present & numbers.isna(), "keine Zahl"
+    if "date" in typ or "timestamp" in typ:
+        parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
+        for fmt in ("%d.%m.%Y", "%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S"):
+            missing = present & parsed.isna()
+            if not missing.any():
+                break
+            parsed[missing] = pd.to_datetime(series[missing], errors="coerce", format=fmt)
+        return parsed, present & parsed.isna(), "kein Datum (JJJJ-MM-TT oder TT.MM.JJJJ)"
+    length = re.search(r"char\((\d+)\)", typ)
+    if length:
+        return series, present & (series.str.len() > int(length.group(1))), f"länger als {length.group(1)} Zeichen"
+    return series, pd.Series(False, index=series.index), ""
+
+
+def validate(conn, table_name: str, df: "pd.DataFrame", schema: list, checks: list = None,
+             foreign_keys: dict = None) -> tuple:
+    """
+    Prüft und wandelt eine eingelesene CSV vektorisiert gegen das Tabellenschema um.
+
+    Args:
+        conn: Datenbankverbindung (für Fremdschlüssel/Primärschlüssel-Abfragen).
+        table_name (str): Zieltabelle.
+        df (pd.DataFrame): Ergebnis von `read_csv`.
+        schema (list): DESCRIBE-Zeilen wie `get_table_schema`.
+        checks (list, optional): Ergebnis von `load_checks`.
+        foreign_keys (dict, optional): Ergebnis von `load_foreign_keys`.
+
+    Returns:
+        tuple: (gültige Zeilen als DataFrame mit Spaltennamen der Tabelle,
+                abgewiesene Zeilen: Originalwerte + "zeile" + "fehler")
+
+    Raises:
+        ValueError: Bei unbekannten oder fehlenden Pflichtspalten.
+    """
+    import pandas as pd
+    from components.table_editor import _parse_enum_options
+
+    by_name = {col["name"].lower(): col for col in schema}
+    unknown = [c for c in df.columns if c.lower() not in by_name]
+    if unknown:
+        raise ValueError(f"Unbekannte Spalten: {', '.join(unknown)}")
+    df = df.rename(columns={c: by_name[c.lower()]["name"] for c in df.columns})
+    required = [
+        col["name"] for col in schema
+        if col["null"] == "NO" and col["default"] is None and "auto_increment" not in (col["extra"] or "").lower()
+    ]
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"Pflichtspalten fehlen: {', '.join(missing)}")
+
+    errors = pd.Series("", index=df.index)
+
+    def reject(mask, text):
+        errors.loc[mask] += text + "; "
+
+    values = {}
+    for name in df.columns:
+        col = by_name[name.lower()]
+        enum_opts = _parse_enum_options(col["type"])
+        series, bad, text = _coerce(df[name], col["type"], enum_opts)
+        reject(bad, f"{name}: {text}")
+        auto = "auto_increment" in (col["extra"] or "").lower()
+        if col["default"] is not None and not auto:
+            # Leere Felder bekommen den Standardwert der Spalte (auch in Spalten mit NULL),
+            # wie beim Weglassen der Spalte im INSERT
+            series = series.where(df[name].notna(), _default_value(col, enum_opts))
+        elif col["null"] == "NO" and not auto:
+            reject(df[name].isna(), f"{name}: Pflichtfeld leer")
+        values[name] = series
+
+    for column, kind, bounds in checks or []:
+        if column not in values:
+            continue
+        series = values[column]
+        if kind == "in":
+            bad = series.notna() & ~series.isin(bounds)
+        else:
+            numbers = pd.to_numeric(series, errors="coerce")
+            ok = {
+                "range": lambda: numbers.between(*bounds), ">=": lambda: numbers >= bounds,
+                "<=": lambda: numbers <= bounds, ">": lambda: numbers > bounds, "<": lambda: numbers < bounds,
+                "<>": lambda: numbers != bounds, "!=": lambda: numbers != bounds,
+            }[kind]()
+            bad = numbers.notna() & ~ok
+        reject(bad, f"{column}: verletzt CHECK ({kind} {bounds})")
+
+    for column, (ref_table, ref_column) in (foreign_keys or {}).items():
+        if column not in values:
+            continue
+        series = values[column]
+        keys = [_plain(v) for v in series.dropna().unique()]
+        found = {_plain(v) for v in existing_values(conn, ref_table, ref_column, keys)}
+        reject(series.notna() & ~series.map(lambda v: _plain(v) in found), f"{column}: fehlt in {ref_table}")
+
+    pk_cols = [col["name"] for col in schema if col["key"] == "PRI"]
+    if pk_cols and all(c in values for c in pk_cols):
+        keys = pd.DataFrame({c: values[c] for c in pk_cols})
+        complete = keys.notna().all(axis=1)
+        reject(complete & keys.duplicated(keep="first"), "Primärschlüssel doppelt in der Datei")
+        if len(pk_cols) == 1:
+            pk = values[pk_cols[0]]
+            taken = existing_values(conn, table_name, pk_cols[0], [_plain(v) for v in pk.dropna().unique()])
+            taken = {_plain(v) for v in taken}
+            reject(pk.notna() & pk.map(lambda v: _plain(v) in taken), "Primärschlüssel existiert bereits")
+
+    ok = errors == ""
+    valid = pd.DataFrame(values)[ok]
+    rejected = df[~ok].copy()
+    rejected.insert(0, "fehler", errors[~ok].str.rstrip("; "))
+    # Zeilennummer wie im Editor/Tabellenprogramm (Kopfzeile = 1)
+    rejected.insert(0, "zeile", rejected.index + 2)
+    return valid, rejected
+
+
+def _default_value(col: dict, enum_opts):
+    """Standardwert einer Spalte (DESCRIBE) im Typ der umgewandelten Spalte."""
+    import pandas as pd
+
+    default = col["default"]
+    if default.upper().startswith("CURRENT_TIMESTAMP"):
+        return pd.Timestamp.now().floor("s")
+    return _coerce(pd.Series([default], dtype=object), col["type"], enum_opts)[0].iloc[0]
+
+
+def _plain(value):
+    """numpy-/pandas-Werte -> Python-Werte (für Vergleiche und als Parameter; NaN/NaT/NA -> None)."""
+    import pandas as pd
+
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def to_rows(valid: "pd.DataFrame") -> list:
+    """Gültige Zeilen als Parameter-Tupel für executemany (NULL = None)."""
+    columns = [[_plain(v) for v in valid[c].tolist()] for c in valid.columns]
+    return list(zip(*columns))
+
+
+def load_rows(conn, table_name: str, columns: list, rows: list, chunk_size: int = CHUNK_SIZE,
+              progress=None) -> dict:
+    """
+    Fügt Zeilen in Chunks per `executemany` ein, jeden Chunk in einer Transaktion.
+
+    Schlägt ein Chunk fehl, wird er in einer neuen Transaktion zeilenweise
+    hinter SAVEPOINTs wiederholt; fehlerhafte Zeilen werden übersprungen
+    und gemeldet, die übrigen committet. Rollt der Server die ganze
+    Transaktion zurück (Deadlock, Lock-Wait-Timeout), wird der Chunk bis zu
+    MAX_RETRIES-mal neu versucht. Bricht der Import danach oder an einem
+    anderen Fehler ab, bleiben die schon committeten Chunks bestehen; das
+    Ergebnis nennt sie und den Fehler, statt ihn weiterzuwerfen.
+
+    Args:
+        conn: Datenbankverbindung ohne offene Transaktion.
+        table_name (str): Zieltabelle.
+        columns (list): Spaltennamen in der Reihenfolge der Tupel.
+        rows (list): Parameter-Tupel (siehe `to_rows`).
+        chunk_size (int, optional): Zeilen pro Transaktion.
+        progress (callable, optional): Wird nach jedem Chunk mit (fertig, gesamt) aufgerufen.
+
+    Returns:
+        dict: inserted, failed (Liste von (Index in rows, Exception)),
+              error (Abbruchgrund oder None), stopped_at (Index der ersten
+              nicht mehr versuchten Zeile oder None), duration_ms und rows_per_s
+    """
+    column_sql = ", ".join(f"`{c}`" for c in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    query = f"INSERT INTO `{table_name}` ({column_sql}) VALUES ({placeholders})"
+    start = time.perf_counter()
+    inserted, failed = 0, []
+    error, stopped_at = None, None
+    for offset in range(0, len(rows), chunk_size):
+        chunk = rows[offset:offset + chunk_size]
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                done, chunk_failed = _load_chunk(conn, query, chunk)
+                break
+            except Exception as e:
+                if getattr(e, "errno", None) in _ROLLED_BACK and attempt < MAX_RETRIES:
+                    time.sleep(RETRY_PAUSE * (attempt + 1))
+                    continue
+                error, stopped_at = e, offset
+                break
+        if error is not None:
+            break
+        inserted += done
+        failed += [(offset + i, e) for i, e in chunk_failed]
+        if progress:
+            progress(min(offset + chunk_size, len(rows)), len(rows))
+    duration = time.perf_counter() - start
+    return {
+        "inserted": inserted,
+        "failed": failed,
+        "error": error,
+        "stopped_at": stopped_at,
+        "duration_ms": duration * 1000,
+        "rows_per_s": inserted / duration if duration else 0.0,
+    }
+
+
+def _load_chunk(conn, query: str, chunk: list):
+    """
+    Ein Chunk in einer Transaktion: erst executemany, bei Fehlern zeilenweise.
+
+    Returns:
+        tuple: (eingefügte Zeilen, Liste von (Index im Chunk, Exception))
+
+    Raises:
+        Exception: Bei Deadlock/Lock-Wait-Timeout und Fehlern außerhalb
+            einzelner Zeilen; die Transaktion ist dann zurückgerollt.
+    """
+    import mysql.connector as mysql
+
+    cursor = conn.cursor()
+    try:
+        try:
+            conn.start_transaction()
+            cursor.executemany(query, chunk)
+            conn.commit()
+            return len(chunk), []
+        except mysql.Error as e:
+            conn.rollback()
+            if e.errno in _ROLLED_BACK:
+                raise
+        inserted, failed = 0, []
+        conn.start_transaction()
+        for i, row in enumerate(chunk):
+            cursor.execute("SAVEPOINT bulk_row")
+            try:
+                cursor.execute(query, row)
+                inserted += 1
+            except mysql.Error as e:
+                if e.errno in _ROLLED_BACK:
+                    # Transaktion ist weg, samt SAVEPOINT: ganzen Chunk wiederholen
+                    raise
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                failed.append((i, e))
+        conn.commit()
+        return inserted, failed
+    except Exception:
+        # Keine offene Transaktion zurücklassen (auch bei Fehlern außerhalb der Datenbank)
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
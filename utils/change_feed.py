@@ -0,0 +1,393 @@
+# utils/change_feed.py
+"""
+Inkrementelle Aktualisierung des TableCache über die Tabelle `changelog`.
+
+Die Trigger aus migrations/0003_changelog.py protokollieren jede
+Änderung (Tabelle, Operation, Primärschlüssel) mit monoton steigender
+`change_id`. Statt nach einem Schreibzugriff die ganze Tabelle neu zu
+laden, liest der ChangeFeed nur die Protokolleinträge nach der zuletzt
+gesehenen ID, lädt die betroffenen Zeilen gezielt über den
+Primärschlüssel nach und patcht damit die zwischengespeicherten
+DataFrames und Spaltenstatistiken. Änderungen aus anderen Sitzungen
+(und von außerhalb der App) werden so beim nächsten Rerun sichtbar.
+
+- Cache-Einträge gehören zu einem Konto; betroffene Zeilen werden
+  immer mit dessen Verbindung nachgeladen. Änderungen für andere Konten
+  werden vorgemerkt, bis deren nächste Sitzung synchronisiert.
+- Einträge mit Joins und zu große Änderungsmengen (mehr als
+  MAX_PATCH_ROWS pro Tabelle) werden verworfen und wie bisher neu
+  geladen.
+- Kaskaden über Fremdschlüssel (ON DELETE/UPDATE CASCADE bzw. SET
+  NULL) lösen in MySQL keine Trigger aus. Wird in einer Elterntabelle
+  gelöscht oder ein Primärschlüssel geändert (Protokoll-Op "D"),
+  werden deshalb alle Einträge der abhängigen Tabellen verworfen
+  (rekursiv, aus information_schema.REFERENTIAL_CONSTRAINTS).
+- `change_id` wird beim Einfügen vergeben, nicht beim Commit: eine
+  Transaktion kann eine kleinere ID erst nach einer größeren sichtbar
+  machen. Übersprungene IDs werden als Lücken gemerkt und bei den
+  folgenden Abfragen mitgelesen, bis sie auftauchen oder nach
+  GAP_TIMEOUT Sekunden als zurückgerollt gelten.
+- Fehlt die Tabelle `changelog` (Migration nicht angewendet), fällt
+  `sync_changes` auf `invalidate_table` zurück.
+- Weitere prozessweite Strukturen (z.B. der Belegungsplan aus
+  utils/schedule.py) melden sich mit `add_listener` an und erfahren so
+  von jeder protokollierten Änderung.
+"""
+import json
+import threading
+import time
+
+import streamlit as st
+
+from utils.table_cache import TableCache, get_table_cache, invalidate_table
+
+# Mindestabstand zwischen zwei Abfragen des Protokolls (Sekunden)
+POLL_INTERVAL = 2.0
+# Höchstens so viele Protokolleinträge pro Abfrage; mehr -> alles neu laden
+MAX_CHANGES = 5000
+# Ab so vielen geänderten Zeilen einer Tabelle lohnt sich das Patchen nicht
+MAX_PATCH_ROWS = 500
+# Einträge im Protokoll, die älter sind, löscht `purge`
+RETENTION_HOURS = 24
+# So lange wird auf eine übersprungene change_id gewartet (Sekunden);
+# länger offene Transaktionen bzw. Rollbacks hinterlassen dauerhafte Lücken
+GAP_TIMEOUT = 300.0
+# Höchstens so viele Lücken werden gemerkt (die ältesten fallen weg)
+MAX_GAPS = 1000
+# Fremdschlüssel-Regeln, die abhängige Zeilen ohne Trigger ändern
+_CASCADE_RULES = ("CASCADE", "SET NULL")
+
+# MySQL: Tabelle existiert nicht bzw. keine Leserechte darauf
+_FEED_UNAVAILABLE = (1146, 1142)
+
+
+def _fetch_rows(conn, table_name: str, pk_cols: list, pks: list):
+    """Lädt die Zeilen zu den Primärschlüsseln als kompaktes DataFrame."""
+    from utils.dtypes import frame_from_cursor
+
+    cols = ", ".join(f"`{c}`" for c in pk_cols)
+    row = "(" + ", ".join(["%s"] * len(pk_cols)) + ")"
+    sql = f"SELECT * FROM `{table_name}` WHERE ({cols}) IN ({', '.join([row] * len(pks))})"
+    cursor = conn.cursor()
+    cursor.execute(sql, [v for pk in pks for v in pk])
+    df = frame_from_cursor(cursor)
+    cursor.close()
+    return df
+
+
+def load_cascades(conn) -> dict:
+    """
+    Fremdschlüssel, über die MySQL abhängige Zeilen ohne Trigger ändert.
+
+    Returns:
+        dict: Elterntabelle (klein) -> Menge der abhängigen Tabellen
+              (ON DELETE/UPDATE CASCADE bzw. SET NULL).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT REFERENCED_TABLE_NAME, TABLE_NAME, DELETE_RULE, UPDATE_RULE "
+            "FROM information_schema.REFERENTIAL_CONSTRAINTS WHERE CONSTRAINT_SCHEMA = DATABASE();"
+        )
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    cascades = {}
+    for parent, child, on_delete, on_update in rows:
+        if on_delete in _CASCADE_RULES or on_update in _CASCADE_RULES:
+            cascades.setdefault(parent.lower(), set()).add(child)
+    return cascades
+
+
+def cascaded(cascades: dict, tables) -> set:
+    """Alle Tabellen, die über Kaskaden (rekursiv) von `tables` abhängen."""
+    found = set()
+    todo = [t.lower() for t in tables]
+    while todo:
+        for child in cascades.get(todo.pop(), ()):
+            if child not in found:
+                found.add(child)
+                todo.append(child.lower())
+    return found
+
+
+def skipped_ids(last_id: int, change_id: int) -> range:
+    """IDs zwischen `last_id` und `change_id`, die (noch) fehlen; höchstens MAX_GAPS."""
+    return range(max(last_id + 1, change_id - MAX_GAPS), change_id)
+
+
+def patch_frame(df, rows, pk_cols: list, pks: list):
+    """
+    Ersetzt die Zeilen mit den gegebenen Primärschlüsseln durch `rows`.
+
+    Zeilen aus `pks`, die in `rows` fehlen, gelten als gelöscht. Das
+    Ergebnis ist wie beim Laden nach Primärschlüssel sortiert; Kategorien
+    bleiben Kategorien.
+
+    Returns:
+        pd.DataFrame: Gepatchtes DataFrame.
+    """
+    import pandas as pd
+
+    keep = ~pd.MultiIndex.from_frame(df[pk_cols]).isin(pks)
+    patched = pd.concat([df[keep], rows], ignore_index=True) if len(rows) else df[keep]
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and not isinstance(patched[col].dtype, pd.CategoricalDtype):
+            patched[col] = patched[col].astype("category")
+    return patched.sort_values(pk_cols, kind="stable").reset_index(drop=True)
+
+
+class ChangeFeed:
+    """
+    Liest das Änderungsprotokoll und patcht den TableCache.
+
+    Args:
+        cache (TableCache): Zu aktualisierender Cache.
+        poll_interval (float, optional): Mindestabstand zwischen Abfragen.
+    """
+
+    def __init__(self, cache: TableCache, poll_interval: float = POLL_INTERVAL):
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.available = True
+        self.last_id = None
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+        # Konto -> Tabelle -> Menge von Primärschlüssel-Tupeln
+        self._pending = {}
+        self._pk_cols = {}
+        self._accounts = set()
+        self._listeners = []
+        # Übersprungene change_id -> Zeitpunkt, seit dem sie fehlt
+        self._gaps = {}
+        # Elterntabelle (klein) -> abhängige Tabellen mit Kaskade; pro Konto ergänzt,
+        # da information_schema nur sichtbare Tabellen zeigt
+        self._cascades = {}
+        self._cascade_accounts = set()
+
+    def add_listener(self, callback):
+        """
+        Meldet `callback(table_name, pks)` für neue Protokolleinträge an.
+
+        `pks` ist eine Liste von Primärschlüssel-Dicts oder None, wenn die
+        Änderungen der Tabelle nicht einzeln bekannt sind (z.B. nach einer
+        Kaskade); table_name ist None, wenn alles neu zu laden ist.
+        Der Aufruf erfolgt unter der Sperre des Feeds
+        und sollte nur vormerken, nicht selbst abfragen.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def notify(self, table_name: str = None, pks: list = None):
+        """Benachrichtigt alle Listener (z.B. nach einem Schreibzugriff ohne Protokoll)."""
+        with self._lock:
+            self._notify(table_name, pks)
+
+    def _notify(self, table_name, pks):
+        for callback in self._listeners:
+            callback(table_name, pks)
+
+    def _poll(self, conn):
+        """Liest neue Protokolleinträge und merkt sie für alle Konten im Cache vor."""
+        now = time.monotonic()
+        for change_id in [i for i, since in self._gaps.items() if now - since > GAP_TIMEOUT]:
+            del self._gaps[change_id]
+        cursor = conn.cursor()
+        try:
+            if self.last_id is None:
+                cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM changelog;")
+                self.last_id = cursor.fetchone()[0]
+                return
+            gaps = sorted(self._gaps)
+            gap_filter = f" OR change_id IN ({', '.join(['%s'] * len(gaps))})" if gaps else ""
+            cursor.execute(
+                f"SELECT change_id, table_name, op, pk FROM changelog WHERE change_id > %s{gap_filter} "
+                f"ORDER BY change_id LIMIT {MAX_CHANGES + 1};",
+                (self.last_id, *gaps),
+            )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        if not rows:
+            return
+        # Auch Konten ohne Einträge: deren Ladevorgang kann gerade laufen
+        accounts = self.cache.accounts() | self._accounts
+        if len(rows) > MAX_CHANGES:
+            # Zu weit zurück: alles verwerfen und beim aktuellen Stand weitermachen.
+            # Den Stand vor dem Verwerfen lesen: Was danach neu geladen wird, ist mindestens
+            # so aktuell, spätere Änderungen kommen mit der nächsten Abfrage.
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM changelog;")
+                head = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            self.cache.invalidate()
+            self._pending.clear()
+            self._gaps.clear()
+            self.last_id = head
+            self._notify(None, None)
+            return
+        changed = {}
+        deleted = set()
+        for change_id, table_name, op, pk in rows:
+            if self._gaps.pop(change_id, None) is None:
+                # Dazwischen fehlende IDs gehören zu noch offenen (oder zurückgerollten) Transaktionen
+                self._gaps.update(dict.fromkeys(skipped_ids(self.last_id, change_id), now))
+                self.last_id = change_id
+            pk = json.loads(pk) if isinstance(pk, (str, bytes)) else pk
+            self._pk_cols[table_name] = list(pk)
+            for account in accounts:
+                self._pending.setdefault(account, {}).setdefault(table_name, set()).add(tuple(pk.values()))
+            changed.setdefault(table_name, []).append(pk)
+            if op == "D":
+                deleted.add(table_name)
+        for change_id in sorted(self._gaps)[:-MAX_GAPS]:
+            del self._gaps[change_id]
+        for table_name, pks in changed.items():
+            # Laufende Ladevorgänge mit dem Stand davor speichern ihr Ergebnis nicht mehr
+            self.cache.bump(table_name)
+            self._notify(table_name, pks)
+        for table_name in cascaded(self._cascades, deleted):
+            # Von der Kaskade geänderte Zeilen stehen nicht im Protokoll: Tabelle neu laden
+            self.cache.invalidate(table_name)
+            for tables in self._pending.values():
+                tables.pop(table_name, None)
+            self._notify(table_name, None)
+        for account, tables in self._pending.items():
+            for table_name in [t for t, pks in tables.items() if len(pks) > MAX_PATCH_ROWS]:
+                # Patchen lohnt sich nicht mehr: Einträge verwerfen, werden neu geladen
+                del tables[table_name]
+                self._discard(account, table_name)
+
+    def _discard(self, account: str, table_name: str):
+        for key in self.cache.keys_for(table_name):
+            if key[0] == account:
+                self.cache.discard(key)
+
+    def sync(self, conn, account: str, force: bool = False) -> dict:
+        """
+        Holt neue Änderungen (höchstens alle poll_interval Sekunden, außer
+        mit force=True) und patcht die Einträge des Kontos.
+
+        Args:
+            conn: Verbindung mit den Rechten von `account`.
+            account (str): Konto der aktuellen Sitzung.
+            force (bool, optional): Sofort abfragen, z.B. nach einem eigenen Schreibzugriff.
+
+        Returns:
+            dict: Tabelle -> Anzahl geänderter Zeilen, die angewendet wurden.
+        """
+        with self._lock:
+            self._accounts.add(account)
+            if account not in self._cascade_accounts:
+                # Ergänzen statt ersetzen: information_schema zeigt nur sichtbare Tabellen
+                for parent, children in load_cascades(conn).items():
+                    self._cascades.setdefault(parent, set()).update(children)
+                self._cascade_accounts.add(account)
+            now = time.monotonic()
+            if force or now - self._last_poll >= self.poll_interval:
+                self._last_poll = now
+                self._poll(conn)
+            pending = self._pending.pop(account, {})
+            pk_cols = dict(self._pk_cols)
+
+        applied = {}
+        for table_name, pks in pending.items():
+            try:
+                self._apply(conn, account, table_name, pk_cols[table_name], list(pks))
+            except Exception:
+                # Lieber neu laden als veraltete Daten behalten
+                self._discard(account, table_name)
+                continue
+            applied[table_name] = len(pks)
+        if applied:
+            self.cache.bump()
+        return applied
+
+    def _apply(self, conn, account: str, table_name: str, pk_cols: list, pks: list):
+        from components.filter_panel import update_column_stats
+
+        generation = self.cache.table_generation(table_name)
+        keys = [key for key in self.cache.keys_for(table_name) if key[0] == account]
+        if not keys:
+            return
+        rows = _fetch_rows(conn, table_name, pk_cols, pks)
+        # Erst nach dem Patchen verwerfen: discard erhöht die Generation der Tabelle
+        stale = []
+        for key in keys:
+            entry = self.cache.get(key)
+            variant = key[2]
+            if entry is None or variant is True or not all(c in entry["df"].columns for c in pk_cols):
+                # Joins lassen sich nicht zeilenweise patchen
+                stale.append(key)
+                continue
+            df = patch_frame(entry["df"], rows, pk_cols, pks)
+            if isinstance(variant, tuple) and variant[0] == "page" and variant[1]:
+                limit = variant[1]
+                if len(entry["df"]) >= limit:
+                    # Volle Seite: Zeilen hinter ihrem letzten Schlüssel kennen wir nicht
+                    last = tuple(entry["df"][pk_cols].iloc[-1])
+                    df = df[[tuple(r) <= last for r in df[pk_cols].itertuples(index=False)]]
+                    if len(df) < limit:
+                        stale.append(key)
+                        continue
+                df = df.head(limit).reset_index(drop=True)
+            stats = update_column_stats(entry["stats"], df, rows) if entry["stats"] is not None else None
+            self.cache.put(key, df, stats, generation=generation)
+        for key in stale:
+            self.cache.discard(key)
+
+
+@st.cache_resource
+def get_change_feed() -> ChangeFeed:
+    """Ein gemeinsamer ChangeFeed pro Streamlit-Prozess."""
+    return ChangeFeed(get_table_cache())
+
+
+def sync_changes(conn, account: str, table_name: str = None, force: bool = False) -> dict:
+    """
+    Bringt den Cache des Kontos auf den Stand der Datenbank.
+
+    Ohne Änderungsprotokoll wird `table_name` (nur bei force, d.h. nach
+    einem eigenen Schreibzugriff) wie bisher komplett verworfen.
+
+    Returns:
+        dict: Tabelle -> Anzahl angewendeter Zeilenänderungen.
+    """
+    feed = get_change_feed()
+    if feed.available:
+        try:
+            return feed.sync(conn, account, force=force)
+        except Exception as e:
+            if getattr(e, "errno", None) not in _FEED_UNAVAILABLE:
+                raise
+            feed.available = False
+    if force:
+        invalidate_table(table_name)
+        feed.notify(table_name)
+    return {}
+
+
+def purge(conn, hours: int = RETENTION_HOURS) -> int:
+    """Löscht Protokolleinträge, die älter als `hours` Stunden sind."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM changelog WHERE changed_at < NOW() - INTERVAL %s HOUR;", (hours,))
+    deleted = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return deleted
+
+
+def main():
+    import sys
+    from utils.session import DBSession
+
+    hours = int(sys.argv[1]) if len(sys.argv) > 1 else RETENTION_HOURS
+    session = DBSession.from_secrets()
+    print(f"{purge(session.connection(), hours)} Protokolleinträge gelöscht.")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,68 @@
 # utils/database.py
 import toml
-from mysql.connector import connect
-import pandas as pd
 import json
 import os
 
+# pandas und mysql.connector werden erst bei Bedarf importiert,
+# damit der Start der App (erster Seitenaufbau) nicht auf sie wartet.
+
 JOIN_CONFIG_PATH = os.path.join("utils","join_config.json")
 SECRETS_PATH = os.path.join(".streamlit","secrets.toml")
+# Umgebungsvariable für das Datenbank-Backend ("mysql" oder "sqlite"), sonst [database] backend in secrets.toml
+BACKEND_ENV = "HS_DB_BACKEND"
+BACKENDS = ("mysql", "sqlite")
+
+
+def backend_name() -> str:
+    """
+    Liefert das konfigurierte Datenbank-Backend.
+
+    "sqlite" ist das In-Process-Testdouble aus utils/sqlite_backend.py
+    (Tests, Demos ohne MySQL-Server); Standard ist "mysql".
+
+    Raises:
+        ValueError: Bei einem unbekannten Backend.
+    """
+    name = os.environ.get(BACKEND_ENV)
+    if not name and os.path.exists(SECRETS_PATH):
+        name = toml.load(SECRETS_PATH).get("database", {}).get("backend")
+    name = (name or "mysql").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unbekanntes Datenbank-Backend: {name} (erlaubt: {', '.join(BACKENDS)})")
+    return name
+
+
+def connect(**kwargs):
+    """
+    Öffnet eine Verbindung über das konfigurierte Backend.
+
+    Args:
+        **kwargs: Parameter wie bei mysql.connector.connect (host, user, password, database, ...).
+    """
+    if backend_name() == "sqlite":
+        from utils.sqlite_backend import connect as backend_connect
+    else:
+        from mysql.connector import connect as backend_connect
+    return backend_connect(**kwargs)
+
+
+def connection_pool(**kwargs):
+    """
+    Erzeugt einen Verbindungspool über das konfigurierte Backend.
+
+    Args:
+        **kwargs: Parameter wie bei MySQLConnectionPool (pool_name, pool_size, Zugangsdaten).
+    """
+    if backend_name() == "sqlite":
+        from utils.sqlite_backend import SQLiteConnectionPool as Pool
+    else:
+        from mysql.connector.pooling import MySQLConnectionPool as Pool
+    return Pool(**kwargs)
 
 
 def get_connection(user=None, password=None, host="localhost", database="hochschulsport"):
     """
-    Stellt eine Verbindung zur MySQL-Datenbank her.
+    Stellt eine Verbindung zur MySQL-Datenbank (bzw. zum konfigurierten Backend) her.
 
     Falls kein user oder pw angegeben: 
     Liest Zugangsdaten aus .streamlit/secrets.toml und gibt eine offene Verbindung zurück.
@@ -88,7 +139,9 @@ def load_dataframe(conn, table_name, apply_joins=False):
 
     cursor.execute(query)
     data = cursor.fetchall()
-    columns = [col[0] for col in cursor.description]
+    description = cursor.description
     cursor.close()
-    df = pd.DataFrame(data, columns=columns)
+    # Spaltentypen aus cursor.description (speichersparend, siehe utils/dtypes.py)
+    from utils.dtypes import frame_from_rows
+    df = frame_from_rows(data, description)
     return df
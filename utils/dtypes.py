@@ -0,0 +1,203 @@
+# utils/dtypes.py
+"""
+Speichersparende DataFrames direkt aus MySQL-Ergebnissen.
+
+Statt `pd.DataFrame(rows, columns=...)` (INT -> int64/object, ENUM und
+DECIMAL als Python-Objekte pro Zeile) wird der Typ jeder Spalte aus
+`cursor.description` (Feldtyp + Flags) abgeleitet:
+
+- Ganzzahlen: kleinster passender Typ (int8 ... int64, unsigned bei
+  UNSIGNED), bei NULL-Werten die nullable-Varianten (Int8 ...).
+  Primärschlüssel bleiben int64, damit Eingaben im Editor nicht an
+  zu kleinen Typen scheitern.
+- ENUM/SET und VARCHAR mit wenigen verschiedenen Werten: category
+- DECIMAL: float64, FLOAT: float32
+- DATE/DATETIME/TIMESTAMP: datetime64
+- alles andere (Text, TIME, BLOB, JSON): unverändert (object)
+
+Aufruf `python -m utils.dtypes [Tabelle ...]` zeigt die Ersparnis pro Tabelle.
+"""
+from typing import TYPE_CHECKING
+
+# pandas, numpy und mysql.connector werden erst in den Funktionen importiert
+if TYPE_CHECKING:
+    import pandas as pd
+
+# VARCHAR wird zur Kategorie, wenn höchstens dieser Anteil der Werte verschieden ist ...
+CATEGORY_MAX_RATIO = 0.5
+# ... und die Spalte mindestens so viele Werte hat (sonst lohnt es sich nicht)
+CATEGORY_MIN_ROWS = 50
+
+_INT_TYPES = ("int8", "int16", "int32", "int64")
+_UINT_TYPES = ("uint8", "uint16", "uint32", "uint64")
+_NULLABLE = {name: name.capitalize() for name in _INT_TYPES}
+_NULLABLE.update({name: "UInt" + name[4:] for name in _UINT_TYPES})
+
+
+def _field_kinds():
+    """Feldtyp-Code -> Art ("int", "decimal", "float", "datetime", "string")."""
+    from mysql.connector.constants import FieldType
+
+    kinds = {}
+    for name in ("TINY", "SHORT", "INT24", "LONG", "LONGLONG", "YEAR"):
+        kinds[getattr(FieldType, name)] = "int"
+    for name in ("DECIMAL", "NEWDECIMAL"):
+        kinds[getattr(FieldType, name)] = "decimal"
+    kinds[FieldType.FLOAT] = "float"
+    kinds[FieldType.DOUBLE] = "double"
+    for name in ("DATE", "NEWDATE", "DATETIME", "TIMESTAMP"):
+        kinds[getattr(FieldType, name)] = "datetime"
+    for name in ("VARCHAR", "VAR_STRING", "STRING"):
+        kinds[getattr(FieldType, name)] = "string"
+    kinds[FieldType.ENUM] = "enum"
+    kinds[FieldType.SET] = "enum"
+    return kinds
+
+
+def _smallest_int(values: list, unsigned: bool) -> str:
+    import numpy as np
+
+    low, high = min(values), max(values)
+    for name in (_UINT_TYPES if unsigned and low >= 0 else _INT_TYPES):
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return name
+    return "object"
+
+
+def convert_column(values: list, field: tuple, kinds: dict = None):
+    """
+    Wandelt die Werte einer Ergebnisspalte in einen kompakten Typ um.
+
+    Args:
+        values (list): Werte der Spalte (None = NULL).
+        field (tuple): Eintrag aus `cursor.description`.
+        kinds (dict, optional): Vorberechnete Feldtyp-Zuordnung.
+
+    Returns:
+        Array/Liste, die direkt als DataFrame-Spalte verwendet werden kann.
+    """
+    import numpy as np
+    import pandas as pd
+    from mysql.connector.constants import FieldFlag
+
+    kinds = kinds or _field_kinds()
+    type_code = field[1]
+    flags = field[7] if len(field) > 7 and field[7] else 0
+    kind = kinds.get(type_code, "other")
+    if kind == "string" and flags & (FieldFlag.ENUM | FieldFlag.SET):
+        kind = "enum"
+    non_null = [v for v in values if v is not None]
+
+    if kind == "int":
+        if not non_null or flags & FieldFlag.PRI_KEY:
+            dtype = "int64"
+        else:
+            dtype = _smallest_int(non_null, bool(flags & FieldFlag.UNSIGNED))
+        if dtype == "object":
+            return values
+        if len(non_null) < len(values):
+            # nullable Integer (Int8, UInt16, ...)
+            return pd.array(values, dtype=_NULLABLE[dtype])
+        return np.array(values, dtype=dtype)
+    if kind in ("decimal", "double", "float"):
+        dtype = "float32" if kind == "float" else "float64"
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=dtype)
+    if kind == "datetime":
+        return pd.to_datetime(values, errors="coerce")
+    if kind == "enum":
+        return pd.Categorical(values)
+    if kind == "string" and not flags & FieldFlag.BINARY and len(values) >= CATEGORY_MIN_ROWS:
+        if len(set(non_null)) <= CATEGORY_MAX_RATIO * len(values):
+            return pd.Categorical(values)
+    return values
+
+
+def frame_from_rows(rows: list, description: list) -> "pd.DataFrame":
+    """
+    Baut ein speichersparendes DataFrame aus `fetchall()`-Zeilen.
+
+    Args:
+        rows (list): Zeilen als Tupel.
+        description (list): `cursor.description` der Abfrage.
+
+    Returns:
+        pd.DataFrame: DataFrame mit kompakten Spaltentypen.
+    """
+    import pandas as pd
+
+    names = [field[0] for field in description]
+    if not rows:
+        return pd.DataFrame(columns=names)
+    kinds = _field_kinds()
+    columns = list(zip(*rows))
+    data = {}
+    for i, field in enumerate(description):
+        data[i] = convert_column(list(columns[i]), field, kinds)
+    df = pd.DataFrame(data)
+    # Spaltennamen erst hier setzen: Joins können doppelte Namen liefern
+    df.columns = names
+    return df
+
+
+def frame_from_cursor(cursor) -> "pd.DataFrame":
+    """Liest das Ergebnis eines ausgeführten Cursors als kompaktes DataFrame."""
+    import pandas as pd
+
+    if not cursor.description:
+        return pd.DataFrame()
+    return frame_from_rows(cursor.fetchall(), cursor.description)
+
+
+def memory_savings(conn, table_name: str) -> dict:
+    """
+    Vergleicht den Speicherbedarf einer Tabelle ohne und mit Typumwandlung.
+
+    Returns:
+        dict: {"rows", "before", "after"} (Bytes, inkl. Python-Objekten).
+    """
+    import pandas as pd
+
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM `{table_name}`;")
+    rows = cursor.fetchall()
+    description = cursor.description
+    cursor.close()
+    naive = pd.DataFrame(rows, columns=[field[0] for field in description])
+    compact = frame_from_rows(rows, description)
+    return {
+        "rows": len(rows),
+        "before": int(naive.memory_usage(deep=True).sum()),
+        "after": int(compact.memory_usage(deep=True).sum()),
+    }
+
+
+def main():
+    import sys
+    from utils.session import DBSession
+
+    session = DBSession.from_secrets()
+    conn = session.connection()
+    tables = sys.argv[1:]
+    if not tables:
+        cursor = conn.cursor()
+        cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE';")
+        tables = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    total_before = total_after = 0
+    print(f"{'Tabelle':<30} {'Zeilen':>8} {'vorher KiB':>11} {'nachher KiB':>12} {'Ersparnis':>10}")
+    for table in tables:
+        result = memory_savings(conn, table)
+        total_before += result["before"]
+        total_after += result["after"]
+        share = 1 - result["after"] / result["before"] if result["before"] else 0.0
+        print(f"{table:<30} {result['rows']:>8} {result['before'] / 1024:>11.1f} "
+              f"{result['after'] / 1024:>12.1f} {share:>9.0%}")
+    if total_before:
+        print(f"{'Gesamt':<30} {'':>8} {total_before / 1024:>11.1f} {total_after / 1024:>12.1f} "
+              f"{1 - total_after / total_before:>9.0%}")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
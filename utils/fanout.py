@@ -0,0 +1,90 @@
+# utils/fanout.py
+"""
+Parallele Ausführung unabhängiger Abfragen eines Reruns.
+
+Ein Rerun der Tabellenansicht braucht mehrere Abfragen, die nicht
+voneinander abhängen (Tabellenliste, Tabelle + Spaltenstatistiken,
+Spaltennamen, erste Ergebnisseite, Anzahl Treffer). Nacheinander kostet
+das die Summe aller Roundtrips. `fan_out` verteilt sie auf die
+UI-Verbindung (im aufrufenden Thread) und zusätzliche Verbindungen aus
+dem Pool der Sitzung (in Worker-Threads); die Dauer entspricht dann etwa
+der langsamsten einzelnen Abfrage.
+
+Jede Verbindung wird nur von genau einem Thread benutzt. Ist der Pool
+ausgeschöpft (z.B. durch den Prefetcher), laufen die übrigen Aufgaben
+einfach nacheinander auf den vorhandenen Verbindungen.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# Zusätzliche Pool-Verbindungen pro Aufruf (eine Verbindung des Pools ist die UI-Verbindung)
+FANOUT_CONNECTIONS = 2
+# Worker-Threads für alle Sitzungen eines Prozesses
+FANOUT_THREADS = 8
+
+
+@st.cache_resource
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """Ein gemeinsamer Thread-Pool für `fan_out` pro Streamlit-Prozess."""
+    return ThreadPoolExecutor(max_workers=FANOUT_THREADS, thread_name_prefix="fanout")
+
+
+def fan_out(tasks: dict, conn, session=None, max_connections: int = FANOUT_CONNECTIONS) -> dict:
+    """
+    Führt unabhängige Aufgaben parallel auf mehreren Verbindungen aus.
+
+    Args:
+        tasks (dict): Name -> Funktion, die eine Verbindung bekommt und ein
+            Ergebnis liefert. Die Funktionen dürfen nicht auf st.session_state
+            zugreifen (Konto, Cache usw. vorher auslesen).
+        conn: Verbindung des aufrufenden Threads (UI-Verbindung).
+        session (DBSession, optional): Sitzung, aus deren Pool zusätzliche
+            Verbindungen geholt werden. Ohne Sitzung läuft alles seriell auf `conn`.
+        max_connections (int, optional): Höchstens so viele zusätzliche Verbindungen.
+
+    Returns:
+        dict: results (Name -> Ergebnis), errors (Name -> Exception),
+              timings (Name -> ms) und duration_ms (gesamt).
+    """
+    from mysql.connector.errors import PoolError
+
+    start = time.perf_counter()
+    pending = queue.SimpleQueue()
+    for item in tasks.items():
+        pending.put(item)
+    results, errors, timings = {}, {}, {}
+
+    def drain(c):
+        while True:
+            try:
+                name, fn = pending.get_nowait()
+            except queue.Empty:
+                return
+            task_start = time.perf_counter()
+            try:
+                results[name] = fn(c)
+            except Exception as e:
+                errors[name] = e
+            timings[name] = (time.perf_counter() - task_start) * 1000
+
+    extra = []
+    if session is not None:
+        for _ in range(min(max_connections, len(tasks) - 1)):
+            try:
+                extra.append(session.pooled())
+            except (PoolError, RuntimeError):
+                # Pool erschöpft bzw. Sitzung abgelaufen: seriell auf `conn` weiter
+                break
+    try:
+        futures = [get_fanout_executor().submit(drain, c) for c in extra]
+        drain(conn)
+        for future in futures:
+            future.result()
+    finally:
+        for c in extra:
+            c.close()
+    return {"results": results, "errors": errors, "timings": timings,
+            "duration_ms": (time.perf_counter() - start) * 1000}
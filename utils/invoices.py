@@ -0,0 +1,262 @@
+# utils/invoices.py
+"""
+Rechnungslauf zu Semesterbeginn: fehlende Rechnungen für alle offenen
+und bezahlten Buchungen anlegen und optional als Dokumente ausgeben.
+
+Erzeugt wird mengenbasiert per INSERT ... SELECT mit Anti-Join auf
+Rechnung.buchungs_id, chunkweise über den Primärschlüssel von Buchung
+(Keyset), jeder Chunk in einer eigenen kurzen Transaktion mit kurzer
+Pause dazwischen. Ein erneuter Lauf legt nur noch Fehlendes an.
+
+Der Betrag (Rechnung.betrag aus migrations/0006_invoice_amount.py)
+richtet sich nach der Teilnehmergruppe: Studierende zahlen
+preis_student, Beschäftigte preis_beschäftigte, Externe/Alumni und
+Teilnehmer ohne Gruppe preis_externe_alumni der Veranstaltung.
+
+Die Dokumente (HTML, eine Datei pro Rechnung) werden in parallelen
+Worker-Prozessen gerendert; der Hauptprozess liest dafür die Daten
+chunkweise aus der Datenbank, die Worker brauchen keine Verbindung.
+
+Aufruf über `python invoices.py` (siehe dort).
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+CHUNK_SIZE = 1000
+# Pause zwischen zwei Chunks (Sekunden), damit andere Transaktionen drankommen
+PAUSE = 0.05
+# Buchungsstatus, für die eine Rechnung gestellt wird
+INVOICE_STATUSES = ("bezahlt", "offen")
+# Absender neuer Rechnungen (Rechnung.sender, VARCHAR(50))
+SENDER = "Hochschulsport"
+# Rechnungen pro Auftrag an einen Worker-Prozess
+RENDER_BATCH = 50
+# Höchstens so viele gelesene Chunks warten gleichzeitig auf die Worker
+MAX_PENDING_CHUNKS = 2
+
+# Betrag nach Teilnehmergruppe (Aliase b/v/s/be wie in PRICE_JOINS)
+PRICE_SQL = (
+    "CASE WHEN s.teilnehmer_id IS NOT NULL THEN v.preis_student "
+    "WHEN be.teilnehmer_id IS NOT NULL THEN v.preis_beschäftigte "
+    "ELSE v.preis_externe_alumni END"
+)
+PRICE_JOINS = (
+    "JOIN Veranstaltung v ON v.veranstaltungs_id = b.veranstaltungs_id "
+    "LEFT JOIN Studierende s ON s.teilnehmer_id = b.teilnehmer_id "
+    "LEFT JOIN Beschäftigte be ON be.teilnehmer_id = b.teilnehmer_id "
+)
+
+_STATUS_IN = ", ".join(f"'{s}'" for s in INVOICE_STATUSES)
+# Buchungen ohne Rechnung (Anti-Join)
+_ANTI_JOIN = "LEFT JOIN Rechnung r ON r.buchungs_id = b.buchungs_id "
+_MISSING = f"WHERE b.buchung_status IN ({_STATUS_IN}) AND r.rechnungs_id IS NULL"
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8"><title>Rechnung {rechnungs_id}</title></head>
+<body>
+<p>{sender}</p>
+<p>An: {empfaenger}<br>{adresse}</p>
+<h1>Rechnung Nr. {rechnungs_id}</h1>
+<p>Buchung {buchungs_id} vom {datum}</p>
+<table>
+<tr><th>Leistung</th><th>Betrag</th></tr>
+<tr><td>{angebot} (Veranstaltung {veranstaltungs_id})</td><td>{betrag} €</td></tr>
+</table>
+<p>Status: {status}</p>
+<p>Bearbeitet von {angestellter}</p>
+</body></html>
+"""
+
+
+def count_missing(conn) -> int:
+    """Anzahl offener/bezahlter Buchungen ohne Rechnung."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM Buchung b {_ANTI_JOIN}{_MISSING};")
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def _insert_chunk(conn, low: int, high: int, angestellten_id: int, sender: str) -> list:
+    """
+    Legt die fehlenden Rechnungen für buchungs_id BETWEEN low AND high an (eine Transaktion).
+
+    Die Kandidaten werden vor dem INSERT in derselben Transaktion gelesen;
+    die neuen Rechnungen werden danach über deren buchungs_id zugeordnet
+    (nicht über die Reihenfolge der rechnungs_id).
+
+    Returns:
+        list: rechnungs_id der neuen Rechnungen.
+    """
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.execute(
+            f"SELECT b.buchungs_id FROM Buchung b {_ANTI_JOIN}{_MISSING} AND b.buchungs_id BETWEEN %s AND %s;",
+            (low, high),
+        )
+        candidates = [row[0] for row in cursor.fetchall()]
+        ids = []
+        if candidates:
+            keys = ", ".join(["%s"] * len(candidates))
+            # Anti-Join erneut: parallel angelegte Rechnungen nicht doppelt erzeugen
+            cursor.execute(
+                "INSERT INTO Rechnung (sender, empfänger, angestellten_id, buchungs_id, betrag) "
+                f"SELECT %s, LEFT(k.teilnehmer_name, 50), %s, b.buchungs_id, {PRICE_SQL} "
+                f"FROM Buchung b JOIN Kursteilnehmer k ON k.teilnehmer_id = b.teilnehmer_id {PRICE_JOINS}{_ANTI_JOIN}"
+                f"{_MISSING} AND b.buchungs_id IN ({keys});",
+                (sender, angestellten_id, *candidates),
+            )
+            if cursor.rowcount:
+                # Die Kandidaten hatten in dieser Transaktion keine Rechnung: alle gefundenen sind neu
+                cursor.execute(
+                    f"SELECT rechnungs_id FROM Rechnung WHERE buchungs_id IN ({keys}) ORDER BY rechnungs_id;",
+                    candidates,
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+        return ids
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def generate_invoices(conn, angestellten_id: int, sender: str = SENDER, chunk_size: int = CHUNK_SIZE,
+                      pause: float = PAUSE, log=print) -> list:
+    """
+    Legt für alle offenen/bezahlten Buchungen ohne Rechnung eine Rechnung an.
+
+    Die Kandidaten werden per Keyset über buchungs_id gelesen; das
+    INSERT ... SELECT prüft den Anti-Join für den Bereich erneut, sodass
+    parallel angelegte Rechnungen nicht doppelt entstehen.
+
+    Args:
+        conn: Verbindung mit INSERT-Recht auf Rechnung.
+        angestellten_id (int): Bearbeitender Verwaltungsangestellter.
+        sender (str, optional): Absender der Rechnungen.
+        chunk_size (int, optional): Buchungen pro Transaktion.
+        pause (float, optional): Pause zwischen Chunks in Sekunden.
+        log (callable, optional): Ausgabe von Fortschrittsmeldungen.
+
+    Returns:
+        list: rechnungs_id aller neu angelegten Rechnungen.
+    """
+    created, last_id = [], 0
+    cursor = conn.cursor()
+    try:
+        while True:
+            cursor.execute(
+                f"SELECT b.buchungs_id FROM Buchung b {_ANTI_JOIN}{_MISSING} AND b.buchungs_id > %s "
+                f"ORDER BY b.buchungs_id LIMIT {int(chunk_size)};",
+                (last_id,),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                break
+            created += _insert_chunk(conn, ids[0], ids[-1], angestellten_id, sender)
+            last_id = ids[-1]
+            log(f"Rechnung: {len(created)} angelegt (bis buchungs_id {last_id})")
+            if pause:
+                time.sleep(pause)
+    finally:
+        cursor.close()
+    return created
+
+
+def fetch_invoices(conn, rechnungs_ids: list) -> list:
+    """Daten für die Dokumente der angegebenen Rechnungen (Dicts, ein Zugriff)."""
+    if not rechnungs_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(rechnungs_ids))
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(
+        "SELECT r.rechnungs_id, r.sender, r.empfänger AS empfaenger, r.betrag, r.buchungs_id, "
+        "b.datum, b.buchung_status AS status, b.veranstaltungs_id, k.teilnehmer_adresse AS adresse, "
+        "sa.angebot_name AS angebot, va.angestellten_name AS angestellter "
+        "FROM Rechnung r "
+        "JOIN Buchung b ON b.buchungs_id = r.buchungs_id "
+        "JOIN Kursteilnehmer k ON k.teilnehmer_id = b.teilnehmer_id "
+        "JOIN Veranstaltung v ON v.veranstaltungs_id = b.veranstaltungs_id "
+        "LEFT JOIN Sportangebot sa ON sa.angebot_id = v.angebot_id "
+        "LEFT JOIN Verwaltungsangestellter va ON va.angestellten_id = r.angestellten_id "
+        f"WHERE r.rechnungs_id IN ({placeholders}) ORDER BY r.rechnungs_id;",
+        list(rechnungs_ids),
+    )
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def render_invoice(invoice: dict, out_dir: str) -> str:
+    """
+    Schreibt das Dokument einer Rechnung (läuft im Worker-Prozess).
+
+    Returns:
+        str: Pfad der Datei.
+    """
+    values = {k: escape("" if v is None else str(v)) for k, v in invoice.items()}
+    if invoice.get("datum") is not None:
+        values["datum"] = f"{invoice['datum']:%d.%m.%Y}"
+    if invoice.get("betrag") is not None:
+        values["betrag"] = f"{invoice['betrag']:.2f}".replace(".", ",")
+    path = os.path.join(out_dir, f"rechnung_{invoice['rechnungs_id']}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_TEMPLATE.format(**values))
+    return path
+
+
+def _render_batch(invoices: list, out_dir: str) -> int:
+    for invoice in invoices:
+        render_invoice(invoice, out_dir)
+    return len(invoices)
+
+
+def render_invoices(conn, rechnungs_ids: list, out_dir: str, workers: int = None,
+                    chunk_size: int = CHUNK_SIZE, log=print) -> int:
+    """
+    Rendert die Dokumente der angegebenen Rechnungen in parallelen Prozessen.
+
+    Der Hauptprozess liest die Daten chunkweise und verteilt sie in
+    Paketen zu RENDER_BATCH Rechnungen auf die Worker. Sind schon
+    MAX_PENDING_CHUNKS Chunks in Arbeit, wartet er auf den ältesten,
+    bevor er weiterliest (begrenzter Speicher auch bei vielen Rechnungen).
+
+    Args:
+        conn: Datenbankverbindung.
+        rechnungs_ids (list): Zu rendernde Rechnungen.
+        out_dir (str): Zielverzeichnis (wird angelegt).
+        workers (int, optional): Anzahl Prozesse (Default: Anzahl CPUs).
+        chunk_size (int, optional): Rechnungen pro Datenbankzugriff.
+        log (callable, optional): Ausgabe von Fortschrittsmeldungen.
+
+    Returns:
+        int: Anzahl geschriebener Dokumente.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    done = 0
+    next_log = chunk_size
+
+    def collect(futures):
+        nonlocal done, next_log
+        for future in futures:
+            done += future.result()
+            if done >= next_log or done == len(rechnungs_ids):
+                log(f"Dokumente: {done} von {len(rechnungs_ids)} geschrieben")
+                next_log = done + chunk_size
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in range(0, len(rechnungs_ids), chunk_size):
+            if len(pending) >= MAX_PENDING_CHUNKS:
+                collect(pending.popleft())
+            invoices = fetch_invoices(conn, rechnungs_ids[start:start + chunk_size])
+            pending.append([pool.submit(_render_batch, invoices[i:i + RENDER_BATCH], out_dir)
+                            for i in range(0, len(invoices), RENDER_BATCH)])
+        while pending:
+            collect(pending.popleft())
+    return done
@@ -0,0 +1,395 @@
+# utils/migrations.py
+"""
+Versionierte Schema-Migrationen für die Hochschulsport-Datenbank.
+
+Migrationen liegen in `migrations/` als `NNNN_name.sql` oder `NNNN_name.py`
+und werden in aufsteigender Reihenfolge genau einmal ausgeführt. Welche
+Versionen angewendet sind, steht in der Tabelle `schema_version`.
+
+- SQL-Migrationen: Statements werden nacheinander ausgeführt (DELIMITER
+  für Trigger/Prozeduren wird unterstützt). ALTER TABLE und CREATE INDEX
+  ohne eigene ALGORITHM-Angabe werden online-freundlich ausgeführt:
+  zuerst ALGORITHM=INSTANT, dann INPLACE mit LOCK=NONE, erst zuletzt
+  mit Tabellenkopie.
+- Python-Migrationen definieren `upgrade(ctx)` und nutzen
+  `ctx.execute`, `ctx.alter` und `ctx.backfill` (Backfill in Chunks über
+  den Primärschlüssel, jeder Chunk in einer kurzen Transaktion).
+- Ein Dry-Run (`estimate`) führt nichts aus und schätzt die Dauer pro
+  Statement anhand der Tabellengrößen aus information_schema.
+"""
+import hashlib
+import importlib.util
+import os
+import re
+import time
+
+from utils.sql_script import split_statements
+
+MIGRATIONS_DIR = "migrations"
+VERSION_TABLE = "schema_version"
+DATABASE = "hochschulsport"
+
+# Grobe Durchsatzwerte für Dry-Run-Schätzungen
+COPY_BYTES_PER_SEC = 40 * 1024 * 1024
+INPLACE_BYTES_PER_SEC = 80 * 1024 * 1024
+ROWS_PER_SEC = 50_000
+STATEMENT_OVERHEAD_SEC = 0.01
+
+# MySQL: Operation mit gewähltem ALGORITHM/LOCK nicht möglich
+_ALGORITHM_NOT_SUPPORTED = (1845, 1846)
+# MySQL: Tabelle existiert nicht
+_NO_SUCH_TABLE = 1146
+
+_FILE = re.compile(r"^(\d+)_([\w\-]+)\.(sql|py)$")
+_ALTER = re.compile(r"^\s*ALTER\s+TABLE\s+`?([\wÀ-ſ]+)`?", re.IGNORECASE)
+_CREATE_INDEX = re.compile(r"^\s*CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX\s+\S+\s+ON\s+`?([\wÀ-ſ]+)`?", re.IGNORECASE)
+_ACCOUNT_PREFIXES = ("CREATE USER", "CREATE ROLE", "GRANT", "SET DEFAULT ROLE", "FLUSH")
+_INSTANT_CANDIDATE = re.compile(
+    r"\b(ADD\s+COLUMN|ALTER\s+COLUMN\s+\S+\s+(SET|DROP)\s+DEFAULT|RENAME\s+COLUMN|RENAME\s+TO|DROP\s+COLUMN)\b",
+    re.IGNORECASE,
+)
+
+
+def is_account_statement(stmt: str) -> bool:
+    """True für Rollen-, Nutzer- und Rechteanweisungen (serverweit, nicht pro Datenbank)."""
+    return stmt.lstrip().upper().startswith(_ACCOUNT_PREFIXES)
+
+
+def discover_migrations(path: str = MIGRATIONS_DIR) -> list:
+    """
+    Liest alle Migrationen aus dem Verzeichnis.
+
+    Returns:
+        list: dicts mit version, name, path, kind ("sql"/"py") und checksum,
+              aufsteigend nach version sortiert.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(path)):
+        match = _FILE.match(filename)
+        if not match:
+            continue
+        full_path = os.path.join(path, filename)
+        with open(full_path, "rb") as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append({
+            "version": int(match.group(1)),
+            "name": match.group(2),
+            "path": full_path,
+            "kind": match.group(3),
+            "checksum": checksum,
+        })
+    versions = [m["version"] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Doppelte Migrationsversion in " + path)
+    return migrations
+
+
+def ensure_version_table(conn):
+    """Legt die Tabelle schema_version an, falls sie fehlt."""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS `{VERSION_TABLE}` ("
+        "version INT PRIMARY KEY, "
+        "name VARCHAR(200) NOT NULL, "
+        "checksum CHAR(64) NOT NULL, "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+        "duration_ms INT)"
+    )
+    cursor.close()
+
+
+def applied_versions(conn) -> dict:
+    """Bereits angewendete Versionen: version -> checksum (ohne schema_version: keine)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT version, checksum FROM `{VERSION_TABLE}`;")
+        return {version: checksum for version, checksum in cursor.fetchall()}
+    except Exception as e:
+        if getattr(e, "errno", None) != _NO_SUCH_TABLE:
+            raise
+        return {}
+    finally:
+        cursor.close()
+
+
+def pending_migrations(conn, path: str = MIGRATIONS_DIR, target: int = None) -> list:
+    """
+    Noch nicht angewendete Migrationen (bis einschließlich target).
+
+    Raises:
+        ValueError: Wenn eine bereits angewendete Migration nachträglich geändert wurde.
+    """
+    applied = applied_versions(conn)
+    pending = []
+    for migration in discover_migrations(path):
+        if target is not None and migration["version"] > target:
+            break
+        if migration["version"] in applied:
+            if applied[migration["version"]] != migration["checksum"]:
+                raise ValueError(
+                    f"Migration {migration['version']:04d}_{migration['name']} wurde nach dem Anwenden geändert."
+                )
+            continue
+        pending.append(migration)
+    return pending
+
+
+def _record(conn, migration: dict, duration_ms: int):
+    cursor = conn.cursor()
+    cursor.execute(
+        f"INSERT INTO `{VERSION_TABLE}` (version, name, checksum, duration_ms) VALUES (%s, %s, %s, %s);",
+        (migration["version"], migration["name"], migration["checksum"], duration_ms),
+    )
+    conn.commit()
+    cursor.close()
+
+
+def _table_sizes(conn) -> dict:
+    """Tabellenname (klein) -> (geschätzte Zeilen, Bytes inkl. Indizes)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH "
+        "FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE();"
+    )
+    sizes = {name.lower(): (rows or 0, size or 0) for name, rows, size in cursor.fetchall()}
+    cursor.close()
+    return sizes
+
+
+class MigrationContext:
+    """
+    Ausführungskontext einer Migration.
+
+    Im Dry-Run (dry_run=True) wird nichts ausgeführt; stattdessen sammelt
+    `estimates` pro Operation eine geschätzte Dauer in Sekunden.
+    """
+
+    def __init__(self, conn, database: str = DATABASE, dry_run: bool = False, skip_accounts: bool = False):
+        self.conn = conn
+        self.database = database
+        self.dry_run = dry_run
+        self.skip_accounts = skip_accounts
+        self.estimates = []
+        self._sizes = _table_sizes(conn) if dry_run else None
+
+    def _prepare(self, stmt: str) -> str:
+        if self.database != DATABASE:
+            stmt = re.sub(rf"\b{DATABASE}\b", self.database, stmt, flags=re.IGNORECASE)
+        return stmt
+
+    def execute(self, stmt: str, params=None):
+        """Führt ein Statement aus; ALTER TABLE/CREATE INDEX laufen über `alter`."""
+        if self.skip_accounts and is_account_statement(stmt):
+            return None
+        stmt = self._prepare(stmt)
+        if (_ALTER.match(stmt) or _CREATE_INDEX.match(stmt)) and not re.search(r"\bALGORITHM\b", stmt, re.IGNORECASE):
+            return self.alter(stmt)
+        if self.dry_run:
+            self.estimates.append((stmt, self._estimate_statement(stmt), "-"))
+            return None
+        cursor = self.conn.cursor()
+        cursor.execute(stmt, params)
+        if cursor.description:
+            cursor.fetchall()
+        rowcount = cursor.rowcount
+        cursor.close()
+        return rowcount
+
+    def alter(self, stmt: str) -> str:
+        """
+        Führt ALTER TABLE/CREATE INDEX möglichst online aus.
+
+        Reihenfolge: ALGORITHM=INSTANT, ALGORITHM=INPLACE + LOCK=NONE,
+        dann ohne Angabe (MySQL wählt ggf. COPY).
+
+        Returns:
+            str: Tatsächlich verwendeter Algorithmus.
+        """
+        import mysql.connector
+
+        stmt = self._prepare(stmt)
+        is_index = _CREATE_INDEX.match(stmt) is not None
+        if is_index:
+            attempts = [("INPLACE", " ALGORITHM=INPLACE LOCK=NONE"), ("DEFAULT", "")]
+        else:
+            attempts = [("INSTANT", ", ALGORITHM=INSTANT"),
+                        ("INPLACE", ", ALGORITHM=INPLACE, LOCK=NONE"),
+                        ("DEFAULT", "")]
+        if self.dry_run:
+            algorithm, seconds = self._estimate_alter(stmt, is_index)
+            self.estimates.append((stmt, seconds, algorithm))
+            return algorithm
+
+        cursor = self.conn.cursor()
+        try:
+            for algorithm, suffix in attempts:
+                try:
+                    cursor.execute(stmt.rstrip().rstrip(";") + suffix)
+                    return algorithm
+                except mysql.connector.Error as e:
+                    if e.errno not in _ALGORITHM_NOT_SUPPORTED or algorithm == "DEFAULT":
+                        raise
+        finally:
+            cursor.close()
+
+    def backfill(self, table: str, key: str, sql: str, chunk_size: int = 5000, pause: float = 0.0) -> int:
+        """
+        Führt ein UPDATE/INSERT ... SELECT in Chunks über den Primärschlüssel aus.
+
+        `sql` muss den Platzhalter `{range}` enthalten, der durch
+        "`key` BETWEEN lo AND hi" ersetzt wird. Jeder Chunk läuft in einer
+        eigenen kurzen Transaktion, damit keine langen Sperren entstehen.
+
+        Args:
+            table (str): Tabelle, über deren Schlüssel iteriert wird.
+            key (str): Numerischer Primärschlüssel.
+            sql (str): Statement mit {range}.
+            chunk_size (int, optional): Schlüsselbereich pro Chunk.
+            pause (float, optional): Pause zwischen Chunks in Sekunden.
+
+        Returns:
+            int: Anzahl betroffener Zeilen.
+        """
+        if "{range}" not in sql:
+            raise ValueError("Backfill-Statement braucht den Platzhalter {range}.")
+        sql = self._prepare(sql)
+        if self.dry_run:
+            rows = self._sizes.get(table.lower(), (0, 0))[0]
+            chunks = max(1, -(-rows // chunk_size))
+            seconds = rows / ROWS_PER_SEC + chunks * (STATEMENT_OVERHEAD_SEC + pause)
+            self.estimates.append((f"BACKFILL {table} ({chunks} Chunks à {chunk_size})", seconds, "-"))
+            return 0
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT MIN(`{key}`), MAX(`{key}`) FROM `{table}`;")
+        low, high = cursor.fetchone()
+        total = 0
+        if low is not None:
+            start = low
+            while start <= high:
+                end = start + chunk_size - 1
+                self.conn.start_transaction()
+                cursor.execute(sql.replace("{range}", f"`{key}` BETWEEN {int(start)} AND {int(end)}"))
+                total += max(cursor.rowcount, 0)
+                self.conn.commit()
+                start = end + 1
+                if pause:
+                    time.sleep(pause)
+        cursor.close()
+        return total
+
+    def _estimate_alter(self, stmt: str, is_index: bool):
+        match = _CREATE_INDEX.match(stmt) if is_index else _ALTER.match(stmt)
+        rows, size = self._sizes.get(match.group(1).lower(), (0, 0))
+        if not is_index and _INSTANT_CANDIDATE.search(stmt) and not re.search(r"\b(AFTER|FIRST)\b", stmt, re.IGNORECASE):
+            return "INSTANT", STATEMENT_OVERHEAD_SEC
+        if is_index or re.search(r"\bADD\s+(UNIQUE\s+|FULLTEXT\s+)?(INDEX|KEY)\b|\bDROP\s+(INDEX|KEY)\b", stmt, re.IGNORECASE):
+            return "INPLACE", STATEMENT_OVERHEAD_SEC + size / INPLACE_BYTES_PER_SEC
+        return "COPY", STATEMENT_OVERHEAD_SEC + size / COPY_BYTES_PER_SEC
+
+    def _estimate_statement(self, stmt: str) -> float:
+        if not re.match(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", stmt, re.IGNORECASE):
+            return STATEMENT_OVERHEAD_SEC
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("EXPLAIN " + stmt)
+            columns = [c[0].lower() for c in cursor.description]
+            rows = sum((row[columns.index("rows")] or 0) for row in cursor.fetchall())
+        except Exception:
+            # z.B. Tabelle existiert im Dry-Run noch nicht
+            rows = 0
+        finally:
+            cursor.close()
+        return STATEMENT_OVERHEAD_SEC + rows / ROWS_PER_SEC
+
+
+def load_migration_module(path: str):
+    """
+    Lädt eine Python-Migration als Modul.
+
+    Auch für spätere Migrationen, die Hilfsfunktionen einer früheren
+    wiederverwenden (z.B. die Trigger-Erzeugung aus 0003_changelog.py).
+    """
+    name = "migration_" + os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_migration(ctx: MigrationContext, migration: dict):
+    if migration["kind"] == "sql":
+        with open(migration["path"], encoding="utf-8") as f:
+            for stmt in split_statements(f.read()):
+                ctx.execute(stmt)
+    else:
+        load_migration_module(migration["path"]).upgrade(ctx)
+
+
+def migrate(conn, database: str = DATABASE, target: int = None, path: str = MIGRATIONS_DIR,
+            skip_accounts: bool = False, log=print) -> dict:
+    """
+    Wendet alle ausstehenden Migrationen an.
+
+    DDL ist in MySQL nicht transaktional: Schlägt eine Migration fehl,
+    wird sie nicht als angewendet markiert und muss nach der Korrektur
+    erneut laufen. Migrationen sollten daher möglichst idempotent sein
+    (IF NOT EXISTS usw.).
+
+    Args:
+        conn: Verbindung mit ausgewählter Zieldatenbank.
+        database (str, optional): Name der Zieldatenbank (für Kopien wird
+            "hochschulsport" in den Statements ersetzt).
+        target (int, optional): Höchste anzuwendende Version.
+        path (str, optional): Verzeichnis mit den Migrationen.
+        skip_accounts (bool, optional): Rollen/Nutzer/Rechte überspringen.
+        log (callable, optional): Ausgabe pro Migration (None = still).
+
+    Returns:
+        dict: "NNNN_name" -> Dauer in Sekunden.
+    """
+    ensure_version_table(conn)
+    durations = {}
+    for migration in pending_migrations(conn, path, target):
+        label = f"{migration['version']:04d}_{migration['name']}"
+        start = time.perf_counter()
+        _run_migration(MigrationContext(conn, database, skip_accounts=skip_accounts), migration)
+        conn.commit()
+        seconds = time.perf_counter() - start
+        _record(conn, migration, int(seconds * 1000))
+        durations[label] = seconds
+        if log:
+            log(f"{label}: {seconds:.2f}s")
+    return durations
+
+
+def estimate(conn, database: str = DATABASE, target: int = None, path: str = MIGRATIONS_DIR) -> list:
+    """
+    Dry-Run: schätzt die Dauer aller ausstehenden Migrationen, ohne etwas auszuführen.
+
+    Auch schema_version wird nicht angelegt; fehlt sie, gilt noch nichts als angewendet.
+
+    Returns:
+        list: (migration, statement, geschätzte Sekunden, Algorithmus) je Operation.
+    """
+    report = []
+    for migration in pending_migrations(conn, path, target):
+        ctx = MigrationContext(conn, database, dry_run=True)
+        _run_migration(ctx, migration)
+        label = f"{migration['version']:04d}_{migration['name']}"
+        report.extend((label, stmt, seconds, algorithm) for stmt, seconds, algorithm in ctx.estimates)
+    return report
+
+
+def mark_baseline(conn, version: int = 1, path: str = MIGRATIONS_DIR):
+    """
+    Markiert Migrationen bis `version` als angewendet, ohne sie auszuführen.
+
+    Für Datenbanken, die noch mit dem alten Setup (komplettes Skript)
+    angelegt wurden.
+    """
+    ensure_version_table(conn)
+    applied = applied_versions(conn)
+    for migration in discover_migrations(path):
+        if migration["version"] <= version and migration["version"] not in applied:
+            _record(conn, migration, 0)
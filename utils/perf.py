@@ -0,0 +1,52 @@
+# utils/perf.py
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+
+def count_rerun():
+    """Zählt die vollständigen Script-Durchläufe dieser Sitzung."""
+    st.session_state["perf_reruns"] = st.session_state.get("perf_reruns", 0) + 1
+
+
+@contextmanager
+def timed(section: str):
+    """
+    Misst die Laufzeit eines Abschnitts und speichert sie im Session State.
+
+    Pro Abschnitt werden Anzahl der Ausführungen, letzte und gesamte Dauer
+    festgehalten. Damit lässt sich prüfen, welche Teile der App bei einem
+    Rerun tatsächlich neu berechnet werden.
+
+    Args:
+        section (str): Name des Abschnitts (z.B. "sidebar", "ergebnis").
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(section, (time.perf_counter() - start) * 1000)
+
+
+def record(section: str, elapsed_ms: float):
+    """Trägt eine extern gemessene Dauer (z.B. aus einem Worker-Thread) für einen Abschnitt ein."""
+    sections = st.session_state.setdefault("perf_sections", {})
+    stats = sections.setdefault(section, {"runs": 0, "last_ms": 0.0, "total_ms": 0.0})
+    stats["runs"] += 1
+    stats["last_ms"] = elapsed_ms
+    stats["total_ms"] += elapsed_ms
+
+
+def show_perf_panel():
+    """Zeigt Rerun-Zähler und Abschnittszeiten in einem Sidebar-Expander an."""
+    with st.sidebar.expander("Performance", expanded=False):
+        st.write(f"Reruns (gesamte App): {st.session_state.get('perf_reruns', 0)}")
+        sections = st.session_state.get("perf_sections", {})
+        if sections:
+            st.table({
+                "Abschnitt": list(sections),
+                "Ausführungen": [s["runs"] for s in sections.values()],
+                "Letzte (ms)": [round(s["last_ms"], 1) for s in sections.values()],
+                "Gesamt (ms)": [round(s["total_ms"], 1) for s in sections.values()],
+            })
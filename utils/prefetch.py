@@ -0,0 +1,152 @@
+# utils/prefetch.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils.table_cache import get_cached_table, get_cached_page, TableCache
+
+# Höchstens so viele Nachbartabellen pro angezeigter Tabelle vorladen
+MAX_NEIGHBOURS = 4
+# Größere Tabellen (laut information_schema) werden nicht vorgeladen
+MAX_PREFETCH_ROWS = 200_000
+# Prefetch nur, solange der Cache zu weniger als diesem Anteil gefüllt ist
+MAX_CACHE_SHARE = 0.5
+
+
+def load_fk_neighbours(conn) -> dict:
+    """
+    Liest die Fremdschlüsselbeziehungen der aktuellen Datenbank.
+
+    Returns:
+        dict: Tabelle -> Liste der über FKs verbundenen Tabellen (beide
+              Richtungen, z.B. Buchung -> [Kursteilnehmer, Veranstaltung, Rechnung]).
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT TABLE_NAME, REFERENCED_TABLE_NAME "
+        "FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL;"
+    )
+    neighbours = {}
+    for table, referenced in cursor.fetchall():
+        if table == referenced:
+            continue
+        neighbours.setdefault(table, [])
+        neighbours.setdefault(referenced, [])
+        if referenced not in neighbours[table]:
+            neighbours[table].append(referenced)
+        if table not in neighbours[referenced]:
+            neighbours[referenced].append(table)
+    cursor.close()
+    return neighbours
+
+
+def _table_rows(conn, tables: list) -> dict:
+    """Geschätzte Zeilenzahlen aus information_schema (ohne COUNT(*))."""
+    placeholders = ", ".join(["%s"] * len(tables))
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+        f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({placeholders});",
+        tables,
+    )
+    rows = {name: (count or 0) for name, count in cursor.fetchall()}
+    cursor.close()
+    return rows
+
+
+class TablePrefetcher:
+    """
+    Lädt nach dem Anzeigen einer Tabelle deren FK-Nachbarn im Hintergrund.
+
+    Ein einzelner Worker-Thread wärmt für jede Nachbartabelle den
+    TableCache (ganze Tabelle + Spaltenstatistiken für das Filter-Panel
+    sowie die erste Ergebnisseite). Ein neuer Auftrag derselben Sitzung
+    bricht den vorherigen ab; begrenzt wird über MAX_NEIGHBOURS,
+    MAX_PREFETCH_ROWS und den Füllstand des Caches.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._futures = {}
+        self._neighbours = {}
+
+    def schedule(self, session, table_name: str, account: str, apply_joins: bool, limit, cache: TableCache):
+        """
+        Plant den Prefetch der Nachbarn von `table_name` für eine Sitzung.
+
+        Args:
+            session: DBSession, aus deren Pool der Worker eine Verbindung holt.
+            table_name (str): Gerade angezeigte Tabelle.
+            account (str): Konto (Cache-Schlüssel).
+            apply_joins (bool): Variante, in der die Sidebar Tabellen lädt.
+            limit: Limit der ersten Ergebnisseite (None = ohne Limit).
+            cache (TableCache): Zu befüllender Cache.
+        """
+        key = id(session)
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._futures[key] = self._executor.submit(
+                self._run, key, generation, session, table_name, account, apply_joins, limit, cache
+            )
+
+    def cancel(self, session):
+        """Bricht laufende/geplante Prefetches einer Sitzung ab (z.B. beim Logout)."""
+        key = id(session)
+        with self._lock:
+            self._generations.pop(key, None)
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _cancelled(self, key, generation) -> bool:
+        return self._generations.get(key) != generation
+
+    def _run(self, key, generation, session, table_name, account, apply_joins, limit, cache):
+        from components.filter_panel import column_stats
+
+        conn = None
+        try:
+            # Abgelaufene Sitzung: pooled() wirft, neu angemeldet wird nur im Skript-Thread
+            conn = session.pooled()
+            if account not in self._neighbours:
+                self._neighbours[account] = load_fk_neighbours(conn)
+            candidates = [
+                t for t in self._neighbours[account].get(table_name, [])
+                if cache.get((account, t, apply_joins)) is None
+            ][:MAX_NEIGHBOURS]
+            if not candidates:
+                return
+            sizes = _table_rows(conn, candidates)
+            for neighbour in candidates:
+                if self._cancelled(key, generation):
+                    return
+                if cache.size_bytes > cache.max_bytes * MAX_CACHE_SHARE:
+                    return
+                if sizes.get(neighbour, 0) > MAX_PREFETCH_ROWS:
+                    continue
+                entry = get_cached_table(conn, neighbour, apply_joins=apply_joins, account=account, cache=cache)
+                if entry["stats"] is None:
+                    entry["stats"] = column_stats(entry["df"])
+                if self._cancelled(key, generation):
+                    return
+                get_cached_page(conn, neighbour, limit, account=account, cache=cache)
+        except Exception:
+            # Prefetch ist rein opportunistisch; Fehler tauchen beim echten Laden auf
+            pass
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+@st.cache_resource
+def get_prefetcher() -> TablePrefetcher:
+    """Ein gemeinsamer Prefetcher (ein Worker-Thread) pro Streamlit-Prozess."""
+    return TablePrefetcher()
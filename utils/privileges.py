@@ -0,0 +1,189 @@
+# utils/privileges.py
+"""
+Effektive Rechte einer Sitzung, einmal pro Anmeldung aus SHOW GRANTS gelesen.
+
+Mit den aktiven Rollen (`SHOW GRANTS FOR CURRENT_USER() USING ...`)
+liefert MySQL die Rechte der Rollen mit aus. Die App blendet damit
+Aktionen aus, die der Server ohnehin mit 1142/1143/1370 ablehnen würde
+(Editor-Aktionen, Tabellen im Editor, Bearbeiten-Links der Suche), und
+schickt schreibende Statements im SQL-Tab gar nicht erst ab, wenn das
+Recht auf der Zieltabelle fehlt.
+
+Die Prüfung ist bewusst großzügig: Spaltenrechte zählen als Recht auf
+die Tabelle, Statements mit mehreren Zieltabellen werden nicht geprüft,
+und wenn SHOW GRANTS nicht lesbar ist, gilt alles als erlaubt. Die
+Datenbank bleibt die maßgebliche Prüfung.
+"""
+import re
+
+from utils.sql_script import main_keyword
+
+# Rechte, die ein Eintrag in der Tabellenliste des Editors braucht (mindestens eines)
+WRITE_PRIVILEGES = ("INSERT", "UPDATE", "DELETE")
+
+_GRANT = re.compile(r"^GRANT\s+(.+?)\s+ON\s+(?:(TABLE|PROCEDURE|FUNCTION)\s+)?(\S+)\s+TO\s", re.I | re.S)
+_OBJECT = re.compile(r"^(`[^`]*`|[^.`]+|\*)\.(`[^`]*`|[^.`]+|\*)$")
+_COLUMNS = re.compile(r"\([^)]*\)")
+_NAME = r"((?:`[^`]+`|[\w$]+)(?:\.(?:`[^`]+`|[\w$]+))?)"
+# Einzelne Zieltabelle schreibender Statements (Mehrtabellen-Varianten werden nicht erkannt)
+_TARGETS = [
+    (re.compile(rf"^(?:INSERT|REPLACE)\s+(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE)\s+)*(?:INTO\s+)?{_NAME}", re.I), None),
+    (re.compile(rf"^UPDATE\s+(?:(?:LOW_PRIORITY|IGNORE)\s+)*{_NAME}(?:\s+(?:AS\s+)?\w+)?\s+SET\b", re.I), ("UPDATE",)),
+    (re.compile(rf"^DELETE\s+(?:(?:LOW_PRIORITY|QUICK|IGNORE)\s+)*FROM\s+{_NAME}(?:\s+(?:AS\s+)?\w+)?\s*(?:WHERE\b|ORDER\b|LIMIT\b|$)", re.I), ("DELETE",)),
+    (re.compile(rf"^TRUNCATE\s+(?:TABLE\s+)?{_NAME}\s*$", re.I), ("DROP",)),
+    (re.compile(rf"^(?:CREATE|ALTER|DROP)\s+TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?{_NAME}", re.I), None),
+]
+_CALL = re.compile(rf"^CALL\s+{_NAME}", re.I)
+
+
+def _unquote(name: str) -> str:
+    return name.strip("`").lower()
+
+
+def _split_name(name: str, database: str) -> tuple:
+    """`db`.`tabelle` bzw. tabelle -> (db, tabelle) in Kleinbuchstaben."""
+    parts = re.findall(r"`[^`]+`|[^.]+", name)
+    if len(parts) == 2:
+        return _unquote(parts[0]), _unquote(parts[1])
+    return database.lower(), _unquote(parts[0])
+
+
+def parse_grants(lines: list) -> dict:
+    """
+    Wertet die Zeilen von SHOW GRANTS aus.
+
+    Rollenzuweisungen (GRANT `rolle`@`%` TO ...) werden übersprungen,
+    Spaltenlisten (SELECT (a, b)) zählen als Recht auf die Tabelle.
+
+    Args:
+        lines (list): GRANT-Statements als Strings.
+
+    Returns:
+        dict: (typ, db, objekt) -> Menge der Rechte in Großbuchstaben; typ ist
+        "TABLE" oder "PROCEDURE"/"FUNCTION", db/objekt sind "*" für alle.
+    """
+    grants = {}
+    for line in lines:
+        match = _GRANT.match(line.strip())
+        if not match:
+            continue
+        privileges, kind, target = match.groups()
+        obj = _OBJECT.match(target)
+        if not obj:
+            continue
+        key = ((kind or "TABLE").upper(), _unquote(obj.group(1)), _unquote(obj.group(2)))
+        names = set()
+        for priv in _COLUMNS.sub("", privileges).split(","):
+            priv = " ".join(priv.split()).upper()
+            names.add("ALL" if priv in ("ALL", "ALL PRIVILEGES") else priv)
+        grants.setdefault(key, set()).update(names)
+    return grants
+
+
+class Privileges:
+    """
+    Rechte einer Sitzung für eine Datenbank.
+
+    Args:
+        database (str): Standarddatenbank (für Namen ohne Datenbank).
+        grants (dict, optional): Ergebnis von `parse_grants`; None = unbekannt (alles erlaubt).
+    """
+
+    def __init__(self, database: str, grants: dict = None):
+        self.database = database
+        self.unrestricted = grants is None
+        self._grants = grants or {}
+
+    def _has(self, privilege: str, kind: str, database: str, name: str) -> bool:
+        for key in ((kind, database, name), (kind, database, "*"), ("TABLE", database, "*"), ("TABLE", "*", "*")):
+            privs = self._grants.get(key, ())
+            if "ALL" in privs or privilege in privs:
+                return True
+        return False
+
+    def allows(self, privilege: str, table: str = None) -> bool:
+        """
+        Ob `privilege` (z.B. "UPDATE") auf `table` (bzw. der ganzen Datenbank) erlaubt ist.
+        """
+        if self.unrestricted:
+            return True
+        database, name = _split_name(table, self.database) if table else (self.database.lower(), "*")
+        return self._has(privilege.upper(), "TABLE", database, name)
+
+    def can_execute(self, procedure: str) -> bool:
+        """Ob die gespeicherte Prozedur ausgeführt werden darf (EXECUTE)."""
+        if self.unrestricted:
+            return True
+        database, name = _split_name(procedure, self.database)
+        return self._has("EXECUTE", "PROCEDURE", database, name)
+
+    def readable(self, tables: list) -> list:
+        """Tabellen mit SELECT-Recht (Reihenfolge bleibt erhalten)."""
+        return [t for t in tables if self.allows("SELECT", t)]
+
+    def writable(self, tables: list) -> list:
+        """Tabellen mit mindestens einem Schreibrecht (INSERT, UPDATE oder DELETE)."""
+        return [t for t in tables if any(self.allows(p, t) for p in WRITE_PRIVILEGES)]
+
+    def denied_statement(self, stmt: str):
+        """
+        Prüft ein einzelnes Statement vor dem Absenden.
+
+        Erkannt werden INSERT/REPLACE, UPDATE und DELETE mit einer
+        Zieltabelle, TRUNCATE, CREATE/ALTER/DROP TABLE und CALL; alles
+        andere gilt als erlaubt.
+
+        Returns:
+            str: Meldung im Stil von MySQL-Fehler 1142, oder None, wenn nichts dagegen spricht.
+        """
+        if self.unrestricted:
+            return None
+        stmt = stmt.strip()
+        keyword = main_keyword(stmt)
+        call = _CALL.match(stmt)
+        if keyword == "CALL" and call:
+            if not self.can_execute(call.group(1)):
+                return f"EXECUTE command denied for routine '{call.group(1).replace('`', '')}'"
+            return None
+        for pattern, required in _TARGETS:
+            match = pattern.match(stmt)
+            if not match:
+                continue
+            if required is None:
+                required = ("INSERT", "DELETE") if keyword == "REPLACE" else (keyword,)
+            table = match.group(1)
+            for privilege in required:
+                if not self.allows(privilege, table):
+                    return f"{privilege} command denied for table '{table.replace('`', '')}'"
+            return None
+        return None
+
+
+def load_privileges(conn, roles: list = (), database: str = None) -> Privileges:
+    """
+    Liest die effektiven Rechte des angemeldeten Kontos (eine Abfrage).
+
+    Args:
+        conn: Verbindung der Sitzung.
+        roles (list, optional): Aktive Rollen; deren Rechte werden mit aufgelöst.
+        database (str, optional): Standarddatenbank (Default: DATABASE() der Verbindung).
+
+    Returns:
+        Privileges: Bei einem Fehler (z.B. Server ohne SHOW GRANTS ... USING) uneingeschränkt.
+    """
+    cursor = conn.cursor()
+    try:
+        if database is None:
+            cursor.execute("SELECT DATABASE();")
+            database = cursor.fetchone()[0] or ""
+        sql = "SHOW GRANTS FOR CURRENT_USER()"
+        if roles:
+            sql += " USING " + ", ".join(f"`{r}`" for r in roles)
+        cursor.execute(sql + ";")
+        lines = [row[0].decode() if isinstance(row[0], (bytes, bytearray)) else row[0] for row in cursor.fetchall()]
+    except Exception:
+        # Rechte unbekannt: nichts ausblenden, die Datenbank prüft weiterhin selbst
+        return Privileges(database or "")
+    finally:
+        cursor.close()
+    return Privileges(database, parse_grants(lines))
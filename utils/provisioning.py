@@ -0,0 +1,289 @@
+# utils/provisioning.py
+"""
+Headless Aufbau und Reset der Hochschulsport-Datenbank (ohne tkinter).
+
+Wird von `setup.py` und `reset.py` genutzt, sowohl im GUI-Modus als auch
+über die Kommandozeile (`--headless`), z.B. in Containern oder CI.
+"""
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import toml
+
+from utils.migrations import (
+    DATABASE, MIGRATIONS_DIR, VERSION_TABLE, applied_versions, discover_migrations, ensure_version_table,
+    is_account_statement, mark_baseline, migrate,
+)
+from utils.sql_script import split_statements
+
+SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
+ROLES = ["rolle_verwaltung", "rolle_kursleiter"]
+USERS = ["verwaltung", "kursleiter"]
+
+_CREATE_TABLE = re.compile(r"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?([\wÀ-ſ]+)`?", re.IGNORECASE)
+
+
+def resolve_credentials(user=None, password=None, host=None, port=None) -> dict:
+    """
+    Ermittelt die Zugangsdaten für den Admin-Login.
+
+    Reihenfolge: explizite Argumente, Umgebungsvariablen (MYSQL_USER,
+    MYSQL_PASSWORD, MYSQL_HOST, MYSQL_PORT), dann .streamlit/secrets.toml.
+
+    Returns:
+        dict: {"user", "password", "host", "port"}
+
+    Raises:
+        ValueError: Wenn Benutzername oder Passwort nirgends gefunden werden.
+    """
+    secrets = {}
+    if os.path.exists(SECRETS_FILE):
+        secrets = toml.load(SECRETS_FILE).get("mysql", {})
+    creds = {
+        "user": user or os.environ.get("MYSQL_USER") or secrets.get("username"),
+        "password": password or os.environ.get("MYSQL_PASSWORD") or secrets.get("password"),
+        "host": host or os.environ.get("MYSQL_HOST") or secrets.get("host") or "localhost",
+        "port": int(port or os.environ.get("MYSQL_PORT") or secrets.get("port") or 3306),
+    }
+    if not creds["user"] or not creds["password"]:
+        raise ValueError("Keine Zugangsdaten gefunden (Argumente, MYSQL_USER/MYSQL_PASSWORD oder secrets.toml).")
+    return creds
+
+
+def connect_server(creds: dict, database=None):
+    """Verbindung zum MySQL-Server (optional direkt auf eine Datenbank)."""
+    import mysql.connector
+
+    kwargs = {"host": creds["host"], "port": creds["port"], "user": creds["user"], "password": creds["password"]}
+    if database:
+        kwargs["database"] = database
+    return mysql.connector.connect(**kwargs)
+
+
+def load_account_statements(database: str = DATABASE, path: str = MIGRATIONS_DIR) -> list:
+    """
+    Rollen-, Nutzer- und Rechteanweisungen aus allen SQL-Migrationen.
+
+    Für Kopien (database != DATABASE) wird der Datenbankname ersetzt.
+    """
+    statements = []
+    for migration in discover_migrations(path):
+        if migration["kind"] != "sql":
+            continue
+        with open(migration["path"], encoding="utf-8") as f:
+            for stmt in split_statements(f.read()):
+                if not is_account_statement(stmt):
+                    continue
+                if database != DATABASE:
+                    stmt = re.sub(rf"\b{DATABASE}\b", database, stmt, flags=re.IGNORECASE)
+                statements.append(stmt)
+    return statements
+
+
+def database_exists(conn, database: str) -> bool:
+    """True, wenn die Datenbank existiert und bereits Tabellen enthält."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s;", (database,)
+    )
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count > 0
+
+
+def _table_names(conn, database: str) -> set:
+    """Tabellen der Datenbank (Namen klein geschrieben)."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s;", (database,))
+    names = {row[0].lower() for row in cursor.fetchall()}
+    cursor.close()
+    return names
+
+
+def baseline_tables(path: str = MIGRATIONS_DIR) -> set:
+    """Tabellen, die die erste Migration (Baseline) anlegt (Namen klein geschrieben)."""
+    baseline = discover_migrations(path)[0]
+    with open(baseline["path"], encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    return {m.group(1).lower() for m in map(_CREATE_TABLE.match, statements) if m}
+
+
+def check_existing_schema(conn, database: str, tables: set, path: str = MIGRATIONS_DIR) -> bool:
+    """
+    Prüft eine bestehende Datenbank vor dem Migrieren auf einen halben Aufbau.
+
+    Ein abgebrochener Baseline-Lauf hinterlässt schema_version ohne Eintrag
+    für die Baseline (ein erneuter Lauf scheitert dann an "table exists");
+    eine Datenbank ohne schema_version gilt nur als Altbestand, wenn alle
+    Tabellen der Baseline vorhanden sind.
+
+    Args:
+        conn: Verbindung mit `database` als aktueller Datenbank.
+        database (str): Name der Datenbank (für die Meldung).
+        tables (set): Vorhandene Tabellen (klein geschrieben, siehe `_table_names`).
+        path (str, optional): Verzeichnis mit den Migrationen.
+
+    Returns:
+        bool: True für einen vollständigen Altbestand ohne schema_version
+        (Baseline wird nur markiert), False wenn normal migriert werden kann.
+
+    Raises:
+        ValueError: Wenn die Datenbank nur teilweise aufgebaut ist.
+    """
+    hint = f"Datenbank {database} ist nur teilweise aufgebaut ({{}}); mit --force löschen und neu aufsetzen."
+    if VERSION_TABLE in tables:
+        if tables == {VERSION_TABLE} or discover_migrations(path)[0]["version"] in applied_versions(conn):
+            return False
+        raise ValueError(hint.format("Baseline nicht in schema_version eingetragen"))
+    missing = baseline_tables(path) - tables
+    if missing:
+        raise ValueError(hint.format("es fehlen " + ", ".join(sorted(missing))))
+    return True
+
+
+def provision_database(creds: dict, database: str = DATABASE, force: bool = False,
+                       with_accounts: bool = True, migrations_dir: str = MIGRATIONS_DIR) -> dict:
+    """
+    Legt die Datenbank idempotent an bzw. bringt sie auf den neuesten Stand.
+
+    Führt alle ausstehenden Migrationen aus (siehe utils/migrations.py).
+    Eine bestehende Datenbank aus dem alten Setup (Tabellen, aber keine
+    schema_version) wird zuerst auf die Baseline gesetzt, damit nur neuere
+    Migrationen laufen. Ein abgebrochener Aufbau wird erkannt und nicht
+    weiter migriert (siehe `check_existing_schema`). Mit force=True wird
+    die Datenbank vorher gelöscht.
+
+    Args:
+        creds (dict): Admin-Zugangsdaten (siehe resolve_credentials).
+        database (str, optional): Name der Zieldatenbank.
+        force (bool, optional): Bestehende Datenbank vorher löschen.
+        with_accounts (bool, optional): Rollen/Nutzer/Rechte anlegen.
+        migrations_dir (str, optional): Verzeichnis mit den Migrationen.
+
+    Returns:
+        dict: "verbindung", je angewendeter Migration und ggf. "konten" -> Dauer in Sekunden.
+
+    Raises:
+        ValueError: Wenn die Datenbank nur teilweise aufgebaut ist (dann force=True nutzen).
+    """
+    durations = {}
+    conn = connect_server(creds)
+    cursor = conn.cursor()
+    try:
+        start = time.perf_counter()
+        if force:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{database}`;")
+        tables = _table_names(conn, database)
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`;")
+        cursor.execute(f"USE `{database}`;")
+        legacy = bool(tables) and check_existing_schema(conn, database, tables, migrations_dir)
+        ensure_version_table(conn)
+        if legacy:
+            mark_baseline(conn, path=migrations_dir)
+        durations["verbindung"] = time.perf_counter() - start
+
+        durations.update(migrate(conn, database, path=migrations_dir, skip_accounts=True, log=None))
+
+        if with_accounts:
+            start = time.perf_counter()
+            for stmt in load_account_statements(database, migrations_dir):
+                cursor.execute(stmt)
+            durations["konten"] = time.perf_counter() - start
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    return durations
+
+
+def provision_copies(creds: dict, copies: int, prefix: str = f"{DATABASE}_", workers: int = 4,
+                     force: bool = False, migrations_dir: str = MIGRATIONS_DIR) -> dict:
+    """
+    Legt `copies` isolierte Schema-Kopien (prefix1 ... prefixN) parallel an, z.B. für Lasttests.
+
+    Jede Kopie läuft in einem eigenen Thread mit eigener Verbindung. Rollen
+    und Nutzer werden anschließend einmal seriell angelegt bzw. berechtigt,
+    damit sich parallele CREATE ROLE/USER nicht gegenseitig stören.
+
+    Returns:
+        dict: Datenbankname -> Dauern (siehe provision_database).
+    """
+    names = [f"{prefix}{i}" for i in range(1, copies + 1)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(provision_database, creds, name, force, False, migrations_dir)
+            for name in names
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    for name in names:
+        start = time.perf_counter()
+        conn = connect_server(creds, database=name)
+        cursor = conn.cursor()
+        for stmt in load_account_statements(name, migrations_dir):
+            cursor.execute(stmt)
+        cursor.close()
+        conn.close()
+        results[name]["konten"] = time.perf_counter() - start
+    return results
+
+
+def reset_database(creds: dict, databases=None, roles=None, users=None) -> float:
+    """
+    Löscht Rollen, Nutzer und Datenbanken idempotent in einem Roundtrip.
+
+    DROP ROLE/USER entfernen auch alle Rechte, ein vorheriges REVOKE pro
+    Nutzer ist daher nicht nötig. Nicht vorhandene Objekte werden ignoriert.
+
+    Args:
+        creds (dict): Admin-Zugangsdaten.
+        databases (list, optional): Zu löschende Datenbanken (Default: [DATABASE]).
+        roles (list, optional): Zu löschende Rollen (Default: ROLES).
+        users (list, optional): Zu löschende Nutzer (Default: USERS, jeweils @'localhost').
+
+    Returns:
+        float: Dauer in Sekunden.
+    """
+    databases = [DATABASE] if databases is None else databases
+    roles = ROLES if roles is None else roles
+    users = USERS if users is None else users
+
+    statements = []
+    if roles:
+        statements.append("DROP ROLE IF EXISTS " + ", ".join(f"`{r}`" for r in roles))
+    if users:
+        statements.append("DROP USER IF EXISTS " + ", ".join(f"'{u}'@'localhost'" for u in users))
+    statements.extend(f"DROP DATABASE IF EXISTS `{db}`" for db in databases)
+
+    start = time.perf_counter()
+    conn = connect_server(creds)
+    cursor = conn.cursor()
+    cursor.execute(";\n".join(statements))
+    while cursor.nextset():
+        pass
+    cursor.close()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def list_copies(creds: dict, prefix: str = f"{DATABASE}_") -> list:
+    """Vorhandene Schema-Kopien mit dem angegebenen Präfix."""
+    conn = connect_server(creds)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT SCHEMA_NAME FROM information_schema.SCHEMATA WHERE SCHEMA_NAME LIKE %s;",
+        (prefix.replace("_", r"\_") + "%",),
+    )
+    names = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    conn.close()
+    return names
+
+
+def format_durations(durations: dict) -> str:
+    """Formatiert Phasendauern für die Konsolenausgabe."""
+    return ", ".join(f"{phase}: {seconds:.2f}s" for phase, seconds in durations.items())
@@ -0,0 +1,237 @@
+# utils/query_guard.py
+"""
+Kostenprüfung für freie SQL-Abfragen (SQL-Tab).
+
+Vor der Ausführung wird jedes SELECT/UPDATE/DELETE/INSERT ... SELECT
+mit `EXPLAIN FORMAT=JSON` analysiert. Aus dem Plan werden die geschätzten
+Kosten (query_cost), die zu lesenden Zeilen und Full Table Scans
+abgeleitet und mit den Grenzwerten der aktiven Rolle verglichen:
+
+- "warn": Ausführung nur nach Bestätigung
+- "block": Ausführung wird verweigert
+
+Zusätzlich bekommt jedes SELECT den Optimizer-Hint
+`MAX_EXECUTION_TIME` und, falls es kein eigenes LIMIT hat, ein LIMIT
+knapp über der maximalen Ergebniszeilenzahl.
+
+Grenzwerte lassen sich pro Rolle in .streamlit/secrets.toml überschreiben:
+
+    [query_guard.rolle_kursleiter]
+    block_rows = 1000000
+    max_execution_ms = 5000
+"""
+import json
+import os
+import re
+
+import toml
+
+from utils.database import SECRETS_PATH
+from utils.sql_script import main_keyword, classify_statement
+
+# Grenzwerte pro Rolle; unbekannte Rollen bekommen DEFAULT_LIMITS
+ROLE_LIMITS = {
+    "rolle_verwaltung": {
+        "warn_rows": 1_000_000, "block_rows": 100_000_000,
+        "warn_cost": 100_000, "block_cost": 10_000_000,
+        "max_execution_ms": 30_000, "max_rows": 50_000,
+    },
+    "rolle_kursleiter": {
+        "warn_rows": 100_000, "block_rows": 10_000_000,
+        "warn_cost": 10_000, "block_cost": 1_000_000,
+        "max_execution_ms": 10_000, "max_rows": 10_000,
+    },
+}
+DEFAULT_LIMITS = ROLE_LIMITS["rolle_kursleiter"]
+
+_LEVELS = ("ok", "warn", "block")
+_EXPLAINABLE = {"SELECT", "UPDATE", "DELETE", "INSERT", "REPLACE", "TABLE"}
+# Statements, an die kein LIMIT angehängt werden darf
+_NO_LIMIT_SUFFIX = re.compile(r"\b(FOR\s+UPDATE|FOR\s+SHARE|LOCK\s+IN\s+SHARE\s+MODE|INTO)\b[^()]*$", re.IGNORECASE)
+
+
+def load_limits(role: str = None, path: str = SECRETS_PATH) -> dict:
+    """
+    Grenzwerte einer Rolle (ROLE_LIMITS, ergänzt um [query_guard.<rolle>] aus secrets.toml).
+
+    Returns:
+        dict: warn_rows, block_rows, warn_cost, block_cost, max_execution_ms, max_rows.
+    """
+    limits = dict(ROLE_LIMITS.get(role, DEFAULT_LIMITS))
+    if os.path.exists(path):
+        try:
+            overrides = toml.load(path).get("query_guard", {}).get(role or "", {})
+        except (toml.TomlDecodeError, AttributeError):
+            overrides = {}
+        limits.update({k: int(v) for k, v in overrides.items() if k in limits})
+    return limits
+
+
+def _walk_plan(node, stats: dict):
+    """Sammelt Zeilen und Full Scans aus einem (Teil-)Plan von EXPLAIN FORMAT=JSON."""
+    if isinstance(node, list):
+        for item in node:
+            _walk_plan(item, stats)
+        return
+    if not isinstance(node, dict):
+        return
+    if "nested_loop" in node:
+        # Join: jede Tabelle wird pro Zeile des bisherigen Zwischenergebnisses
+        # gelesen (Obergrenze; Hash Joins lesen die innere Tabelle nur einmal)
+        prefix = 1.0
+        for item in node["nested_loop"]:
+            table = item.get("table", {})
+            inner = {"rows": 0.0, "full_scans": stats["full_scans"]}
+            _walk_plan(item, inner)
+            stats["rows"] += prefix * inner["rows"]
+            if "rows_produced_per_join" in table:
+                prefix = float(table["rows_produced_per_join"])
+        return
+    table = node.get("table")
+    if isinstance(table, dict) and "table_name" in table:
+        stats["rows"] += float(table.get("rows_examined_per_scan", 0))
+        if table.get("access_type") == "ALL":
+            stats["full_scans"].append(table["table_name"])
+        # Unterabfragen/materialisierte Tabellen innerhalb des Tabellenknotens
+        for key, value in table.items():
+            if isinstance(value, (dict, list)):
+                _walk_plan(value, stats)
+        return
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            _walk_plan(value, stats)
+
+
+def _produced_rows(block: dict) -> float:
+    """Geschätzte Ergebniszeilen eines query_block (vor LIMIT), bei UNION summiert."""
+    union = block.get("union_result")
+    if isinstance(union, dict):
+        return sum(_produced_rows(spec.get("query_block", {})) for spec in union.get("query_specifications", []))
+    for wrapper in ("ordering_operation", "grouping_operation", "duplicates_removal"):
+        if isinstance(block.get(wrapper), dict):
+            return _produced_rows(block[wrapper])
+    if block.get("nested_loop"):
+        return float(block["nested_loop"][-1].get("table", {}).get("rows_produced_per_join", 0))
+    table = block.get("table")
+    if isinstance(table, dict):
+        return float(table.get("rows_produced_per_join", 0))
+    return 0.0
+
+
+def explain(conn, stmt: str, params=None) -> dict:
+    """
+    Führt EXPLAIN FORMAT=JSON aus.
+
+    Returns:
+        dict: cost (query_cost oder None), rows (geschätzte gelesene
+              Zeilen), produced (geschätzte Ergebniszeilen) und
+              full_scans (Tabellen mit access_type ALL).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"EXPLAIN FORMAT=JSON {stmt}", params)
+        row = cursor.fetchone()
+        while cursor.nextset():
+            pass
+    finally:
+        cursor.close()
+    plan = json.loads(row[0])
+    block = plan.get("query_block", {})
+    cost = block.get("cost_info", {}).get("query_cost")
+    stats = {"rows": 0.0, "full_scans": []}
+    _walk_plan(block, stats)
+    return {
+        "cost": float(cost) if cost is not None else None,
+        "rows": stats["rows"],
+        "produced": _produced_rows(block),
+        "full_scans": sorted(set(stats["full_scans"])),
+    }
+
+
+def analyze(conn, stmt: str, limits: dict, params=None) -> dict:
+    """
+    Bewertet ein Statement anhand seines Ausführungsplans.
+
+    Statements ohne Plan (SHOW, SET, DDL, ...) oder deren EXPLAIN
+    fehlschlägt (z.B. Tabelle entsteht erst im selben Skript) gelten als "ok".
+
+    Returns:
+        dict: statement, level ("ok"/"warn"/"block"), reasons (Liste von
+              Meldungen), cost, rows und full_scans.
+    """
+    result = {"statement": stmt, "level": "ok", "reasons": [], "cost": None, "rows": None, "full_scans": []}
+    if main_keyword(stmt) not in _EXPLAINABLE:
+        return result
+    try:
+        result.update(explain(conn, stmt, params))
+    except Exception:
+        return result
+
+    def flag(level, reason):
+        result["reasons"].append(reason)
+        if _LEVELS.index(level) > _LEVELS.index(result["level"]):
+            result["level"] = level
+
+    rows, cost = result["rows"], result["cost"]
+    if rows >= limits["block_rows"]:
+        flag("block", f"ca. {rows:,.0f} zu lesende Zeilen (Grenze {limits['block_rows']:,})")
+    elif rows >= limits["warn_rows"]:
+        flag("warn", f"ca. {rows:,.0f} zu lesende Zeilen (Warnung ab {limits['warn_rows']:,})")
+    if cost is not None:
+        if cost >= limits["block_cost"]:
+            flag("block", f"geschätzte Kosten {cost:,.0f} (Grenze {limits['block_cost']:,})")
+        elif cost >= limits["warn_cost"]:
+            flag("warn", f"geschätzte Kosten {cost:,.0f} (Warnung ab {limits['warn_cost']:,})")
+    if result["level"] != "ok" and result["full_scans"]:
+        result["reasons"].append("Full Table Scan auf " + ", ".join(result["full_scans"]))
+    return result
+
+
+def analyze_script(conn, statements: list, limits: dict, params=None) -> dict:
+    """
+    Bewertet alle Statements eines Skripts.
+
+    Returns:
+        dict: level (schlechteste Bewertung) und statements (Ergebnisse von `analyze`).
+    """
+    analyses = [analyze(conn, stmt, limits, params) for stmt in statements]
+    level = max((a["level"] for a in analyses), key=_LEVELS.index, default="ok")
+    return {"level": level, "statements": analyses}
+
+
+def _top_level_tokens(stmt: str):
+    """Schlüsselwörter auf Klammerebene 0 (ohne Inhalte von Strings) mit Position."""
+    depth = 0
+    for match in re.finditer(r"\(|\)|[A-Za-z_]+|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`", stmt):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token[0].isalpha():
+            yield token.upper(), match.start()
+
+
+def guard_statement(stmt: str, limits: dict) -> str:
+    """
+    Ergänzt ein SELECT um MAX_EXECUTION_TIME und (ohne eigenes LIMIT) um ein LIMIT.
+
+    Das LIMIT liegt eine Zeile über max_rows, damit die Anzeige erkennen
+    kann, dass das Ergebnis gekürzt wurde. Andere Statements bleiben
+    unverändert (MAX_EXECUTION_TIME gilt in MySQL nur für SELECT).
+    """
+    if classify_statement(stmt) != "read" or main_keyword(stmt) != "SELECT":
+        return stmt
+    tokens = list(_top_level_tokens(stmt))
+    select_pos = next((pos for token, pos in tokens if token == "SELECT"), None)
+    if select_pos is None:
+        return stmt
+    if "MAX_EXECUTION_TIME" not in stmt.upper():
+        hint = f" /*+ MAX_EXECUTION_TIME({int(limits['max_execution_ms'])}) */"
+        stmt = stmt[:select_pos + 6] + hint + stmt[select_pos + 6:]
+        tokens = list(_top_level_tokens(stmt))
+    has_limit = any(token == "LIMIT" for token, _ in tokens)
+    if not has_limit and not _NO_LIMIT_SUFFIX.search(stmt):
+        # Zeilenumbruch: ein abschließender Kommentar (-- ...) würde das LIMIT verschlucken
+        stmt = f"{stmt.rstrip().rstrip(';')}\nLIMIT {int(limits['max_rows']) + 1}"
+    return stmt
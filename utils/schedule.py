@@ -0,0 +1,278 @@
+# utils/schedule.py
+"""
+Belegungsplan für Orte und Kursleiter: Konfliktprüfung und Suche nach
+freien Terminen über Termin, Veranstaltung_Termine, Veranstaltung_Orte
+und Veranstaltung.
+
+Jede Veranstaltung belegt zu ihren Terminen den Ort aus
+Veranstaltung.ort_id und alle Orte aus Veranstaltung_Orte sowie ihren
+Kursleiter. Termin hat nur einen Beginn (Termin.datum); belegt wird
+jeweils TERMIN_MINUTES ab Beginn.
+
+Pro Ort und pro Kursleiter hält ein `IntervalIndex` die belegten
+Zeiträume nach Beginn sortiert, zusammen mit dem laufenden Maximum der
+Enden. Ob ein Zeitraum frei ist, entscheidet damit eine binäre Suche
+(O(log n)); die Konflikte selbst werden von dort rückwärts eingesammelt.
+
+Der Plan wird einmal pro Prozess geladen (`get_schedule`) und über den
+ChangeFeed (utils/change_feed.py) aktuell gehalten: Änderungen an den
+beteiligten Tabellen merken die betroffenen Veranstaltungen vor, die
+vor der nächsten Abfrage gezielt nachgeladen werden.
+"""
+import datetime as dt
+import threading
+from bisect import bisect_left
+
+import streamlit as st
+
+from utils.change_feed import get_change_feed
+
+# Belegte Zeit pro Termin in Minuten (Termin hat keine Endzeit)
+TERMIN_MINUTES = 90
+# Raster und Tageszeiten für die Suche nach freien Terminen
+SLOT_MINUTES = 30
+DAY_START = dt.time(8, 0)
+DAY_END = dt.time(22, 0)
+# Höchstens so viele Vorschläge liefert `free_slots`
+MAX_SLOTS = 10
+# Tabellen, deren Änderungen den Plan betreffen
+SCHEDULE_TABLES = ("Veranstaltung", "Veranstaltung_Orte", "Veranstaltung_Termine", "Termin")
+
+_WEEK = dt.timedelta(weeks=1)
+
+
+class IntervalIndex:
+    """
+    Halboffene Zeiträume [beginn, ende) nach Beginn sortiert.
+
+    Neben der sortierten Liste wird das Präfix-Maximum der Enden
+    gehalten: Ein Zeitraum [s, e) überschneidet sich genau dann mit
+    einem Eintrag, wenn unter den Einträgen mit Beginn < e das größte
+    Ende > s ist.
+    """
+
+    def __init__(self):
+        # (beginn, ende, veranstaltungs_id, termin_id), nach Beginn sortiert
+        self._items = []
+        self._starts = []
+        self._max_end = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _reindex(self):
+        self._starts = [item[0] for item in self._items]
+        self._max_end = []
+        for item in self._items:
+            self._max_end.append(item[1] if not self._max_end or item[1] > self._max_end[-1] else self._max_end[-1])
+
+    def extend(self, items: list):
+        """Fügt viele Zeiträume (beginn, ende, veranstaltungs_id, termin_id) auf einmal ein."""
+        self._items = sorted(self._items + list(items))
+        self._reindex()
+
+    def remove(self, veranstaltungs_ids: set):
+        """Entfernt alle Zeiträume der angegebenen Veranstaltungen."""
+        items = [item for item in self._items if item[2] not in veranstaltungs_ids]
+        if len(items) != len(self._items):
+            self._items = items
+            self._reindex()
+
+    def overlaps(self, start, end) -> bool:
+        """Ob [start, end) einen Eintrag überschneidet (O(log n))."""
+        pos = bisect_left(self._starts, end)
+        return pos > 0 and self._max_end[pos - 1] > start
+
+    def conflicts(self, start, end, exclude: int = None) -> list:
+        """
+        Einträge, die [start, end) überschneiden.
+
+        Args:
+            start, end: Zeitraum.
+            exclude (int, optional): Diese Veranstaltung ignorieren (z.B. beim Bearbeiten).
+
+        Returns:
+            list: Tupel (beginn, ende, veranstaltungs_id, termin_id) nach Beginn.
+        """
+        found = []
+        pos = bisect_left(self._starts, end) - 1
+        while pos >= 0 and self._max_end[pos] > start:
+            item = self._items[pos]
+            if item[1] > start and item[2] != exclude:
+                found.append(item)
+            pos -= 1
+        return found[::-1]
+
+
+class Schedule:
+    """
+    Belegung aller Orte und Kursleiter, im Speicher.
+
+    `refresh` bringt den Plan vor jeder Abfrage auf den Stand der
+    Datenbank: beim ersten Mal (oder nach `invalidate`) komplett, sonst
+    nur für die vorgemerkten Veranstaltungen.
+    """
+
+    def __init__(self, minutes: int = TERMIN_MINUTES):
+        self.duration = dt.timedelta(minutes=minutes)
+        self.by_ort = {}
+        self.by_kursleiter = {}
+        # veranstaltungs_id -> {"orte": set, "kursleiter": id, "termine": {termin_id: beginn}}
+        self.events = {}
+        self._termin_events = {}
+        self._dirty = set()
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        """Beim nächsten `refresh` komplett neu laden."""
+        with self._lock:
+            self._loaded = False
+
+    def on_change(self, table_name: str, pks: list):
+        """Listener für den ChangeFeed: betroffene Veranstaltungen vormerken."""
+        if table_name is not None and table_name not in SCHEDULE_TABLES:
+            return
+        with self._lock:
+            if table_name is None or pks is None:
+                self._loaded = False
+            elif table_name == "Termin":
+                for pk in pks:
+                    self._dirty.update(self._termin_events.get(pk["termin_id"], ()))
+            else:
+                self._dirty.update(pk["veranstaltungs_id"] for pk in pks)
+
+    def refresh(self, conn):
+        """Lädt den Plan bzw. die vorgemerkten Veranstaltungen nach."""
+        with self._lock:
+            if not self._loaded:
+                self.by_ort, self.by_kursleiter, self.events, self._termin_events = {}, {}, {}, {}
+                self._dirty.clear()
+                self._load(conn)
+                self._loaded = True
+            elif self._dirty:
+                ids = set(self._dirty)
+                self._dirty.clear()
+                self._drop(ids)
+                self._load(conn, ids)
+
+    def _drop(self, ids: set):
+        for index in list(self.by_ort.values()) + list(self.by_kursleiter.values()):
+            index.remove(ids)
+        for vid in ids:
+            event = self.events.pop(vid, None)
+            for termin_id in (event or {}).get("termine", ()):
+                self._termin_events.get(termin_id, set()).discard(vid)
+
+    def _load(self, conn, ids: set = None):
+        """Liest Veranstaltungen (alle oder `ids`) mit Orten und Terminen, drei Abfragen."""
+        where, params = "", ()
+        if ids is not None:
+            where = f" WHERE veranstaltungs_id IN ({', '.join(['%s'] * len(ids))})"
+            params = tuple(ids)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT veranstaltungs_id, kursleiter_id, ort_id FROM Veranstaltung{where};", params)
+            events = {vid: {"orte": set() if ort is None else {ort}, "kursleiter": kl, "termine": {}}
+                      for vid, kl, ort in cursor.fetchall()}
+            cursor.execute(f"SELECT veranstaltungs_id, ort_id FROM Veranstaltung_Orte{where};", params)
+            for vid, ort in cursor.fetchall():
+                if vid in events:
+                    events[vid]["orte"].add(ort)
+            cursor.execute(
+                "SELECT vt.veranstaltungs_id, vt.termin_id, t.datum FROM Veranstaltung_Termine vt "
+                "JOIN Termin t ON t.termin_id = vt.termin_id"
+                + where.replace("veranstaltungs_id", "vt.veranstaltungs_id") + ";",
+                params,
+            )
+            for vid, termin_id, datum in cursor.fetchall():
+                if vid in events and datum is not None:
+                    events[vid]["termine"][termin_id] = datum
+        finally:
+            cursor.close()
+
+        by_ort, by_kursleiter = {}, {}
+        for vid, event in events.items():
+            items = [(start, start + self.duration, vid, tid) for tid, start in event["termine"].items()]
+            for ort in event["orte"]:
+                by_ort.setdefault(ort, []).extend(items)
+            if event["kursleiter"] is not None:
+                by_kursleiter.setdefault(event["kursleiter"], []).extend(items)
+            for tid in event["termine"]:
+                self._termin_events.setdefault(tid, set()).add(vid)
+        for target, added in ((self.by_ort, by_ort), (self.by_kursleiter, by_kursleiter)):
+            for key, items in added.items():
+                target.setdefault(key, IntervalIndex()).extend(items)
+        self.events.update(events)
+
+    def _indexes(self, ort_ids, kursleiter_id) -> list:
+        indexes = [("Ort", o, self.by_ort.get(o)) for o in ort_ids if o is not None]
+        if kursleiter_id is not None:
+            indexes.append(("Kursleiter", kursleiter_id, self.by_kursleiter.get(kursleiter_id)))
+        return [(kind, key, index) for kind, key, index in indexes if index]
+
+    def conflicts(self, ort_ids, kursleiter_id, starts: list, exclude: int = None) -> list:
+        """
+        Belegungen, die mit Terminen zu den Beginnzeiten `starts` kollidieren.
+
+        Args:
+            ort_ids (list): Orte der geplanten Veranstaltung.
+            kursleiter_id (int | None): Kursleiter der geplanten Veranstaltung.
+            starts (list): Beginn der geplanten Termine (datetime).
+            exclude (int, optional): Eigene veranstaltungs_id (beim Bearbeiten).
+
+        Returns:
+            list: Dicts mit art ("Ort"/"Kursleiter"), id, beginn, veranstaltungs_id und
+            termin_id der belegenden Veranstaltung, nach Beginn.
+        """
+        with self._lock:
+            found = []
+            for kind, key, index in self._indexes(ort_ids, kursleiter_id):
+                for start in starts:
+                    for begin, _, vid, tid in index.conflicts(start, start + self.duration, exclude):
+                        found.append({"art": kind, "id": key, "beginn": begin,
+                                      "veranstaltungs_id": vid, "termin_id": tid})
+        return sorted(found, key=lambda c: (c["beginn"], c["art"], c["id"]))
+
+    def is_free(self, ort_ids, kursleiter_id, starts: list) -> bool:
+        """Ob alle Termine zu `starts` frei sind (je O(log n) pro Ort/Kursleiter)."""
+        with self._lock:
+            indexes = self._indexes(ort_ids, kursleiter_id)
+            return not any(index.overlaps(s, s + self.duration) for _, _, index in indexes for s in starts)
+
+    def free_slots(self, ort_ids, kursleiter_id, first_day: dt.date, weeks: int = 1,
+                   limit: int = MAX_SLOTS) -> list:
+        """
+        Sucht wöchentliche Termine, die für Ort(e) und Kursleiter frei sind.
+
+        Geprüft werden die sieben Tage ab `first_day` im Raster SLOT_MINUTES
+        zwischen DAY_START und DAY_END; ein Vorschlag zählt nur, wenn auch
+        alle Wiederholungen der folgenden `weeks - 1` Wochen frei sind.
+
+        Returns:
+            list: Beginn des ersten Termins (datetime) je Vorschlag, chronologisch.
+        """
+        step = dt.timedelta(minutes=SLOT_MINUTES)
+        slots = []
+        for day in range(7):
+            date = first_day + dt.timedelta(days=day)
+            start = dt.datetime.combine(date, DAY_START)
+            last = dt.datetime.combine(date, DAY_END) - self.duration
+            while start <= last and len(slots) < limit:
+                if self.is_free(ort_ids, kursleiter_id, weekly(start, weeks)):
+                    slots.append(start)
+                start += step
+        return slots
+
+
+def weekly(first: dt.datetime, weeks: int) -> list:
+    """Beginn von `weeks` wöchentlichen Terminen ab `first`."""
+    return [first + i * _WEEK for i in range(max(int(weeks or 1), 1))]
+
+
+@st.cache_resource
+def get_schedule() -> Schedule:
+    """Ein gemeinsamer Belegungsplan pro Streamlit-Prozess, am ChangeFeed angemeldet."""
+    schedule = Schedule()
+    get_change_feed().add_listener(schedule.on_change)
+    return schedule
@@ -0,0 +1,114 @@
+# utils/search.py
+"""
+Volltextsuche über mehrere Tabellen (MySQL FULLTEXT, siehe
+migrations/0002_fulltext_search.sql).
+
+Alle Tabellen aus SEARCH_INDEXES werden parallel über zusätzliche
+Verbindungen aus dem Pool der Sitzung abgefragt. Jede Abfrage nutzt den
+FULLTEXT-Index (MATCH ... AGAINST im Boolean Mode mit Präfixsuche) und
+liefert höchstens `limit` Treffer, sortiert nach Relevanz.
+"""
+import re
+
+from utils.fanout import fan_out
+
+# Tabelle -> Primärschlüssel und indizierte Spalten (Reihenfolge wie im Index)
+SEARCH_INDEXES = {
+    "Kursteilnehmer": {"pk": "teilnehmer_id", "columns": ["teilnehmer_name", "teilnehmer_mail"]},
+    "Sportangebot": {"pk": "angebot_id", "columns": ["angebot_name", "angebot_beschreibung"]},
+    "Feedback": {"pk": "feedback_id", "columns": ["kommentar"]},
+    "Ort": {"pk": "ort_id", "columns": ["ort_name", "adresse"]},
+}
+RESULTS_PER_TABLE = 10
+# Zusätzliche Pool-Verbindungen für die Suche (eine bleibt für die UI)
+SEARCH_WORKERS = 2
+# Kürzere Wörter stehen nicht im InnoDB-Volltextindex (innodb_ft_min_token_size)
+MIN_TOKEN_LENGTH = 3
+SNIPPET_LENGTH = 120
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_boolean_query(text: str) -> str:
+    """
+    Wandelt eine Eingabe in eine Boolean-Mode-Suche um.
+
+    Jedes Wort muss vorkommen und darf ein Präfix sein ("mül yoga" ->
+    "+mül* +yoga*"). Sonderzeichen der Boolean-Syntax werden entfernt.
+
+    Returns:
+        str: Suchausdruck oder "" wenn kein Wort lang genug ist.
+    """
+    tokens = [t for t in _TOKEN.findall(text) if len(t) >= MIN_TOKEN_LENGTH]
+    return " ".join(f"+{t}*" for t in tokens)
+
+
+def search_table(conn, table_name: str, boolean_query: str, limit: int = RESULTS_PER_TABLE) -> list:
+    """
+    Durchsucht eine Tabelle über ihren FULLTEXT-Index.
+
+    Returns:
+        list: dicts mit table, pk_column, pk, text (gekürzt) und score.
+    """
+    spec = SEARCH_INDEXES[table_name]
+    columns = ", ".join(f"`{c}`" for c in spec["columns"])
+    match = f"MATCH({columns}) AGAINST(%s IN BOOLEAN MODE)"
+    sql = (
+        f"SELECT `{spec['pk']}`, LEFT(CONCAT_WS(' · ', {columns}), {SNIPPET_LENGTH}), {match} AS score "
+        f"FROM `{table_name}` WHERE {match} ORDER BY score DESC LIMIT {int(limit)};"
+    )
+    cursor = conn.cursor()
+    cursor.execute(sql, (boolean_query, boolean_query))
+    rows = cursor.fetchall()
+    cursor.close()
+    return [
+        {"table": table_name, "pk_column": spec["pk"], "pk": pk, "text": text, "score": float(score)}
+        for pk, text, score in rows
+    ]
+
+
+def rank(results: list) -> list:
+    """
+    Sortiert Treffer tabellenübergreifend.
+
+    MATCH-Werte hängen von Tabellengröße und Worthäufigkeit ab und sind
+    zwischen Tabellen nicht vergleichbar; sie werden daher pro Tabelle auf
+    den besten Treffer normiert (1.0 = bester Treffer der Tabelle).
+    """
+    best = {}
+    for r in results:
+        best[r["table"]] = max(best.get(r["table"], 0.0), r["score"])
+    for r in results:
+        r["relevance"] = r["score"] / best[r["table"]] if best[r["table"]] else 0.0
+    return sorted(results, key=lambda r: (r["relevance"], r["score"]), reverse=True)
+
+
+def search_all(session, text: str, limit: int = RESULTS_PER_TABLE, tables: list = None) -> dict:
+    """
+    Durchsucht alle indizierten Tabellen parallel (siehe utils.fanout.fan_out).
+
+    Die Tabellen werden auf die UI-Verbindung und bis zu SEARCH_WORKERS
+    zusätzliche Verbindungen aus dem Pool der Sitzung verteilt. Ist der
+    Pool gerade ausgeschöpft (z.B. durch den Prefetcher), wird seriell
+    über die UI-Verbindung gesucht.
+
+    Args:
+        session: DBSession des Nutzers (Suche läuft mit seinen Rechten).
+        text (str): Sucheingabe.
+        limit (int, optional): Treffer pro Tabelle.
+        tables (list, optional): Nur diese Tabellen durchsuchen.
+
+    Returns:
+        dict: results (gerankt, siehe rank), errors (Tabelle -> Meldung), duration_ms.
+    """
+    boolean_query = build_boolean_query(text)
+    tables = [t for t in (tables or SEARCH_INDEXES) if t in SEARCH_INDEXES]
+    if not boolean_query or not tables:
+        return {"results": [], "errors": {}, "duration_ms": 0.0}
+
+    tasks = {t: (lambda c, t=t: search_table(c, t, boolean_query, limit)) for t in tables}
+    outcome = fan_out(tasks, session.connection(), session, SEARCH_WORKERS)
+    results = [r for t in tables for r in outcome["results"].get(t, [])]
+    # z.B. fehlender Index (Migration nicht angewendet) oder fehlende Rechte
+    errors = {t: getattr(e, "msg", None) or str(e) for t, e in outcome["errors"].items()}
+    return {"results": rank(results), "errors": errors, "duration_ms": outcome["duration_ms"]}
@@ -0,0 +1,163 @@
+# utils/session.py
+import re
+import time
+import uuid
+
+import toml
+
+from utils.database import SECRETS_PATH, connect, connection_pool
+from utils.privileges import load_privileges
+
+# Nach dieser Zeit ohne Nutzung wird die Anmeldung erneut geprüft (Sekunden)
+SESSION_TTL = 30 * 60
+# Verbindungen pro Sitzung: eine für die UI, der Rest für parallele Arbeit
+POOL_SIZE = 3
+
+
+class DBSession:
+    """
+    Authentifizierte Datenbanksitzung eines Nutzers.
+
+    Wird einmal beim Login (bzw. für die öffentliche Ansicht mit den
+    Zugangsdaten aus secrets.toml) erzeugt und im Session State gehalten.
+    Die Anmeldung wird dabei mit `SELECT CURRENT_ROLE()` geprüft, die
+    aktiven Rollen werden gespeichert. Alle Tabs nutzen dieselbe
+    UI-Verbindung aus dem Pool; weitere Verbindungen für parallele
+    Abfragen liefert `pooled()`. Erst nach Ablauf von SESSION_TTL ohne
+    Nutzung wird neu authentifiziert. Die effektiven Rechte (`privileges`)
+    werden einmal pro Anmeldung gelesen.
+    """
+
+    def __init__(self, user, password, host="localhost", database="hochschulsport"):
+        self.user = user
+        self.host = host
+        self.database = database
+        self._password = password
+        self._pool = None
+        self._conn = None
+        self.roles = []
+        self.expires_at = 0.0
+        self._privileges = None
+
+    @classmethod
+    def login(cls, user, password, host="localhost", database="hochschulsport"):
+        """
+        Meldet einen Nutzer an und gibt die verifizierte Sitzung zurück.
+
+        Raises:
+            mysql.connector.Error: Wenn die Anmeldung fehlschlägt.
+        """
+        session = cls(user, password, host=host, database=database)
+        session._authenticate()
+        return session
+
+    @classmethod
+    def from_secrets(cls):
+        """Sitzung mit den Zugangsdaten aus .streamlit/secrets.toml (öffentliche Ansicht)."""
+        secrets = toml.load(SECRETS_PATH)["mysql"]
+        return cls.login(
+            secrets["username"],
+            secrets["password"],
+            host=secrets["host"],
+            database=secrets["database"],
+        )
+
+    @property
+    def role(self) -> str:
+        """Erste aktive Rolle (z.B. 'rolle_verwaltung') oder None."""
+        return self.roles[0] if self.roles else None
+
+    @property
+    def privileges(self):
+        """Effektive Rechte (utils.privileges.Privileges), beim ersten Zugriff nach der Anmeldung gelesen."""
+        if self._privileges is None:
+            conn = self.connection()
+            self._privileges = load_privileges(conn, self.roles, self.database)
+        return self._privileges
+
+    def _authenticate(self):
+        """Baut den Pool auf und ermittelt die aktiven Rollen (ein Handshake)."""
+        self.close()
+        safe_user = re.sub(r"[^a-zA-Z0-9._:\-*$#]", "_", self.user)[:40]
+        self._pool = connection_pool(
+            pool_name=f"hs_{safe_user}_{uuid.uuid4().hex[:8]}",
+            pool_size=POOL_SIZE,
+            host=self.host,
+            user=self.user,
+            password=self._password,
+            database=self.database,
+            # Verbindungen leben über viele Reruns: ohne autocommit würden
+            # Lesezugriffe im Snapshot der ersten Abfrage hängen bleiben.
+            # Schreibvorgänge starten bei Bedarf explizit eine Transaktion.
+            autocommit=True,
+        )
+        self._conn = self._pool.get_connection()
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT CURRENT_ROLE();")
+        row = cursor.fetchone()
+        cursor.close()
+        self.roles = _parse_roles(row[0] if row else None)
+        self._privileges = None
+        self.expires_at = time.time() + SESSION_TTL
+
+    def connection(self):
+        """
+        Liefert die UI-Verbindung der Sitzung.
+
+        Wird über Reruns hinweg wiederverwendet; nur nach Ablauf der Sitzung
+        wird neu authentifiziert, nach einem Verbindungsabbruch wird eine neue
+        Verbindung aus dem Pool geholt.
+        """
+        if time.time() >= self.expires_at:
+            self._authenticate()
+        elif not self._conn.is_connected():
+            self._conn.close()
+            self._conn = self._pool.get_connection()
+        self.expires_at = time.time() + SESSION_TTL
+        return self._conn
+
+    def pooled(self):
+        """
+        Zusätzliche Verbindung aus dem Pool für parallele Arbeit.
+
+        Die Verbindung muss mit `close()` zurückgegeben werden. Wird auch
+        aus Hintergrund-Threads (Prefetch, fan_out) aufgerufen und meldet
+        deshalb nie selbst neu an: Das würde die UI-Verbindung schließen und
+        den Pool unter dem Skript-Thread austauschen. Neu angemeldet wird
+        über `connection()` im Skript-Thread.
+
+        Raises:
+            RuntimeError: Wenn die Sitzung abgelaufen ist.
+        """
+        pool = self._pool
+        if pool is None or time.time() >= self.expires_at:
+            raise RuntimeError("Sitzung abgelaufen, neue Anmeldung über connection() nötig.")
+        return pool.get_connection()
+
+    def new_connection(self):
+        """
+        Eigene Verbindung außerhalb des Pools mit den Rechten dieser Sitzung.
+
+        Für langlebige Hintergrund-Threads (z.B. den Writer der
+        WriteQueue), die den Pool der Sitzung nicht blockieren sollen.
+        """
+        return connect(host=self.host, user=self.user, password=self._password, database=self.database)
+
+    def close(self):
+        """Gibt die UI-Verbindung zurück und verwirft den Pool."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._pool = None
+
+
+def _parse_roles(value) -> list:
+    """Wandelt das Ergebnis von CURRENT_ROLE() ("`r1`@`%`,`r2`@`%`" oder "NONE") in Rollennamen um."""
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode()
+    if not value or value == "NONE":
+        return []
+    return [part.split("@")[0].strip("`'") for part in value.split(",")]
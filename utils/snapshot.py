@@ -0,0 +1,463 @@
+# utils/snapshot.py
+"""
+Lokaler Analyse-Snapshot der Datenbank (Parquet-Dateien + DuckDB).
+
+Aggregationen über viele Buchungen (Umsatz pro Angebot, Buchungen pro
+Teilnehmer, Auslastung) belasten sonst die MySQL-Datenbank, die auch
+die Buchungs-Trigger und den Editor bedient. Der Snapshot exportiert
+alle Tabellen und Views als spaltenorientierte Parquet-Dateien nach
+SNAPSHOT_DIR; lesende Abfragen aus dem SQL-Tab und dem Tabellen-Browser
+können stattdessen dort mit DuckDB (im Prozess, vektorisiert) laufen.
+
+Aktualisiert wird inkrementell über die Tabelle `changelog`
+(migrations/0003_changelog.py): Nur Tabellen mit neuen Einträgen werden
+angefasst, und nur deren geänderte Zeilen werden über den
+Primärschlüssel nachgeladen (wie im ChangeFeed). Views werden bei jeder
+Änderung komplett neu exportiert. Ohne Changelog, bei zu vielen
+Änderungen oder mit `full=True` wird alles neu exportiert.
+
+Wie im ChangeFeed werden übersprungene change_ids (späte Commits) in
+_state.json als Lücken gemerkt und nachgelesen, und nach Löschungen in
+einer Elterntabelle werden die per Kaskade abhängigen Tabellen komplett
+neu exportiert (MySQL protokolliert Kaskaden nicht).
+
+Der Snapshot ist höchstens REFRESH_INTERVAL Sekunden alt; Stand und
+Zeilenzahlen stehen in SNAPSHOT_DIR/_state.json. Aktualisiert wird
+durch einen Hintergrund-Thread der App (`get_snapshot_scheduler`) oder
+per `python -m utils.snapshot [--full]` (z.B. als Cronjob).
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import streamlit as st
+
+SNAPSHOT_DIR = "snapshot"
+STATE_FILE = "_state.json"
+# Abstand zwischen zwei Aktualisierungen durch den Hintergrund-Thread (Sekunden)
+REFRESH_INTERVAL = 300
+# Höchstens so viele Protokolleinträge pro Aktualisierung; mehr -> alles neu exportieren
+MAX_CHANGES = 50_000
+# Ab so vielen geänderten Zeilen einer Tabelle wird sie komplett neu exportiert
+MAX_PATCH_ROWS = 5000
+# Primärschlüssel pro Nachlade-Abfrage
+FETCH_CHUNK = 500
+# Nicht in den Snapshot
+EXCLUDED = {"changelog", "schema_version"}
+
+# MySQL: Tabelle existiert nicht bzw. keine Leserechte darauf
+_CHANGELOG_UNAVAILABLE = (1146, 1142)
+_refresh_lock = threading.Lock()
+
+
+def snapshot_path(name: str, directory: str = SNAPSHOT_DIR) -> str:
+    """Pfad der Parquet-Datei einer Tabelle bzw. View."""
+    return os.path.join(directory, f"{name}.parquet")
+
+
+def load_state(directory: str = SNAPSHOT_DIR) -> dict:
+    """
+    Stand des Snapshots.
+
+    Returns:
+        dict: change_id (zuletzt übernommene Changelog-ID oder None),
+              refreshed_at (ISO-Zeitpunkt) und tables (Name -> rows, kind, pk).
+              Leer, wenn noch kein Snapshot existiert.
+    """
+    try:
+        with open(os.path.join(directory, STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(state: dict, directory: str):
+    path = os.path.join(directory, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _write_parquet(df, path: str):
+    """Schreibt ein DataFrame atomar als Parquet (Leser sehen alte oder neue Datei)."""
+    import duckdb
+
+    con = duckdb.connect()
+    try:
+        con.register("frame", df)
+        con.execute(f"COPY frame TO '{_quote_path(path + '.tmp')}' (FORMAT PARQUET)")
+    finally:
+        con.close()
+    os.replace(path + ".tmp", path)
+
+
+def _read_parquet(path: str):
+    import duckdb
+
+    con = duckdb.connect()
+    try:
+        return con.execute(f"SELECT * FROM read_parquet('{_quote_path(path)}')").df()
+    finally:
+        con.close()
+
+
+def _quote_path(path: str) -> str:
+    return os.path.abspath(path).replace("'", "''")
+
+
+def list_relations(conn) -> dict:
+    """
+    Tabellen und Views der Datenbank, die in den Snapshot gehören.
+
+    Returns:
+        dict: tables (Name -> Primärschlüsselspalten, leer ohne Primärschlüssel)
+              und views (Liste der Namen).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT t.TABLE_NAME, t.TABLE_TYPE, k.COLUMN_NAME FROM information_schema.TABLES t "
+            "LEFT JOIN information_schema.KEY_COLUMN_USAGE k ON k.TABLE_SCHEMA = t.TABLE_SCHEMA "
+            "AND k.TABLE_NAME = t.TABLE_NAME AND k.CONSTRAINT_NAME = 'PRIMARY' "
+            "WHERE t.TABLE_SCHEMA = DATABASE() ORDER BY t.TABLE_NAME, k.ORDINAL_POSITION;"
+        )
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    tables, views = {}, []
+    for name, kind, column in rows:
+        if name.lower() in EXCLUDED:
+            continue
+        if kind == "VIEW":
+            views.append(name)
+        else:
+            cols = tables.setdefault(name, [])
+            if column:
+                cols.append(column)
+    return {"tables": tables, "views": views}
+
+
+def export_relation(conn, name: str, directory: str = SNAPSHOT_DIR) -> int:
+    """Exportiert eine Tabelle bzw. View komplett. Gibt die Zeilenzahl zurück."""
+    from utils.dtypes import frame_from_cursor
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM `{name}`;")
+        df = frame_from_cursor(cursor)
+    finally:
+        cursor.close()
+    _write_parquet(df, snapshot_path(name, directory))
+    return len(df)
+
+
+def _patch_relation(conn, name: str, pk_cols: list, pks: set, directory: str) -> int:
+    """Übernimmt geänderte Zeilen einer Tabelle in ihre Parquet-Datei."""
+    import pandas as pd
+    from utils.change_feed import _fetch_rows, patch_frame
+
+    pks = sorted(pks, key=str)
+    rows = [_fetch_rows(conn, name, pk_cols, pks[i:i + FETCH_CHUNK]) for i in range(0, len(pks), FETCH_CHUNK)]
+    path = snapshot_path(name, directory)
+    df = patch_frame(_read_parquet(path), pd.concat(rows, ignore_index=True), pk_cols, pks)
+    _write_parquet(df, path)
+    return len(df)
+
+
+def _changelog_head(conn):
+    """Höchste change_id im Protokoll oder None, wenn es kein Protokoll gibt."""
+    from mysql.connector import Error
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM changelog;")
+        return cursor.fetchone()[0]
+    except Error as e:
+        if e.errno in _CHANGELOG_UNAVAILABLE:
+            return None
+        raise
+    finally:
+        cursor.close()
+
+
+def _changes_between(conn, last_id: int, head: int, gaps: dict):
+    """
+    Geänderte Primärschlüssel seit `last_id` bis einschließlich `head`.
+
+    Wie im ChangeFeed werden übersprungene IDs (Transaktionen, die erst
+    nach dem Lesen von `head` committen) als Lücken gemerkt und bei den
+    folgenden Aktualisierungen mitgelesen, bis sie auftauchen oder
+    GAP_TIMEOUT abgelaufen ist.
+
+    Args:
+        gaps (dict): Fehlende change_id -> Zeitpunkt (epoch), seit dem sie fehlt.
+
+    Returns:
+        tuple: (changes, deleted, gaps) – changes ist Tabelle -> Menge von
+              Schlüsseln (frozenset von Spalte/Wert-Paaren; die Reihenfolge im
+              JSON-Objekt ist nicht die des Index), deleted die Tabellen mit
+              Op "D", gaps die weiterhin fehlenden IDs; None bei zu vielen Einträgen.
+    """
+    from utils.change_feed import GAP_TIMEOUT, skipped_ids
+
+    ids = sorted(gaps)
+    gap_filter = f" OR change_id IN ({', '.join(['%s'] * len(ids))})" if ids else ""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"SELECT change_id, table_name, op, pk FROM changelog "
+            f"WHERE (change_id > %s AND change_id <= %s){gap_filter} "
+            f"ORDER BY change_id LIMIT {MAX_CHANGES + 1};",
+            (last_id, head, *ids),
+        )
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if len(rows) > MAX_CHANGES:
+        return None
+    now = time.time()
+    gaps = {i: since for i, since in gaps.items() if now - since <= GAP_TIMEOUT}
+    changes, deleted, seen = {}, set(), last_id
+    for change_id, table_name, op, pk in rows:
+        if change_id > seen:
+            gaps.update(dict.fromkeys(skipped_ids(seen, change_id), now))
+            seen = change_id
+        else:
+            gaps.pop(change_id, None)
+        pk = json.loads(pk) if isinstance(pk, (str, bytes)) else pk
+        changes.setdefault(table_name, set()).add(frozenset(pk.items()))
+        if op == "D":
+            deleted.add(table_name)
+    gaps.update(dict.fromkeys(skipped_ids(seen, head + 1), now))
+    return changes, deleted, gaps
+
+
+def refresh_snapshot(conn, directory: str = SNAPSHOT_DIR, full: bool = False, log=None) -> dict:
+    """
+    Bringt den Snapshot auf den aktuellen Stand der Datenbank.
+
+    Args:
+        conn: Verbindung mit Leserechten auf alle Tabellen (und `changelog`).
+        directory (str, optional): Zielverzeichnis.
+        full (bool, optional): Alles neu exportieren statt inkrementell.
+        log (callable, optional): Ausgabe von Fortschrittsmeldungen.
+
+    Returns:
+        dict: mode ("full"/"incremental"), exported (Namen komplett exportiert),
+              patched (Name -> Anzahl geänderter Zeilen) und duration_ms.
+    """
+    log = log or (lambda message: None)
+    start = time.perf_counter()
+    with _refresh_lock:
+        os.makedirs(directory, exist_ok=True)
+        relations = list_relations(conn)
+        state = load_state(directory)
+        known = state.get("tables", {})
+        # Stand vor dem Lesen der Zeilen festhalten: spätere Änderungen kommen beim nächsten Mal
+        head = _changelog_head(conn)
+
+        changes, cascade, gaps = None, set(), {}
+        if not full and head is not None and state.get("change_id") is not None:
+            found = _changes_between(conn, state["change_id"], head,
+                                     {int(i): since for i, since in state.get("gaps", {}).items()})
+            if found is not None:
+                changes, deleted, gaps = found
+                if deleted:
+                    # Per Kaskade geänderte Zeilen stehen nicht im Protokoll: abhängige Tabellen neu exportieren
+                    from utils.change_feed import cascaded, load_cascades
+
+                    cascade = {t.lower() for t in cascaded(load_cascades(conn), deleted)}
+        mode = "full" if changes is None else "incremental"
+
+        exported, patched = [], {}
+        tables = {}
+        for name, pk_cols in relations["tables"].items():
+            entry = {"kind": "table", "pk": pk_cols, "rows": known.get(name, {}).get("rows")}
+            pks = {tuple(dict(pk)[c] for c in pk_cols) for pk in (changes or {}).get(name, ())}
+            missing = name not in known or not os.path.exists(snapshot_path(name, directory))
+            if mode == "full" or missing or not pk_cols:
+                # Tabellen ohne Primärschlüssel haben keine Changelog-Trigger
+                if mode == "full" or missing or changes:
+                    entry["rows"] = export_relation(conn, name, directory)
+                    exported.append(name)
+            elif len(pks) > MAX_PATCH_ROWS or name.lower() in cascade:
+                entry["rows"] = export_relation(conn, name, directory)
+                exported.append(name)
+            elif pks:
+                entry["rows"] = _patch_relation(conn, name, pk_cols, pks, directory)
+                patched[name] = len(pks)
+            tables[name] = entry
+        for name in relations["views"]:
+            entry = {"kind": "view", "pk": [], "rows": known.get(name, {}).get("rows")}
+            if mode == "full" or changes or name not in known:
+                entry["rows"] = export_relation(conn, name, directory)
+                exported.append(name)
+            tables[name] = entry
+        for name in set(known) - set(tables):
+            # Tabelle gelöscht (oder keine Leserechte mehr)
+            if os.path.exists(snapshot_path(name, directory)):
+                os.remove(snapshot_path(name, directory))
+
+        _save_state({
+            "change_id": head,
+            "gaps": {str(i): since for i, since in gaps.items()},
+            "refreshed_at": datetime.now().isoformat(timespec="seconds"),
+            "tables": tables,
+        }, directory)
+    duration_ms = (time.perf_counter() - start) * 1000
+    log(f"Snapshot ({mode}): {len(exported)} exportiert, {len(patched)} gepatcht, {duration_ms:.0f} ms")
+    return {"mode": mode, "exported": exported, "patched": patched, "duration_ms": duration_ms}
+
+
+# Backticks (MySQL) -> doppelte Anführungszeichen, %s -> ? (Strings bleiben unverändert)
+_DIALECT_TOKEN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`([^`]*)`|%s")
+
+
+def to_duckdb_sql(sql: str) -> str:
+    """Übersetzt die MySQL-Schreibweise von Bezeichnern und Platzhaltern für DuckDB."""
+    def replace(match):
+        token = match.group(0)
+        if token == "%s":
+            return "?"
+        if token.startswith("`"):
+            return '"' + match.group(1).replace('"', '""') + '"'
+        return token
+    return _DIALECT_TOKEN.sub(replace, sql)
+
+
+def snapshot_connection(directory: str = SNAPSHOT_DIR, tables: list = None):
+    """
+    In-Memory-DuckDB mit je einer View pro Parquet-Datei des Snapshots.
+
+    Dateizugriffe sind auf das Snapshot-Verzeichnis beschränkt und die
+    Konfiguration ist danach gesperrt.
+
+    Args:
+        directory (str, optional): Snapshot-Verzeichnis.
+        tables (list, optional): Nur diese Tabellen/Views anlegen (z.B. die
+            lesbaren aus `Privileges.readable`); None = alle.
+    """
+    import duckdb
+
+    con = duckdb.connect()
+    con.execute(f"SET allowed_directories = ['{_quote_path(directory)}/']")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    allowed = None if tables is None else set(tables)
+    for name in load_state(directory).get("tables", {}):
+        path = snapshot_path(name, directory)
+        if (allowed is None or name in allowed) and os.path.exists(path):
+            quoted = name.replace('"', '""')
+            con.execute(f"CREATE VIEW \"{quoted}\" AS SELECT * FROM read_parquet('{_quote_path(path)}')")
+    return con
+
+
+def query_snapshot(sql: str, params=None, directory: str = SNAPSHOT_DIR, tables: list = None):
+    """
+    Führt eine lesende Abfrage auf dem Snapshot aus.
+
+    Exportiert wird mit dem Konto aus secrets.toml; damit angemeldete
+    Nutzer darüber keine Tabellen ohne Leserecht abfragen, gibt der
+    Aufrufer die lesbaren Tabellen in `tables` mit.
+
+    Args:
+        sql (str): Genau ein SELECT (auch WITH ... SELECT), MySQL-Schreibweise
+            mit Backticks und %s-Platzhaltern ist erlaubt.
+        params (tuple, optional): Parameter für die Platzhalter.
+        directory (str, optional): Snapshot-Verzeichnis.
+        tables (list, optional): Sichtbare Tabellen/Views; None = alle.
+
+    Returns:
+        pd.DataFrame: Ergebnis.
+
+    Raises:
+        ValueError: Bei mehreren oder nicht lesenden Statements.
+    """
+    from utils.sql_script import main_keyword, split_statements
+
+    statements = split_statements(sql)
+    if len(statements) != 1 or main_keyword(statements[0]) != "SELECT":
+        raise ValueError("Auf dem Snapshot ist genau ein SELECT erlaubt.")
+    con = snapshot_connection(directory, tables)
+    try:
+        return con.execute(to_duckdb_sql(statements[0]), list(params) if params else None).df()
+    finally:
+        con.close()
+
+
+def snapshot_tables(privileges=None, directory: str = SNAPSHOT_DIR) -> list:
+    """Tabellen/Views des Snapshots, die mit `privileges` lesbar sind (ohne: alle)."""
+    names = list(load_state(directory).get("tables", {}))
+    return privileges.readable(names) if privileges is not None else names
+
+
+def snapshot_available(table_name: str = None, directory: str = SNAPSHOT_DIR) -> bool:
+    """Ob ein Snapshot (bzw. die Datei einer Tabelle darin) existiert."""
+    tables = load_state(directory).get("tables", {})
+    if table_name is None:
+        return bool(tables)
+    return table_name in tables and os.path.exists(snapshot_path(table_name, directory))
+
+
+class SnapshotScheduler:
+    """
+    Hintergrund-Thread, der den Snapshot alle `interval` Sekunden aktualisiert.
+
+    Nutzt eine eigene Verbindung mit den Zugangsdaten der öffentlichen
+    Ansicht (.streamlit/secrets.toml). Fehler werden in `last_error`
+    festgehalten und beim nächsten Durchlauf erneut versucht.
+    """
+
+    def __init__(self, interval: float = REFRESH_INTERVAL, directory: str = SNAPSHOT_DIR):
+        self.interval = interval
+        self.directory = directory
+        self.last_result = None
+        self.last_error = None
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="snapshot", daemon=True)
+        self._thread.start()
+
+    def refresh_now(self):
+        """Startet die nächste Aktualisierung sofort (z.B. per Button)."""
+        self._wake.set()
+
+    def _loop(self):
+        from utils.database import get_connection
+
+        while True:
+            conn = None
+            try:
+                conn = get_connection()
+                self.last_result = refresh_snapshot(conn, self.directory)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            finally:
+                if conn is not None:
+                    conn.close()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+@st.cache_resource
+def get_snapshot_scheduler() -> SnapshotScheduler:
+    """Ein Snapshot-Thread pro Streamlit-Prozess (startet beim ersten Aufruf)."""
+    return SnapshotScheduler()
+
+
+def main():
+    import sys
+    from utils.database import get_connection
+
+    conn = get_connection()
+    try:
+        refresh_snapshot(conn, full="--full" in sys.argv[1:], log=print)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
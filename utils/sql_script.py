@@ -0,0 +1,279 @@
+# utils/sql_script.py
+import re
+import time
+
+# Maximale Anzahl Statements, die in einem Roundtrip gesendet werden
+BATCH_SIZE = 20
+
+READ_KEYWORDS = {"SELECT", "SHOW", "DESCRIBE", "DESC", "EXPLAIN", "TABLE", "VALUES", "HELP"}
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE", "LOAD", "CALL", "DO"}
+# Statements mit implizitem COMMIT – beenden eine offene Schreib-Transaktion
+# (execute_script committet davor explizit und meldet das pro Statement)
+DDL_KEYWORDS = {"CREATE", "ALTER", "DROP", "TRUNCATE", "RENAME", "GRANT", "REVOKE", "FLUSH", "ANALYZE", "OPTIMIZE"}
+
+_DELIMITER_LINE = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+_WORD = re.compile(r"[A-Za-z_]+")
+
+
+def split_statements(sql: str) -> list:
+    """
+    Zerlegt ein SQL-Skript in einzelne Statements.
+
+    Beachtet Strings ('...', "...", `...`), Kommentare (--, #, /* */) und
+    DELIMITER-Zeilen, sodass Trigger/Prozeduren mit BEGIN ... END als ein
+    Statement erhalten bleiben. Kommentare werden entfernt, leere
+    Statements verworfen.
+
+    Args:
+        sql (str): Das komplette Skript.
+
+    Returns:
+        list: Statements ohne abschließendes Trennzeichen.
+    """
+    statements = []
+    delimiter = ";"
+    current = []
+    i = 0
+    n = len(sql)
+    at_line_start = True
+
+    while i < n:
+        # DELIMITER-Direktive (nur am Zeilenanfang, außerhalb von Statements)
+        if at_line_start:
+            line_end = sql.find("\n", i)
+            line_end = n if line_end == -1 else line_end
+            match = _DELIMITER_LINE.match(sql[i:line_end])
+            if match and not "".join(current).strip():
+                delimiter = match.group(1)
+                i = line_end + 1
+                continue
+        ch = sql[i]
+        at_line_start = ch == "\n"
+
+        if ch in ("'", '"', "`"):
+            end = i + 1
+            while end < n:
+                if sql[end] == "\\" and ch != "`":
+                    end += 2
+                    continue
+                if sql[end] == ch:
+                    if end + 1 < n and sql[end + 1] == ch:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if sql.startswith("--", i) and (i + 2 >= n or sql[i + 2] in " \t\r\n") or ch == "#":
+            end = sql.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            current.append(" ")
+            continue
+        if sql.startswith(delimiter, i):
+            stmt = "".join(current).strip()
+            if stmt:
+                statements.append(stmt)
+            current = []
+            i += len(delimiter)
+            continue
+        current.append(ch)
+        i += 1
+
+    stmt = "".join(current).strip()
+    if stmt:
+        statements.append(stmt)
+    return statements
+
+
+def main_keyword(stmt: str) -> str:
+    """Erstes Schlüsselwort; bei WITH das Schlüsselwort nach den CTEs."""
+    words = _WORD.findall(stmt.lstrip("( \t\r\n"))
+    if not words:
+        return ""
+    first = words[0].upper()
+    if first != "WITH":
+        return first
+    # Nach den CTEs folgt auf Klammerebene 0 das eigentliche Statement
+    depth = 0
+    for match in re.finditer(r"\(|\)|[A-Za-z_]+|'(?:[^'\\]|\\.)*'", stmt):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() in ("SELECT", "UPDATE", "DELETE", "INSERT", "TABLE"):
+            return token.upper()
+    return "SELECT"
+
+
+def classify_statement(stmt: str) -> str:
+    """
+    Ordnet ein Statement einer Klasse zu.
+
+    Returns:
+        str: "read" (liefert Zeilen, z.B. SELECT, WITH ... SELECT, SHOW,
+             DESCRIBE, EXPLAIN), "write" (INSERT/UPDATE/DELETE/...),
+             "ddl" (implizites COMMIT) oder "other" (z.B. SET, USE).
+    """
+    keyword = main_keyword(stmt)
+    if keyword in READ_KEYWORDS:
+        return "read"
+    if keyword in WRITE_KEYWORDS:
+        return "write"
+    if keyword in DDL_KEYWORDS:
+        return "ddl"
+    return "other"
+
+
+def _is_compound(stmt: str) -> bool:
+    """Statements mit eigenen Semikolons (BEGIN ... END) oder CALL werden einzeln gesendet."""
+    keyword = main_keyword(stmt)
+    return keyword == "CALL" or (keyword == "CREATE" and re.search(r"\bBEGIN\b", stmt, re.IGNORECASE) is not None)
+
+
+def _batches(statements: list, batch_size: int) -> list:
+    """Gruppiert Statements; DDL, CALL und Compound-Statements bilden eigene Batches."""
+    batches = []
+    current = []
+    for stmt in statements:
+        if classify_statement(stmt) == "ddl" or _is_compound(stmt):
+            if current:
+                batches.append(current)
+                current = []
+            batches.append([stmt])
+            continue
+        current.append(stmt)
+        if len(current) >= batch_size:
+            batches.append(current)
+            current = []
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _writes_before_ddl(batches: list) -> bool:
+    """Ob bis zur nächsten DDL (bzw. bis zum Ende) geschrieben wird."""
+    for batch in batches:
+        if classify_statement(batch[0]) == "ddl":
+            return False
+        if any(classify_statement(stmt) == "write" for stmt in batch):
+            return True
+    return False
+
+
+def execute_script(conn, sql: str, params=None, batch_size: int = BATCH_SIZE, rewrite=None) -> list:
+    """
+    Führt ein SQL-Skript mit mehreren Statements aus.
+
+    - Statements werden in Batches per Multi-Statement-Execution gesendet
+      (ein Roundtrip pro Batch); die Ergebnismengen werden der Reihe nach
+      den Statements zugeordnet.
+    - Enthält das Skript Schreiboperationen, laufen diese in einer
+      gemeinsamen Transaktion: bei einem Fehler wird sie zurückgerollt.
+      DDL-Statements haben in MySQL ein implizites COMMIT; sie werden
+      einzeln gesendet, davor wird die offene Transaktion explizit
+      committet und danach eine neue begonnen. Was vor einer DDL lag,
+      bleibt also auch bei einem späteren Fehler bestehen ("committed").
+    - Die Dauer pro Statement ist die Zeit bis zum Eintreffen seiner
+      Ergebnismenge (der Server arbeitet die Statements nacheinander ab).
+    - `params` sind nur bei einem einzelnen Statement erlaubt.
+
+    Args:
+        conn: Offene MySQL-Verbindung.
+        sql (str): Skript mit einem oder mehreren Statements.
+        params (tuple, optional): Parameter für ein einzelnes Statement.
+        batch_size (int, optional): Maximale Statements pro Roundtrip.
+        rewrite (callable, optional): Wird auf jedes Statement vor dem Senden
+            angewendet (z.B. `utils.query_guard.guard_statement`).
+
+    Returns:
+        list: Pro Statement ein dict mit statement, kind, columns,
+              description (cursor.description), rows, rowcount,
+              duration_ms, error (None oder Exception) und committed
+              (ob die Wirkung dauerhaft ist, auch wenn später ein Fehler folgt).
+              Nach einem Fehler nicht mehr ausgeführte Statements fehlen.
+    """
+    statements = split_statements(sql)
+    if rewrite is not None:
+        statements = [rewrite(stmt) for stmt in statements]
+    if params and len(statements) != 1:
+        raise ValueError("Parameter sind nur für ein einzelnes Statement erlaubt.")
+
+    results = []
+    batches = _batches(statements, batch_size)
+    # Ergebnisse ab diesem Index gehören zur offenen Transaktion
+    open_from = 0
+
+    def commit():
+        if conn.in_transaction:
+            conn.commit()
+        for res in results[open_from:]:
+            res["committed"] = True
+        return len(results)
+
+    cursor = conn.cursor()
+    try:
+        for index, batch in enumerate(batches):
+            if classify_statement(batch[0]) == "ddl":
+                # MySQL würde hier implizit committen: explizit und nachvollziehbar
+                open_from = commit()
+            elif not conn.in_transaction and _writes_before_ddl(batches[index:]):
+                conn.start_transaction()
+            pending = list(batch)
+            start = time.perf_counter()
+            try:
+                if params:
+                    cursor.execute(pending[0], params)
+                else:
+                    cursor.execute(";\n".join(pending))
+                while pending:
+                    description = cursor.description
+                    columns = [c[0] for c in description] if description else None
+                    rows = cursor.fetchall() if columns else []
+                    now = time.perf_counter()
+                    stmt = pending.pop(0)
+                    results.append({
+                        "statement": stmt,
+                        "kind": classify_statement(stmt),
+                        "columns": columns,
+                        "description": description,
+                        "rows": rows,
+                        "rowcount": cursor.rowcount,
+                        "duration_ms": (now - start) * 1000,
+                        "error": None,
+                        "committed": False,
+                    })
+                    start = now
+                    if pending and not cursor.nextset():
+                        break
+                # Weitere Ergebnismengen (z.B. Status nach CALL) verwerfen
+                while cursor.nextset():
+                    if cursor.description:
+                        cursor.fetchall()
+            except Exception as e:
+                failed = pending[0] if pending else batch[-1]
+                results.append({
+                    "statement": failed,
+                    "kind": classify_statement(failed),
+                    "columns": None,
+                    "description": None,
+                    "rows": [],
+                    "rowcount": -1,
+                    "duration_ms": (time.perf_counter() - start) * 1000,
+                    "error": e,
+                    "committed": False,
+                })
+                if conn.in_transaction:
+                    conn.rollback()
+                return results
+            if classify_statement(batch[0]) == "ddl":
+                open_from = commit()
+        commit()
+    finally:
+        cursor.close()
+    return results
@@ -0,0 +1,957 @@
+# utils/sqlite_backend.py
+"""
+SQLite-Testdouble für die MySQL-Schicht (Backend "sqlite", siehe utils.database).
+
+Bildet die Teile von mysql.connector nach, die App und Komponenten
+benutzen (connect, Pool, Cursor mit description/rowcount/lastrowid,
+mehrere Statements pro execute mit nextset, Transaktionen, Savepoints),
+und übersetzt den MySQL-Dialekt der App:
+
+- `%s`/`%(name)s`-Platzhalter, Strings in doppelten Anführungszeichen,
+  Backslash-Escapes, `<=>` und MATCH ... AGAINST (ohne Index, per Funktion)
+- SHOW TABLES, SHOW FULL TABLES, DESCRIBE, SELECT CURRENT_ROLE(),
+  DATABASE(), NOW() und ein nachgebildetes information_schema
+  (TABLES, COLUMNS, KEY_COLUMN_USAGE, REFERENTIAL_CONSTRAINTS, STATISTICS)
+- CREATE TABLE mit ENUM, AUTO_INCREMENT und Constraints zwischen den
+  Spalten; DESCRIBE liefert die ursprünglichen MySQL-Typen
+- Fehler als mysql.connector-Exceptions mit den MySQL-Fehlernummern
+  (1146, 1062, 1452, 1142, ...)
+
+Das Schema wird aus migrations/0001_baseline.sql geladen; die Trigger
+der Baseline sind in SQLITE_TRIGGERS von Hand nach SQLite übertragen
+(handle_storno im Stand von 0005), dazu die Changelog-Trigger aus 0003
+und die Prozeduren aus SQLITE_PROCEDURES (nur über `cursor.callproc`). Rechte der Konten
+`verwaltung`/`kursleiter` werden wie in der Baseline über den
+Authorizer von SQLite durchgesetzt; andere Nutzer arbeiten ohne
+Einschränkung. Nicht nachgebildet sind u.a. EXPLAIN, CALL, FULLTEXT-Indizes
+und die übrigen späteren Migrationen.
+
+Jede Datenbank (Parameter `database`) ist eine temporäre SQLite-Datei im
+WAL-Modus, damit Pool-Verbindungen aus mehreren Threads eigene
+Transaktionen haben; sie lebt bis zum Prozessende bzw. `reset_database`.
+Getrennte Prozesse (z.B. parallele Testläufe) haben getrennte Datenbanken.
+"""
+import atexit
+import datetime as dt
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from decimal import Decimal
+
+from mysql.connector import errors
+from mysql.connector.constants import FieldFlag, FieldType
+
+from utils.sql_script import classify_statement, split_statements
+
+SCHEMA_PATH = os.path.join("migrations", "0001_baseline.sql")
+DATABASE = "hochschulsport"
+# Konten der Baseline: Passwort und aktive Rolle
+ACCOUNTS = {"verwaltung": ("1234", "rolle_verwaltung"), "kursleiter": ("12345", "rolle_kursleiter")}
+# Schreibrechte der Rollen wie in der Baseline (GRANT ...): Operation -> Tabellen (None = alle)
+ROLE_WRITES = {
+    "rolle_verwaltung": {"INSERT": None, "UPDATE": None, "DELETE": None},
+    "rolle_kursleiter": {"UPDATE": {"buchung", "feedback"}, "DELETE": {"buchung", "feedback"}},
+}
+# Wartezeit auf Schreibsperren anderer Verbindungen (Sekunden)
+BUSY_TIMEOUT = 5.0
+# Interne Tabelle mit den ursprünglichen MySQL-Spaltentypen
+CATALOG_TABLE = "_shim_columns"
+
+# Trigger der Baseline in SQLite-Syntax (ohne IF/DECLARE, NEW ist in SQLite nicht änderbar)
+SQLITE_TRIGGERS = {
+    # BEFORE INSERT setzt in MySQL NEW.buchung_status; hier direkt nach dem Einfügen
+    "check_teilnahme_moeglich": """
+        CREATE TRIGGER check_teilnahme_moeglich AFTER INSERT ON Buchung FOR EACH ROW BEGIN
+            UPDATE Buchung SET buchung_status = 'wartend'
+            WHERE buchungs_id = NEW.buchungs_id AND COALESCE(
+                (SELECT COUNT(*) FROM Buchung WHERE veranstaltungs_id = NEW.veranstaltungs_id
+                 AND buchung_status IN ('offen', 'bezahlt') AND buchungs_id <> NEW.buchungs_id)
+                >= (SELECT verfügbare_plätze FROM Veranstaltung WHERE veranstaltungs_id = NEW.veranstaltungs_id), 0);
+            UPDATE anmeldungsliste SET teilnahme_möglich = (SELECT buchung_status <> 'wartend'
+                OR NEW.buchung_status = 'wartend' FROM Buchung WHERE buchungs_id = NEW.buchungs_id)
+            WHERE veranstaltungs_id = NEW.veranstaltungs_id;
+            INSERT INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id)
+            SELECT NEW.teilnehmer_id, (SELECT anmeldungsliste_id FROM anmeldungsliste WHERE veranstaltungs_id = NEW.veranstaltungs_id)
+            FROM Buchung WHERE buchungs_id = NEW.buchungs_id AND buchung_status = 'bezahlt';
+            DELETE FROM Angemeldete_Kursteilnehmer
+            WHERE teilnehmer_id = NEW.teilnehmer_id
+              AND anmeldungsliste_id = (SELECT anmeldungsliste_id FROM anmeldungsliste WHERE veranstaltungs_id = NEW.veranstaltungs_id)
+              AND (SELECT buchung_status FROM Buchung WHERE buchungs_id = NEW.buchungs_id) <> 'bezahlt';
+        END""",
+    # Stand nach migrations/0005: das Nachrücken übernimmt die Prozedur nachruecken
+    "handle_storno": """
+        CREATE TRIGGER handle_storno AFTER UPDATE ON Buchung FOR EACH ROW
+        WHEN NEW.buchung_status = 'storniert' AND OLD.buchung_status <> 'storniert' BEGIN
+            UPDATE anmeldungsliste SET teilnahme_möglich = 1 WHERE veranstaltungs_id = NEW.veranstaltungs_id;
+        END""",
+    "after_veranstaltung_insert": """
+        CREATE TRIGGER after_veranstaltung_insert AFTER INSERT ON Veranstaltung FOR EACH ROW BEGIN
+            INSERT INTO anmeldungsliste (veranstaltungs_id, teilnahme_möglich) VALUES (NEW.veranstaltungs_id, 1);
+        END""",
+    # buchung_insert ist in check_teilnahme_moeglich enthalten (Reihenfolge wie in MySQL: erst Status, dann Liste)
+    "buchung_insert": None,
+    "buchung_update": """
+        CREATE TRIGGER buchung_update AFTER UPDATE ON Buchung FOR EACH ROW BEGIN
+            INSERT OR IGNORE INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id)
+            SELECT NEW.teilnehmer_id, (SELECT anmeldungsliste_id FROM anmeldungsliste
+                                       WHERE veranstaltungs_id = NEW.veranstaltungs_id LIMIT 1)
+            WHERE NEW.buchung_status = 'bezahlt';
+            DELETE FROM Angemeldete_Kursteilnehmer
+            WHERE OLD.buchung_status = 'bezahlt' AND NEW.buchung_status <> 'bezahlt'
+              AND teilnehmer_id = NEW.teilnehmer_id
+              AND anmeldungsliste_id = (SELECT anmeldungsliste_id FROM anmeldungsliste
+                                        WHERE veranstaltungs_id = NEW.veranstaltungs_id LIMIT 1);
+        END""",
+}
+
+# Gespeicherte Prozeduren (Stand nach migrations/0007) in SQLite-Syntax:
+# Name -> (IN-Parameter, Statements); der OUT-Parameter ist die Zeilenzahl des ersten
+# Statements mit Zeilenzahl (DDL zählt nicht)
+_PROMOTED_EVENT = (
+    "({column} = :p_veranstaltungs_id OR (:p_veranstaltungs_id IS NULL AND {column} IN "
+    "(SELECT veranstaltungs_id FROM temp.nachruecken_kandidaten)))"
+)
+SQLITE_PROCEDURES = {
+    "nachruecken": (("p_veranstaltungs_id",), (
+        "DROP TABLE IF EXISTS temp.nachruecken_kandidaten",
+        "CREATE TEMP TABLE nachruecken_kandidaten (buchungs_id INTEGER PRIMARY KEY, veranstaltungs_id INTEGER NOT NULL)",
+        """
+        INSERT INTO temp.nachruecken_kandidaten (buchungs_id, veranstaltungs_id)
+        SELECT w.buchungs_id, w.veranstaltungs_id
+        FROM (SELECT buchungs_id, veranstaltungs_id,
+                     ROW_NUMBER() OVER (PARTITION BY veranstaltungs_id ORDER BY datum, buchungs_id) AS rang
+              FROM Buchung
+              WHERE buchung_status = 'wartend'
+                AND (:p_veranstaltungs_id IS NULL OR veranstaltungs_id = :p_veranstaltungs_id)) w
+        JOIN (SELECT v.veranstaltungs_id, v.verfügbare_plätze - COUNT(a.buchungs_id) AS frei
+              FROM Veranstaltung v
+              LEFT JOIN Buchung a
+                ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+              WHERE :p_veranstaltungs_id IS NULL OR v.veranstaltungs_id = :p_veranstaltungs_id
+              GROUP BY v.veranstaltungs_id, v.verfügbare_plätze) f ON f.veranstaltungs_id = w.veranstaltungs_id
+        WHERE f.frei IS NULL OR w.rang <= f.frei""",
+        """
+        UPDATE Buchung SET buchung_status = 'offen'
+        WHERE buchungs_id IN (SELECT buchungs_id FROM temp.nachruecken_kandidaten)""",
+        f"""
+        UPDATE anmeldungsliste SET teilnahme_möglich = f.moeglich
+        FROM (SELECT v.veranstaltungs_id, COALESCE(v.verfügbare_plätze > COUNT(a.buchungs_id), 1) AS moeglich
+              FROM Veranstaltung v
+              LEFT JOIN Buchung a
+                ON a.veranstaltungs_id = v.veranstaltungs_id AND a.buchung_status IN ('offen', 'bezahlt')
+              WHERE {_PROMOTED_EVENT.format(column='v.veranstaltungs_id')}
+              GROUP BY v.veranstaltungs_id, v.verfügbare_plätze) f
+        WHERE f.veranstaltungs_id = anmeldungsliste.veranstaltungs_id""",
+        f"""
+        DELETE FROM Angemeldete_Kursteilnehmer
+        WHERE anmeldungsliste_id IN (SELECT anmeldungsliste_id FROM anmeldungsliste
+                                     WHERE {_PROMOTED_EVENT.format(column='veranstaltungs_id')})
+          AND NOT EXISTS (
+              SELECT 1 FROM Buchung b
+              JOIN anmeldungsliste l ON l.veranstaltungs_id = b.veranstaltungs_id
+              WHERE l.anmeldungsliste_id = Angemeldete_Kursteilnehmer.anmeldungsliste_id
+                AND b.teilnehmer_id = Angemeldete_Kursteilnehmer.teilnehmer_id
+                AND b.buchung_status = 'bezahlt')""",
+        f"""
+        INSERT OR IGNORE INTO Angemeldete_Kursteilnehmer (teilnehmer_id, anmeldungsliste_id)
+        SELECT b.teilnehmer_id, MIN(l.anmeldungsliste_id)
+        FROM Buchung b
+        JOIN anmeldungsliste l ON l.veranstaltungs_id = b.veranstaltungs_id
+        WHERE b.buchung_status = 'bezahlt'
+          AND {_PROMOTED_EVENT.format(column='b.veranstaltungs_id')}
+          AND NOT EXISTS (
+              SELECT 1 FROM Angemeldete_Kursteilnehmer k
+              JOIN anmeldungsliste l2 ON l2.anmeldungsliste_id = k.anmeldungsliste_id
+              WHERE k.teilnehmer_id = b.teilnehmer_id AND l2.veranstaltungs_id = b.veranstaltungs_id)
+        GROUP BY b.teilnehmer_id, b.veranstaltungs_id""",
+        "DROP TABLE temp.nachruecken_kandidaten",
+    )),
+}
+
+_INFORMATION_SCHEMA = """
+CREATE TABLE information_schema.TABLES (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, TABLE_TYPE TEXT, TABLE_ROWS INTEGER,
+    DATA_LENGTH INTEGER, INDEX_LENGTH INTEGER);
+CREATE TABLE information_schema.COLUMNS (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT, ORDINAL_POSITION INTEGER,
+    COLUMN_DEFAULT TEXT, IS_NULLABLE TEXT, DATA_TYPE TEXT, COLUMN_TYPE TEXT, COLUMN_KEY TEXT, EXTRA TEXT);
+CREATE TABLE information_schema.KEY_COLUMN_USAGE (CONSTRAINT_NAME TEXT, TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT,
+    ORDINAL_POSITION INTEGER, REFERENCED_TABLE_SCHEMA TEXT, REFERENCED_TABLE_NAME TEXT, REFERENCED_COLUMN_NAME TEXT);
+CREATE TABLE information_schema.REFERENTIAL_CONSTRAINTS (CONSTRAINT_SCHEMA TEXT, CONSTRAINT_NAME TEXT,
+    UPDATE_RULE TEXT, DELETE_RULE TEXT, TABLE_NAME TEXT, REFERENCED_TABLE_NAME TEXT);
+CREATE TABLE information_schema.STATISTICS (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, NON_UNIQUE INTEGER, INDEX_NAME TEXT,
+    SEQ_IN_INDEX INTEGER, COLUMN_NAME TEXT, INDEX_TYPE TEXT);
+"""
+
+# Strings, Bezeichner, Platzhalter und <=> (für die Übersetzung nach SQLite)
+_TOKEN = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|%\((\w+)\)s|%s|<=>""")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0"}
+_SHOW_TABLES = re.compile(r"^SHOW\s+(FULL\s+)?TABLES(?:\s+WHERE\s+Table_type\s*=\s*'([^']*)')?$", re.I)
+_DESCRIBE = re.compile(r"^(?:DESCRIBE|DESC|SHOW\s+COLUMNS\s+FROM)\s+`?([^`\s]+)`?$", re.I)
+_SHOW_GRANTS = re.compile(r"^SHOW\s+GRANTS\b", re.I)
+_START = re.compile(r"^(?:START\s+TRANSACTION|BEGIN)(?:\s+WORK)?$", re.I)
+_IGNORED = re.compile(r"^(?:USE|SET|FLUSH|ANALYZE|OPTIMIZE|CREATE\s+(?:USER|ROLE)|GRANT|REVOKE|DROP\s+(?:USER|ROLE))\b", re.I)
+_UNSUPPORTED = re.compile(r"^(?:EXPLAIN|CALL|CREATE\s+(?:TRIGGER|PROCEDURE|FUNCTION|FULLTEXT|SPATIAL)|DROP\s+(?:TRIGGER|PROCEDURE|FUNCTION))\b", re.I)
+_CREATE_TABLE = re.compile(r"^CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?`?([^`\s(]+)`?\s*\((.*)\)([^)]*)$", re.I | re.S)
+_COLUMN = re.compile(r"^`?([^`\s]+)`?\s+(\w+)(\s*\((?:'[^']*'|[^)])*\))?(\s+UNSIGNED)?(.*)$", re.I | re.S)
+_MATCH = re.compile(r"MATCH\s*\(([^()]*)\)\s*AGAINST\s*\(\s*(\?|:\w+|'(?:[^']|'')*')(\s+IN\s+BOOLEAN\s+MODE)?\s*\)", re.I)
+_LEFT_RIGHT = re.compile(r"\b(LEFT|RIGHT)\s*\(", re.I)
+_TRIGGER_NAME = re.compile(r"^CREATE\s+TRIGGER\s+`?(\w+)`?", re.I)
+_SOURCE_TABLE = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.I)
+
+_DDL_ACTIONS = {
+    getattr(sqlite3, name) for name in dir(sqlite3)
+    if re.match(r"SQLITE_(CREATE|DROP)_(INDEX|TABLE|TRIGGER|VIEW)$|SQLITE_ALTER_TABLE$", name)
+}
+_WRITE_ACTIONS = {sqlite3.SQLITE_INSERT: "INSERT", sqlite3.SQLITE_UPDATE: "UPDATE", sqlite3.SQLITE_DELETE: "DELETE"}
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+class EnumText(str):
+    """Wert einer ENUM-Spalte (für das ENUM-Flag in cursor.description)."""
+
+
+def _parse_datetime(value: bytes):
+    text = value.decode()
+    try:
+        return dt.datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _parse_date(value: bytes):
+    text = value.decode()
+    try:
+        return dt.date.fromisoformat(text[:10])
+    except ValueError:
+        return text
+
+
+sqlite3.register_converter("DATETIME", _parse_datetime)
+sqlite3.register_converter("TIMESTAMP", _parse_datetime)
+sqlite3.register_converter("DATE", _parse_date)
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()))
+sqlite3.register_converter("ENUMTEXT", lambda value: EnumText(value.decode()))
+
+
+def _unescape(inner: str, quote: str) -> str:
+    inner = inner.replace(quote * 2, quote)
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), inner, flags=re.S)
+
+
+def translate(stmt: str) -> str:
+    """Übersetzt Platzhalter, Strings und `<=>` eines MySQL-Statements nach SQLite."""
+    def replace(match):
+        token = match.group(0)
+        if token[0] in "'\"":
+            return "'" + _unescape(token[1:-1], token[0]).replace("'", "''") + "'"
+        if token == "%s":
+            return "?"
+        if token == "<=>":
+            return " IS "
+        if match.group(1):
+            return ":" + match.group(1)
+        return token
+    stmt = _MATCH.sub(r"MATCH_AGAINST(\2, \1)", _TOKEN.sub(replace, stmt))
+    # LEFT/RIGHT sind in SQLite Schlüsselwörter (LEFT JOIN)
+    return _LEFT_RIGHT.sub(lambda m: f"MYSQL_{m.group(1).upper()}(", stmt)
+
+
+def _match_against(query, *values) -> float:
+    """
+    Relevanz wie MATCH ... AGAINST im Boolean Mode (vereinfacht).
+
+    Unterstützt +wort (Pflicht), -wort (ausgeschlossen) und wort* (Präfix);
+    die Relevanz ist die Anzahl der Treffer aller Wörter.
+    """
+    words = re.findall(r"\w+", " ".join(str(v) for v in values if v is not None).lower())
+    score = 0.0
+    for term in (query or "").lower().split():
+        op = term[0] if term[0] in "+-" else ""
+        stem = term.lstrip("+-")
+        prefix = stem.endswith("*")
+        stem = stem.rstrip("*")
+        hits = sum(1 for w in words if (w.startswith(stem) if prefix else w == stem)) if stem else 0
+        if (op == "+" and not hits) or (op == "-" and hits):
+            return 0.0
+        if op != "-":
+            score += hits
+    return score
+
+
+def _split_top_level(body: str) -> list:
+    """Trennt die Definitionen in CREATE TABLE (...) an Kommas auf Klammerebene 0."""
+    parts, depth, current, quote = [], 0, [], None
+    for ch in body:
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _mysql_type(name: str, args: str, unsigned: str) -> str:
+    """Spaltentyp, wie ihn DESCRIBE in MySQL anzeigt (z.B. varchar(100), enum('a','b'))."""
+    name = name.lower()
+    if name in ("bool", "boolean"):
+        return "tinyint(1)"
+    if name == "integer":
+        name = "int"
+    args = (args or "").strip()
+    args = re.sub(r"'\s*,\s*'", "','", args) if "'" in args else args.replace(" ", "")
+    return name + args + (" unsigned" if unsigned else "")
+
+
+def translate_create_table(stmt: str):
+    """
+    Übersetzt ein MySQL-CREATE TABLE nach SQLite.
+
+    Returns:
+        tuple: (Statements für SQLite, Katalogzeilen (Tabelle, Spalte, MySQL-Typ, Extra))
+               oder None, wenn es kein CREATE TABLE (...) ist.
+    """
+    match = _CREATE_TABLE.match(stmt.strip())
+    if not match:
+        return None
+    if_not_exists, table, body = match.group(1) or "", match.group(2), match.group(3)
+    columns, constraints, indexes, catalog = [], [], [], []
+    for part in _split_top_level(body):
+        head = part.split(None, 1)[0].upper()
+        if head in ("FOREIGN", "CHECK", "PRIMARY", "UNIQUE", "CONSTRAINT"):
+            constraints.append(part)
+            continue
+        if head in ("INDEX", "KEY", "FULLTEXT", "SPATIAL"):
+            if head in ("INDEX", "KEY"):
+                cols = part[part.find("("):]
+                indexes.append(f"CREATE INDEX IF NOT EXISTS `idx_{table}_{len(indexes) + 1}` ON `{table}` {cols}")
+            continue
+        col = _COLUMN.match(part)
+        name, type_name, args, unsigned, rest = col.groups()
+        rest = re.sub(r"\bON\s+UPDATE\s+CURRENT_TIMESTAMP(\(\d*\))?|\bCOMMENT\s+'[^']*'|"
+                      r"\b(CHARACTER\s+SET|COLLATE)\s+\w+", "", rest, flags=re.I)
+        rest = re.sub(r"\bDEFAULT\s+CURRENT_TIMESTAMP(\(\d*\))?", "DEFAULT (datetime('now', 'localtime'))", rest, flags=re.I)
+        extra = "auto_increment" if re.search(r"\bAUTO_INCREMENT\b", rest, re.I) else ""
+        catalog.append((table, name, _mysql_type(type_name, args, unsigned), extra))
+        if type_name.upper() in ("ENUM", "SET"):
+            definition = f"`{name}` ENUMTEXT{rest} CHECK (`{name}` IN {args.strip()})"
+        elif extra and re.search(r"\bPRIMARY\s+KEY\b", rest, re.I):
+            rest = re.sub(r"\bAUTO_INCREMENT\b|\bPRIMARY\s+KEY\b|\bNOT\s+NULL\b", "", rest, flags=re.I)
+            definition = f"`{name}` INTEGER PRIMARY KEY AUTOINCREMENT{rest}"
+        else:
+            rest = re.sub(r"\bAUTO_INCREMENT\b", "", rest, flags=re.I)
+            definition = f"`{name}` {type_name}{(args or '').strip()}{rest}"
+        columns.append(definition.rstrip())
+    create = f"CREATE TABLE {if_not_exists}`{table}` (\n    " + ",\n    ".join(columns + constraints) + "\n)"
+    return [translate(create)] + indexes, catalog
+
+
+def _mysql_error(e: sqlite3.Error, denied=None) -> errors.Error:
+    """Wandelt einen SQLite-Fehler in die passende mysql.connector-Exception um."""
+    msg = str(e)
+    if "not authorized" in msg and denied:
+        op, table, user = denied
+        return errors.ProgrammingError(msg=f"{op} command denied to user '{user}'@'localhost' for table '{table}'", errno=1142)
+    if "ER_CANT_UPDATE_USED_TABLE_IN_SF_OR_TRG" in msg:
+        return errors.DatabaseError(
+            msg="Can't update table 'Buchung' in stored function/trigger because it is already used by "
+                "statement which invoked this stored function/trigger.", errno=1442)
+    mapping = [
+        ("no such table", errors.ProgrammingError, 1146),
+        ("no such column", errors.ProgrammingError, 1054),
+        ("UNIQUE constraint failed", errors.IntegrityError, 1062),
+        ("FOREIGN KEY constraint failed", errors.IntegrityError, 1452),
+        ("NOT NULL constraint failed", errors.IntegrityError, 1048),
+        ("CHECK constraint failed", errors.DatabaseError, 3819),
+        ("database is locked", errors.DatabaseError, 1205),
+        ("syntax error", errors.ProgrammingError, 1064),
+        ("incomplete input", errors.ProgrammingError, 1064),
+        ("already exists", errors.ProgrammingError, 1050),
+    ]
+    for text, cls, errno in mapping:
+        if text in msg:
+            return cls(msg=msg, errno=errno)
+    return errors.DatabaseError(msg=msg, errno=1105)
+
+
+def _param(value):
+    """Python-/numpy-/pandas-Werte so umwandeln, wie MySQL sie speichern würde."""
+    if value is None or isinstance(value, (str, bytes, int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, dt.datetime):
+        return value.isoformat(sep=" ", timespec="microseconds" if value.microsecond else "seconds")
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if isinstance(value, (Decimal, dt.timedelta)):
+        return str(value)
+    if hasattr(value, "to_pydatetime"):
+        return _param(value.to_pydatetime())
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _describe(names: list, rows: list, primary: set = frozenset()) -> list:
+    """
+    cursor.description im Format von mysql.connector, abgeleitet aus den Werten.
+
+    Spalten aus `primary` (Namen in Kleinbuchstaben) bekommen wie bei
+    MySQL das Flag PRI_KEY.
+    """
+    description = []
+    for i, name in enumerate(names):
+        value = next((row[i] for row in rows if row[i] is not None), None)
+        flags = FieldFlag.PRI_KEY if name.lower() in primary else 0
+        if isinstance(value, EnumText):
+            type_code, flags = FieldType.STRING, flags | FieldFlag.ENUM
+        elif isinstance(value, (bool, int)):
+            type_code = FieldType.LONGLONG
+        elif isinstance(value, float):
+            type_code = FieldType.DOUBLE
+        elif isinstance(value, Decimal):
+            type_code = FieldType.NEWDECIMAL
+        elif isinstance(value, dt.datetime):
+            type_code = FieldType.DATETIME
+        elif isinstance(value, dt.date):
+            type_code = FieldType.DATE
+        elif isinstance(value, bytes):
+            type_code, flags = FieldType.BLOB, flags | FieldFlag.BINARY
+        else:
+            type_code = FieldType.VAR_STRING
+        description.append((name, type_code, None, None, None, None, 1, flags, 45))
+    return description
+
+
+def _primary_columns(db, stmt: str) -> set:
+    """
+    Primärschlüsselspalten der Tabellen nach FROM/JOIN (Kleinbuchstaben).
+
+    SQLite nennt die Herkunft einer Ergebnisspalte nicht; zugeordnet wird
+    über den Spaltennamen (Aliase und Views bleiben ohne Flag).
+    """
+    columns = set()
+    for table in {t.lower() for t in _SOURCE_TABLE.findall(stmt)}:
+        columns.update(row[1].lower() for row in db.execute(f"PRAGMA main.table_info(`{table}`)") if row[5])
+    return columns
+
+
+def _plain(row: tuple) -> tuple:
+    return tuple(str(v) if isinstance(v, EnumText) else v for v in row)
+
+
+def _relations(db) -> list:
+    """(Name, Art) aller Tabellen und Views ohne interne SQLite-/Shim-Tabellen."""
+    return [
+        (name, "VIEW" if kind == "view" else "BASE TABLE")
+        for name, kind in db.execute(
+            "SELECT name, type FROM main.sqlite_master WHERE type IN ('table', 'view') "
+            f"AND name NOT LIKE 'sqlite_%' AND name <> '{CATALOG_TABLE}' ORDER BY name COLLATE NOCASE"
+        )
+    ]
+
+
+def _columns(db, table: str) -> list:
+    """DESCRIBE-Zeilen (Field, Type, Null, Key, Default, Extra) einer Tabelle."""
+    catalog = {
+        name.lower(): (column_type, extra)
+        for name, column_type, extra in db.execute(
+            f"SELECT column_name, column_type, extra FROM {CATALOG_TABLE} WHERE table_name = ? COLLATE NOCASE", (table,))
+    }
+    fk_columns = {row[3].lower() for row in db.execute(f"PRAGMA main.foreign_key_list(`{table}`)")}
+    rows = []
+    for _, name, decl, notnull, default, pk in db.execute(f"PRAGMA main.table_info(`{table}`)"):
+        column_type, extra = catalog.get(name.lower(), (decl.lower() or "text", ""))
+        key = "PRI" if pk else ("MUL" if name.lower() in fk_columns else "")
+        if default is not None:
+            default = "CURRENT_TIMESTAMP" if "'now'" in default else default.strip("'")
+        rows.append((name, column_type, "NO" if notnull or pk else "YES", key, default, extra))
+    return rows
+
+
+def _refresh_information_schema(db, database: str):
+    """Füllt die nachgebildeten information_schema-Tabellen aus dem aktuellen Schema."""
+    relations = _relations(db)
+    by_lower = {name.lower(): name for name, _ in relations}
+    tables, columns, keys, constraints, stats = [], [], [], [], []
+    for name, kind in relations:
+        rows = db.execute(f"SELECT COUNT(*) FROM main.`{name}`").fetchone()[0] if kind == "BASE TABLE" else None
+        # Größen werden nicht nachgebildet (Tabellen 0 Byte, Views wie in MySQL NULL)
+        size = 0 if rows is not None else None
+        tables.append((database, name, kind, rows, size, size))
+        pk_cols = []
+        for pos, (field, column_type, null, key, default, extra) in enumerate(_columns(db, name), start=1):
+            data_type = column_type.split("(")[0].split()[0]
+            columns.append((database, name, field, pos, default, null, data_type, column_type, key, extra))
+            if key == "PRI":
+                pk_cols.append(field)
+        if kind != "BASE TABLE":
+            continue
+        for pos, field in enumerate(pk_cols, start=1):
+            keys.append(("PRIMARY", database, name, field, pos, None, None, None))
+            stats.append((database, name, 0, "PRIMARY", pos, field, "BTREE"))
+        for fk_id, seq, ref_table, field, ref_field, on_update, on_delete, _ in db.execute(
+                f"PRAGMA main.foreign_key_list(`{name}`)"):
+            ref_name = by_lower.get(ref_table.lower(), ref_table)
+            keys.append((f"{name}_ibfk_{fk_id + 1}", database, name, field, seq + 1, database, ref_name, ref_field))
+            if seq == 0:
+                constraints.append((database, f"{name}_ibfk_{fk_id + 1}", on_update, on_delete, name, ref_name))
+        for _, index, unique, origin, _partial in db.execute(f"PRAGMA main.index_list(`{name}`)"):
+            if origin == "pk":
+                continue
+            for seq, _, field in db.execute(f"PRAGMA main.index_info(`{index}`)"):
+                stats.append((database, name, 0 if unique else 1, index, seq + 1, field, "BTREE"))
+    for table, rows in (("TABLES", tables), ("COLUMNS", columns), ("KEY_COLUMN_USAGE", keys),
+                        ("REFERENTIAL_CONSTRAINTS", constraints), ("STATISTICS", stats)):
+        db.execute(f"DELETE FROM information_schema.{table}")
+        if rows:
+            db.executemany(f"INSERT INTO information_schema.{table} VALUES ({', '.join(['?'] * len(rows[0]))})", rows)
+
+
+def _changelog_triggers(db) -> list:
+    """Changelog-Tabelle und -Trigger (wie migrations/0003_changelog.py) in SQLite-Syntax."""
+    statements = [
+        "CREATE TABLE changelog (change_id INTEGER PRIMARY KEY AUTOINCREMENT, table_name VARCHAR(64) NOT NULL, "
+        "op ENUMTEXT NOT NULL CHECK (op IN ('I', 'U', 'D')), pk JSON NOT NULL, "
+        "changed_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')))",
+        "CREATE INDEX idx_changelog_changed_at ON changelog(changed_at)",
+    ]
+    for table, kind in _relations(db):
+        if kind != "BASE TABLE":
+            continue
+        pk_cols = [row[1] for row in sorted(db.execute(f"PRAGMA main.table_info(`{table}`)"), key=lambda r: r[5]) if row[5]]
+        if not pk_cols:
+            continue
+
+        def log(op, row):
+            pk = ", ".join(f"'{c}', {row}.`{c}`" for c in pk_cols)
+            return f"INSERT INTO changelog (table_name, op, pk) VALUES ('{table}', '{op}', json_object({pk}));"
+
+        pk_changed = " OR ".join(f"OLD.`{c}` IS NOT NEW.`{c}`" for c in pk_cols)
+        statements += [
+            f"CREATE TRIGGER `changelog_ins_{table}` AFTER INSERT ON `{table}` BEGIN {log('I', 'NEW')} END",
+            f"CREATE TRIGGER `changelog_upd_{table}` AFTER UPDATE ON `{table}` BEGIN "
+            f"INSERT INTO changelog (table_name, op, pk) SELECT '{table}', 'D', json_object("
+            + ", ".join(f"'{c}', OLD.`{c}`" for c in pk_cols) + f") WHERE {pk_changed}; {log('U', 'NEW')} END",
+            f"CREATE TRIGGER `changelog_del_{table}` AFTER DELETE ON `{table}` BEGIN {log('D', 'OLD')} END",
+        ]
+    statements.append(f"INSERT INTO {CATALOG_TABLE} VALUES ('changelog', 'op', \"enum('I','U','D')\", '')")
+    return statements
+
+
+def load_schema(conn, path: str = SCHEMA_PATH):
+    """
+    Lädt das MySQL-Schema (samt Beispieldaten) über die Übersetzung in eine leere Datenbank.
+
+    Trigger werden durch ihre Entsprechung aus SQLITE_TRIGGERS ersetzt;
+    Konten, Rollen und GRANTs werden übersprungen.
+
+    Raises:
+        ValueError: Für einen Trigger ohne SQLite-Entsprechung.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    cursor = conn.cursor()
+    for stmt in statements:
+        trigger = _TRIGGER_NAME.match(stmt.strip())
+        if trigger:
+            name = trigger.group(1)
+            if name not in SQLITE_TRIGGERS:
+                raise ValueError(f"Trigger {name} hat keine SQLite-Entsprechung (SQLITE_TRIGGERS).")
+            if SQLITE_TRIGGERS[name]:
+                conn._db.execute(SQLITE_TRIGGERS[name])
+            continue
+        cursor.execute(stmt)
+    for stmt in _changelog_triggers(conn._db):
+        conn._db.execute(stmt)
+    cursor.close()
+
+
+def _database_path(name: str) -> str:
+    """Pfad der Datenbankdatei; legt sie beim ersten Zugriff an und lädt das Schema."""
+    with _databases_lock:
+        if name in _databases:
+            return _databases[name]
+        fd, path = tempfile.mkstemp(prefix=f"hs_{name}_", suffix=".sqlite3")
+        os.close(fd)
+        setup = SQLiteConnection(database=name, _path=path)
+        try:
+            setup._db.execute("PRAGMA journal_mode = WAL")
+            setup._db.execute(f"CREATE TABLE {CATALOG_TABLE} (table_name TEXT, column_name TEXT, column_type TEXT, extra TEXT)")
+            load_schema(setup)
+        except Exception:
+            setup.close()
+            _remove_files(path)
+            raise
+        setup.close()
+        _databases[name] = path
+        return path
+
+
+def _remove_files(path: str):
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+def reset_database(name: str = DATABASE):
+    """Verwirft eine Datenbank; die nächste Verbindung legt sie mit frischen Beispieldaten neu an."""
+    with _databases_lock:
+        path = _databases.pop(name, None)
+    if path:
+        _remove_files(path)
+
+
+@atexit.register
+def _cleanup():
+    for name in list(_databases):
+        reset_database(name)
+
+
+def _authenticate(user, password):
+    """Aktive Rolle des Kontos; falsches Passwort -> Fehler 1045 wie bei MySQL."""
+    if user in ACCOUNTS:
+        expected, role = ACCOUNTS[user]
+        if password != expected:
+            raise errors.ProgrammingError(
+                msg=f"Access denied for user '{user}'@'localhost' (using password: YES)", errno=1045)
+        return role
+    return None
+
+
+class SQLiteCursor:
+    """Cursor mit der Schnittstelle von mysql.connector (gepuffert)."""
+
+    def __init__(self, connection, dictionary: bool = False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._pending = []
+        self._rows = []
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self.statement = None
+
+    @property
+    def column_names(self) -> tuple:
+        return tuple(d[0] for d in self.description) if self.description else ()
+
+    @property
+    def with_rows(self) -> bool:
+        return self.description is not None
+
+    def execute(self, operation: str, params=None, **kwargs):
+        """Führt ein oder mehrere Statements aus; weitere Ergebnisse liefert `nextset`."""
+        statements = split_statements(operation)
+        if params and len(statements) > 1:
+            raise errors.ProgrammingError(msg="Parameter sind nur für ein einzelnes Statement möglich.", errno=1064)
+        self._pending = statements[1:]
+        self._run(statements[0] if statements else "", params)
+
+    def executemany(self, operation: str, seq_params):
+        total = 0
+        for params in seq_params:
+            self.execute(operation, params)
+            total += max(self.rowcount, 0)
+        self.rowcount = total
+
+    def callproc(self, procname: str, args=()) -> tuple:
+        """Ruft eine Prozedur aus SQLITE_PROCEDURES auf; liefert `args` mit gesetztem OUT-Parameter."""
+        self.description, self._rows, self._pending = None, [], []
+        return self._connection._call(procname, tuple(args))
+
+    def nextset(self):
+        """Führt das nächste Statement eines Mehrfach-execute aus (wie mysql.connector)."""
+        if not self._pending:
+            return None
+        self._run(self._pending.pop(0), None)
+        return True
+
+    def _run(self, stmt: str, params):
+        self.statement = stmt
+        result = self._connection._execute(stmt, params)
+        self.description, self._rows, self.rowcount, self.lastrowid = result
+
+    def _shape(self, row):
+        return dict(zip(self.column_names, row)) if self._dictionary else row
+
+    def fetchone(self):
+        return self._shape(self._rows.pop(0)) if self._rows else None
+
+    def fetchmany(self, size: int = 1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return [self._shape(r) for r in rows]
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return [self._shape(r) for r in rows]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._rows = []
+        self._pending = []
+
+
+class SQLiteConnection:
+    """
+    Verbindung mit der Schnittstelle von mysql.connector.
+
+    Args wie `mysql.connector.connect` (user, password, host, database,
+    autocommit); weitere Parameter werden ignoriert.
+    """
+
+    def __init__(self, user=None, password=None, host=None, database=DATABASE, autocommit=False, _path=None, **kwargs):
+        self.user = user
+        self.database = database or DATABASE
+        self.autocommit = autocommit
+        self.role = _authenticate(user, password)
+        self._denied = None
+        self._db = sqlite3.connect(
+            _path or _database_path(self.database), timeout=BUSY_TIMEOUT, isolation_level=None,
+            check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("ATTACH DATABASE ':memory:' AS information_schema")
+        self._db.executescript(_INFORMATION_SCHEMA)
+        self._db.create_function("NOW", 0, lambda: dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self._db.create_function("CURDATE", 0, lambda: dt.date.today().isoformat())
+        self._db.create_function("DATABASE", 0, lambda: self.database)
+        self._db.create_function("CURRENT_ROLE", 0, lambda: f"`{self.role}`@`%`" if self.role else "NONE")
+        self._db.create_function("MATCH_AGAINST", -1, _match_against)
+        self._db.create_function("CONCAT", -1, lambda *a: None if None in a else "".join(str(v) for v in a))
+        self._db.create_function("CONCAT_WS", -1, lambda sep, *a: None if sep is None else str(sep).join(str(v) for v in a if v is not None))
+        self._db.create_function("MYSQL_LEFT", 2, lambda v, n: None if v is None or n is None else str(v)[:max(int(n), 0)])
+        self._db.create_function("MYSQL_RIGHT", 2, lambda v, n: None if v is None or n is None else (str(v)[-int(n):] if int(n) > 0 else ""))
+        self._db.create_function("GREATEST", -1, lambda *a: None if None in a else max(a))
+        self._db.create_function("LEAST", -1, lambda *a: None if None in a else min(a))
+        self._definer = False
+        if self.role:
+            self._db.set_authorizer(self._authorize)
+
+    def _authorize(self, action, arg1, arg2, dbname, source):
+        # Innerhalb von Triggern/Views/Prozeduren gelten (wie in MySQL) die Rechte des Definers
+        if self._definer or source is not None or dbname in ("information_schema", "temp"):
+            return sqlite3.SQLITE_OK
+        if action in _DDL_ACTIONS:
+            self._denied = ("CREATE", arg1, self.user)
+            return sqlite3.SQLITE_DENY
+        op = _WRITE_ACTIONS.get(action)
+        if op is None or (arg1 or "").startswith("sqlite_"):
+            return sqlite3.SQLITE_OK
+        grants = ROLE_WRITES.get(self.role, {})
+        if op in grants and (grants[op] is None or arg1.lower() in grants[op]):
+            return sqlite3.SQLITE_OK
+        self._denied = (op, arg1, self.user)
+        return sqlite3.SQLITE_DENY
+
+    def _execute(self, stmt: str, params) -> tuple:
+        """Führt ein einzelnes MySQL-Statement aus: (description, rows, rowcount, lastrowid)."""
+        stripped = stmt.strip()
+        began = False
+        try:
+            special = self._special(stripped)
+            if special is not None:
+                names, rows = special
+                return _describe(names, rows), rows, len(rows), None
+            kind = classify_statement(stripped)
+            if kind == "ddl" and self._db.in_transaction:
+                # DDL beendet in MySQL eine offene Transaktion (implizites COMMIT)
+                self._db.execute("COMMIT")
+            elif kind == "write" and not self.autocommit and not self._db.in_transaction:
+                self._db.execute("BEGIN IMMEDIATE")
+                began = True
+            if "information_schema" in stripped.lower():
+                _refresh_information_schema(self._db, self.database)
+            created = translate_create_table(stripped) if kind == "ddl" else None
+            if created is not None:
+                statements, catalog = created
+                cursor = self._db.execute(statements[0])
+                for index in statements[1:]:
+                    self._db.execute(index)
+                self._db.executemany(f"INSERT INTO {CATALOG_TABLE} VALUES (?, ?, ?, ?)", catalog)
+            else:
+                if isinstance(params, dict):
+                    params = {k: _param(v) for k, v in params.items()}
+                elif params is not None:
+                    params = [_param(v) for v in params]
+                cursor = self._db.execute(translate(stripped), params or ())
+            if cursor.description:
+                rows = cursor.fetchall()
+                names = [d[0] for d in cursor.description]
+                description = _describe(names, rows, _primary_columns(self._db, stripped))
+                rows = [_plain(r) for r in rows]
+                return description, rows, len(rows), None
+            return None, [], cursor.rowcount, cursor.lastrowid
+        except sqlite3.Error as e:
+            if began and self._db.in_transaction:
+                # Die gerade begonnene Transaktion ist leer; sonst bliebe die Schreibsperre
+                # (BEGIN IMMEDIATE) z.B. nach einer Rechteverweigerung bis zum nächsten COMMIT liegen
+                self._db.execute("ROLLBACK")
+            raise _mysql_error(e, self._denied) from e
+        finally:
+            self._denied = None
+
+    def _call(self, name: str, args: tuple) -> tuple:
+        """Führt eine Prozedur in einer (ggf. impliziten) Transaktion aus, mit den Rechten des Definers."""
+        if name.lower() not in SQLITE_PROCEDURES:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {self.database}.{name} does not exist", errno=1305)
+        in_params, statements = SQLITE_PROCEDURES[name.lower()]
+        if len(args) != len(in_params) + 1:
+            raise errors.ProgrammingError(
+                msg=f"Incorrect number of arguments for PROCEDURE {self.database}.{name}; "
+                    f"expected {len(in_params) + 1}, got {len(args)}", errno=1318)
+        params = {p: _param(v) for p, v in zip(in_params, args)}
+        self._definer = True
+        try:
+            if not self.autocommit and not self._db.in_transaction:
+                self._db.execute("BEGIN IMMEDIATE")
+            counts = [self._db.execute(stmt, params).rowcount for stmt in statements]
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        finally:
+            self._definer = False
+        return args[:len(in_params)] + (next((c for c in counts if c >= 0), 0),)
+
+    def _special(self, stmt: str):
+        """MySQL-Statements ohne SQLite-Entsprechung: (Spaltennamen, Zeilen) oder None."""
+        show = _SHOW_TABLES.match(stmt)
+        if show:
+            relations = [r for r in _relations(self._db) if not show.group(2) or r[1] == show.group(2).upper()]
+            if show.group(1):
+                return [f"Tables_in_{self.database}", "Table_type"], relations
+            return [f"Tables_in_{self.database}"], [(name,) for name, _ in relations]
+        describe = _DESCRIBE.match(stmt)
+        if describe:
+            rows = _columns(self._db, describe.group(1))
+            if not rows:
+                raise errors.ProgrammingError(msg=f"Table '{self.database}.{describe.group(1)}' doesn't exist", errno=1146)
+            return ["Field", "Type", "Null", "Key", "Default", "Extra"], rows
+        if _SHOW_GRANTS.match(stmt):
+            return [f"Grants for {self.user}@localhost"], [(line,) for line in self._grants()]
+        if _START.match(stmt):
+            self.start_transaction()
+            return [], []
+        if _IGNORED.match(stmt) or not stmt:
+            return [], []
+        if _UNSUPPORTED.match(stmt):
+            raise errors.NotSupportedError(
+                msg=f"Vom SQLite-Testdouble nicht unterstützt: {stmt.split()[0].upper()}", errno=1235)
+        return None
+
+    def _grants(self) -> list:
+        """SHOW GRANTS (samt Rechten der aktiven Rolle) wie in Baseline und 0005."""
+        account = f"`{self.user}`@`localhost`"
+        if not self.role:
+            return [f"GRANT ALL PRIVILEGES ON *.* TO {account}"]
+        lines = [f"GRANT USAGE ON *.* TO {account}", f"GRANT SELECT ON `{self.database}`.* TO {account}"]
+        for op, tables in ROLE_WRITES.get(self.role, {}).items():
+            targets = ["*"] if tables is None else [f"`{t}`" for t in sorted(tables)]
+            lines += [f"GRANT {op} ON `{self.database}`.{t} TO {account}" for t in targets]
+        lines += [f"GRANT EXECUTE ON PROCEDURE `{self.database}`.`{p}` TO {account}" for p in SQLITE_PROCEDURES]
+        lines.append(f"GRANT `{self.role}`@`%` TO {account}")
+        return lines
+
+    def cursor(self, buffered=None, dictionary=None, **kwargs) -> SQLiteCursor:
+        return SQLiteCursor(self, dictionary=bool(dictionary))
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._db.in_transaction
+
+    def start_transaction(self, *args, **kwargs):
+        if self._db.in_transaction:
+            raise errors.ProgrammingError(msg="Transaction already in progress")
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+    def commit(self):
+        if self._db.in_transaction:
+            self._db.execute("COMMIT")
+
+    def rollback(self):
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+
+    def is_connected(self) -> bool:
+        return self._db is not None
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if self._db is None:
+            raise errors.InterfaceError(msg="Connection not available.", errno=2013)
+
+    def close(self):
+        if self._db is not None:
+            self.rollback()
+            self._db.close()
+            self._db = None
+
+    disconnect = close
+
+
+class _PooledConnection:
+    """Verbindung aus einem SQLiteConnectionPool; `close()` gibt sie zurück."""
+
+    def __init__(self, pool, connection: SQLiteConnection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.rollback()
+            self._pool._release(self._connection)
+            self._connection = None
+
+    def is_connected(self) -> bool:
+        return self._connection is not None
+
+
+class SQLiteConnectionPool:
+    """
+    Verbindungspool mit der Schnittstelle von mysql.connector.pooling.MySQLConnectionPool.
+
+    Alle Verbindungen werden sofort aufgebaut (Anmeldefehler also beim
+    Erzeugen); ein leerer Pool wirft PoolError.
+    """
+
+    def __init__(self, pool_name=None, pool_size=5, **kwargs):
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._idle = [SQLiteConnection(**kwargs) for _ in range(pool_size)]
+
+    def get_connection(self) -> _PooledConnection:
+        with self._lock:
+            if not self._idle:
+                raise errors.PoolError(msg="Failed getting connection; pool exhausted")
+            return _PooledConnection(self, self._idle.pop())
+
+    def _release(self, connection: SQLiteConnection):
+        with self._lock:
+            self._idle.append(connection)
+
+
+def connect(**kwargs) -> SQLiteConnection:
+    """Wie `mysql.connector.connect`, aber gegen die SQLite-Datenbank `database`."""
+    return SQLiteConnection(**kwargs)
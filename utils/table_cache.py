@@ -0,0 +1,254 @@
+# utils/table_cache.py
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.database import load_dataframe
+
+# Obergrenze für alle zwischengespeicherten DataFrames (in Bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Wie lange die Tabellenliste (SHOW TABLES) zwischengespeichert wird (Sekunden)
+TABLE_LIST_TTL = 60
+
+
+class TableCache:
+    """
+    Threadsicherer LRU-Zwischenspeicher für geladene Tabellen.
+
+    Ein Eintrag besteht aus dem DataFrame und (lazy berechnet) den
+    Spaltenstatistiken für das Filter-Panel. Schlüssel ist
+    (konto, tabelle, variante) – variante ist apply_joins (ganze Tabelle)
+    oder ("page", limit) für die erste Ergebnisseite. Verschiedene
+    Nutzerkonten teilen sich so keine Daten, für die sie evtl. keine
+    Rechte haben.
+
+    Pro Tabelle zählt eine Generation (`table_generation`) jede
+    Invalidierung und jede Änderung über den ChangeFeed mit. Wer vor einem
+    langsamen Ladevorgang die Generation festhält und sie an `put`
+    übergibt, überschreibt so keine neueren Daten mit dem alten Stand.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        # Wird bei jeder Invalidierung erhöht; abgeleitete Ergebnisse
+        # (z.B. gefilterte Abfragen) nutzen sie als Teil ihres Cache-Schlüssels.
+        self.generation = 0
+        # Tabelle -> Stand des Zählers bei der letzten Änderung; _all_changed für alle Tabellen
+        self._clock = 0
+        self._changed = {}
+        self._all_changed = 0
+
+    def get(self, key):
+        """Liefert den Eintrag (dict mit df, stats, size) oder None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _touch(self, table_name=None):
+        self._clock += 1
+        if table_name is None:
+            self._all_changed = self._clock
+        else:
+            self._changed[table_name] = self._clock
+
+    def _table_generation(self, table_name: str) -> int:
+        return max(self._changed.get(table_name, 0), self._all_changed)
+
+    def table_generation(self, table_name: str) -> int:
+        """Generation einer Tabelle; vor dem Laden festhalten und an `put` übergeben."""
+        with self._lock:
+            return self._table_generation(table_name)
+
+    def put(self, key, df, stats=None, generation=None):
+        """
+        Speichert ein DataFrame und verdrängt bei Bedarf die ältesten Einträge.
+
+        Mit `generation` (aus `table_generation` vor dem Laden) wird nur
+        gespeichert, wenn die Tabelle seitdem nicht invalidiert oder
+        geändert wurde; sonst kommt der Eintrag ungespeichert zurück und
+        ein vorhandener Eintrag unter `key` wird vorsichtshalber verworfen.
+        """
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if generation is not None and self._table_generation(key[1]) != generation:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._bytes -= old["size"]
+                    self.generation += 1
+                return {"df": df, "stats": stats, "size": size}
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old["size"]
+            entry = {"df": df, "stats": stats, "size": size}
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
+            return entry
+
+    def invalidate(self, table_name=None):
+        """Entfernt alle Einträge einer Tabelle (oder alle, falls table_name None)."""
+        with self._lock:
+            self.generation += 1
+            self._touch(table_name)
+            for key in list(self._entries):
+                if table_name is None or key[1] == table_name:
+                    self._bytes -= self._entries.pop(key)["size"]
+
+    def discard(self, key):
+        """Entfernt einen einzelnen Eintrag."""
+        with self._lock:
+            self.generation += 1
+            self._touch(key[1])
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry["size"]
+
+    def keys_for(self, table_name: str) -> list:
+        """Schlüssel aller Einträge einer Tabelle."""
+        with self._lock:
+            return [key for key in self._entries if key[1] == table_name]
+
+    def accounts(self) -> set:
+        """Konten, für die Einträge im Cache liegen."""
+        with self._lock:
+            return {key[0] for key in self._entries}
+
+    def bump(self, table_name: str = None):
+        """
+        Erhöht die Generation, z.B. nachdem Einträge gepatcht wurden.
+
+        Mit `table_name` auch die Generation der Tabelle: Laufende
+        Ladevorgänge mit älterem Stand speichern ihr Ergebnis dann nicht.
+        """
+        with self._lock:
+            self.generation += 1
+            if table_name is not None:
+                self._touch(table_name)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+@st.cache_resource
+def get_table_cache() -> TableCache:
+    """Ein gemeinsamer TableCache pro Streamlit-Prozess."""
+    return TableCache()
+
+
+def current_account() -> str:
+    """Name des angemeldeten Datenbanknutzers oder 'default' für die öffentliche Ansicht."""
+    return st.session_state.get("sql_user") or "default"
+
+
+@st.cache_data(ttl=TABLE_LIST_TTL, show_spinner=False)
+def load_table_names(_conn, account: str) -> list:
+    """
+    Liefert die Tabellenliste (SHOW TABLES), zwischengespeichert pro Konto.
+
+    Args:
+        _conn: Datenbankverbindung (wird nicht gehasht).
+        account (str): Konto, für das die Liste gilt (Cache-Schlüssel).
+
+    Returns:
+        list: Tabellennamen.
+    """
+    cursor = _conn.cursor()
+    cursor.execute("SHOW TABLES;")
+    tables = [t[0] for t in cursor.fetchall()]
+    cursor.close()
+    return tables
+
+
+@st.cache_data(show_spinner=False)
+def load_primary_key(_conn, account: str, table_name: str) -> list:
+    """
+    Primärschlüsselspalten einer Tabelle in Indexreihenfolge, zwischengespeichert pro Konto.
+
+    Bestimmt die Sortierung beim Blättern (LIMIT/OFFSET) und der ersten
+    Seite; der ChangeFeed setzt beim Patchen diese Reihenfolge voraus.
+
+    Returns:
+        list: Spaltennamen (leer für Views und Tabellen ohne Primärschlüssel).
+    """
+    cursor = _conn.cursor()
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY' "
+        "ORDER BY ORDINAL_POSITION;",
+        (table_name,),
+    )
+    columns = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return columns
+
+
+def get_cached_table(conn, table_name: str, apply_joins: bool = False, account: str = None, cache: TableCache = None) -> dict:
+    """
+    Liefert den Cache-Eintrag einer Tabelle und lädt sie nur bei einem Cache-Miss.
+
+    Args:
+        conn: Datenbankverbindung.
+        table_name (str): Name der Tabelle.
+        apply_joins (bool, optional): Ob Joins aus join_config.json angewendet werden.
+        account (str, optional): Konto; Default ist das Konto der aktuellen Sitzung.
+        cache (TableCache, optional): Default ist der gemeinsame Cache des Prozesses.
+            account und cache müssen aus Hintergrund-Threads explizit übergeben werden.
+
+    Returns:
+        dict: Eintrag mit den Schlüsseln "df", "stats" und "size".
+    """
+    cache = cache or get_table_cache()
+    key = (account or current_account(), table_name, apply_joins)
+    generation = cache.table_generation(table_name)
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache.put(key, load_dataframe(conn, table_name, apply_joins=apply_joins), generation=generation)
+    return entry
+
+
+def get_cached_page(conn, table_name: str, limit, account: str = None, cache: TableCache = None) -> dict:
+    """
+    Liefert die erste Ergebnisseite einer Tabelle ohne Filter (SELECT * ... ORDER BY pk LIMIT).
+
+    Wird vom Filter-Runner genutzt, wenn kein Filter aktiv ist, und vom
+    Prefetcher vorab befüllt. Parameter wie bei `get_cached_table`.
+
+    Returns:
+        dict: Eintrag mit den Schlüsseln "df", "stats" und "size".
+    """
+    cache = cache or get_table_cache()
+    account = account or current_account()
+    key = (account, table_name, ("page", limit))
+    generation = cache.table_generation(table_name)
+    entry = cache.get(key)
+    if entry is None:
+        from utils.dtypes import frame_from_cursor
+
+        sql = f"SELECT * FROM `{table_name}`"
+        pk_cols = load_primary_key(conn, account, table_name)
+        if pk_cols:
+            # Erste N Zeilen nach Primärschlüssel, wie der ChangeFeed beim Patchen annimmt
+            sql += " ORDER BY " + ", ".join(f"`{c}`" for c in pk_cols)
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        df = frame_from_cursor(cursor)
+        cursor.close()
+        entry = cache.put(key, df, generation=generation)
+    return entry
+
+
+def invalidate_table(table_name=None):
+    """Verwirft zwischengespeicherte Daten nach Schreiboperationen."""
+    get_table_cache().invalidate(table_name)
+    load_table_names.clear()
@@ -0,0 +1,95 @@
+# utils/waitlist.py
+"""
+Nachrücken von der Warteliste über die Prozedur `nachruecken`
+(migrations/0005_waitlist_promotion.sql, Stand 0007_waitlist_reconcile.sql).
+
+Die Prozedur lässt für eine oder alle Veranstaltungen in einem
+Statement so viele der ältesten wartenden Buchungen nachrücken, wie
+Plätze frei sind, und gleicht danach anmeldungsliste.teilnahme_möglich
+und Angemeldete_Kursteilnehmer mengenbasiert ab – für alle
+Veranstaltungen nur dort, wo jemand nachgerückt ist (archivierte
+Veranstaltungen bleiben unberührt). Sie wird nach jeder
+Änderung aufgerufen, die Plätze frei machen kann (Stornierung oder
+Löschen einer Buchung, mehr verfügbare_plätze); Trigger können das
+nicht, weil sie Buchung nicht selbst ändern dürfen.
+"""
+
+PROCEDURE = "nachruecken"
+# Tabellen, nach deren Änderung Plätze frei werden können
+WAITLIST_TABLES = ("Buchung", "Veranstaltung")
+
+
+def promote_waitlist(conn, veranstaltungs_id: int = None) -> int:
+    """
+    Lässt Wartende nachrücken (eigene Transaktion).
+
+    Args:
+        conn: Datenbankverbindung (ohne offene Transaktion).
+        veranstaltungs_id (int, optional): Nur diese Veranstaltung (Default: alle).
+
+    Returns:
+        int: Anzahl der nachgerückten Buchungen.
+    """
+    cursor = conn.cursor()
+    conn.start_transaction()
+    try:
+        result = cursor.callproc(PROCEDURE, (veranstaltungs_id, 0))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return int(result[-1] or 0)
+
+
+def waitlist_overview(conn, veranstaltungs_id: int = None) -> list:
+    """
+    Veranstaltungen mit Warteliste: Plätze, belegte Plätze und Wartende.
+
+    Args:
+        conn: Datenbankverbindung.
+        veranstaltungs_id (int, optional): Nur diese Veranstaltung (Default: alle).
+
+    Returns:
+        list: Dicts mit veranstaltungs_id, plaetze (None = unbegrenzt),
+        belegt, wartend und frei (None = unbegrenzt), nach Wartenden absteigend.
+    """
+    sql = (
+        "SELECT v.veranstaltungs_id, v.verfügbare_plätze, "
+        "SUM(b.buchung_status IN ('offen', 'bezahlt')), SUM(b.buchung_status = 'wartend') "
+        "FROM Veranstaltung v JOIN Buchung b ON b.veranstaltungs_id = v.veranstaltungs_id "
+    )
+    params = ()
+    if veranstaltungs_id is not None:
+        sql += "WHERE v.veranstaltungs_id = %s "
+        params = (veranstaltungs_id,)
+    sql += ("GROUP BY v.veranstaltungs_id, v.verfügbare_plätze "
+            "HAVING SUM(b.buchung_status = 'wartend') > 0 ORDER BY 4 DESC, v.veranstaltungs_id")
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    overview = []
+    for vid, plaetze, belegt, wartend in rows:
+        belegt, wartend = int(belegt or 0), int(wartend or 0)
+        frei = None if plaetze is None else max(int(plaetze) - belegt, 0)
+        overview.append({"veranstaltungs_id": vid, "plaetze": plaetze, "belegt": belegt,
+                         "wartend": wartend, "frei": frei})
+    return overview
+
+
+def affected_event(table_name: str, row: dict):
+    """
+    Veranstaltung, für die nach einer Änderung an `row` nachgerückt werden muss.
+
+    Args:
+        table_name (str): Geänderte Tabelle.
+        row (dict): Zeile (vorher oder nachher) mit ihren Spaltenwerten.
+
+    Returns:
+        int | None: veranstaltungs_id oder None, wenn die Tabelle keine Plätze beeinflusst.
+    """
+    if table_name not in WAITLIST_TABLES or not row or row.get("veranstaltungs_id") is None:
+        return None
+    return int(row["veranstaltungs_id"])
@@ -0,0 +1,201 @@
+# utils/write_queue.py
+"""
+Gebündelte Schreibzugriffe (Group Commit) für den Tabellen-Editor.
+
+Jede Schreiboperation einzeln zu committen kostet pro Operation einen
+fsync auf dem Server; bei vielen gleichzeitigen Editoren wird das zum
+Engpass. Die WriteQueue sammelt Operationen aller Sitzungen eines Kontos
+für ein kurzes Zeitfenster (WINDOW_MS bzw. bis BATCH_SIZE) und führt sie
+auf einer eigenen Writer-Verbindung in einer Transaktion mit einem
+gemeinsamen COMMIT aus.
+
+- Jede Operation läuft hinter einem SAVEPOINT: Schlägt sie fehl (z.B.
+  FK-Verstoß oder Fehler aus einem Trigger), wird nur sie zurückgerollt,
+  die übrigen Operationen des Batches werden trotzdem committet.
+- Ergebnisse (rowcount) bzw. Fehler kommen pro Operation über ein
+  Future zurück, erst nachdem der Batch committet ist.
+- Ein Thread arbeitet die Operationen strikt in Eingangsreihenfolge ab,
+  die Reihenfolge innerhalb einer Sitzung bleibt damit erhalten.
+- Bei einem Deadlock rollt MySQL die ganze Transaktion zurück; der Batch
+  wird dann bis zu MAX_RETRIES-mal in derselben Reihenfolge wiederholt.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import streamlit as st
+
+# Zeitfenster, in dem weitere Operationen für denselben COMMIT gesammelt werden
+WINDOW_MS = 5
+# Höchstens so viele Operationen pro COMMIT
+BATCH_SIZE = 50
+# Writer-Thread beendet sich (und schließt seine Verbindung) nach so langer Ruhe
+IDLE_TIMEOUT = 60.0
+MAX_RETRIES = 2
+# So lange wartet ein Aufrufer höchstens auf das Ergebnis seiner Operation (Sekunden)
+RESULT_TIMEOUT = 30.0
+
+# MySQL: Deadlock, Transaktion wurde vom Server zurückgerollt
+_DEADLOCK = 1213
+
+
+class WriteQueue:
+    """
+    Schreib-Warteschlange eines Kontos mit eigenem Writer-Thread.
+
+    Args:
+        connect: Funktion, die eine neue Verbindung (mit den Rechten des
+            Kontos) liefert, z.B. `DBSession.new_connection`.
+        window_ms (float, optional): Sammelfenster pro COMMIT.
+        batch_size (int, optional): Maximale Operationen pro COMMIT.
+    """
+
+    def __init__(self, connect, window_ms: float = WINDOW_MS, batch_size: int = BATCH_SIZE):
+        self._connect = connect
+        self.window_ms = window_ms
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.commits = 0
+        self.operations = 0
+
+    def submit(self, sql: str, params=None) -> Future:
+        """
+        Reiht ein Statement ein.
+
+        Returns:
+            Future: Liefert den rowcount nach dem COMMIT oder wirft den
+                Datenbankfehler der Operation.
+        """
+        future = Future()
+        self._queue.put((sql, params, future))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+        return future
+
+    def _collect(self, first) -> list:
+        """Sammelt nach der ersten Operation weitere bis Fenster oder Batchgröße erreicht sind."""
+        batch = [first]
+        deadline = time.perf_counter() + self.window_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=IDLE_TIMEOUT)
+                except queue.Empty:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+                batch = self._collect(first)
+                try:
+                    if conn is None or not conn.is_connected():
+                        conn = self._connect()
+                    self._execute(conn, batch)
+                except Exception as e:
+                    # Kein Future darf offen bleiben, sonst wartet der Aufrufer vergeblich
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    conn = self._drop(conn)
+        finally:
+            self._drop(conn)
+
+    @staticmethod
+    def _drop(conn):
+        """Schließt eine (evtl. abgebrochene) Verbindung; die nächste wird neu aufgebaut."""
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        return None
+
+    def _execute(self, conn, batch: list):
+        """Führt einen Batch in einer Transaktion aus und löst die Futures auf."""
+        for attempt in range(MAX_RETRIES + 1):
+            results = {}
+            cursor = None
+            try:
+                cursor = conn.cursor()
+                conn.start_transaction()
+                for i, (sql, params, _) in enumerate(batch):
+                    cursor.execute(f"SAVEPOINT op{i}")
+                    try:
+                        cursor.execute(sql, params)
+                        results[i] = cursor.rowcount
+                    except Exception as e:
+                        if getattr(e, "errno", None) == _DEADLOCK:
+                            raise
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT op{i}")
+                        results[i] = e
+                    cursor.execute(f"RELEASE SAVEPOINT op{i}")
+                conn.commit()
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                if getattr(e, "errno", None) == _DEADLOCK and attempt < MAX_RETRIES:
+                    continue
+                for _, _, future in batch:
+                    future.set_exception(e)
+                return
+            finally:
+                if cursor is not None:
+                    try:
+                        cursor.close()
+                    except Exception:
+                        pass
+
+            self.commits += 1
+            self.operations += len(batch)
+            for i, (_, _, future) in enumerate(batch):
+                if isinstance(results[i], Exception):
+                    future.set_exception(results[i])
+                else:
+                    future.set_result(results[i])
+            return
+
+
+class WriteQueueRegistry:
+    """Eine WriteQueue pro Konto (Nutzer, Host, Datenbank) und Streamlit-Prozess."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}
+
+    def for_session(self, session) -> WriteQueue:
+        key = (session.user, session.host, session.database)
+        with self._lock:
+            if key not in self._queues:
+                self._queues[key] = WriteQueue(session.new_connection)
+            return self._queues[key]
+
+
+@st.cache_resource
+def get_write_queues() -> WriteQueueRegistry:
+    return WriteQueueRegistry()
+
+
+def get_write_queue(session) -> WriteQueue:
+    """WriteQueue für das Konto einer DBSession (None ohne Sitzung)."""
+    if session is None:
+        return None
+    return get_write_queues().for_session(session)